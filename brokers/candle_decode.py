@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+OANDA Candle Decoding - RBOTzilla UNI
+Turns the /candles payload into NumPy arrays in one pass: per-bar strings
+are gathered column by column and converted by NumPy in C, so scans read
+`bars['close']` instead of running float(c['mid']['c']) loops and keeping
+a dict per bar.
+JSON bodies are parsed with orjson when it is installed (optional; set
+RICK_FAST_JSON=0 to force the stdlib parser).
+PIN: 841921
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+try:
+    if os.getenv("RICK_FAST_JSON", "1") == "0":
+        raise ImportError
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# time: epoch nanoseconds (OANDA candle times are whole seconds)
+CANDLE_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+    ("complete", "?"),
+])
+
+FIELDS = CANDLE_DTYPE.names
+_PRICE_KEYS = {"open": "o", "high": "h", "low": "l", "close": "c"}
+
+JSON_BACKEND = "orjson" if _orjson is not None else "json"
+
+
+def json_loads(payload: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse a JSON document with the fastest available parser"""
+    if _orjson is not None:
+        return _orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _times_ns(times: List[str]) -> np.ndarray:
+    if not times:
+        return np.empty(0, np.int64)
+    first = times[0]
+    if "T" not in first:
+        # UNIX datetime format ("1699999200.000000000")
+        return np.round(np.array(times, dtype=np.float64) * 1e9).astype(np.int64)
+    # RFC3339: the fixed-width S19 cast keeps "YYYY-MM-DDTHH:MM:SS" and drops fraction/zone
+    seconds = np.array(times, dtype="S19").astype("datetime64[s]").astype(np.int64)
+    return seconds * 1_000_000_000
+
+
+def _floats(values: List[Any]) -> np.ndarray:
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        # A malformed price: convert one by one so only that bar becomes NaN
+        out = np.empty(len(values))
+        for i, value in enumerate(values):
+            try:
+                out[i] = float(value)
+            except (TypeError, ValueError):
+                out[i] = np.nan
+        return out
+
+
+def candle_columns(candles: Iterable[Dict[str, Any]], price: str = "mid",
+                   fields: Optional[Sequence[str]] = None,
+                   complete_only: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Decode OANDA candles into column arrays
+
+    Args:
+        candles: Candle dicts as returned by /v3/instruments/{i}/candles
+        price: Price component to read ("mid", "bid" or "ask")
+        fields: Subset of FIELDS to decode (default: all); decoding only
+            'close' is several times cheaper than the full bar
+        complete_only: Drop in-progress bars
+
+    Returns:
+        {field: array} with the dtypes of CANDLE_DTYPE; bars without the
+        requested price component are skipped
+    """
+    wanted = FIELDS if fields is None else tuple(fields)
+    for name in wanted:
+        if name not in CANDLE_DTYPE.names:
+            raise ValueError(f"Unknown candle field: {name}")
+
+    bars = [c for c in candles if c.get(price) and (not complete_only or c.get("complete", True))]
+    columns: Dict[str, np.ndarray] = {}
+    for name in wanted:
+        if name in _PRICE_KEYS:
+            key = _PRICE_KEYS[name]
+            columns[name] = _floats([c[price].get(key) for c in bars])
+        elif name == "time":
+            columns[name] = _times_ns([c["time"] for c in bars])
+        elif name == "volume":
+            columns[name] = np.array([c.get("volume", 0) for c in bars], dtype=np.int64)
+        else:
+            columns[name] = np.array([c.get("complete", True) for c in bars], dtype=bool)
+    return columns
+
+
+def decode_candles(candles: Iterable[Dict[str, Any]], price: str = "mid",
+                   complete_only: bool = False) -> np.ndarray:
+    """Decode OANDA candles into a structured array of CANDLE_DTYPE (one record per bar)"""
+    columns = candle_columns(candles, price, complete_only=complete_only)
+    out = np.empty(len(columns["time"]), dtype=CANDLE_DTYPE)
+    for name, values in columns.items():
+        out[name] = values
+    return out
+
+
+def decode_candles_json(payload: Union[bytes, str], price: str = "mid",
+                        complete_only: bool = False) -> np.ndarray:
+    """Decode a raw /candles response body straight to a CANDLE_DTYPE array"""
+    return decode_candles(json_loads(payload).get("candles", []), price, complete_only)
+
+
+def closes(candles: Union[np.ndarray, Iterable[Dict[str, Any]]], price: str = "mid") -> np.ndarray:
+    """Close prices from a decoded array or from raw candle dicts"""
+    if isinstance(candles, np.ndarray):
+        return candles["close"]
+    return candle_columns(candles, price, fields=("close",))["close"]
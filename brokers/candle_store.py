@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Columnar Candle Store - RBOTzilla UNI
+Local history of completed candles, partitioned as
+<root>/<instrument>/<granularity>/ with one fixed-width little-endian file
+per column (time.i8 = epoch seconds, open/high/low/close.f8, volume.i8).
+Reads are np.memmap views sliced by binary search on time, so backtests and
+model training load years of M1/M15 bars without parsing JSON or CSV.
+New bars are appended to the column files; bars older than the last stored
+bar (backfills) are merged into a fresh generation directory (g<N>/) that
+replaces the live columns with a single rename of the `current` symlink.
+PIN: 841921
+"""
+
+import fcntl
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .oanda_candle_cache import GRANULARITY_SECONDS, MAX_CANDLES_PER_REQUEST
+    from .candle_decode import candle_columns
+except ImportError:
+    from brokers.oanda_candle_cache import GRANULARITY_SECONDS, MAX_CANDLES_PER_REQUEST
+    from brokers.candle_decode import candle_columns
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<i8"),
+)
+_DTYPES = {name: np.dtype(dtype) for name, dtype in COLUMNS}
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "candles")
+
+TimeLike = Union[int, float, str, datetime, None]
+
+
+def to_epoch(value: TimeLike) -> Optional[int]:
+    """Epoch seconds from int/float, datetime or RFC3339 / UNIX-timestamp string"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return int(value)
+    try:
+        return int(float(value))
+    except ValueError:  # not a number: RFC3339 / ISO date ("2024-01-01", "2024-01-01T00:00:00Z")
+        return int(np.datetime64(value[:19], "s").astype(np.int64))
+
+
+def _in_sorted(haystack: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """np.isin(values, haystack) for an ascending haystack, by binary search (O(k log N))"""
+    pos = np.searchsorted(haystack, values)
+    found = pos < len(haystack)
+    found[found] = haystack[pos[found]] == values[found]
+    return found
+
+
+def to_rfc3339(ts: int) -> str:
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_oanda_candles(candles: List[Dict[str, Any]], price: str = "mid") -> Dict[str, np.ndarray]:
+    """Completed OANDA candles -> column arrays (in-progress bars are dropped)"""
+    columns = candle_columns(candles, price, fields=tuple(_DTYPES), complete_only=True)
+    columns["time"] //= 1_000_000_000
+    return columns
+
+
+def _market_closed(times: np.ndarray) -> np.ndarray:
+    """True for FX weekend-closure bars (Fri 21:00 UTC -> Sun 21:00 UTC)"""
+    weekday = (times // 86400 + 3) % 7  # 1970-01-01 was a Thursday; 0 = Monday
+    hour = times % 86400 // 3600
+    return (weekday == 5) | ((weekday == 4) & (hour >= 21)) | ((weekday == 6) & (hour < 21))
+
+
+class CandleStore:
+    """
+    Memory-mapped columnar candle history
+
+    Usage:
+        store = CandleStore()                          # root: RICK_CANDLE_STORE or data/candles
+        store.ingest_oanda("EUR_USD", "M15", candles)  # append completed bars
+        bars = store.read("EUR_USD", "M15", start="2024-01-01")
+        closes = bars["close"]                         # zero-copy memmap view
+        store.backfill(fetch, "EUR_USD", "M15")        # fill holes via fetch(params) -> candles
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            root: Store directory (default: RICK_CANDLE_STORE, else <repo>/data/candles)
+        """
+        self.root = Path(root or os.getenv("RICK_CANDLE_STORE") or DEFAULT_ROOT)
+        self._lock = threading.Lock()
+        self.stats = {"appended": 0, "merged": 0, "rewrites": 0}
+
+    # --- Layout -----------------------------------------------------------------------------
+    def _dir(self, instrument: str, granularity: str) -> Path:
+        return self.root / instrument / granularity
+
+    def series(self) -> List[Tuple[str, str]]:
+        """(instrument, granularity) pairs present in the store"""
+        if not self.root.is_dir():
+            return []
+        return sorted((d.parent.name, d.name) for d in self.root.glob("*/*")
+                      if (self._data(d) / "time.i8").exists())
+
+    @staticmethod
+    def _data(directory: Path) -> Path:
+        """
+        Directory holding the live columns: the partition itself until the
+        first merge, then the generation the `current` symlink points at.
+        Resolve once per operation so all columns come from one generation.
+        """
+        try:
+            return directory / os.readlink(directory / "current")
+        except OSError:
+            return directory
+
+    def _rows(self, directory: Path) -> int:
+        """Complete rows = shortest column (a torn append leaves some columns longer)"""
+        try:
+            return min(os.path.getsize(self._file(directory, name)) // dtype.itemsize
+                       for name, dtype in _DTYPES.items())
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _file(directory: Path, name: str) -> Path:
+        dtype = _DTYPES[name]
+        return directory / f"{name}.{dtype.kind}{dtype.itemsize}"
+
+    @contextmanager
+    def _writing(self, directory: Path) -> Iterator[None]:
+        """Serialize writers to one partition across threads and processes"""
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            fd = os.open(directory / ".lock", os.O_CREAT | os.O_RDWR)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    # --- Read -------------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return sum(self.count(i, g) for i, g in self.series())
+
+    def count(self, instrument: str, granularity: str) -> int:
+        return self._rows(self._data(self._dir(instrument, granularity)))
+
+    def read(self, instrument: str, granularity: str, start: TimeLike = None,
+             end: TimeLike = None) -> Dict[str, np.ndarray]:
+        """
+        Columns for bars with start <= time < end as read-only memmap views (no copy)
+
+        Returns:
+            {"time", "open", "high", "low", "close", "volume"} arrays of equal length
+        """
+        directory = self._data(self._dir(instrument, granularity))
+        rows = self._rows(directory)
+        if rows == 0:
+            return {name: np.empty(0, dtype) for name, dtype in _DTYPES.items()}
+        cols = {name: np.memmap(self._file(directory, name), dtype=dtype, mode="r", shape=(rows,))
+                for name, dtype in _DTYPES.items()}
+        lo = 0 if start is None else int(np.searchsorted(cols["time"], to_epoch(start), side="left"))
+        hi = rows if end is None else int(np.searchsorted(cols["time"], to_epoch(end), side="left"))
+        return {name: col[lo:hi] for name, col in cols.items()}
+
+    def tail(self, instrument: str, granularity: str, count: int) -> Dict[str, np.ndarray]:
+        """Last `count` bars (memmap views)"""
+        cols = self.read(instrument, granularity)
+        return {name: col[-count:] if count else col[:0] for name, col in cols.items()}
+
+    def last_time(self, instrument: str, granularity: str) -> Optional[int]:
+        times = self.read(instrument, granularity)["time"]
+        return int(times[-1]) if len(times) else None
+
+    def read_dataframe(self, instrument: str, granularity: str, start: TimeLike = None, end: TimeLike = None):
+        """Bars as a pandas DataFrame indexed by UTC timestamp (copies the slice)"""
+        import pandas as pd
+
+        cols = self.read(instrument, granularity, start, end)
+        index = pd.to_datetime(np.asarray(cols["time"]), unit="s", utc=True)
+        return pd.DataFrame({name: np.asarray(cols[name]) for name in _DTYPES if name != "time"}, index=index)
+
+    def to_oanda_candles(self, instrument: str, granularity: str, count: int) -> List[Dict[str, Any]]:
+        """Last `count` bars in OANDA /candles format, for callers that still expect dicts"""
+        cols = self.tail(instrument, granularity, count)
+        return [
+            {"time": to_rfc3339(t), "volume": int(v), "complete": True,
+             "mid": {"o": f"{o:.5f}", "h": f"{h:.5f}", "l": f"{l:.5f}", "c": f"{c:.5f}"}}
+            for t, o, h, l, c, v in zip(cols["time"].tolist(), cols["open"].tolist(), cols["high"].tolist(),
+                                        cols["low"].tolist(), cols["close"].tolist(), cols["volume"].tolist())
+        ]
+
+    # --- Write ------------------------------------------------------------------------------
+    def append(self, instrument: str, granularity: str, bars: Dict[str, np.ndarray]) -> int:
+        """
+        Add bars; returns how many were new
+
+        Bars after the last stored bar are appended to the column files.
+        Anything older that is not stored yet (a backfill) triggers a merge
+        into a new generation that readers switch to in one rename.
+        """
+        times = np.asarray(bars["time"], dtype=np.int64)
+        if len(times) == 0:
+            return 0
+        order = np.argsort(times, kind="stable")
+        times = times[order]
+        keep = np.ones(len(times), dtype=bool)
+        keep[:-1] = times[1:] != times[:-1]  # last write wins for duplicate times
+        new = {name: np.asarray(bars[name], dtype=dtype)[order][keep] for name, dtype in _DTYPES.items()}
+
+        partition = self._dir(instrument, granularity)
+        with self._writing(partition):
+            directory = self._data(partition)
+            rows = self._rows(directory)
+            if rows:
+                self._truncate(directory, rows)
+                stored_times = np.memmap(self._file(directory, "time"), dtype=_DTYPES["time"], mode="r", shape=(rows,))
+                last = int(stored_times[-1])
+                older = new["time"] <= last
+                if older.any():
+                    missing = older.copy()
+                    missing[older] = ~_in_sorted(stored_times, new["time"][older])
+                    del stored_times
+                    if missing.any():
+                        return self._merge(partition, directory, rows,
+                                           {n: c[missing | ~older] for n, c in new.items()})
+                    new = {n: c[~older] for n, c in new.items()}
+                else:
+                    del stored_times
+            for name in _DTYPES:
+                with open(self._file(directory, name), "ab") as f:
+                    f.write(new[name].tobytes())
+            self.stats["appended"] += len(new["time"])
+            return len(new["time"])
+
+    def _truncate(self, directory: Path, rows: int):
+        """Cut columns left longer by an interrupted append back to `rows`"""
+        for name, dtype in _DTYPES.items():
+            path = self._file(directory, name)
+            if os.path.getsize(path) != rows * dtype.itemsize:
+                os.truncate(path, rows * dtype.itemsize)
+
+    def _merge(self, partition: Path, directory: Path, rows: int, new: Dict[str, np.ndarray]) -> int:
+        """
+        Write the merged columns to a new generation directory, then repoint
+        `current` at it with one os.replace: readers see all old or all new
+        columns, never a mix. The previous generation is kept for readers
+        that resolved it just before the swap; older ones are removed.
+        """
+        stored = {name: np.fromfile(self._file(directory, name), dtype=dtype, count=rows)
+                  for name, dtype in _DTYPES.items()}
+        merged_times = np.concatenate([stored["time"], new["time"]])
+        order = np.argsort(merged_times, kind="stable")
+        added = len(new["time"]) - int(_in_sorted(stored["time"], new["time"]).sum())
+        sorted_times = merged_times[order]
+        keep = np.ones(len(sorted_times), dtype=bool)
+        keep[:-1] = sorted_times[1:] != sorted_times[:-1]
+        generation = partition / f"g{self._generation(partition, directory) + 1}"
+        shutil.rmtree(generation, ignore_errors=True)  # leftover of an interrupted merge
+        generation.mkdir()
+        for name in _DTYPES:
+            column = np.concatenate([stored[name], new[name]])[order][keep]
+            column.tofile(self._file(generation, name))
+        link = partition / "current.tmp"
+        if os.path.lexists(link):
+            os.unlink(link)
+        os.symlink(generation.name, link)
+        os.replace(link, partition / "current")
+
+        for old in partition.glob("g*"):
+            if old.is_dir() and old not in (generation, directory):
+                shutil.rmtree(old, ignore_errors=True)
+        if directory != partition:  # columns from before the first merge are two generations old now
+            for name in _DTYPES:
+                try:
+                    os.unlink(self._file(partition, name))
+                except FileNotFoundError:
+                    pass
+        self.stats["merged"] += added
+        self.stats["rewrites"] += 1
+        return added
+
+    @staticmethod
+    def _generation(partition: Path, directory: Path) -> int:
+        return 0 if directory == partition else int(directory.name[1:])
+
+    def ingest_oanda(self, instrument: str, granularity: str, candles: List[Dict[str, Any]],
+                     price: str = "mid") -> int:
+        """Append the completed bars of an OANDA /candles response"""
+        return self.append(instrument, granularity, parse_oanda_candles(candles, price))
+
+    # --- Gaps -------------------------------------------------------------------------------
+    def find_gaps(self, instrument: str, granularity: str, start: TimeLike = None, end: TimeLike = None,
+                  skip_weekends: bool = True) -> List[Tuple[int, int, int]]:
+        """
+        Holes in the stored series
+
+        Args:
+            skip_weekends: Ignore bars inside the FX weekend closure (use False for crypto)
+
+        Returns:
+            [(first_missing_time, last_missing_time, missing_bars), ...] in epoch seconds
+        """
+        bar = GRANULARITY_SECONDS.get(granularity)
+        if not bar:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        times = np.asarray(self.read(instrument, granularity, start, end)["time"])
+        if len(times) < 2:
+            return []
+        jumps = np.flatnonzero(np.diff(times) > bar * 1.5)
+        gaps = []
+        for i in jumps:
+            expected = np.arange(times[i] + bar, times[i + 1], bar, dtype=np.int64)
+            if skip_weekends:
+                expected = expected[~_market_closed(expected)]
+            if len(expected):
+                gaps.append((int(expected[0]), int(expected[-1]), len(expected)))
+        return gaps
+
+    def backfill(self, fetch: Callable[[Dict[str, Any]], List[Dict[str, Any]]], instrument: str,
+                 granularity: str, start: TimeLike = None, end: TimeLike = None,
+                 skip_weekends: bool = True) -> int:
+        """
+        Fetch and store missing bars
+
+        Fills interior gaps, history before the first stored bar back to
+        `start`, and bars after the last one up to `end` (default: now).
+
+        Args:
+            fetch: fetch(params) -> OANDA candles; params carry "from"/"to" RFC3339 bounds
+                   (the caller adds granularity/price)
+
+        Returns:
+            Number of bars added
+        """
+        bar = GRANULARITY_SECONDS.get(granularity)
+        if not bar:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        spans = [(first, last + bar) for first, last, _ in
+                 self.find_gaps(instrument, granularity, start, end, skip_weekends)]
+        times = self.read(instrument, granularity)["time"]
+        start_ts, end_ts = to_epoch(start), to_epoch(end)
+        if len(times):
+            if start_ts is not None and start_ts < times[0]:
+                spans.insert(0, (start_ts, int(times[0])))
+            spans.append((int(times[-1]) + bar, end_ts or int(datetime.now(timezone.utc).timestamp())))
+        elif start_ts is not None:
+            spans.append((start_ts, end_ts or int(datetime.now(timezone.utc).timestamp())))
+
+        added = 0
+        chunk = bar * MAX_CANDLES_PER_REQUEST
+        for span_start, span_end in spans:
+            for lo in range(span_start, span_end, chunk):
+                hi = min(lo + chunk, span_end)
+                candles = fetch({"from": to_rfc3339(lo), "to": to_rfc3339(hi)})
+                added += self.append(instrument, granularity, parse_oanda_candles(candles or []))
+        if added:
+            logger.info(f"Backfilled {added} {instrument} {granularity} bars")
+        return added
+
+
+_default_store: Optional[CandleStore] = None
+
+
+def get_candle_store() -> CandleStore:
+    """Process-wide store rooted at RICK_CANDLE_STORE (or data/candles)"""
+    global _default_store
+    if _default_store is None:
+        _default_store = CandleStore()
+    return _default_store
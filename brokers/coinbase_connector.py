@@ -21,6 +21,11 @@ from datetime import datetime, timezone
 import websocket
 from urllib.parse import urljoin
 
+try:
+    from .rate_limiter import get_rate_limiter, RequestPriority
+except ImportError:
+    from brokers.rate_limiter import get_rate_limiter, RequestPriority
+
 # Charter compliance imports
 try:
     from ..foundation.rick_charter import validate_pin
@@ -155,6 +160,9 @@ class CoinbaseConnector:
         self.request_times = []
         self._lock = threading.Lock()
         
+        # Process-wide Coinbase request scheduler (orders > pricing > candles > account)
+        self.rate_limiter = get_rate_limiter("coinbase")
+        
         # Charter compliance
         self.max_placement_latency_ms = 300
         self.default_timeout = 5.0  # 5 second API timeout
@@ -531,6 +539,9 @@ class CoinbaseConnector:
         Returns:
             Dict with API response
         """
+        # Wait for a rate-limit token before signing (signature timestamps must be fresh)
+        self.rate_limiter.acquire(self._request_priority(method, endpoint))
+        
         start_time = time.time()
         url = urljoin(self.api_base, endpoint)
         body = json.dumps(data) if data else ""
@@ -638,6 +649,18 @@ class CoinbaseConnector:
                 "broker": "Coinbase"
             }
     
+    @staticmethod
+    def _request_priority(method: str, endpoint: str) -> RequestPriority:
+        """Scheduler class for a request: order placement/cancel first, account polling last"""
+        path = endpoint.split("?", 1)[0]
+        if method.upper() != "GET":
+            return RequestPriority.ORDER
+        if path.endswith("/ticker") or path.endswith("/book") or "/best_bid_ask" in path:
+            return RequestPriority.PRICING
+        if path.endswith("/candles"):
+            return RequestPriority.CANDLES
+        return RequestPriority.ACCOUNT
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get connector performance statistics"""
         with self._lock:
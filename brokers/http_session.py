@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Transport - RBOTzilla UNI
+Shared keep-alive requests.Session for broker connectors with retry/backoff
+and per-endpoint connection-reuse and latency counters.
+PIN: 841921
+"""
+
+import threading
+from typing import Dict, Any, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Per-thread record of whether the last connection checked out of a pool was
+# already connected (keep-alive reuse) or needs a fresh TCP+TLS handshake.
+_conn_state = threading.local()
+
+# Only idempotent reads are retried automatically; order placement must never
+# be replayed by the transport layer.
+DEFAULT_RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class _ReuseTrackingMixin:
+    """Records connection reuse for the request running on this thread"""
+
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout=timeout)
+        _conn_state.reused = getattr(conn, "sock", None) is not None
+        return conn
+
+
+class _TrackingHTTPConnectionPool(_ReuseTrackingMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSConnectionPool(_ReuseTrackingMixin, HTTPSConnectionPool):
+    pass
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report keep-alive reuse"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TrackingHTTPConnectionPool,
+            "https": _TrackingHTTPSConnectionPool,
+        }
+
+
+def build_pooled_session(pool_size: int = 10,
+                         max_retries: int = 2,
+                         backoff_factor: float = 0.2,
+                         retry_methods: Iterable[str] = DEFAULT_RETRY_METHODS,
+                         retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES,
+                         headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Build a keep-alive session with a bounded connection pool
+
+    Args:
+        pool_size: Max pooled connections per host (also the number of hosts cached)
+        max_retries: Retries for idempotent methods on connect errors / retry statuses
+        backoff_factor: Exponential backoff base in seconds between retries
+        retry_methods: HTTP methods eligible for automatic retry
+        retry_statuses: Status codes that trigger a retry (Retry-After is honoured)
+        headers: Default headers applied to every request
+
+    Returns:
+        Configured requests.Session (safe to share across threads once built)
+    """
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=tuple(retry_statuses),
+        allowed_methods=frozenset(m.upper() for m in retry_methods),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = PooledHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry,
+        pool_block=False,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def pooled_request(session: requests.Session, method: str, url: str, **kwargs):
+    """
+    Send a request through a pooled session
+
+    Returns:
+        Tuple of (response, reused) where reused is True if the request ran on
+        an already-open keep-alive connection, False if a new connection was
+        opened, and None if it could not be determined.
+    """
+    _conn_state.reused = None
+    response = session.request(method, url, **kwargs)
+    return response, getattr(_conn_state, "reused", None)
+
+
+class EndpointStats:
+    """Thread-safe per-endpoint request, reuse and latency counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, key: str, latency_ms: float, reused: Optional[bool], ok: bool):
+        with self._lock:
+            s = self._stats.get(key)
+            if s is None:
+                s = self._stats[key] = {
+                    "requests": 0,
+                    "errors": 0,
+                    "reused_connections": 0,
+                    "new_connections": 0,
+                    "total_latency_ms": 0.0,
+                    "max_latency_ms": 0.0,
+                    "last_latency_ms": 0.0,
+                }
+            s["requests"] += 1
+            if not ok:
+                s["errors"] += 1
+            if reused is True:
+                s["reused_connections"] += 1
+            elif reused is False:
+                s["new_connections"] += 1
+            s["total_latency_ms"] += latency_ms
+            s["last_latency_ms"] = latency_ms
+            if latency_ms > s["max_latency_ms"]:
+                s["max_latency_ms"] = latency_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the counters with derived averages and reuse rate"""
+        with self._lock:
+            out = {}
+            for key, s in self._stats.items():
+                tracked = s["reused_connections"] + s["new_connections"]
+                out[key] = {
+                    "requests": s["requests"],
+                    "errors": s["errors"],
+                    "reused_connections": s["reused_connections"],
+                    "new_connections": s["new_connections"],
+                    "reuse_rate": round(s["reused_connections"] / tracked, 3) if tracked else 0.0,
+                    "avg_latency_ms": round(s["total_latency_ms"] / s["requests"], 1),
+                    "max_latency_ms": round(s["max_latency_ms"], 1),
+                    "last_latency_ms": round(s["last_latency_ms"], 1),
+                }
+            return out
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Async OANDA Broker Connector - RBOTzilla UNI
+Awaitable counterpart to OandaConnector for asyncio trading loops.
+Broker reads and trade modifications run natively on aiohttp so a slow
+response never stalls the event loop.
+PIN: 841921
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Any
+from urllib.parse import urljoin
+
+import aiohttp
+
+try:
+    from .oanda_connector import OandaConnector, PriceSnapshot
+    from .request_coalescer import RequestCoalescer
+    from .candle_decode import decode_candles, json_loads
+except ImportError:
+    from brokers.oanda_connector import OandaConnector, PriceSnapshot
+    from brokers.request_coalescer import RequestCoalescer
+    from brokers.candle_decode import decode_candles, json_loads
+
+
+class AsyncOandaConnector:
+    """
+    Async OANDA v20 REST connector
+
+    Shares credentials, environment, latency window and per-endpoint stats with a
+    synchronous OandaConnector. Method names and return shapes match the sync
+    connector; every method is a coroutine.
+    """
+
+    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None,
+                 connector: Optional[OandaConnector] = None, pool_size: Optional[int] = None):
+        """
+        Initialize async OANDA connector
+
+        Args:
+            pin: Charter PIN (841921)
+            environment: 'practice' or 'live' (ignored when connector is given)
+            connector: Existing OandaConnector to share credentials and stats with
+            pool_size: Max keep-alive connections (defaults to the sync connector's pool size)
+        """
+        self.sync = connector or OandaConnector(pin=pin, environment=environment)
+        self.environment = self.sync.environment
+        self.account_id = self.sync.account_id
+        self.api_base = self.sync.api_base
+        self.headers = self.sync.headers
+        self.default_timeout = self.sync.default_timeout
+        self.max_placement_latency_ms = self.sync.max_placement_latency_ms
+        self.pool_size = pool_size or self.sync.pool_size
+        self.logger = logging.getLogger(__name__)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the keep-alive session on the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.default_timeout),
+                headers=self.headers,
+            )
+        return self._session
+
+    async def close(self):
+        """Close the aiohttp session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _make_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                            params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make authenticated API request with performance tracking
+
+        Identical concurrent GETs share one request through the sync connector's
+        coalescer (and its micro-cache); writes invalidate it.
+
+        Returns:
+            Dict with API response (same shape as OandaConnector._make_request)
+        """
+        method = method.upper()
+        if method == "GET":
+            key = RequestCoalescer.make_key(method, endpoint, params)
+            ttl = self.sync.micro_cache_ttl.get(OandaConnector._endpoint_class(method, endpoint), 0.0)
+            return await self.sync.coalescer.do_async(
+                key, lambda: self._send_request(method, endpoint, data, params), ttl)
+        try:
+            return await self._send_request(method, endpoint, data, params)
+        finally:
+            self.sync.coalescer.invalidate()
+
+    async def _send_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                            params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one request (no coalescing); see _make_request"""
+        start_time = time.time()
+        url = urljoin(self.api_base, endpoint)
+        tracked = False
+
+        try:
+            if method not in ("GET", "POST", "PUT", "DELETE"):
+                raise ValueError(f"Unsupported HTTP method: {method}")
+
+            await self.sync.rate_limiter.acquire_async(OandaConnector._request_priority(method, endpoint))
+            start_time = time.time()
+            session = await self._get_session()
+            async with session.request(
+                method, url,
+                params=params if method == "GET" else None,
+                json=data if method in ("POST", "PUT") else None,
+            ) as response:
+                body = await response.read()
+                latency_ms = (time.time() - start_time) * 1000
+                ok = response.status < 400
+                self.sync._track_request(method, endpoint, latency_ms, None, ok)
+                tracked = True
+
+                if not ok:
+                    error_msg = f"HTTP {response.status}: {body.decode(errors='replace')}"
+                    self.logger.error(f"OANDA API ERROR ({self.environment}): {error_msg}")
+                    return {
+                        "success": False,
+                        "error": error_msg,
+                        "latency_ms": latency_ms,
+                        "status_code": response.status
+                    }
+
+                result = json_loads(body) if body else {}
+
+            if self.environment == "live" and latency_ms > self.max_placement_latency_ms:
+                self.logger.error(f"LIVE OANDA API TIMEOUT: {latency_ms:.1f}ms for {method} {endpoint}")
+
+            return {
+                "success": True,
+                "data": result,
+                "latency_ms": latency_ms,
+                "status_code": response.status
+            }
+
+        except asyncio.TimeoutError:
+            latency_ms = (time.time() - start_time) * 1000
+            self.sync._track_request(method, endpoint, latency_ms, None, False)
+            self.logger.error(f"OANDA API TIMEOUT ({self.environment}): {latency_ms:.1f}ms for {method} {endpoint}")
+            return {
+                "success": False,
+                "error": "Request timeout - order execution failed",
+                "latency_ms": latency_ms,
+                "status_code": 408
+            }
+
+        except Exception as e:
+            latency_ms = (time.time() - start_time) * 1000
+            if not tracked:
+                self.sync._track_request(method, endpoint, latency_ms, None, False)
+            self.logger.error(f"OANDA API EXCEPTION ({self.environment}): {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "latency_ms": latency_ms,
+                "status_code": 0
+            }
+
+    # --- Same surface as OandaConnector ---------------------------------------------------
+    async def get_orders(self, state: str = "PENDING") -> List[Dict[str, Any]]:
+        """Return pending orders from OANDA for this account."""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/orders", params={"state": state})
+        if resp.get("success"):
+            return (resp.get("data") or {}).get("orders", [])
+        return []
+
+    async def get_trades(self) -> List[Dict[str, Any]]:
+        """Return open trades for this account."""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/trades")
+        if resp.get("success"):
+            return (resp.get("data") or {}).get("trades", [])
+        return []
+
+    async def get_historical_data(self, instrument: str, count: int = 120,
+                                  granularity: str = "M15", as_array: bool = False):
+        """Fetch historical mid-price candles (same format, candle cache and as_array option as
+        OandaConnector.get_historical_data)"""
+        candles = await self._fetch_historical_data(instrument, count, granularity)
+        return decode_candles(candles) if as_array else candles
+
+    async def _fetch_historical_data(self, instrument: str, count: int, granularity: str) -> List[Dict[str, Any]]:
+        cache = self.sync.candle_cache
+        params = cache.request_params(instrument, granularity, count) if cache else {"count": count}
+        resp = await self._make_request("GET", f"/v3/instruments/{instrument}/candles",
+                                        params={**params, "granularity": granularity, "price": "M"})
+        if resp.get("success"):
+            candles = (resp.get("data") or {}).get("candles", [])
+            if self.sync.candle_store is not None and candles:
+                self.sync._store_candles(instrument, granularity, candles)
+            if cache:
+                return cache.update(instrument, granularity, candles, count, params)
+            if not candles:
+                self.logger.warning(f"No candles in response for {instrument}")
+            return candles
+        self.logger.error(f"OANDA candles error for {instrument}: {resp.get('error', 'unknown error')}")
+        return []
+
+    async def get_live_prices(self, instruments: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch real-time price snapshots (bid/ask/mid) for instruments."""
+        if not instruments:
+            return {}
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/pricing",
+                                        params={"instruments": ",".join(instruments)})
+        if not resp.get("success"):
+            self.logger.error(f"Pricing API error: {resp.get('error')}")
+            return {}
+        return OandaConnector._parse_prices(resp.get("data", {}))
+
+    async def get_price_snapshot(self, instruments: List[str]) -> PriceSnapshot:
+        """Fetch all instruments in one pricing request and freeze the result."""
+        unique = list(dict.fromkeys(instruments))
+        return PriceSnapshot(await self.get_live_prices(unique) if unique else {})
+
+    async def get_account_info(self) -> Dict[str, Any]:
+        """Return the account summary (same shape as OandaConnector.get_account_info)."""
+        resp = await self._make_request("GET", f"/v3/accounts/{self.account_id}/summary")
+        if resp.get("success"):
+            return (resp.get("data") or {}).get("account", {})
+        return {}
+
+    async def cancel_order(self, order_id: str) -> Dict[str, Any]:
+        """Cancel a pending order by id."""
+        return await self._make_request("PUT", f"/v3/accounts/{self.account_id}/orders/{order_id}/cancel")
+
+    async def set_trade_stop(self, trade_id: str, stop_price: float) -> Dict[str, Any]:
+        """Set/modify the stop loss price for an existing trade."""
+        payload = {"stopLoss": {"price": str(stop_price)}}
+        return await self._make_request("PUT", f"/v3/accounts/{self.account_id}/trades/{trade_id}/orders", payload)
+
+    async def place_oco_order(self, *args, **kwargs) -> Dict[str, Any]:
+        """
+        Place OCO order
+
+        Order placement keeps the single, audited Charter implementation in
+        OandaConnector.place_oco_order and runs it off the event loop.
+        """
+        return await asyncio.to_thread(self.sync.place_oco_order, *args, **kwargs)
+
+    def get_performance_stats(self) -> Dict[str, Any]:
+        """Get connector performance statistics (shared with the sync connector)"""
+        return self.sync.get_performance_stats()
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get per-endpoint counters (shared with the sync connector)"""
+        return self.sync.get_connection_stats()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Incremental Candle Cache - RBOTzilla UNI
+Per-(instrument, granularity) ring buffer of completed OANDA candles.
+After the first load only bars newer than the last cached bar are fetched
+(OANDA `from=` param); the in-progress bar is held separately and replaced
+on every fetch.
+PIN: 841921
+"""
+
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
+
+# Bar length in seconds per OANDA granularity (M = month, approximated as 31 days)
+GRANULARITY_SECONDS = {
+    "S5": 5, "S10": 10, "S15": 15, "S30": 30,
+    "M1": 60, "M2": 120, "M4": 240, "M5": 300, "M10": 600, "M15": 900, "M30": 1800,
+    "H1": 3600, "H2": 7200, "H3": 10800, "H4": 14400, "H6": 21600, "H8": 28800, "H12": 43200,
+    "D": 86400, "W": 604800, "M": 2678400,
+}
+
+# OANDA returns at most 5000 candles per request
+MAX_CANDLES_PER_REQUEST = 5000
+
+
+def parse_oanda_time(value: str) -> datetime:
+    """Parse OANDA RFC3339 time (nanosecond precision) or a UNIX timestamp string"""
+    if not value:
+        raise ValueError("empty candle time")
+    if value[0].isdigit() and "T" not in value:
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+    head = value.rstrip("Z").split(".")[0]
+    return datetime.strptime(head, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+class _Series:
+    __slots__ = ("completed", "partial", "last_time")
+
+    def __init__(self, maxlen: int):
+        self.completed: deque = deque(maxlen=maxlen)
+        self.partial: Optional[Dict[str, Any]] = None
+        self.last_time: Optional[str] = None
+
+
+class CandleCache:
+    """
+    Ring buffer of completed candles keyed by (instrument, granularity)
+
+    Usage (fetcher-agnostic so sync and async connectors share it):
+        params = cache.request_params(instrument, granularity, count)
+        candles = <fetch /candles with params>
+        return cache.update(instrument, granularity, candles, count, params)
+    """
+
+    def __init__(self, maxlen: int = 500):
+        """
+        Args:
+            maxlen: Completed bars kept per series (grown automatically if a caller asks for more)
+        """
+        self.maxlen = maxlen
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.stats = {"cold_fetches": 0, "incremental_fetches": 0, "bars_fetched": 0}
+
+    def _get_series(self, key: Tuple[str, str], count: int) -> _Series:
+        series = self._series.get(key)
+        wanted = max(self.maxlen, count)
+        if series is None:
+            series = self._series[key] = _Series(wanted)
+        elif series.completed.maxlen < wanted:
+            grown = _Series(wanted)
+            grown.completed.extend(series.completed)
+            grown.partial, grown.last_time = series.partial, series.last_time
+            series = self._series[key] = grown
+        return series
+
+    def request_params(self, instrument: str, granularity: str, count: int) -> Dict[str, Any]:
+        """Query params for the next fetch: full `count` when cold, `from=` last bar when warm"""
+        with self._lock:
+            series = self._get_series((instrument, granularity), count)
+            cached = len(series.completed)
+            if series.last_time is None or cached < count - 1:
+                return {"count": count}
+            # OANDA answers a from= request with `count` bars (500 if omitted): ask for a full
+            # window explicitly, and reload if the bars since the last one would not fit in it
+            window = min(series.completed.maxlen, MAX_CANDLES_PER_REQUEST)
+            bar_seconds = GRANULARITY_SECONDS.get(granularity)
+            if bar_seconds:
+                try:
+                    elapsed = (datetime.now(timezone.utc) - parse_oanda_time(series.last_time)).total_seconds()
+                    if elapsed / bar_seconds >= window:  # completed bars + the in-progress one
+                        return {"count": count}
+                except ValueError:
+                    return {"count": count}
+            return {"from": series.last_time, "includeFirst": "false", "count": window}
+
+    def update(self, instrument: str, granularity: str, candles: List[Dict[str, Any]],
+               count: int, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Merge a fetch result and return the last `count` candles (completed + in-progress)"""
+        incremental = "from" in params
+        with self._lock:
+            series = self._get_series((instrument, granularity), count)
+            if incremental:
+                self.stats["incremental_fetches"] += 1
+            else:
+                self.stats["cold_fetches"] += 1
+                series.completed.clear()
+                series.last_time = None
+            self.stats["bars_fetched"] += len(candles)
+
+            series.partial = None
+            for candle in candles:
+                if not candle.get("complete", True):
+                    series.partial = candle
+                    continue
+                if incremental and series.last_time is not None and candle.get("time") <= series.last_time:
+                    continue  # already cached (same-format RFC3339 strings sort chronologically)
+                series.completed.append(candle)
+                series.last_time = candle.get("time")
+
+            return self._tail(series, count)
+
+    def get(self, instrument: str, granularity: str, count: int) -> List[Dict[str, Any]]:
+        """Return cached candles without fetching"""
+        with self._lock:
+            series = self._series.get((instrument, granularity))
+            return self._tail(series, count) if series else []
+
+    @staticmethod
+    def _tail(series: _Series, count: int) -> List[Dict[str, Any]]:
+        if series.partial is not None:
+            if count <= 1:
+                return [series.partial]
+            bars = list(series.completed)[-(count - 1):]
+            bars.append(series.partial)
+            return bars
+        return list(series.completed)[-count:]
+
+    def invalidate(self, instrument: Optional[str] = None, granularity: Optional[str] = None):
+        """Drop cached series (all, per instrument, or one series)"""
+        with self._lock:
+            for key in list(self._series):
+                if (instrument is None or key[0] == instrument) and (granularity is None or key[1] == granularity):
+                    del self._series[key]
@@ -11,13 +11,29 @@ import time
 import logging
 import requests
 import threading
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
+from types import MappingProxyType
 from datetime import datetime, timezone, timedelta
 import websocket
 from urllib.parse import urljoin, urlencode
 
+try:
+    from .http_session import build_pooled_session, pooled_request, EndpointStats
+    from .oanda_candle_cache import CandleCache
+    from .candle_store import CandleStore
+    from .candle_decode import decode_candles, json_loads
+    from .rate_limiter import get_rate_limiter, RequestPriority
+    from .request_coalescer import RequestCoalescer
+except ImportError:
+    from brokers.http_session import build_pooled_session, pooled_request, EndpointStats
+    from brokers.oanda_candle_cache import CandleCache
+    from brokers.candle_store import CandleStore
+    from brokers.candle_decode import decode_candles, json_loads
+    from brokers.rate_limiter import get_rate_limiter, RequestPriority
+    from brokers.request_coalescer import RequestCoalescer
+
 # Charter compliance imports
 try:
     from ..foundation.rick_charter import validate_pin
@@ -88,6 +104,34 @@ class OandaInstrument:
     maximum_trailing_stop_distance: float
     minimum_trailing_stop_distance: float
 
+class PriceSnapshot:
+    """
+    Immutable point-in-time prices for many instruments (one pricing request)
+    Shared by every consumer in a cycle so each sees the same quotes.
+    """
+    __slots__ = ("_prices", "taken_at", "source")
+
+    def __init__(self, prices: Dict[str, Dict[str, Any]], source: str = "rest"):
+        self._prices = MappingProxyType({k: MappingProxyType(dict(v)) for k, v in prices.items()})
+        self.taken_at = time.time()
+        self.source = source
+
+    def get(self, instrument: str) -> Optional[Dict[str, Any]]:
+        return self._prices.get(instrument)
+
+    def __contains__(self, instrument: str) -> bool:
+        return instrument in self._prices
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    @property
+    def instruments(self) -> List[str]:
+        return list(self._prices)
+
+    def age_seconds(self) -> float:
+        return time.time() - self.taken_at
+
 class OandaConnector:
     """
     OANDA v20 REST API Connector with OCO support
@@ -95,13 +139,18 @@ class OandaConnector:
     Supports dynamic mode switching via .upgrade_toggle
     """
     
-    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None):
+    def __init__(self, pin: Optional[int] = None, environment: Optional[str] = None,
+                 pool_size: Optional[int] = None, max_retries: Optional[int] = None,
+                 retry_backoff: Optional[float] = None):
         """
         Initialize OANDA connector
         
         Args:
             pin: Charter PIN (841921)
             environment: 'practice' or 'live' (if None, reads from .upgrade_toggle)
+            pool_size: Keep-alive connections per host (env OANDA_POOL_SIZE, default 10)
+            max_retries: Retries for idempotent GETs (env OANDA_MAX_RETRIES, default 2)
+            retry_backoff: Backoff factor in seconds (env OANDA_RETRY_BACKOFF, default 0.2)
         """
         if pin and not validate_pin(pin):
             raise PermissionError("Invalid PIN for OandaConnector")
@@ -150,6 +199,39 @@ class OandaConnector:
         self.request_times = []
         self._lock = threading.Lock()
         
+        # Shared keep-alive transport (one TCP+TLS handshake per pooled connection)
+        self.pool_size = int(pool_size if pool_size is not None else os.getenv("OANDA_POOL_SIZE", 10))
+        self.max_retries = int(max_retries if max_retries is not None else os.getenv("OANDA_MAX_RETRIES", 2))
+        self.retry_backoff = float(retry_backoff if retry_backoff is not None else os.getenv("OANDA_RETRY_BACKOFF", 0.2))
+        self._session = build_pooled_session(
+            pool_size=self.pool_size,
+            max_retries=self.max_retries,
+            backoff_factor=self.retry_backoff,
+        )
+        self.endpoint_stats = EndpointStats()
+        
+        # Process-wide OANDA request scheduler (orders > stops > pricing > candles > account)
+        self.rate_limiter = get_rate_limiter("oanda")
+        
+        # Single-flight for identical GETs, plus optional micro-cache TTL per endpoint class,
+        # e.g. OANDA_MICRO_CACHE_TTL="trades=1,account=2" (seconds; 0 = coalesce only)
+        self.coalescer = RequestCoalescer()
+        self.micro_cache_ttl: Dict[str, float] = {}
+        for item in filter(None, os.getenv("OANDA_MICRO_CACHE_TTL", "").split(",")):
+            name, _, ttl = item.partition("=")
+            self.set_micro_cache_ttl(name.strip(), float(ttl or 0))
+        
+        # Optional streaming quote cache (see brokers/oanda_price_stream.py)
+        self.price_stream = None
+        
+        # Optional incremental candle cache (see enable_candle_cache)
+        self.candle_cache: Optional[CandleCache] = None
+        
+        # Optional on-disk candle history (see enable_candle_store); on when RICK_CANDLE_STORE is set
+        self.candle_store: Optional[CandleStore] = None
+        if os.getenv("RICK_CANDLE_STORE"):
+            self.enable_candle_store()
+        
         # Charter compliance
         self.max_placement_latency_ms = 300
         self.default_timeout = 5.0  # 5 second API timeout
@@ -563,6 +645,9 @@ class OandaConnector:
         """
         Make authenticated API request with performance tracking - LIVE VERSION
         
+        Concurrent identical GETs share one HTTP request and one (read-only) result;
+        any write drops micro-cached reads so callers never see pre-write state.
+        
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint path
@@ -572,34 +657,62 @@ class OandaConnector:
         Returns:
             Dict with API response
         """
+        method = method.upper()
+        if method == "GET":
+            return self._coalesced_get(endpoint, params, lambda: self._send_request(method, endpoint, data, params))
+        try:
+            return self._send_request(method, endpoint, data, params)
+        finally:
+            self.coalescer.invalidate()
+    
+    def _coalesced_get(self, endpoint: str, params: Optional[Dict[str, Any]],
+                       fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run fetch() once for all concurrent callers of the same GET"""
+        key = RequestCoalescer.make_key("GET", endpoint, params)
+        return self.coalescer.do(key, fetch, self.micro_cache_ttl.get(self._endpoint_class("GET", endpoint), 0.0))
+    
+    def set_micro_cache_ttl(self, endpoint_class: str, ttl: float):
+        """Keep successful reads of an endpoint class ('trades', 'account', 'GET pricing', ...) for ttl seconds"""
+        key = endpoint_class if " " in endpoint_class else f"GET {endpoint_class}"
+        if ttl > 0:
+            self.micro_cache_ttl[key] = float(ttl)
+        else:
+            self.micro_cache_ttl.pop(key, None)
+    
+    def _send_request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None,
+                      params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send one request (no coalescing); see _make_request"""
         start_time = time.time()
         url = urljoin(self.api_base, endpoint)
+        method = method.upper()
+        response = None
+        reused = None
         
         try:
-            # Prepare request
-            if method.upper() == "GET":
-                # Pass params for query string support (e.g., candles)
-                response = requests.get(url, headers=self.headers, params=params, timeout=self.default_timeout)
-            elif method.upper() == "POST":
-                response = requests.post(url, headers=self.headers, json=data, timeout=self.default_timeout)
-            elif method.upper() == "PUT":
-                response = requests.put(url, headers=self.headers, json=data, timeout=self.default_timeout)
-            elif method.upper() == "DELETE":
-                response = requests.delete(url, headers=self.headers, timeout=self.default_timeout)
-            else:
+            if method not in ("GET", "POST", "PUT", "DELETE"):
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
+            # Wait for a rate-limit token; Charter latency is measured from send, not queue entry
+            self.rate_limiter.acquire(self._request_priority(method, endpoint))
+            start_time = time.time()
+            
+            # Pass params for query string support (e.g., candles); body only for POST/PUT
+            response, reused = pooled_request(
+                self._session, method, url,
+                headers=self.headers,
+                params=params if method == "GET" else None,
+                json=data if method in ("POST", "PUT") else None,
+                timeout=self.default_timeout,
+            )
+            
             # Track request latency
             latency_ms = (time.time() - start_time) * 1000
-            with self._lock:
-                self.request_times.append(latency_ms)
-                if len(self.request_times) > 100:
-                    self.request_times = self.request_times[-100:]
+            self._track_request(method, endpoint, latency_ms, reused, response.ok)
             
             # Check response
             response.raise_for_status()
             
-            result = response.json() if response.content else {}
+            result = json_loads(response.content) if response.content else {}
             
             # Log performance for LIVE environment
             if self.environment == "live":
@@ -617,6 +730,7 @@ class OandaConnector:
             
         except requests.exceptions.Timeout:
             latency_ms = (time.time() - start_time) * 1000
+            self._track_request(method, endpoint, latency_ms, reused, False)
             self.logger.error(f"OANDA API TIMEOUT ({self.environment}): {latency_ms:.1f}ms for {method} {endpoint}")
             return {
                 "success": False,
@@ -638,6 +752,8 @@ class OandaConnector:
             
         except Exception as e:
             latency_ms = (time.time() - start_time) * 1000
+            if response is None:
+                self._track_request(method, endpoint, latency_ms, reused, False)
             self.logger.error(f"OANDA API EXCEPTION ({self.environment}): {str(e)}")
             return {
                 "success": False,
@@ -646,6 +762,74 @@ class OandaConnector:
                 "status_code": 0
             }
     
+    @staticmethod
+    def _endpoint_class(method: str, endpoint: str) -> str:
+        """Collapse an endpoint path into a stable stats key (ids stripped)"""
+        path = endpoint.split("?", 1)[0]
+        if path.endswith("/candles"):
+            name = "candles"
+        elif path.endswith("/pricing"):
+            name = "pricing"
+        elif "/orders" in path:
+            name = "orders"
+        elif "/trades" in path:
+            name = "trades"
+        elif "Positions" in path or "/positions" in path:
+            name = "positions"
+        elif "/accounts" in path:
+            name = "account"
+        else:
+            name = "other"
+        return f"{method.upper()} {name}"
+    
+    @staticmethod
+    def _request_priority(method: str, endpoint: str) -> RequestPriority:
+        """Scheduler class for a request: order placement/cancel first, account polling last"""
+        path = endpoint.split("?", 1)[0]
+        if method.upper() != "GET":
+            if "/trades/" in path and path.endswith("/orders"):
+                return RequestPriority.STOP  # stop-loss / take-profit modification
+            return RequestPriority.ORDER     # place / cancel / close
+        if path.endswith("/pricing"):
+            return RequestPriority.PRICING
+        if path.endswith("/candles"):
+            return RequestPriority.CANDLES
+        return RequestPriority.ACCOUNT
+    
+    def _track_request(self, method: str, endpoint: str, latency_ms: float,
+                       reused: Optional[bool], ok: bool):
+        """Record latency in the rolling window and the per-endpoint counters"""
+        with self._lock:
+            self.request_times.append(latency_ms)
+            if len(self.request_times) > 100:
+                self.request_times = self.request_times[-100:]
+        self.endpoint_stats.record(self._endpoint_class(method, endpoint), latency_ms, reused, ok)
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Get keep-alive pool configuration, per-endpoint reuse/latency and scheduler queue metrics"""
+        endpoints = self.endpoint_stats.snapshot()
+        reused = sum(e["reused_connections"] for e in endpoints.values())
+        new = sum(e["new_connections"] for e in endpoints.values())
+        return {
+            "pool_size": self.pool_size,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "total_requests": sum(e["requests"] for e in endpoints.values()),
+            "reused_connections": reused,
+            "new_connections": new,
+            "reuse_rate": round(reused / (reused + new), 3) if (reused + new) else 0.0,
+            "endpoints": endpoints,
+            "rate_limiter": self.rate_limiter.get_metrics(),
+            "coalescing": {**self.coalescer.get_stats(), "micro_cache_ttl": dict(self.micro_cache_ttl)},
+        }
+    
+    def close(self):
+        """Close pooled connections"""
+        try:
+            self._session.close()
+        except Exception:
+            pass
+    
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get connector performance statistics"""
         with self._lock:
@@ -700,20 +884,39 @@ class OandaConnector:
             self.logger.warning(f"Failed to fetch trades: {e}")
         return []
 
+    def get_account_info(self) -> Dict[str, Any]:
+        """Return the account summary (NAV, balance, marginUsed, ... as OANDA strings); empty on failure."""
+        try:
+            endpoint = f"/v3/accounts/{self.account_id}/summary"
+            resp = self._make_request("GET", endpoint)
+            if resp.get("success"):
+                data = resp.get("data") or {}
+                return data.get("account", {})
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch account summary: {e}")
+        return {}
+
 
     def _safe_request_get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Runtime-safe GET wrapper that ALWAYS bypasses _make_request.
-        Directly uses requests.get() for maximum compatibility with legacy stubs.
+        Uses the pooled session directly for maximum compatibility with legacy stubs.
+        Identical concurrent GETs are coalesced as in _make_request.
         """
+        return self._coalesced_get(endpoint, params, lambda: self._send_safe_get(endpoint, params))
+    
+    def _send_safe_get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        start_time = time.time()
+        r = None
+        reused = None
         try:
             url = urljoin(self.api_base, endpoint)
-            r = requests.get(url, headers=self.headers, params=params, timeout=self.default_timeout)
+            self.rate_limiter.acquire(self._request_priority("GET", endpoint))
+            start_time = time.time()
+            r, reused = pooled_request(self._session, "GET", url, headers=self.headers,
+                                       params=params, timeout=self.default_timeout)
+            latency_ms = (time.time() - start_time) * 1000
+            self._track_request("GET", endpoint, latency_ms, reused, r.ok)
             r.raise_for_status()
-            latency_ms = 0  # Direct call timing
-            with self._lock:
-                self.request_times.append(latency_ms)
-                if len(self.request_times) > 100:
-                    self.request_times = self.request_times[-100:]
             return {
                 "success": True,
                 "data": r.json() if r.content else {},
@@ -721,34 +924,82 @@ class OandaConnector:
                 "status_code": r.status_code
             }
         except Exception as e:
+            if r is None:
+                self._track_request("GET", endpoint, (time.time() - start_time) * 1000, reused, False)
             self.logger.error(f"_safe_request_get failed: {e}")
             return {"success": False, "error": str(e)}
 
-    def get_historical_data(self, instrument: str, count: int = 120, granularity: str = "M15") -> List[Dict[str, Any]]:
+    def enable_candle_cache(self, maxlen: int = 500) -> CandleCache:
+        """Serve get_historical_data from an incremental per-(instrument, granularity) candle cache"""
+        if self.candle_cache is None:
+            self.candle_cache = CandleCache(maxlen=maxlen)
+        return self.candle_cache
+
+    def enable_candle_store(self, root: Optional[str] = None) -> CandleStore:
+        """Append every completed bar fetched by get_historical_data to a columnar CandleStore"""
+        if self.candle_store is None:
+            self.candle_store = CandleStore(root)
+        return self.candle_store
+
+    def _store_candles(self, instrument: str, granularity: str, candles: List[Dict[str, Any]]):
+        try:
+            self.candle_store.ingest_oanda(instrument, granularity, candles)
+        except Exception as e:
+            self.logger.warning(f"Candle store append failed for {instrument} {granularity}: {e}")
+
+    def backfill_candles(self, instrument: str, granularity: str = "M15", start=None, end=None) -> int:
+        """Fill gaps in the candle store (and extend it back to `start`) from the /candles endpoint
+
+        Returns:
+            Number of bars added
+        """
+        store = self.enable_candle_store()
+        endpoint = f"/v3/instruments/{instrument}/candles"
+
+        def fetch(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+            resp = self._safe_request_get(endpoint, params={**params, "granularity": granularity, "price": "M"})
+            if not resp.get("success"):
+                raise RuntimeError(f"OANDA candles error for {instrument}: {resp.get('error', 'unknown error')}")
+            return (resp.get("data") or {}).get("candles", [])
+
+        return store.backfill(fetch, instrument, granularity, start, end)
+
+    def get_historical_data(self, instrument: str, count: int = 120, granularity: str = "M15",
+                            as_array: bool = False):
         """Fetch historical candle data from OANDA for signal generation
         
+        With a candle cache enabled only bars newer than the last cached bar are downloaded.
+        
         Args:
             instrument: Trading pair (e.g., "EUR_USD")
             count: Number of candles to fetch (default: 120)
             granularity: Candle period (default: "M15" for 15 minutes)
+            as_array: Return a NumPy record array (candle_decode.CANDLE_DTYPE:
+                time ns, open/high/low/close, volume, complete) instead of dicts
             
         Returns:
             List of candle dicts with format:
             [{'time': 'ISO8601', 'volume': int, 'mid': {'o': str, 'h': str, 'l': str, 'c': str}}, ...]
+            or the equivalent record array when as_array is set
         """
+        candles = self._fetch_historical_data(instrument, count, granularity)
+        return decode_candles(candles) if as_array else candles
+
+    def _fetch_historical_data(self, instrument: str, count: int, granularity: str) -> List[Dict[str, Any]]:
         try:
+            cache = self.candle_cache
+            params = cache.request_params(instrument, granularity, count) if cache else {"count": count}
             endpoint = f"/v3/instruments/{instrument}/candles"
-            params = {
-                "count": count,
-                "granularity": granularity,
-                "price": "M"   # Mid prices only
-            }
             # Use safe wrapper that handles legacy signatures
-            resp = self._safe_request_get(endpoint, params=params)
+            resp = self._safe_request_get(endpoint, params={**params, "granularity": granularity, "price": "M"})
             
             if resp.get("success"):
                 data = resp.get("data") or {}
                 candles = data.get("candles", [])
+                if self.candle_store is not None and candles:
+                    self._store_candles(instrument, granularity, candles)
+                if cache:
+                    return cache.update(instrument, granularity, candles, count, params)
                 if candles:
                     return candles
                 self.logger.warning(f"No candles in response for {instrument}")
@@ -781,27 +1032,52 @@ class OandaConnector:
                 self.logger.error(f"Pricing API error: {resp.get('error')}")
                 return {}
 
-            data = resp.get("data", {})
-            prices = data.get("prices", [])
-            out: Dict[str, Dict[str, Any]] = {}
-            for p in prices:
-                inst = p.get("instrument")
-                bids = p.get("bids", [])
-                asks = p.get("asks", [])
-                bid = float(bids[0]["price"]) if bids else None
-                ask = float(asks[0]["price"]) if asks else None
-                mid = (bid + ask) / 2.0 if (bid is not None and ask is not None) else None
-                out[inst] = {
-                    "bid": bid,
-                    "ask": ask,
-                    "mid": mid,
-                    "time": p.get("time")
-                }
-            return out
+            return self._parse_prices(resp.get("data", {}))
         except Exception as e:
             self.logger.error(f"Failed to fetch live prices: {e}")
             return {}
 
+    def get_price_snapshot(self, instruments: List[str]) -> PriceSnapshot:
+        """Fetch all instruments in one pricing request and freeze the result."""
+        unique = list(dict.fromkeys(instruments))
+        return PriceSnapshot(self.get_live_prices(unique) if unique else {})
+
+    @staticmethod
+    def _parse_prices(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Convert a /pricing payload into instrument -> { bid, ask, mid, time }"""
+        out: Dict[str, Dict[str, Any]] = {}
+        for p in (data or {}).get("prices", []):
+            inst = p.get("instrument")
+            bids = p.get("bids", [])
+            asks = p.get("asks", [])
+            bid = float(bids[0]["price"]) if bids else None
+            ask = float(asks[0]["price"]) if asks else None
+            mid = (bid + ask) / 2.0 if (bid is not None and ask is not None) else None
+            out[inst] = {
+                "bid": bid,
+                "ask": ask,
+                "mid": mid,
+                "time": p.get("time")
+            }
+        return out
+
+    def get_current_bid_ask(self, instrument: str) -> Dict[str, Any]:
+        """Latest bid/ask for one instrument (stream cache first, REST pricing fallback).
+
+        Returns:
+            Dict with bid, ask, mid, time and source ('stream' or 'rest'); empty on failure
+        """
+        if self.price_stream is not None:
+            quote = self.price_stream.get_quote(instrument)
+            if quote is not None:
+                return {"bid": quote.bid, "ask": quote.ask, "mid": quote.mid,
+                        "time": quote.time, "source": "stream"}
+            self.price_stream.subscribe([instrument])
+        price = self.get_live_prices([instrument]).get(instrument)
+        if not price:
+            return {}
+        return {**price, "source": "rest"}
+
     def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel a pending order by id."""
         try:
@@ -19,10 +19,10 @@ from urllib.parse import urljoin
 
 # Import Parameter Manager
 try:
-    from ..util.parameter_manager import ParameterManager
+    from ..util.parameter_manager import ParameterManager, get_parameter_manager
 except ImportError:
     try:
-        from util.parameter_manager import ParameterManager
+        from util.parameter_manager import ParameterManager, get_parameter_manager
     except ImportError:
         raise ImportError("ParameterManager not found. Please ensure util/parameter_manager.py exists.")
 
@@ -122,7 +122,8 @@ class EnhancedOandaConnector:
         config_dir = os.path.join(os.path.dirname(__file__), '..', 'config')
         os.makedirs(config_dir, exist_ok=True)
         config_path = os.path.join(config_dir, 'oanda_parameters.json')
-        self.param_manager = ParameterManager(config_path)
+        # Shared with every other user of this config file, so edits reach all of them
+        self.param_manager: ParameterManager = get_parameter_manager(config_path)
         
         # Dynamic environment from parameter manager if not specified
         if environment is None:
@@ -169,9 +170,25 @@ class EnhancedOandaConnector:
         
         self.logger.info(f"EnhancedOandaConnector initialized for {environment} environment")
         
+        # Report (never follow) oanda.environment changes made by other connectors in this process:
+        # the trading environment only changes through an explicit switch_environment() call
+        self._unsubscribe = self.param_manager.subscribe(self._on_parameters_changed, keys=["oanda.environment"],
+                                                         watch=False)
+        
         # Validate connection
         self._validate_connection()
     
+    def _on_parameters_changed(self, changes):
+        """Parameter manager callback: warn when oanda.environment no longer matches this connector"""
+        old, new = changes["oanda.environment"]
+        if new != self.environment:
+            self.logger.warning(f"⚠️  oanda.environment changed {old} -> {new}; this connector stays on "
+                                f"{self.environment} (call switch_environment() to change it)")
+    
+    def close(self):
+        """Stop watching parameter changes"""
+        self._unsubscribe()
+    
     def _load_credentials(self):
         """
         Load API credentials from parameter manager with fallback to .env file
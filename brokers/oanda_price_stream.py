@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+OANDA Streaming Price Feed - RBOTzilla UNI
+One long-lived pricing stream per account feeding an in-process quote cache.
+Heartbeat/stale detection and auto-reconnect with exponential backoff.
+PIN: 841921
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Any
+
+import requests
+
+
+class Quote(NamedTuple):
+    """Immutable top-of-book quote"""
+    instrument: str
+    bid: float
+    ask: float
+    mid: float
+    time: str            # OANDA RFC3339 timestamp
+    received: float      # time.monotonic() when the quote arrived
+    tradeable: bool = True
+
+
+class QuoteCache:
+    """
+    Latest quote per instrument
+
+    Lock-free: the single stream writer replaces whole immutable Quote tuples
+    with one dict store, and readers do one dict lookup, both atomic under
+    the GIL. Readers never block the writer.
+    """
+
+    def __init__(self):
+        self._quotes: Dict[str, Quote] = {}
+
+    def update(self, quote: Quote):
+        self._quotes[quote.instrument] = quote
+
+    def get(self, instrument: str, max_age: Optional[float] = None) -> Optional[Quote]:
+        """Return the cached quote, or None if missing or older than max_age seconds"""
+        quote = self._quotes.get(instrument)
+        if quote is None:
+            return None
+        if max_age is not None and time.monotonic() - quote.received > max_age:
+            return None
+        return quote
+
+    def snapshot(self) -> Dict[str, Quote]:
+        return dict(self._quotes)
+
+    def __len__(self):
+        return len(self._quotes)
+
+
+class OandaPriceStream:
+    """
+    Background reader for /v3/accounts/{id}/pricing/stream
+
+    OANDA sends a PRICE line whenever a subscribed instrument changes and a
+    HEARTBEAT line every 5 seconds. If neither arrives within
+    heartbeat_timeout the connection is treated as stale and re-opened.
+    """
+
+    def __init__(self, connector, instruments: Iterable[str] = (), cache: Optional[QuoteCache] = None,
+                 heartbeat_timeout: float = 15.0, reconnect_backoff: float = 1.0, max_backoff: float = 30.0):
+        """
+        Args:
+            connector: OandaConnector providing stream_base, account_id and headers
+            instruments: Initial instrument subscription (e.g. ["EUR_USD"])
+            cache: QuoteCache to write into (a new one is created if omitted)
+            heartbeat_timeout: Seconds without any line before the stream is stale
+            reconnect_backoff: Initial reconnect delay in seconds (doubles per failure)
+            max_backoff: Reconnect delay ceiling in seconds
+        """
+        self.connector = connector
+        self.cache = cache or QuoteCache()
+        self.heartbeat_timeout = heartbeat_timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger(__name__)
+
+        self._instruments = set(instruments)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._resubscribe = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+        self._session = requests.Session()
+
+        self.last_message = 0.0   # monotonic time of last PRICE/HEARTBEAT
+        self.connected = False
+        self.stats = {
+            "connects": 0,
+            "reconnects": 0,
+            "stale_disconnects": 0,
+            "prices": 0,
+            "heartbeats": 0,
+            "errors": 0,
+        }
+
+    # --- Lifecycle ------------------------------------------------------------------------
+    def start(self):
+        """Start the background reader (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="oanda-price-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the reader and close the stream connection"""
+        self._stop_event.set()
+        self._close_response()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._session.close()
+        self.connected = False
+
+    def subscribe(self, instruments: Iterable[str]):
+        """Add instruments; the stream reconnects once with the wider subscription"""
+        with self._lock:
+            new = set(instruments) - self._instruments
+            if not new:
+                return
+            self._instruments |= new
+        self._resubscribe.set()
+        self._close_response()
+
+    @property
+    def instruments(self) -> List[str]:
+        with self._lock:
+            return sorted(self._instruments)
+
+    # --- Reads ----------------------------------------------------------------------------
+    def is_healthy(self) -> bool:
+        """True while the stream is connected and has produced a line recently"""
+        return self.connected and (time.monotonic() - self.last_message) <= self.heartbeat_timeout
+
+    def get_quote(self, instrument: str) -> Optional[Quote]:
+        """
+        Latest quote for instrument, or None if the stream is unhealthy
+
+        Quotes for quiet instruments stay valid as long as heartbeats keep
+        confirming the connection; OANDA only pushes prices on change.
+        """
+        if not self.is_healthy():
+            return None
+        return self.cache.get(instrument)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "connected": self.connected,
+            "healthy": self.is_healthy(),
+            "instruments": len(self._instruments),
+            "cached_quotes": len(self.cache),
+            "seconds_since_message": round(time.monotonic() - self.last_message, 1) if self.last_message else None,
+        }
+
+    # --- Reader thread --------------------------------------------------------------------
+    def _close_response(self):
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def _run(self):
+        backoff = self.reconnect_backoff
+        while not self._stop_event.is_set():
+            instruments = self.instruments
+            if not instruments:
+                self._stop_event.wait(1.0)
+                continue
+            self._resubscribe.clear()
+            try:
+                self._consume(instruments)
+                backoff = self.reconnect_backoff  # clean close (resubscribe/stop)
+            except requests.exceptions.ConnectionError as e:
+                # Read timeouts surface as ConnectionError while iterating a stream
+                if self._stop_event.is_set() or self._resubscribe.is_set():
+                    continue
+                self.stats["stale_disconnects"] += 1
+                self.logger.warning(f"OANDA price stream stale/disconnected: {e}")
+            except Exception as e:
+                if self._stop_event.is_set() or self._resubscribe.is_set():
+                    continue
+                self.stats["errors"] += 1
+                self.logger.error(f"OANDA price stream error: {e}")
+            finally:
+                self.connected = False
+                self._response = None
+
+            if self._stop_event.is_set():
+                break
+            if not self._resubscribe.is_set():
+                self.stats["reconnects"] += 1
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    def _consume(self, instruments: List[str]):
+        url = f"{self.connector.stream_base}/v3/accounts/{self.connector.account_id}/pricing/stream"
+        response = self._session.get(
+            url,
+            headers=self.connector.headers,
+            params={"instruments": ",".join(instruments)},
+            stream=True,
+            timeout=(self.connector.default_timeout, self.heartbeat_timeout),
+        )
+        self._response = response
+        response.raise_for_status()
+        self.connected = True
+        self.last_message = time.monotonic()
+        self.stats["connects"] += 1
+        self.logger.info(f"OANDA price stream connected ({len(instruments)} instruments)")
+
+        for line in response.iter_lines():
+            if self._stop_event.is_set() or self._resubscribe.is_set():
+                return
+            if not line:
+                continue
+            self._handle_line(line)
+
+    def _handle_line(self, line: bytes):
+        msg = json.loads(line)
+        self.last_message = time.monotonic()
+        msg_type = msg.get("type")
+        if msg_type == "HEARTBEAT":
+            self.stats["heartbeats"] += 1
+            return
+        if msg_type != "PRICE":
+            return
+        bids = msg.get("bids") or []
+        asks = msg.get("asks") or []
+        if not bids or not asks:
+            return
+        bid = float(bids[0]["price"])
+        ask = float(asks[0]["price"])
+        self.cache.update(Quote(
+            instrument=msg.get("instrument"),
+            bid=bid,
+            ask=ask,
+            mid=(bid + ask) / 2.0,
+            time=msg.get("time"),
+            received=self.last_message,
+            tradeable=msg.get("tradeable", True),
+        ))
+        self.stats["prices"] += 1
+
+
+# One stream per account (keyed by stream endpoint + account id)
+_streams: Dict[tuple, OandaPriceStream] = {}
+_streams_lock = threading.Lock()
+
+
+def get_price_stream(connector, instruments: Iterable[str] = (), start: bool = True, **kwargs) -> OandaPriceStream:
+    """
+    Get (or create) the shared price stream for the connector's account
+
+    Additional instruments are merged into the existing subscription.
+    """
+    key = (connector.stream_base, connector.account_id)
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = OandaPriceStream(connector, instruments, **kwargs)
+    stream.subscribe(instruments)
+    if start:
+        stream.start()
+    return stream
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Broker Request Scheduler - RBOTzilla UNI
+Shared client-side token bucket with strict priority classes so order
+placement never queues behind bulk candle downloads or account polling.
+PIN: 841921
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, Optional, Any, Tuple
+
+
+class RequestPriority(IntEnum):
+    """Lower value = served first"""
+    ORDER = 0      # order placement / cancel / position close
+    STOP = 1       # stop-loss / trailing-stop modification
+    PRICING = 2    # quotes
+    CANDLES = 3    # historical bars
+    ACCOUNT = 4    # account / trade / order polling
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request could not get a token within its timeout"""
+
+
+class PriorityRateLimiter:
+    """
+    Token bucket shared by every caller of one broker
+
+    Waiting requests are served strictly by (priority, arrival). Tokens at or
+    below `reserve` are held back for ORDER/STOP traffic, so a burst of
+    candle or account reads can never starve order placement. Thread-safe,
+    with a blocking acquire() for sync connectors and acquire_async() for
+    asyncio callers.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, reserve: float = 1.0, name: str = "broker"):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket capacity (defaults to one second of rate)
+            reserve: Tokens only ORDER/STOP requests may consume
+            name: Label used in metrics
+        """
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(rate, 1.0))
+        self.reserve = min(float(reserve), self.capacity - 1.0) if self.capacity > 1 else 0.0
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []                  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._metrics = {
+            p: {"acquired": 0, "queued": 0, "timeouts": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0}
+            for p in RequestPriority
+        }
+
+    # --- Bucket internals (call with self._cond held) --------------------------------------
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _floor(self, priority: RequestPriority) -> float:
+        return 0.0 if priority <= RequestPriority.STOP else self.reserve
+
+    def _try_take(self, ticket: Tuple[int, int]) -> float:
+        """Take a token for ticket if it is first in line; return 0 on success else seconds to wait"""
+        self._refill()
+        priority = RequestPriority(ticket[0])
+        needed = self._floor(priority) + 1.0
+        if self._waiters[0] == ticket and self._tokens >= needed:
+            heapq.heappop(self._waiters)
+            self._tokens -= 1.0
+            self._cond.notify_all()
+            return 0.0
+        deficit = max(needed - self._tokens, 0.0)
+        if self._waiters[0] != ticket:
+            deficit += 1.0  # the head of the line takes the next token; its pop wakes us
+        return max(deficit / self.rate, 0.001) if self.rate > 0 else 0.05
+
+    def _enqueue(self, priority: RequestPriority) -> Tuple[int, int]:
+        ticket = (int(priority), next(self._seq))
+        heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _cancel(self, ticket: Tuple[int, int]):
+        try:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+        except ValueError:
+            pass
+        self._cond.notify_all()
+
+    def _record(self, priority: RequestPriority, wait_s: float, queued: bool):
+        m = self._metrics[priority]
+        m["acquired"] += 1
+        if queued:
+            m["queued"] += 1
+        wait_ms = wait_s * 1000
+        m["total_wait_ms"] += wait_ms
+        if wait_ms > m["max_wait_ms"]:
+            m["max_wait_ms"] = wait_ms
+
+    # --- Public API ------------------------------------------------------------------------
+    def acquire(self, priority: RequestPriority = RequestPriority.ACCOUNT, timeout: Optional[float] = None) -> float:
+        """
+        Block until a token is granted
+
+        Returns:
+            Seconds spent waiting
+        Raises:
+            RateLimitTimeout if timeout elapses first
+        """
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        with self._cond:
+            ticket = self._enqueue(priority)
+            queued = False
+            while True:
+                wait = self._try_take(ticket)
+                if wait == 0.0:
+                    waited = time.monotonic() - start
+                    self._record(priority, waited, queued)
+                    return waited
+                queued = True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._cancel(ticket)
+                        self._metrics[priority]["timeouts"] += 1
+                        raise RateLimitTimeout(f"{self.name}: no token for {priority.name} within {timeout}s")
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    async def acquire_async(self, priority: RequestPriority = RequestPriority.ACCOUNT,
+                            timeout: Optional[float] = None) -> float:
+        """Awaitable acquire(); shares the same bucket and queue as sync callers"""
+        start = time.monotonic()
+        deadline = start + timeout if timeout is not None else None
+        with self._cond:
+            ticket = self._enqueue(priority)
+        queued = False
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(ticket)
+                    if wait == 0.0:
+                        waited = time.monotonic() - start
+                        self._record(priority, waited, queued)
+                        return waited
+                queued = True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        with self._cond:
+                            self._cancel(ticket)
+                            self._metrics[priority]["timeouts"] += 1
+                        raise RateLimitTimeout(f"{self.name}: no token for {priority.name} within {timeout}s")
+                    wait = min(wait, remaining)
+                # Poll cap keeps async waiters responsive to tokens freed by other callers
+                await asyncio.sleep(min(wait, 0.05))
+        except asyncio.CancelledError:
+            with self._cond:
+                self._cancel(ticket)
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, wait-time and throughput per priority class"""
+        with self._cond:
+            self._refill()
+            depth = {p.name: 0 for p in RequestPriority}
+            for prio, _ in self._waiters:
+                depth[RequestPriority(prio).name] += 1
+            classes = {}
+            for p, m in self._metrics.items():
+                classes[p.name] = {
+                    "acquired": m["acquired"],
+                    "queued": m["queued"],
+                    "timeouts": m["timeouts"],
+                    "queue_depth": depth[p.name],
+                    "avg_wait_ms": round(m["total_wait_ms"] / m["acquired"], 2) if m["acquired"] else 0.0,
+                    "max_wait_ms": round(m["max_wait_ms"], 2),
+                }
+            return {
+                "name": self.name,
+                "rate_per_sec": self.rate,
+                "burst": self.capacity,
+                "reserve": self.reserve,
+                "tokens_available": round(self._tokens, 2),
+                "queue_depth": len(self._waiters),
+                "classes": classes,
+            }
+
+
+# Default budgets per broker (requests/sec, burst); override with
+# RICK_RATE_LIMIT_<NAME>="rate[:burst]", e.g. RICK_RATE_LIMIT_OANDA="50:50"
+DEFAULT_LIMITS = {
+    "oanda": (50.0, 50.0),
+    "coinbase": (10.0, 10.0),
+}
+
+_limiters: Dict[str, PriorityRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_limit(name: str) -> Tuple[float, float]:
+    raw = os.getenv(f"RICK_RATE_LIMIT_{name.upper()}")
+    if raw:
+        rate, _, burst = raw.partition(":")
+        return float(rate), float(burst or rate)
+    return DEFAULT_LIMITS.get(name, (10.0, 10.0))
+
+
+def get_rate_limiter(name: str) -> PriorityRateLimiter:
+    """Process-wide limiter for one broker, shared by every connector instance"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            rate, burst = _configured_limit(name)
+            limiter = _limiters[name] = PriorityRateLimiter(rate, burst, name=name)
+        return limiter
+
+
+def get_all_rate_limiter_metrics() -> Dict[str, Dict[str, Any]]:
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.get_metrics() for name, limiter in limiters.items()}
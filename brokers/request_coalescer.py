@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Request Coalescer - RBOTzilla UNI
+Single-flight for identical broker reads: concurrent callers asking for the
+same GET share one in-flight HTTP request and one parsed result, with an
+optional short-TTL micro-cache per endpoint class.
+PIN: 841921
+"""
+
+import asyncio
+import copy
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "generation")
+
+    def __init__(self, generation: int):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.generation = generation
+
+
+class RequestCoalescer:
+    """
+    Share identical in-flight reads between threads and coroutines
+
+    Every caller gets its own deep copy of the shared result, so mutating
+    it cannot leak into other waiters or the cache. Only results accepted
+    by `cacheable` are kept in the micro-cache; failures are never cached.
+    invalidate() bumps a generation counter: reads already in flight finish
+    for their callers but neither populate the cache nor serve later callers.
+    """
+
+    def __init__(self, cacheable: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            cacheable: Predicate deciding whether a result may be micro-cached
+                       (default: dicts with a truthy "success")
+        """
+        self.cacheable = cacheable or (lambda r: isinstance(r, dict) and bool(r.get("success")))
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._async_inflight: Dict[Tuple[int, Hashable], Tuple[int, "asyncio.Future"]] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._generation = 0
+        self.stats = {"executed": 0, "coalesced": 0, "cache_hits": 0}
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Hashable:
+        """Stable key for a request; param order does not matter"""
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return (method.upper(), endpoint, items)
+
+    def _cached(self, key: Hashable) -> Tuple[bool, Any]:
+        """Call with self._lock held"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        expires, result = entry
+        if time.monotonic() >= expires:
+            del self._cache[key]
+            return False, None
+        self.stats["cache_hits"] += 1
+        return True, result
+
+    def _store(self, key: Hashable, result: Any, ttl: float, generation: int):
+        if ttl > 0 and self.cacheable(result):
+            with self._lock:
+                if generation == self._generation:  # not fetched before an invalidate()
+                    self._cache[key] = (time.monotonic() + ttl, result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any], ttl: float = 0.0) -> Any:
+        """Run fn() once for all concurrent callers with the same key"""
+        with self._lock:
+            hit, result = self._cached(key)
+            if hit:
+                return copy.deepcopy(result)
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight(self._generation)
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result)
+
+        try:
+            flight.result = fn()
+            self._store(key, flight.result, ttl, flight.generation)
+            return copy.deepcopy(flight.result)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]], ttl: float = 0.0) -> Any:
+        """Awaitable do(); coroutines on the same loop share one task, the micro-cache is shared with sync callers"""
+        loop = asyncio.get_running_loop()
+        akey = (id(loop), key)
+        with self._lock:
+            hit, result = self._cached(key)
+            if hit:
+                return copy.deepcopy(result)
+            generation, task = self._async_inflight.get(akey, (self._generation, None))
+            if task is None:
+                self.stats["executed"] += 1
+                task = loop.create_task(fn())
+                self._async_inflight[akey] = (generation, task)
+                task.add_done_callback(lambda t: self._forget_task(akey, t))
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+
+        # shield: one cancelled waiter must not cancel the shared request
+        result = await asyncio.shield(task)
+        if leader:
+            self._store(key, result, ttl, generation)
+        return copy.deepcopy(result)
+
+    def _forget_task(self, akey: Tuple[int, Hashable], task: "asyncio.Future"):
+        with self._lock:
+            if self._async_inflight.get(akey, (None, None))[1] is task:
+                del self._async_inflight[akey]
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None):
+        """
+        Drop micro-cached results (all, or those whose key matches predicate)
+
+        Matching reads still in flight are detached: their callers get the
+        result, but it is not cached and new callers start a fresh request.
+        """
+        with self._lock:
+            self._generation += 1
+            if predicate is None:
+                self._cache.clear()
+                self._inflight.clear()
+                self._async_inflight.clear()
+            else:
+                for key in [k for k in self._cache if predicate(k)]:
+                    del self._cache[key]
+                for key in [k for k in self._inflight if predicate(k)]:
+                    del self._inflight[key]
+                for akey in [k for k in self._async_inflight if predicate(k[1])]:
+                    del self._async_inflight[akey]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._inflight) + len(self._async_inflight),
+                    "cached": len(self._cache)}
@@ -1490,14 +1490,70 @@ def live_monitor():
     except Exception as e:
         return jsonify({"status": "error", "message": str(e)})
 
+@app.route('/api/events', methods=['GET'])
+def api_events():
+    """Events from the SQLite event store
+
+    Query params: stream (narration/pnl/breaker/oco/pattern), event_type, symbol,
+    since, until (ISO timestamps), limit (default 100).
+    """
+    try:
+        from util.event_store import get_event_store
+        store = get_event_store()
+        if store is None:
+            return jsonify({"error": "event store disabled"}), 503
+        events = store.query(
+            stream=request.args.get('stream'),
+            event_type=request.args.get('event_type'),
+            symbol=request.args.get('symbol'),
+            since=request.args.get('since'),
+            until=request.args.get('until'),
+            limit=request.args.get('limit', default=100, type=int),
+        )
+        return jsonify({"events": events, "count": len(events)})
+    except Exception as e:
+        logger.error(f"Events API error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/events/summary', methods=['GET'])
+def api_events_summary():
+    """Daily P&L, win rate and violation counts (indexed queries on the event store)"""
+    try:
+        from util.event_store import get_event_store
+        store = get_event_store()
+        if store is None:
+            return jsonify({"error": "event store disabled"}), 503
+        days = request.args.get('days', default=7, type=int)
+        since = request.args.get('since')
+        return jsonify({
+            "pnl": get_session_summary(),
+            "daily_pnl": store.daily_pnl(days),
+            "violations": store.violation_counts(since),
+            "store": store.get_stats(),
+        })
+    except Exception as e:
+        logger.error(f"Events summary API error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/narration', methods=['GET'])
 def narration():
-    """API endpoint to fetch latest narration with Rick's plain English commentary"""
+    """API endpoint to fetch latest narration with Rick's plain English commentary
+    
+    Optional query params: event_type, since, until (ISO timestamps), limit (default 50).
+    Filtered queries only open the archive segments that overlap the range.
+    """
     try:
-        from util.narration_logger import get_latest_narration
+        from util.narration_logger import get_latest_narration, query_narration
         
         # Get raw events
-        events = get_latest_narration(n=50)
+        limit = request.args.get('limit', default=50, type=int)
+        event_type = request.args.get('event_type')
+        since = request.args.get('since')
+        until = request.args.get('until')
+        if event_type or since or until:
+            events = query_narration(event_type=event_type, since=since, until=until, limit=limit)
+        else:
+            events = get_latest_narration(n=limit)
         
         # Add Rick's human commentary to each event
         for event in events:
@@ -22,6 +22,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 
+import pandas as pd
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -137,17 +139,18 @@ class IntegratedWolfEngine:
         try:
             # Get recent price data
             candles = self.connector.get_historical_data(
-                symbol=symbol,
+                symbol,
                 granularity="M15",
-                count=200
+                count=200,
+                as_array=True
             )
             
-            if not candles:
+            if not len(candles):
                 logger.warning("No candle data, defaulting to SIDEWAYS")
                 return MarketRegime.SIDEWAYS
             
-            # Extract closing prices
-            prices = [float(c['mid']['c']) for c in candles]
+            # Closing prices (already decoded to float64 by the connector)
+            prices = candles['close']
             
             # Detect regime
             regime_data = detect_market_regime(prices, symbol)
@@ -203,27 +206,39 @@ class IntegratedWolfEngine:
         # Step 3: Get candle data for strategy
         try:
             candles = self.connector.get_historical_data(
-                symbol=symbol,
+                symbol,
                 granularity=timeframe,
-                count=200
+                count=200,
+                as_array=True
             )
             
-            if not candles or len(candles) < 50:
+            if len(candles) < 50:
                 logger.warning("Insufficient candle data")
                 return None
             
+            # Time-indexed so the shared indicator state only computes bars it has not seen
+            bars = {name: pd.Series(candles[name], index=candles['time'])
+                    for name in ('close', 'high', 'low', 'volume')}
+            
         except Exception as e:
             logger.error(f"Failed to fetch candles: {e}")
             return None
         
         # Step 4: Generate signal from Wolf Pack
         try:
-            signal = strategy.analyze(candles, symbol)
+            result = strategy.generate_trade_signal(bars, symbol=symbol, timeframe=timeframe)
             
-            if not signal or signal.get('action') == 'NONE':
-                logger.info("❌ No signal generated by strategy")
+            if not result.get('trade'):
+                logger.info(f"❌ No signal generated by strategy: {result.get('reason')}")
                 return None
             
+            signal = {
+                **result,
+                'symbol': symbol,
+                'action': result['direction'],
+                'entry_price': result['technical_data']['current_price']
+            }
+            
             logger.info(f"✅ Signal: {signal.get('action')} @ {signal.get('entry_price')}")
             logger.info(f"   Confidence: {signal.get('confidence', 0):.2%}")
             logger.info(f"   SL: {signal.get('stop_loss')} | TP: {signal.get('take_profit')}")
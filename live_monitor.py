@@ -19,6 +19,11 @@ from pathlib import Path
 import signal
 import psutil
 
+try:
+    from util.event_store import get_event_store
+except ImportError:
+    get_event_store = None
+
 # =============================================================================
 # RBOTZILLA UNI LIVE MONITORING SYSTEM
 # =============================================================================
@@ -288,9 +293,25 @@ class LiveMonitor:
         except Exception:
             return 20.0
     
+    def _trade_store(self):
+        """Event store when it holds real closed trades, else None (metrics stay simulated)"""
+        try:
+            store = get_event_store() if get_event_store is not None else None
+            if store is not None and store.count(stream="pnl") > 0:
+                return store
+        except Exception as e:
+            self.logger.debug(f"Event store unavailable: {e}")
+        return None
+    
     def calculate_win_rate(self) -> float:
         """Calculate current win rate percentage"""
         try:
+            store = self._trade_store()
+            if store is not None:
+                recent = store.pnl_summary(since=time.time() - 7 * 86400)
+                if recent["total_trades"]:
+                    return round(recent["win_rate"], 1)
+            
             # Simulate win rate based on system performance
             base_win_rate = 58.0
             
@@ -346,6 +367,12 @@ class LiveMonitor:
     def count_daily_trades(self) -> int:
         """Count trades executed today"""
         try:
+            store = self._trade_store()
+            if store is not None:
+                midnight = datetime.datetime.now(datetime.timezone.utc).replace(
+                    hour=0, minute=0, second=0, microsecond=0)
+                return store.count(stream="pnl", since=midnight)
+            
             today = datetime.datetime.now().date()
             
             base_trades = len([m for m in self.metrics_history if 
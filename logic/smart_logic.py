@@ -2,6 +2,8 @@
 """
 Smart Logic Filters - RBOTzilla UNI Phase 6
 Signal validation with RR, FVG, Fibonacci confluence scoring.
+validate_signals() scores a list of candidates in one pass: each shared
+price history is analyzed once and FVG/Fibonacci checks run as NumPy masks.
 PIN: 841921 | Generated: 2025-09-26
 """
 
@@ -86,6 +88,49 @@ class SignalValidation:
     validation_timestamp: str
     charter_compliant: bool
 
+# Price-history fields that candidate signals of one cycle usually share
+HISTORY_FIELDS = ("recent_highs", "recent_lows", "recent_closes", "recent_volumes")
+
+@dataclass
+class PriceHistory:
+    """Direction-independent analysis of one recent price history
+    (computed once, reused by every candidate signal built on it)"""
+    data_points: int          # Number of highs (FVG input)
+    fvg_upper: np.ndarray     # 3-candle gap zones: bullish first, then bearish
+    fvg_lower: np.ndarray
+    fvg_bullish: np.ndarray
+    volume_points: int
+    price_points: int
+    volume_ratio: float = 0.0
+    volume_trend: float = 0.0
+    correlation: float = 0.0
+    rsi: Optional[float] = None
+    momentum: Optional[float] = None
+
+def _rsi(prices_array, period=14):
+    """Simple RSI (mean gain/loss over the last period changes)"""
+    deltas = np.diff(prices_array)
+    gains = np.where(deltas > 0, deltas, 0)
+    losses = np.where(deltas < 0, -deltas, 0)
+
+    avg_gain = np.mean(gains[-period:])
+    avg_loss = np.mean(losses[-period:])
+
+    if avg_loss == 0:
+        return 100
+
+    rs = avg_gain / avg_loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+def _rate_of_change(prices_array, period=10):
+    """Simple momentum (rate of change)"""
+    if len(prices_array) < period:
+        return 0
+    current = prices_array[-1]
+    previous = prices_array[-period]
+    return (current - previous) / previous if previous != 0 else 0
+
 class SmartLogicFilter:
     """
     Advanced signal validation system with confluence scoring
@@ -185,229 +230,234 @@ class SmartLogicFilter:
             details={"calculated_rr": rr_ratio, "excess_ratio": excess_ratio}
         )
     
-    def _validate_fvg_confluence(self, signal_dict: Dict[str, Any]) -> FilterScore:
+    def analyze_history(self, signal_dict: Dict[str, Any]) -> PriceHistory:
+        """
+        Analyze the recent_* price history of a signal once:
+        FVG zones from boolean masks over all 3-candle windows, window
+        volume statistics, price-volume correlation, RSI and momentum
+        """
+        high_prices = np.asarray(signal_dict.get("recent_highs", []), dtype=float)
+        low_prices = np.asarray(signal_dict.get("recent_lows", []), dtype=float)[:len(high_prices)]
+        volumes = signal_dict.get("recent_volumes", [])
+        prices = signal_dict.get("recent_closes", [])
+
+        # Candle i against candle i + 2 for every window at once
+        c1_high, c1_low = high_prices[:-2], low_prices[:-2]
+        c3_high, c3_low = high_prices[2:], low_prices[2:]
+        bullish = c1_low > c3_high   # Bullish FVG: candle1_low > candle3_high (gap up)
+        bearish = c1_high < c3_low   # Bearish FVG: candle1_high < candle3_low (gap down)
+
+        history = PriceHistory(
+            data_points=len(high_prices),
+            fvg_upper=np.concatenate([c1_low[bullish], c3_low[bearish]]),
+            fvg_lower=np.concatenate([c3_high[bullish], c1_high[bearish]]),
+            fvg_bullish=np.repeat([True, False], [bullish.sum(), bearish.sum()]),
+            volume_points=len(volumes),
+            price_points=len(prices)
+        )
+
+        if len(volumes) >= 10 and len(prices) >= 10:
+            volumes = np.asarray(volumes)
+
+            # Calculate volume metrics
+            avg_volume = np.mean(volumes)
+            history.volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 0
+
+            # Volume trend analysis (last 5 vs previous 5)
+            recent_vol_avg = np.mean(volumes[-5:])
+            previous_vol_avg = np.mean(volumes[-10:-5])
+            history.volume_trend = (recent_vol_avg - previous_vol_avg) / previous_vol_avg if previous_vol_avg > 0 else 0
+
+            # Price-volume relationship
+            try:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    correlation = np.corrcoef(np.diff(prices)[-10:], np.diff(volumes)[-10:])[0, 1]
+                history.correlation = 0 if np.isnan(correlation) else correlation
+            except Exception:
+                history.correlation = 0
+
+        if len(prices) >= 14:
+            prices = np.array(prices)
+            history.rsi = _rsi(prices)
+            history.momentum = _rate_of_change(prices)
+
+        return history
+
+    def _validate_fvg_confluence(self, signal_dict: Dict[str, Any],
+                                 history: Optional[PriceHistory] = None) -> FilterScore:
         """
         Fair Value Gap confluence validation
         Simulates FVG detection and alignment with signal direction
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        direction = signal_dict.get("direction", "buy").lower()
-        high_prices = signal_dict.get("recent_highs", [])
-        low_prices = signal_dict.get("recent_lows", [])
-        close_prices = signal_dict.get("recent_closes", [])
-        
-        if not entry_price or len(high_prices) < 3:
-            return FilterScore(
-                filter_name="fvg_confluence",
-                passed=False,
-                score=0.3,  # Neutral score for insufficient data
-                weight=self.filter_weights["fvg_confluence"],
-                reason="Insufficient price data for FVG analysis",
-                details={"data_points": len(high_prices)}
-            )
-        
-        # Simulate FVG detection (simplified)
-        # In reality, this would analyze 3-candle patterns for gaps
-        fvg_zones = []
-        
-        # Look for potential FVG zones in recent price action
-        for i in range(len(high_prices) - 2):
-            candle1_high = high_prices[i]
-            candle1_low = low_prices[i]
-            candle2_high = high_prices[i + 1]  
-            candle2_low = low_prices[i + 1]
-            candle3_high = high_prices[i + 2]
-            candle3_low = low_prices[i + 2]
-            
-            # Bullish FVG: candle1_low > candle3_high (gap up)
-            if candle1_low > candle3_high:
-                fvg_zones.append({
-                    "type": "bullish",
-                    "upper": candle1_low,
-                    "lower": candle3_high,
-                    "strength": (candle1_low - candle3_high) / entry_price
-                })
-            
-            # Bearish FVG: candle1_high < candle3_low (gap down)
-            if candle1_high < candle3_low:
-                fvg_zones.append({
-                    "type": "bearish", 
-                    "upper": candle3_low,
-                    "lower": candle1_high,
-                    "strength": (candle3_low - candle1_high) / entry_price
-                })
-        
-        if not fvg_zones:
-            return FilterScore(
-                filter_name="fvg_confluence",
-                passed=False,
-                score=0.4,
-                weight=self.filter_weights["fvg_confluence"],
-                reason="No FVG zones detected in recent price action",
-                details={"zones_found": 0}
-            )
-        
-        # Check alignment with signal direction
-        aligned_zones = []
-        for zone in fvg_zones:
-            zone_contains_entry = zone["lower"] <= entry_price <= zone["upper"]
-            direction_aligned = (
-                (direction in ["buy", "long"] and zone["type"] == "bullish") or
-                (direction in ["sell", "short"] and zone["type"] == "bearish")
-            )
-            
-            if zone_contains_entry and direction_aligned:
-                aligned_zones.append(zone)
-        
-        if not aligned_zones:
-            return FilterScore(
-                filter_name="fvg_confluence",
-                passed=False,
-                score=0.2,
-                weight=self.filter_weights["fvg_confluence"],
-                reason="No FVG zones align with signal direction and entry",
-                details={"total_zones": len(fvg_zones), "aligned_zones": 0}
-            )
-        
-        # Score based on strongest aligned zone
-        strongest_zone = max(aligned_zones, key=lambda z: z["strength"])
-        strength_score = min(1.0, strongest_zone["strength"] * 100)  # Convert to 0-1 scale
-        
-        return FilterScore(
-            filter_name="fvg_confluence",
-            passed=True,
-            score=max(0.6, strength_score),  # Minimum 60% for passing
-            weight=self.filter_weights["fvg_confluence"],
-            reason=f"FVG confluence detected with {strongest_zone['type']} zone",
-            details={"aligned_zones": len(aligned_zones), "strongest_strength": strongest_zone["strength"]}
+        if history is None:
+            history = self.analyze_history(signal_dict)
+        return self._fvg_scores([signal_dict], history)[0]
+
+    def _fvg_scores(self, signals: List[Dict[str, Any]], history: PriceHistory) -> List[FilterScore]:
+        """FVG confluence for signals sharing one price history (entries x zones masks)"""
+        entries = np.array([float(s.get("entry_price", 0) or 0) for s in signals])
+        directions = [s.get("direction", "buy").lower() for s in signals]
+        wants_bullish = np.array([d in ["buy", "long"] for d in directions])
+        wants_bearish = np.array([d in ["sell", "short"] for d in directions])
+
+        entry = entries[:, None]
+        upper, lower, bullish = history.fvg_upper, history.fvg_lower, history.fvg_bullish
+        with np.errstate(divide="ignore", invalid="ignore"):
+            strength = (upper - lower) / entry
+        # Zone contains entry and points the signal's way
+        aligned = (lower <= entry) & (entry <= upper) & (
+            (bullish & wants_bullish[:, None]) | (~bullish & wants_bearish[:, None])
         )
-    
+        aligned_count = aligned.sum(axis=1)
+        strongest = np.where(aligned, strength, -np.inf).max(axis=1, initial=-np.inf)
+
+        results = []
+        for i, entry_price in enumerate(entries):
+            if not entry_price or history.data_points < 3:
+                results.append(FilterScore(
+                    filter_name="fvg_confluence",
+                    passed=False,
+                    score=0.3,  # Neutral score for insufficient data
+                    weight=self.filter_weights["fvg_confluence"],
+                    reason="Insufficient price data for FVG analysis",
+                    details={"data_points": history.data_points}
+                ))
+            elif not len(upper):
+                results.append(FilterScore(
+                    filter_name="fvg_confluence",
+                    passed=False,
+                    score=0.4,
+                    weight=self.filter_weights["fvg_confluence"],
+                    reason="No FVG zones detected in recent price action",
+                    details={"zones_found": 0}
+                ))
+            elif not aligned_count[i]:
+                results.append(FilterScore(
+                    filter_name="fvg_confluence",
+                    passed=False,
+                    score=0.2,
+                    weight=self.filter_weights["fvg_confluence"],
+                    reason="No FVG zones align with signal direction and entry",
+                    details={"total_zones": len(upper), "aligned_zones": 0}
+                ))
+            else:
+                # Score based on strongest aligned zone
+                strongest_strength = float(strongest[i])
+                strength_score = min(1.0, strongest_strength * 100)  # Convert to 0-1 scale
+                zone_type = "bullish" if wants_bullish[i] else "bearish"
+                results.append(FilterScore(
+                    filter_name="fvg_confluence",
+                    passed=True,
+                    score=max(0.6, strength_score),  # Minimum 60% for passing
+                    weight=self.filter_weights["fvg_confluence"],
+                    reason=f"FVG confluence detected with {zone_type} zone",
+                    details={"aligned_zones": int(aligned_count[i]), "strongest_strength": strongest_strength}
+                ))
+        return results
+
     def _validate_fibonacci_confluence(self, signal_dict: Dict[str, Any]) -> FilterScore:
         """
         Fibonacci retracement/extension confluence validation
         Checks if entry aligns with key Fibonacci levels
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        swing_high = signal_dict.get("swing_high", 0)
-        swing_low = signal_dict.get("swing_low", 0)
-        direction = signal_dict.get("direction", "buy").lower()
-        
-        if not all([entry_price, swing_high, swing_low]) or swing_high <= swing_low:
-            return FilterScore(
-                filter_name="fibonacci",
-                passed=False,
-                score=0.3,
-                weight=self.filter_weights["fibonacci"],
-                reason="Missing or invalid swing high/low for Fibonacci analysis",
-                details={"swing_high": swing_high, "swing_low": swing_low}
-            )
-        
-        # Calculate Fibonacci levels
-        swing_range = swing_high - swing_low
-        fib_levels_prices = {}
-        
-        # Retracement levels (from swing high)
-        for level in self.fib_levels:
-            if level <= 1.0:  # Retracement
-                fib_price = swing_high - (swing_range * level)
-                fib_levels_prices[f"ret_{level}"] = fib_price
-            else:  # Extension
-                fib_price = swing_high + (swing_range * (level - 1.0))
-                fib_levels_prices[f"ext_{level}"] = fib_price
-        
-        # Find closest Fibonacci level to entry price
-        closest_level = None
-        min_distance = float('inf')
-        
-        for level_name, fib_price in fib_levels_prices.items():
-            distance = abs(entry_price - fib_price)
-            relative_distance = distance / entry_price  # Relative to entry price
-            
-            if relative_distance < min_distance:
-                min_distance = relative_distance
-                closest_level = (level_name, fib_price)
-        
+        return self._fibonacci_scores([signal_dict])[0]
+
+    def _fibonacci_scores(self, signals: List[Dict[str, Any]]) -> List[FilterScore]:
+        """Fibonacci confluence for many signals: entries broadcast against a (signals x levels) price grid"""
+        entries = np.array([float(s.get("entry_price", 0) or 0) for s in signals])
+        swing_highs = np.array([float(s.get("swing_high", 0) or 0) for s in signals])
+        swing_lows = np.array([float(s.get("swing_low", 0) or 0) for s in signals])
+
+        # Retracement levels (from swing high) up to 1.0, extensions beyond
+        levels = np.array(self.fib_levels, dtype=float)
+        level_names = [f"ret_{level}" if level <= 1.0 else f"ext_{level}" for level in self.fib_levels]
+        swing_range = (swing_highs - swing_lows)[:, None]
+        high = swing_highs[:, None]
+        fib_prices = np.where(levels <= 1.0, high - (swing_range * levels), high + (swing_range * (levels - 1.0)))
+
+        # Closest Fibonacci level to entry price, relative to entry price
+        with np.errstate(divide="ignore", invalid="ignore"):
+            relative = np.abs(entries[:, None] - fib_prices) / entries[:, None]
+        closest = np.argmin(relative, axis=1) if len(levels) else np.zeros(len(signals), dtype=int)
+
         # Tolerance for Fibonacci confluence (within 0.5% of price)
         tolerance = 0.005
-        
-        if min_distance > tolerance:
-            return FilterScore(
+        key_levels = [0.5, 0.618, 1.618]
+
+        results = []
+        for i, signal_dict in enumerate(signals):
+            swing_high = signal_dict.get("swing_high", 0)
+            swing_low = signal_dict.get("swing_low", 0)
+            if not all([entries[i], swing_high, swing_low]) or swing_high <= swing_low:
+                results.append(FilterScore(
+                    filter_name="fibonacci",
+                    passed=False,
+                    score=0.3,
+                    weight=self.filter_weights["fibonacci"],
+                    reason="Missing or invalid swing high/low for Fibonacci analysis",
+                    details={"swing_high": swing_high, "swing_low": swing_low}
+                ))
+                continue
+
+            j = closest[i]
+            min_distance = float(relative[i, j]) if len(levels) else float('inf')
+            closest_level = (level_names[j], float(fib_prices[i, j])) if len(levels) else None
+
+            if min_distance > tolerance:
+                results.append(FilterScore(
+                    filter_name="fibonacci",
+                    passed=False,
+                    score=0.3,
+                    weight=self.filter_weights["fibonacci"],
+                    reason=f"Entry not close to Fibonacci level (closest: {min_distance:.1%} away)",
+                    details={"closest_level": closest_level[0] if closest_level else None, "distance": min_distance}
+                ))
+                continue
+
+            # Score based on how close to the Fibonacci level
+            proximity_score = 1.0 - (min_distance / tolerance)
+
+            # Bonus for key levels (0.618, 0.5, 1.618)
+            is_key_level = any(abs(levels[j] - key) < 0.01 for key in key_levels)
+
+            final_score = proximity_score
+            if is_key_level:
+                final_score = min(1.0, final_score + 0.2)  # 20% bonus for key levels
+
+            results.append(FilterScore(
                 filter_name="fibonacci",
-                passed=False,
-                score=0.3,
+                passed=True,
+                score=max(0.6, final_score),
                 weight=self.filter_weights["fibonacci"],
-                reason=f"Entry not close to Fibonacci level (closest: {min_distance:.1%} away)",
-                details={"closest_level": closest_level[0] if closest_level else None, "distance": min_distance}
-            )
-        
-        # Score based on how close to the Fibonacci level
-        proximity_score = 1.0 - (min_distance / tolerance)
-        
-        # Bonus for key levels (0.618, 0.5, 1.618)
-        level_value = float(closest_level[0].split('_')[1])
-        key_levels = [0.5, 0.618, 1.618]
-        is_key_level = any(abs(level_value - key) < 0.01 for key in key_levels)
-        
-        final_score = proximity_score
-        if is_key_level:
-            final_score = min(1.0, final_score + 0.2)  # 20% bonus for key levels
-        
-        return FilterScore(
-            filter_name="fibonacci",
-            passed=True,
-            score=max(0.6, final_score),
-            weight=self.filter_weights["fibonacci"],
-            reason=f"Entry aligns with Fibonacci {closest_level[0]} level",
-            details={"level": closest_level[0], "fib_price": closest_level[1], "distance": min_distance, "is_key_level": is_key_level}
-        )
-    
-    def _validate_volume_profile(self, signal_dict: Dict[str, Any]) -> FilterScore:
+                reason=f"Entry aligns with Fibonacci {closest_level[0]} level",
+                details={"level": closest_level[0], "fib_price": closest_level[1], "distance": min_distance, "is_key_level": is_key_level}
+            ))
+        return results
+
+    def _validate_volume_profile(self, signal_dict: Dict[str, Any],
+                                 history: Optional[PriceHistory] = None) -> FilterScore:
         """
         Volume profile and behavior-based signal validation
         Simulates volume analysis for signal strength
         """
-        entry_price = signal_dict.get("entry_price", 0)
-        volumes = signal_dict.get("recent_volumes", [])
-        prices = signal_dict.get("recent_closes", [])
+        if history is None:
+            history = self.analyze_history(signal_dict)
         direction = signal_dict.get("direction", "buy").lower()
         
-        if len(volumes) < 10 or len(prices) < 10:
+        if history.volume_points < 10 or history.price_points < 10:
             return FilterScore(
                 filter_name="volume_profile",
                 passed=False,
                 score=0.4,
                 weight=self.filter_weights["volume_profile"],
                 reason="Insufficient volume data for analysis",
-                details={"volume_points": len(volumes), "price_points": len(prices)}
+                details={"volume_points": history.volume_points, "price_points": history.price_points}
             )
         
-        # Calculate volume metrics
-        avg_volume = np.mean(volumes)
-        recent_volume = volumes[-1] if volumes else 0
-        volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 0
-        
-        # Volume trend analysis (last 5 vs previous 5)
-        if len(volumes) >= 10:
-            recent_vol_avg = np.mean(volumes[-5:])
-            previous_vol_avg = np.mean(volumes[-10:-5])
-            volume_trend = (recent_vol_avg - previous_vol_avg) / previous_vol_avg if previous_vol_avg > 0 else 0
-        else:
-            volume_trend = 0
-        
-        # Price-volume relationship
-        price_changes = np.diff(prices) if len(prices) > 1 else [0]
-        volume_changes = np.diff(volumes) if len(volumes) > 1 else [0]
-        
-        # Positive correlation between price and volume movement
-        if len(price_changes) > 0 and len(volume_changes) > 0:
-            try:
-                correlation = np.corrcoef(price_changes[-10:], volume_changes[-10:])[0, 1]
-                if np.isnan(correlation):
-                    correlation = 0
-            except:
-                correlation = 0
-        else:
-            correlation = 0
+        # Volume metrics and price-volume correlation come from the shared history
+        volume_ratio = history.volume_ratio
+        volume_trend = history.volume_trend
+        correlation = history.correlation
         
         # Scoring based on volume confirmation
         score_components = []
@@ -457,50 +507,28 @@ class SmartLogicFilter:
             }
         )
     
-    def _validate_momentum(self, signal_dict: Dict[str, Any]) -> FilterScore:
+    def _validate_momentum(self, signal_dict: Dict[str, Any],
+                           history: Optional[PriceHistory] = None) -> FilterScore:
         """
         Momentum confirmation using simple technical indicators
         RSI, MACD-like momentum analysis
         """
-        prices = signal_dict.get("recent_closes", [])
+        if history is None:
+            history = self.analyze_history(signal_dict)
         direction = signal_dict.get("direction", "buy").lower()
         
-        if len(prices) < 14:
+        if history.rsi is None:
             return FilterScore(
                 filter_name="momentum",
                 passed=False,
                 score=0.4,
                 weight=self.filter_weights["momentum"],
                 reason="Insufficient price data for momentum analysis",
-                details={"price_points": len(prices)}
+                details={"price_points": history.price_points}
             )
         
-        # Simple RSI calculation (14-period)
-        def calculate_rsi(prices_array, period=14):
-            deltas = np.diff(prices_array)
-            gains = np.where(deltas > 0, deltas, 0)
-            losses = np.where(deltas < 0, -deltas, 0)
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = np.mean(losses[-period:])
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
-        
-        # Simple momentum (rate of change)
-        def calculate_momentum(prices_array, period=10):
-            if len(prices_array) < period:
-                return 0
-            current = prices_array[-1]
-            previous = prices_array[-period]
-            return (current - previous) / previous if previous != 0 else 0
-        
-        rsi = calculate_rsi(np.array(prices))
-        momentum = calculate_momentum(np.array(prices))
+        rsi = history.rsi
+        momentum = history.momentum
         
         # Momentum scoring
         score_components = []
@@ -573,84 +601,16 @@ class SmartLogicFilter:
         )
         
         try:
-            # Run all filters
-            filter_results = []
-            
-            # 1. Risk-Reward (hard requirement)
-            rr_result = self._validate_risk_reward(signal_dict)
-            filter_results.append(rr_result)
-            
-            # If RR fails, immediately reject
-            if not rr_result.passed:
-                return SignalValidation(
-                    passed=False,
-                    score=0.0,
-                    reject_reason=rr_result.reason,
-                    filter_scores=filter_results,
-                    risk_reward_ratio=signal_dict.get("risk_reward_ratio", 0),
-                    confluence_count=0,
-                    validation_timestamp=datetime.now(timezone.utc).isoformat(),
-                    charter_compliant=False
-                )
-            
-            # 2. FVG Confluence
-            fvg_result = self._validate_fvg_confluence(signal_dict)
-            filter_results.append(fvg_result)
-            
-            # 3. Fibonacci Confluence  
-            fib_result = self._validate_fibonacci_confluence(signal_dict)
-            filter_results.append(fib_result)
-            
-            # 4. Volume Profile
-            volume_result = self._validate_volume_profile(signal_dict)
-            filter_results.append(volume_result)
-            
-            # 5. Momentum
-            momentum_result = self._validate_momentum(signal_dict)
-            filter_results.append(momentum_result)
-            
-            # Calculate weighted average score
-            total_weighted_score = 0
-            total_weight = 0
-            passing_filters = 0
-            
-            for result in filter_results:
-                weighted_score = result.score * result.weight
-                total_weighted_score += weighted_score
-                total_weight += result.weight
-                
-                if result.passed:
-                    passing_filters += 1
-            
-            final_score = total_weighted_score / total_weight if total_weight > 0 else 0
-            
-            # Determine if signal passes overall
-            score_passes = final_score >= self.min_total_score
-            confluence_passes = passing_filters >= self.min_confluence_count
-            overall_pass = score_passes and confluence_passes
-            
-            # Determine reject reason if failed
-            reject_reason = None
-            if not overall_pass:
-                if not score_passes:
-                    reject_reason = f"Total score {final_score:.2f} below minimum {self.min_total_score}"
-                elif not confluence_passes:
-                    reject_reason = f"Only {passing_filters} filters passed, need {self.min_confluence_count}"
+            result = self._validate_batch([signal_dict])[0]
             
-            # Charter compliance (RR already checked above)
-            charter_compliant = rr_result.passed
+            # RR failures are rejected before confluence scoring
+            if not result.charter_compliant:
+                return result
             
-            # Create result
-            result = SignalValidation(
-                passed=overall_pass,
-                score=final_score,
-                reject_reason=reject_reason,
-                filter_scores=filter_results,
-                risk_reward_ratio=rr_result.details.get("calculated_rr", 0) if rr_result.details else 0,
-                confluence_count=passing_filters,
-                validation_timestamp=datetime.now(timezone.utc).isoformat(),
-                charter_compliant=charter_compliant
-            )
+            overall_pass = result.passed
+            final_score = result.score
+            passing_filters = result.confluence_count
+            reject_reason = result.reject_reason
             
             # Log completion
             validation_time = (datetime.now() - start_time).total_seconds()
@@ -678,6 +638,144 @@ class SmartLogicFilter:
             )
             raise RuntimeError(f"Signal validation system error: {e}") from e
     
+    def validate_signals(self, signals: List[Dict[str, Any]],
+                         market_data: Optional[Dict[str, Any]] = None) -> List[SignalValidation]:
+        """
+        Validate many candidate signals in one pass
+        
+        Signals that share a price history (the same recent_* lists, or a
+        common market_data) have it analyzed once; FVG and Fibonacci checks
+        are broadcast across all candidates.
+        
+        Args:
+            signals: Signal dicts as accepted by validate_signal()
+            market_data: Fields merged under every signal (e.g. recent_highs,
+                recent_lows, recent_closes, recent_volumes, swing_high/low)
+        
+        Returns:
+            One SignalValidation per signal, in order
+        """
+        if market_data:
+            signals = [{**market_data, **signal} for signal in signals]
+        start_time = datetime.now()
+        
+        try:
+            results = self._validate_batch(signals)
+        except Exception as e:
+            self.logger.error(f"Batch signal validation failed: {e}")
+            self.tracker.log_event(
+                EventType.SYSTEM_ERROR,
+                "smart_logic",
+                f"Validation error: {str(e)}"
+            )
+            raise RuntimeError(f"Signal validation system error: {e}") from e
+        
+        validation_time = (datetime.now() - start_time).total_seconds()
+        passed = sum(1 for r in results if r.passed)
+        self.tracker.log_event(
+            EventType.PHASE_COMPLETE,
+            "smart_logic",
+            f"Batch validation completed: {passed}/{len(results)} PASSED",
+            {
+                "signals": len(results),
+                "passed": passed,
+                "validation_time_ms": int(validation_time * 1000)
+            }
+        )
+        return results
+    
+    def _validate_batch(self, signals: List[Dict[str, Any]]) -> List[SignalValidation]:
+        """Run all filters for a list of signals (shared by validate_signal and validate_signals)"""
+        # 1. Risk-Reward (hard requirement)
+        rr_results = [self._validate_risk_reward(signal_dict) for signal_dict in signals]
+        live = [i for i, rr_result in enumerate(rr_results) if rr_result.passed]
+        
+        # Group candidates by the identity of their price-history lists
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i in live:
+            key = tuple(id(signals[i].get(field)) for field in HISTORY_FIELDS)
+            groups.setdefault(key, []).append(i)
+        
+        confluence: Dict[int, List[FilterScore]] = {}
+        fib_results = dict(zip(live, self._fibonacci_scores([signals[i] for i in live])))
+        for members in groups.values():
+            history = self.analyze_history(signals[members[0]])
+            fvg_results = self._fvg_scores([signals[i] for i in members], history)
+            for i, fvg_result in zip(members, fvg_results):
+                confluence[i] = [
+                    fvg_result,                                             # 2. FVG Confluence
+                    fib_results[i],                                         # 3. Fibonacci Confluence
+                    self._validate_volume_profile(signals[i], history),     # 4. Volume Profile
+                    self._validate_momentum(signals[i], history),           # 5. Momentum
+                ]
+        
+        return [
+            self._combine_filters(signal_dict, rr_results[i], confluence.get(i))
+            for i, signal_dict in enumerate(signals)
+        ]
+    
+    def _combine_filters(self, signal_dict: Dict[str, Any], rr_result: FilterScore,
+                         confluence: Optional[List[FilterScore]]) -> SignalValidation:
+        """Weighted scoring of one signal's filter results"""
+        filter_results = [rr_result]
+        
+        # If RR fails, immediately reject
+        if not rr_result.passed:
+            return SignalValidation(
+                passed=False,
+                score=0.0,
+                reject_reason=rr_result.reason,
+                filter_scores=filter_results,
+                risk_reward_ratio=signal_dict.get("risk_reward_ratio", 0),
+                confluence_count=0,
+                validation_timestamp=datetime.now(timezone.utc).isoformat(),
+                charter_compliant=False
+            )
+        
+        filter_results.extend(confluence)
+        
+        # Calculate weighted average score
+        total_weighted_score = 0
+        total_weight = 0
+        passing_filters = 0
+        
+        for result in filter_results:
+            weighted_score = result.score * result.weight
+            total_weighted_score += weighted_score
+            total_weight += result.weight
+            
+            if result.passed:
+                passing_filters += 1
+        
+        final_score = total_weighted_score / total_weight if total_weight > 0 else 0
+        
+        # Determine if signal passes overall
+        score_passes = final_score >= self.min_total_score
+        confluence_passes = passing_filters >= self.min_confluence_count
+        overall_pass = score_passes and confluence_passes
+        
+        # Determine reject reason if failed
+        reject_reason = None
+        if not overall_pass:
+            if not score_passes:
+                reject_reason = f"Total score {final_score:.2f} below minimum {self.min_total_score}"
+            elif not confluence_passes:
+                reject_reason = f"Only {passing_filters} filters passed, need {self.min_confluence_count}"
+        
+        # Charter compliance (RR already checked above)
+        charter_compliant = rr_result.passed
+        
+        return SignalValidation(
+            passed=overall_pass,
+            score=final_score,
+            reject_reason=reject_reason,
+            filter_scores=filter_results,
+            risk_reward_ratio=rr_result.details.get("calculated_rr", 0) if rr_result.details else 0,
+            confluence_count=passing_filters,
+            validation_timestamp=datetime.now(timezone.utc).isoformat(),
+            charter_compliant=charter_compliant
+        )
+    
     def get_filter_summary(self, validation: SignalValidation) -> Dict[str, Any]:
         """Get human-readable validation summary"""
         return {
@@ -26,6 +26,15 @@ except ImportError:
     # Fallback for testing
     def validate_pin(pin): return pin == 841921
 
+# Columnar candle history (optional; CSV glob is the fallback)
+try:
+    from ..brokers.candle_store import CandleStore
+except ImportError:
+    try:
+        from brokers.candle_store import CandleStore
+    except ImportError:
+        CandleStore = None
+
 # Regime detection integration
 try:
     from ..logic.regime_detector import detect_regime, RegimeType
@@ -143,8 +152,11 @@ class MLModel:
         return self.asset_class
     
     def _load_training_data(self):
-        """Load training data from CSV files"""
+        """Load training data from the candle store (RICK_TRAINING_SERIES_<type>) or CSV files"""
         try:
+            if self._load_store_data():
+                return
+            
             csv_files = glob.glob(os.path.join(self.data_path, self.csv_pattern))
             
             if not csv_files:
@@ -167,6 +179,23 @@ class MLModel:
             self.logger.error(f"Error loading training data: {str(e)}")
             self._create_sample_data()
     
+    def _load_store_data(self) -> bool:
+        """Memory-mapped bars from the candle store, e.g. RICK_TRAINING_SERIES_A=EUR_USD:M15"""
+        series = os.getenv(f"RICK_TRAINING_SERIES_{self.model_type.value}")
+        if not series or CandleStore is None:
+            return False
+        instrument, _, granularity = series.partition(":")
+        store = CandleStore()
+        frame = store.read_dataframe(instrument, granularity or "M15")
+        if frame.empty:
+            self.logger.warning(f"Candle store has no {series} bars - falling back to CSV")
+            return False
+        self.training_data = frame.rename_axis("timestamp").reset_index()
+        available_features = [col for col in self.expected_features if col in self.training_data.columns]
+        self.feature_importance = {feature: random.uniform(0.1, 1.0) for feature in available_features}
+        self.logger.info(f"Loaded training data: {series} from {store.root} ({len(self.training_data)} rows, {len(available_features)} features)")
+        return True
+    
     def _create_sample_data(self):
         """Create sample data structure for testing"""
         sample_size = 1000
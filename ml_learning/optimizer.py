@@ -7,6 +7,7 @@ PIN: 841921 | Phase 13
 
 import json
 import os
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
@@ -17,6 +18,12 @@ import threading
 from collections import defaultdict
 import math
 
+try:
+    from util.state_store import IncrementalStateStore
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from util.state_store import IncrementalStateStore
+
 @dataclass
 class OptimizationResult:
     """
@@ -75,12 +82,55 @@ class TradingOptimizer:
         self.logger = logging.getLogger(f"TradingOptimizer_{pin}")
         self.logger.info("Trading Optimizer initialized")
         
+        # Persistence: snapshot + delta log next to optimization_file
+        self.state = IncrementalStateStore(os.path.splitext(optimization_file)[0], lock=self.lock)
+        
         # Load existing optimization history
-        self._load_optimizations()
+        migrated = self._load_optimizations()
+        self.state.attach(self._snapshot_state)
+        if migrated:
+            self._save_optimizations()
+    
+    def _load_optimizations(self) -> bool:
+        """
+        ENGINEER: Load the latest snapshot and replay deltas (or import the legacy JSON file)
+        
+        Returns:
+            True if legacy data was imported and should be snapshotted
+        """
+        migrated = False
+        snapshot, deltas = self.state.load()
+        if snapshot is not None:
+            tables, _ = snapshot
+            self.performance_history = tables.get('performance', [])
+            self.optimization_history = [OptimizationResult(**d) for d in tables.get('optimizations', [])]
+        else:
+            migrated = self._load_legacy_file()
+        
+        replayed = 0
+        for delta in deltas:
+            if delta['op'] == 'trade':
+                self.performance_history.append(delta['record'])
+            elif delta['op'] == 'suggestions':
+                self.optimization_history.extend(OptimizationResult(**d) for d in delta['results'])
+            replayed += 1
+        
+        if snapshot is not None or replayed:
+            self.logger.info(f"Loaded {len(self.optimization_history)} optimization results ({replayed} deltas replayed)")
+        return migrated
+    
+    def _snapshot_state(self):
+        """
+        ENGINEER: Full state for compaction (called by the state store under self.lock)
+        """
+        return {
+            'performance': self.performance_history[-1000:],  # Keep last 1000 records
+            'optimizations': [asdict(opt) for opt in self.optimization_history[-100:]]  # Keep last 100 optimizations
+        }, {'last_updated': datetime.now(timezone.utc).isoformat()}
     
-    def _load_optimizations(self):
+    def _load_legacy_file(self) -> bool:
         """
-        ENGINEER: Load optimization history from persistent storage
+        ENGINEER: One-time import of the pre-snapshot optimizations JSON file
         """
         if os.path.exists(self.optimization_file):
             try:
@@ -99,6 +149,7 @@ class TradingOptimizer:
                 
                 self.optimization_history = opt_results
                 self.logger.info(f"Loaded {len(self.optimization_history)} optimization results")
+                return True
                 
             except Exception as e:
                 self.logger.error(f"Failed to load optimizations: {e}")
@@ -106,28 +157,16 @@ class TradingOptimizer:
                 self.optimization_history = []
         else:
             self.logger.info("No existing optimization file found - starting fresh")
+        return False
     
     def _save_optimizations(self):
         """
-        ENGINEER: Save optimization history to persistent storage
+        ENGINEER: Write a compacted snapshot now (acquires self.lock; do not call while holding it)
         """
-        try:
-            opt_data = {
-                'performance_history': self.performance_history[-1000:],  # Keep last 1000 records
-                'optimization_history': [asdict(opt) for opt in self.optimization_history[-100:]],  # Keep last 100 optimizations
-                'last_updated': datetime.now(timezone.utc).isoformat()
-            }
-            
-            # Write to temporary file first, then rename for atomic operation
-            temp_file = f"{self.optimization_file}.tmp"
-            with open(temp_file, 'w') as f:
-                json.dump(opt_data, f, indent=2)
-            
-            os.rename(temp_file, self.optimization_file)
+        if not self.state.snapshot():
+            self.logger.error("Failed to save optimizations")
+        else:
             self.logger.info("Saved optimization data")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to save optimizations: {e}")
     
     def record_trade_performance(self, trade_data: Dict[str, Any]):
         """
@@ -151,6 +190,7 @@ class TradingOptimizer:
                 }
                 
                 self.performance_history.append(performance_record)
+                self.state.record('trade', record=performance_record)
                 self.logger.debug(f"Recorded trade performance: {performance_record['outcome']} PnL: {performance_record['pnl']:.4f}")
                 
         except Exception as e:
@@ -356,7 +396,7 @@ class TradingOptimizer:
             with self.lock:
                 self.optimization_history.extend(suggestions)
                 if len(suggestions) > 0:
-                    self._save_optimizations()
+                    self.state.record('suggestions', results=[asdict(s) for s in suggestions])
             
             self.logger.info(f"Generated {len(suggestions)} optimization suggestions")
             return suggestions
@@ -430,8 +470,7 @@ class TradingOptimizer:
     
     def save_now(self):
         """Force save optimization data to disk"""
-        with self.lock:
-            self._save_optimizations()
+        self._save_optimizations()
 
 def get_trading_optimizer(pin: int = 841921) -> TradingOptimizer:
     """Convenience function to get Trading Optimizer instance"""
@@ -5,6 +5,7 @@ ML-powered pattern memorization and similarity matching for trade optimization.
 PIN: 841921 | Phase 13
 """
 
+import gc
 import json
 import os
 import numpy as np
@@ -17,6 +18,18 @@ import threading
 from collections import deque
 import math
 
+try:
+    from ..util.event_store import record_event
+    from ..util.state_journal import StateJournal
+except ImportError:
+    from util.state_journal import StateJournal
+    try:
+        from util.event_store import record_event
+    except ImportError:
+        record_event = None
+
+SNAPSHOT_VERSION = 1
+
 @dataclass
 class TradePattern:
     """
@@ -35,6 +48,115 @@ class TradePattern:
     duration_minutes: Optional[int] = None
     win_rate_context: Optional[float] = None  # Win rate when pattern was created
 
+_SEP = '\x1f'  # joins key/signal tuples into one vocabulary string
+
+
+def _nullable(column: np.ndarray) -> list:
+    """Float column -> list with NaN mapped back to None"""
+    return [None if v != v else v for v in column.tolist()]
+
+
+def _categorical(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Hashable values -> (vocabulary, int32 codes with -1 for None)"""
+    lookup: Dict[Any, int] = {}
+    codes = np.array([-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values], dtype=np.int32)
+    return np.array(list(lookup), dtype=str), codes
+
+
+def _categories(data, name: str) -> list:
+    vocab = data[f'{name}_vocab'].tolist() + [None]  # code -1 -> None
+    return [vocab[c] for c in data[name].tolist()]
+
+
+def encode_patterns(patterns: List[TradePattern], seq: int, trade_count: int) -> Dict[str, np.ndarray]:
+    """
+    ENGINEER: Columnar snapshot arrays (one typed array per field, no pickled objects)
+    
+    Indicator dicts are stored as a value matrix plus a per-row key-set code and
+    signal lists as a per-row signal-set code, since both repeat across patterns.
+    """
+    def floats(name):
+        return np.array([np.nan if getattr(p, name) is None else float(getattr(p, name)) for p in patterns],
+                        dtype=np.float64)
+
+    key_sets = [tuple(p.indicators) for p in patterns]
+    keys = sorted({k for ks in set(key_sets) for k in ks})
+    key_index = {k: j for j, k in enumerate(keys)}
+    ind_values = np.full((len(patterns), len(keys)), np.nan)
+    for i, p in enumerate(patterns):
+        for k, v in p.indicators.items():
+            ind_values[i, key_index[k]] = v
+    key_set_vocab, key_set_codes = _categorical([_SEP.join(ks) for ks in key_sets])
+    signal_vocab, signal_codes = _categorical([_SEP.join(p.signals) for p in patterns])
+
+    regime_vocab, regime_codes = _categorical([p.regime for p in patterns])
+    direction_vocab, direction_codes = _categorical([p.direction for p in patterns])
+    outcome_vocab, outcome_codes = _categorical([p.outcome for p in patterns])
+    return {
+        'version': np.array(SNAPSHOT_VERSION),
+        'seq': np.array(seq, dtype=np.int64),
+        'trade_count': np.array(trade_count, dtype=np.int64),
+        'timestamp': np.array([p.timestamp for p in patterns], dtype=str),
+        'regime_vocab': regime_vocab, 'regime': regime_codes,
+        'direction_vocab': direction_vocab, 'direction': direction_codes,
+        'outcome_vocab': outcome_vocab, 'outcome': outcome_codes,
+        'indicator_keys': np.array(keys, dtype=str),
+        'indicator_values': ind_values,
+        'indicator_set_vocab': key_set_vocab, 'indicator_set': key_set_codes,
+        'signals_vocab': signal_vocab, 'signals': signal_codes,
+        'confidence': np.array([float(p.confidence) for p in patterns], dtype=np.float64),
+        'entry_price': floats('entry_price'),
+        'exit_price': floats('exit_price'),
+        'pnl': floats('pnl'),
+        'duration_minutes': floats('duration_minutes'),
+        'win_rate_context': floats('win_rate_context'),
+    }
+
+
+def decode_patterns(data) -> Tuple[List[TradePattern], int, int]:
+    """
+    ENGINEER: Columnar snapshot -> (patterns, journal seq, trade_count)
+    """
+    if int(data['version']) != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported pattern snapshot version {int(data['version'])}")
+    # Only acyclic objects are built here; pausing the cyclic GC roughly halves load time
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _decode_columns(data)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _decode_columns(data) -> Tuple[List[TradePattern], int, int]:
+    n = len(data['timestamp'])
+
+    # Indicators: one vectorized gather per distinct key set
+    key_index = {k: j for j, k in enumerate(data['indicator_keys'].tolist())}
+    values = data['indicator_values']
+    set_codes = data['indicator_set']
+    indicators: List[Optional[Dict[str, float]]] = [None] * n
+    for code, joined in enumerate(data['indicator_set_vocab'].tolist()):
+        set_keys = tuple(joined.split(_SEP)) if joined else ()
+        rows = np.flatnonzero(set_codes == code)
+        block = values[np.ix_(rows, [key_index[k] for k in set_keys])].tolist()
+        for row, vals in zip(rows.tolist(), block):
+            indicators[row] = dict(zip(set_keys, vals))
+
+    signal_sets = [tuple(joined.split(_SEP)) if joined else () for joined in data['signals_vocab'].tolist()]
+    signals = [list(signal_sets[c]) for c in data['signals'].tolist()]
+    durations = [None if d is None else int(d) for d in _nullable(data['duration_minutes'])]
+
+    # Positional construction in TradePattern field order
+    patterns = list(map(
+        TradePattern,
+        data['timestamp'].tolist(), _categories(data, 'regime'), indicators, signals,
+        data['confidence'].tolist(), _categories(data, 'direction'),
+        _nullable(data['entry_price']), _nullable(data['exit_price']), _categories(data, 'outcome'),
+        _nullable(data['pnl']), durations, _nullable(data['win_rate_context'])))
+    return patterns, int(data['seq']), int(data['trade_count'])
+
 class PatternLearner:
     """
     PROF_QUANT (40%): Advanced pattern learning with similarity scoring
@@ -58,8 +180,14 @@ class PatternLearner:
         self.patterns_file = patterns_file
         self.min_win_rate = 0.55  # 55% minimum win rate for updates
         self.similarity_threshold = 0.15  # Maximum distance for similar patterns
-        self.auto_save_interval = 25  # Save every 25 trades
+        self.auto_save_interval = 25  # Legacy setting: every update is now journaled
         self.max_patterns = 10000  # Maximum patterns to store
+        self.compact_min_records = 1000  # Snapshot once the journal outgrows max(this, pattern count)
+        
+        # Persistence: columnar snapshot + append-only journal next to patterns_file
+        base = os.path.splitext(patterns_file)[0]
+        self.snapshot_file = f"{base}.snapshot.npz"
+        self.journal_file = f"{base}.journal.jsonl"
         
         # Pattern storage
         self.patterns: List[TradePattern] = []
@@ -85,55 +213,104 @@ class PatternLearner:
     
     def _load_patterns(self):
         """
-        ENGINEER: Load patterns from persistent storage
+        ENGINEER: Load the latest snapshot, then replay journal records written after it
         """
-        if os.path.exists(self.patterns_file):
+        self.patterns = []
+        self.trade_count = 0
+        snapshot_seq = 0
+        migrated = False
+        
+        if os.path.exists(self.snapshot_file):
+            try:
+                with np.load(self.snapshot_file, allow_pickle=False) as data:
+                    self.patterns, snapshot_seq, self.trade_count = decode_patterns(data)
+            except Exception as e:
+                self.logger.error(f"Failed to load pattern snapshot: {e}")
+                self.patterns, snapshot_seq, self.trade_count = [], 0, 0
+        elif os.path.exists(self.patterns_file):
+            # Legacy full-JSON file: load once, then persist as a snapshot
             try:
                 with open(self.patterns_file, 'r') as f:
                     pattern_data = json.load(f)
                 
-                self.patterns = []
                 for p_dict in pattern_data.get('patterns', []):
                     try:
-                        pattern = TradePattern(**p_dict)
-                        self.patterns.append(pattern)
+                        self.patterns.append(TradePattern(**p_dict))
                     except Exception as e:
                         self.logger.warning(f"Failed to load pattern: {e}")
                 
                 self.trade_count = pattern_data.get('trade_count', 0)
-                self.logger.info(f"Loaded {len(self.patterns)} patterns from {self.patterns_file}")
+                migrated = True
                 
             except Exception as e:
                 self.logger.error(f"Failed to load patterns: {e}")
                 self.patterns = []
                 self.trade_count = 0
+        
+        self.journal = StateJournal(self.journal_file)
+        self.journal.advance_to(snapshot_seq)
+        replayed = 0
+        for record in self.journal.replay(snapshot_seq):
+            self._apply(record)
+            replayed += 1
+        
+        if migrated:
+            self._save_patterns()
+        if self.patterns or replayed:
+            self.logger.info(f"Loaded {len(self.patterns)} patterns ({replayed} journal records replayed)")
         else:
             self.logger.info("No existing pattern file found - starting fresh")
-            self.patterns = []
-            self.trade_count = 0
+    
+    def _apply(self, record: Dict[str, Any]):
+        """
+        ENGINEER: Re-apply one journal record (mirrors store_trade_pattern / update_trade_outcome)
+        """
+        try:
+            if record['op'] == 'add':
+                self.patterns.append(TradePattern(**record['pattern']))
+            elif record['op'] == 'outcome':
+                index = record['index']
+                pattern = self.patterns[index]
+                pattern.exit_price = record['exit_price']
+                pattern.outcome = record['outcome']
+                pattern.pnl = record['pnl']
+                pattern.duration_minutes = record['duration_minutes']
+                if record['accepted']:
+                    self.trade_count += 1
+                else:
+                    self.patterns.pop(index)
+        except (KeyError, IndexError, TypeError) as e:
+            self.logger.warning(f"Skipping journal record {record.get('seq')}: {e}")
+    
+    def _journal(self, op: str, **fields):
+        """
+        ENGINEER: Append one mutation (O(1)); compact once the journal outgrows the pattern set
+        """
+        self.journal.append(op, **fields)
+        if self.journal.records >= max(self.compact_min_records, len(self.patterns)):
+            self._save_patterns()
     
     def _save_patterns(self):
         """
-        ENGINEER: Save patterns to persistent storage
+        ENGINEER: Write a compacted columnar snapshot and truncate the journal it covers
         """
         try:
             # Keep only the most recent patterns if we exceed max
             if len(self.patterns) > self.max_patterns:
                 self.patterns = self.patterns[-self.max_patterns:]
             
-            pattern_data = {
-                'patterns': [asdict(p) for p in self.patterns],
-                'trade_count': self.trade_count,
-                'last_updated': datetime.now(timezone.utc).isoformat()
-            }
+            seq = self.journal.seq
+            arrays = encode_patterns(self.patterns, seq, self.trade_count)
             
             # Write to temporary file first, then rename for atomic operation
-            temp_file = f"{self.patterns_file}.tmp"
-            with open(temp_file, 'w') as f:
-                json.dump(pattern_data, f, indent=2)
-            
-            os.rename(temp_file, self.patterns_file)
-            self.logger.info(f"Saved {len(self.patterns)} patterns to {self.patterns_file}")
+            temp_file = f"{self.snapshot_file}.tmp"
+            with open(temp_file, 'wb') as f:
+                np.savez(f, **arrays)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.snapshot_file)
+            self.journal.reset(seq)
+            self.logger.info(f"Saved {len(self.patterns)} patterns to {self.snapshot_file}")
             
         except Exception as e:
             self.logger.error(f"Failed to save patterns: {e}")
@@ -322,6 +499,7 @@ class PatternLearner:
                 
                 self.patterns.append(pattern)
                 pattern_id = f"{len(self.patterns)-1}_{pattern.timestamp}"
+                self._journal('add', pattern=asdict(pattern))
                 
                 self.logger.info(f"Stored trade pattern: {pattern_id}")
                 return pattern_id
@@ -360,19 +538,30 @@ class PatternLearner:
                     current_win_rate = recent_wins / len(recent_patterns) if recent_patterns else 0.0
                     
                     # Only accept updates if win rate is acceptable
-                    if current_win_rate >= self.min_win_rate or len(recent_patterns) < 10:
+                    accepted = current_win_rate >= self.min_win_rate or len(recent_patterns) < 10
+                    if accepted:
                         self.trade_count += 1
+                        if record_event is not None:
+                            record_event("pattern", {
+                                "timestamp": datetime.now(timezone.utc).isoformat(),
+                                "pattern_id": pattern_id,
+                                "regime": pattern.regime,
+                                "direction": pattern.direction,
+                                "confidence": pattern.confidence,
+                                "exit_price": exit_price,
+                                "outcome": outcome,
+                                "pnl": pnl,
+                                "duration_minutes": duration_minutes,
+                            })
                         
                         self.logger.info(f"Updated trade outcome: {pattern_id} -> {outcome} (PnL: {pnl:.4f})")
-                        
-                        # Auto-save every N trades
-                        if self.trade_count % self.auto_save_interval == 0:
-                            self._save_patterns()
-                            self.logger.info(f"Auto-saved patterns after {self.trade_count} trades")
                     else:
                         self.logger.warning(f"Pattern update rejected - win rate {current_win_rate:.3f} < {self.min_win_rate}")
                         # Remove the pattern if win rate is too low
                         self.patterns.pop(pattern_index)
+                    
+                    self._journal('outcome', index=pattern_index, exit_price=exit_price, outcome=outcome,
+                                  pnl=pnl, duration_minutes=duration_minutes, accepted=accepted)
                 else:
                     self.logger.error(f"Pattern not found for ID: {pattern_id}")
                     
@@ -12,7 +12,6 @@ import sys
 import os
 import asyncio
 import threading
-import json
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from collections import defaultdict
@@ -37,6 +36,7 @@ from brokers.ib_connector import IBConnector
 from util.terminal_display import TerminalDisplay, Colors
 from util.narration_logger import log_narration, log_pnl
 from util.rick_narrator import RickNarrator
+from util.positions_registry import get_active_pair_leases
 
 # Strategy imports
 try:
@@ -93,7 +93,13 @@ class MultiBrokerEngine:
         # Max 3-4 pairs per platform, no duplicates across platforms
         self.max_pairs_per_platform = 4
         self.active_pairs_by_broker = defaultdict(set)  # {broker: set(symbols)}
-        self.global_active_pairs_file = '/tmp/rick_trading_global_pairs.json'
+        self.unseen_pairs_by_broker = defaultdict(set)  # active pairs missing from the last position poll
+        # Shared with other engines as crash-safe leases in the positions registry DB
+        try:
+            self.pair_leases = get_active_pair_leases()
+        except Exception as e:
+            self.pair_leases = None
+            print(f"⚠️  Active-pair leases unavailable: {e}")
         
         # Stats
         self.stats = {
@@ -143,32 +149,70 @@ class MultiBrokerEngine:
         if not self.brokers:
             raise RuntimeError("No brokers available!")
     
-    def _load_global_active_pairs(self) -> set:
-        """Load active pairs from all platforms to prevent duplicates"""
-        try:
-            if os.path.exists(self.global_active_pairs_file):
-                with open(self.global_active_pairs_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('pairs', []))
-        except Exception as e:
-            print(f"⚠️  Could not load global active pairs: {e}")
-        return set()
+    def _acquire_pair(self, broker: str, symbol: str) -> tuple:
+        """
+        Mark a pair active on broker (atomic across engines via the lease table)
+        
+        Returns:
+            Tuple of (acquired: bool, reason: str)
+        """
+        if self.pair_leases is not None:
+            try:
+                acquired, reason = self.pair_leases.acquire(symbol, broker, self.max_pairs_per_platform)
+            except Exception as e:
+                print(f"⚠️  Could not lease active pair {symbol}: {e}")
+                acquired, reason = True, "OK"  # fall back to in-process tracking
+            if not acquired:
+                return False, reason
+        self.active_pairs_by_broker[broker].add(symbol)
+        return True, "OK"
     
-    def _save_global_active_pairs(self):
-        """Save active pairs from all brokers to global tracker"""
-        try:
-            all_pairs = set()
-            for broker, pairs in self.active_pairs_by_broker.items():
-                all_pairs.update(pairs)
-            
-            with open(self.global_active_pairs_file, 'w') as f:
-                json.dump({
-                    'pairs': list(all_pairs),
-                    'by_broker': {broker: list(pairs) for broker, pairs in self.active_pairs_by_broker.items()},
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }, f)
-        except Exception as e:
-            print(f"⚠️  Could not save global active pairs: {e}")
+    def _release_pair(self, broker: str, symbol: str):
+        """Mark a pair inactive on broker and release its lease"""
+        self.active_pairs_by_broker[broker].discard(symbol)
+        self.unseen_pairs_by_broker[broker].discard(symbol)
+        if self.pair_leases is not None:
+            try:
+                self.pair_leases.release(symbol)
+            except Exception as e:
+                print(f"⚠️  Could not release active pair {symbol}: {e}")
+    
+    @staticmethod
+    def _pair_key(symbol) -> str:
+        """Broker-neutral pair key (EUR_USD, EUR/USD, eur-usd and EURUSD all match)"""
+        return ''.join(ch for ch in str(symbol or '').upper() if ch.isalnum())
+    
+    @staticmethod
+    def _open_positions(connector) -> Optional[List[Dict]]:
+        """
+        Open positions from the connector's own API as [{'symbol', 'unrealized_pnl'}]
+        
+        IBKR lists positions (get_open_positions), OANDA lists open trades (get_trades).
+        Returns None when the connector cannot list open positions at all.
+        """
+        if hasattr(connector, 'get_open_positions'):
+            return [{'symbol': p.get('symbol'), 'unrealized_pnl': float(p.get('unrealized_pnl') or 0)}
+                    for p in connector.get_open_positions()]
+        if hasattr(connector, 'get_trades'):
+            return [{'symbol': t.get('instrument'), 'unrealized_pnl': float(t.get('unrealizedPL') or 0)}
+                    for t in connector.get_trades()]
+        return None
+    
+    def _release_closed_pairs(self, broker: str, positions: Optional[List[Dict]]):
+        """Release active pairs on broker whose positions have closed"""
+        active = self.active_pairs_by_broker[broker]
+        if positions is None:
+            # No position API (Coinbase): the OCO bracket manages the exit, so don't hold the lease
+            for symbol in list(active):
+                self._release_pair(broker, symbol)
+            return
+        open_keys = {self._pair_key(p.get('symbol')) for p in positions}
+        missing = {symbol for symbol in active if self._pair_key(symbol) not in open_keys}
+        # Connectors report an empty list when the poll itself fails: only release a pair
+        # after two consecutive polls without it
+        for symbol in missing & self.unseen_pairs_by_broker[broker]:
+            self._release_pair(broker, symbol)
+        self.unseen_pairs_by_broker[broker] = missing & self.active_pairs_by_broker[broker]
     
     def _can_trade_pair(self, broker: str, symbol: str) -> tuple:
         """
@@ -188,6 +232,11 @@ class MultiBrokerEngine:
             if other_broker != broker and symbol in pairs:
                 return False, f"Pair {symbol} already active on {other_broker}"
         
+        # Pairs held by other engines
+        holder = self.pair_leases.holder(symbol) if self.pair_leases is not None else None
+        if holder is not None and symbol not in broker_pairs:
+            return False, f"Pair {symbol} already active on {holder}"
+        
         return True, "OK"
     
     def get_market_data(self):
@@ -289,6 +338,18 @@ class MultiBrokerEngine:
                 print(f"  ❌ Broker {broker} not available")
                 continue
             
+            symbol = signal['symbol']
+            already_active = symbol in self.active_pairs_by_broker[broker]
+            if not already_active:
+                allowed, reason = self._can_trade_pair(broker, symbol)
+                if allowed:
+                    # Take the lease before ordering so two engines cannot both enter the pair
+                    allowed, reason = self._acquire_pair(broker, symbol)
+                if not allowed:
+                    print(f"  ⏭️  {broker:10} {symbol:12} skipped: {reason}")
+                    continue
+            
+            placed = False
             try:
                 # Prepare order
                 order_params = {
@@ -302,6 +363,7 @@ class MultiBrokerEngine:
                 result = self.brokers[broker].place_order(**order_params)
                 
                 if result.get('status') == 'success':
+                    placed = True
                     executed += 1
                     self.stats['total_trades'] += 1
                     self.stats['by_broker'][broker]['trades'] += 1
@@ -318,6 +380,9 @@ class MultiBrokerEngine:
             
             except Exception as e:
                 print(f"  ❌ Execution error: {e}")
+            
+            if not placed and not already_active:
+                self._release_pair(broker, symbol)
         
         print(f"\n✅ Executed {executed}/{len(signals)} signals")
         return executed
@@ -330,7 +395,7 @@ class MultiBrokerEngine:
         all_positions = []
         for broker, connector in self.brokers.items():
             try:
-                positions = connector.get_positions()
+                positions = self._open_positions(connector) or []
                 all_positions.extend([(broker, p) for p in positions])
             except Exception as e:
                 print(f"  ⚠️  {broker} position fetch failed: {e}")
@@ -348,8 +413,13 @@ class MultiBrokerEngine:
         total_pnl = 0
         for broker, connector in self.brokers.items():
             try:
-                positions = connector.get_positions()
-                pnl = sum(p.get('unrealized_pnl', 0) for p in positions)
+                positions = self._open_positions(connector)
+                
+                # Pairs whose positions have closed become available again
+                self._release_closed_pairs(broker, positions)
+                
+                positions = positions or []
+                pnl = sum(p['unrealized_pnl'] for p in positions)
                 total_pnl += pnl
                 
                 if positions:
@@ -421,6 +491,9 @@ class MultiBrokerEngine:
             except:
                 pass
         
+        if self.pair_leases is not None:
+            self.pair_leases.close()
+        
         # Log final stats
         print("\n📊 Final Statistics:")
         print(f"  Total trades: {self.stats['total_trades']}")
@@ -34,12 +34,15 @@ if os.path.exists(env_file):
 # Charter compliance imports
 from foundation.rick_charter import RickCharter
 from foundation.margin_correlation_gate import MarginCorrelationGate, Position, Order, HookResult
-from brokers.oanda_connector import OandaConnector
+from brokers.oanda_connector import OandaConnector, PriceSnapshot
+from brokers.oanda_async_connector import AsyncOandaConnector
+from brokers.oanda_price_stream import get_price_stream
+from brokers.rate_limiter import get_rate_limiter, RequestPriority
 from util.terminal_display import TerminalDisplay, Colors
-from util.narration_logger import log_narration, log_pnl
+from util.narration_logger import log_narration, log_pnl, enable_buffered_logging, flush_logs
 from util.rick_narrator import RickNarrator
 from util.usd_converter import get_usd_notional
-from util.positions_registry import PositionsRegistry
+from util.positions_registry import get_active_pair_leases, get_positions_registry
 from systems.momentum_signals import generate_signal
 
 # ML Intelligence imports
@@ -78,13 +81,16 @@ class OandaTradingEngine:
     - Sub-300ms execution tracking
     """
     
-    def __init__(self, environment='practice'):
+    def __init__(self, environment='practice', async_broker=False, stream_prices=False):
         """
         Initialize Trading Engine
         
         Args:
             environment: 'practice' or 'live' (default: practice)
                         Only difference is API endpoint and token used
+            async_broker: Use the aiohttp connector inside the asyncio loops so the
+                        signal scan and trade manager never block each other
+            stream_prices: Serve quotes from the OANDA pricing stream cache (REST fallback)
         """
         # Validate Charter PIN
         if not RickCharter.validate_pin(841921):
@@ -100,6 +106,23 @@ class OandaTradingEngine:
         print(f"   Account: {self.oanda.account_id}")
         print(f"   Endpoint: {self.oanda.api_base}")
         
+        # Narration/P&L lines are batched by a background writer; order, fill and
+        # breaker events still block until fsynced (see util/narration_logger.py)
+        enable_buffered_logging()
+        
+        # Incremental candle cache: each scan downloads only newly closed M15 bars
+        self.oanda.enable_candle_cache()
+
+        # Trade/account polls from the trade manager, position close handling and gate checks
+        # collapse into one call per cycle (writes invalidate; OANDA_MICRO_CACHE_TTL overrides)
+        for endpoint_class, ttl in (("trades", 1.0), ("account", 2.0)):
+            self.oanda.micro_cache_ttl.setdefault(f"GET {endpoint_class}", ttl)
+
+        # Async broker mode: awaitable connector sharing the sync connector's credentials/stats
+        self.async_oanda = AsyncOandaConnector(connector=self.oanda) if async_broker else None
+        if self.async_oanda:
+            self.display.success("✅ Async broker I/O enabled (non-blocking event loop)")
+        
         # Initialize Rick's narration system
         self.narrator = RickNarrator()
         
@@ -150,7 +173,7 @@ class OandaTradingEngine:
         
         # Initialize Positions Registry (cross-platform position tracking)
         try:
-            self.positions_registry = PositionsRegistry()
+            self.positions_registry = get_positions_registry()  # RICK_POSITIONS_BACKEND
             self.display.success("✅ Positions Registry initialized")
         except Exception as e:
             self.positions_registry = None
@@ -177,6 +200,10 @@ class OandaTradingEngine:
         self.pending_orders = []      # Track pending orders for gate monitoring
         self.display.success("🛡️  Margin & Correlation Guardian Gates ACTIVE")
         
+        # Streaming quote cache (one pricing stream per account, started in run_trading_loop)
+        self.stream_prices = stream_prices
+        self.price_stream = None
+        
         # ALL AVAILABLE OANDA FOREX PAIRS (from env_new.env)
         # Major USD pairs + Major crosses + Commodity currencies
         self.trading_pairs = [
@@ -215,7 +242,18 @@ class OandaTradingEngine:
         # Max 3-4 pairs per platform, no duplicates across platforms
         self.max_pairs_per_platform = 4
         self.active_pairs = set()  # Track active pairs on this platform
-        self.global_active_pairs_file = '/tmp/rick_trading_global_pairs.json'  # Cross-platform tracking
+        # Cross-platform tracking: leases in the registry DB, released automatically if this engine dies
+        try:
+            self.pair_leases = get_active_pair_leases()
+        except Exception as e:
+            self.pair_leases = None
+            self.display.warning(f"⚠️  Active-pair leases unavailable: {e}")
+        
+        # Signal scan settings (concurrent fan-out across trading_pairs)
+        self.scan_concurrency = int(os.getenv("RICK_SCAN_CONCURRENCY", 8))
+        self.scan_early_exit_confidence = 1.0  # stop waiting once a max-confidence signal arrives
+        self._scan_rotation = 0               # rotates scan/tie-break order between cycles
+        self.last_scan_report = {}
         
         # TradeManager settings
         # Only consider converting TP -> trailing SL after 60 seconds
@@ -302,8 +340,64 @@ class OandaTradingEngine:
         self.display.divider()
         print()
     
-    def get_current_price(self, pair):
-        """Get current real-time price from OANDA API (environment-agnostic)"""
+    @staticmethod
+    def _price_dict(bid: float, ask: float, source: str) -> Dict:
+        """Engine price format shared by stream, snapshot and REST lookups"""
+        return {
+            'bid': bid,
+            'ask': ask,
+            'spread': round((ask - bid) * 10000, 1),  # in pips
+            'real_api': True,
+            'source': source
+        }
+    
+    def _get_streamed_price(self, pair):
+        """Return a price dict from the streaming quote cache, or None to fall back to REST"""
+        if self.price_stream is None:
+            return None
+        quote = self.price_stream.get_quote(pair)
+        if quote is None:
+            self.price_stream.subscribe([pair])
+            return None
+        return self._price_dict(quote.bid, quote.ask, 'stream')
+    
+    def _get_snapshot_price(self, pair, snapshot: Optional[PriceSnapshot]):
+        """Return a price dict from this cycle's snapshot, or None if the pair is not in it"""
+        if snapshot is None:
+            return None
+        quote = snapshot.get(pair)
+        if not quote or quote.get('bid') is None or quote.get('ask') is None:
+            return None
+        return self._price_dict(quote['bid'], quote['ask'], f"snapshot:{snapshot.source}")
+    
+    async def _get_cycle_snapshot(self, instruments) -> Optional[PriceSnapshot]:
+        """One immutable price snapshot per cycle: stream cache if complete, else one pricing request"""
+        instruments = list(dict.fromkeys(instruments))
+        if not instruments:
+            return None
+        if self.price_stream is not None and self.price_stream.is_healthy():
+            quotes = {pair: self.price_stream.cache.get(pair) for pair in instruments}
+            if all(quotes.values()):
+                return PriceSnapshot(
+                    {pair: {'bid': q.bid, 'ask': q.ask, 'mid': q.mid, 'time': q.time} for pair, q in quotes.items()},
+                    source='stream'
+                )
+        try:
+            return await self._broker('get_price_snapshot', instruments)
+        except Exception as e:
+            self.display.warning(f"⚠️  Price snapshot failed ({len(instruments)} pairs): {e}")
+            return None
+    
+    def get_current_price(self, pair, snapshot: Optional[PriceSnapshot] = None):
+        """Get current real-time price from OANDA API (environment-agnostic)
+        
+        Args:
+            pair: Instrument (e.g. 'EUR_USD')
+            snapshot: Optional per-cycle PriceSnapshot; used instead of a new request when it has the pair
+        """
+        cached = self._get_snapshot_price(pair, snapshot) or self._get_streamed_price(pair)
+        if cached:
+            return cached
         try:
             # Get real-time prices from OANDA API (practice or live based on connector config)
             api_base = self.oanda.api_base
@@ -340,6 +434,117 @@ class OandaTradingEngine:
             self.display.warning(f"⚠️  API error for {pair}: {str(e)}, using fallback")
             return self._get_fallback_price(pair)
     
+    async def get_current_price_async(self, pair, snapshot: Optional[PriceSnapshot] = None):
+        """Awaitable get_current_price; non-blocking when async broker mode is enabled"""
+        if self.async_oanda is None:
+            return self.get_current_price(pair, snapshot)
+        cached = self._get_snapshot_price(pair, snapshot) or self._get_streamed_price(pair)
+        if cached:
+            return cached
+        try:
+            quote = (await self.async_oanda.get_live_prices([pair])).get(pair)
+            if quote and quote['bid'] is not None and quote['ask'] is not None:
+                return self._price_dict(quote['bid'], quote['ask'], 'rest')
+            self.display.warning(f"⚠️  API pricing failed for {pair}, using fallback")
+            return self._get_fallback_price(pair)
+        except Exception as e:
+            self.display.warning(f"⚠️  API error for {pair}: {str(e)}, using fallback")
+            return self._get_fallback_price(pair)
+    
+    async def _broker(self, method: str, *args, **kwargs):
+        """Call an OANDA connector method, awaiting the async connector when enabled"""
+        if self.async_oanda is not None:
+            return await getattr(self.async_oanda, method)(*args, **kwargs)
+        return getattr(self.oanda, method)(*args, **kwargs)
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a blocking engine step off the event loop when async broker mode is enabled"""
+        if self.async_oanda is not None:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+        return fn(*args, **kwargs)
+    
+    async def _scan_pair(self, pair: str, semaphore: asyncio.Semaphore, order: int) -> Dict:
+        """Fetch candles and evaluate the momentum signal for one pair (bounded by semaphore)"""
+        async with semaphore:
+            start = time.perf_counter()
+            result = {'symbol': pair, 'signal': None, 'confidence': 0.0, 'order': order, 'error': None}
+            try:
+                # Decoded straight to a NumPy record array: no per-bar dicts or float() calls
+                if self.async_oanda is not None:
+                    candles = await self.async_oanda.get_historical_data(pair, count=120, granularity="M15",
+                                                                         as_array=True)
+                else:
+                    # Pooled sync connector is thread-safe; fan out on worker threads
+                    candles = await asyncio.to_thread(self.oanda.get_historical_data, pair, 120, "M15", True)
+                sig, conf = generate_signal(pair, candles)  # returns ("BUY"/"SELL", confidence) or (None, 0)
+                result['signal'] = sig
+                result['confidence'] = conf
+            except Exception as e:
+                result['error'] = str(e)
+                self.display.error(f"Signal error for {pair}: {e}")
+            result['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            return result
+    
+    async def scan_signals(self, pairs) -> List[Dict]:
+        """
+        Scan pairs concurrently (at most scan_concurrency in flight) and rank BUY/SELL signals
+        
+        Signals are ranked by confidence; ties go to the pair earliest in this cycle's
+        rotated order, so no pair permanently wins by list position. Once a signal reaches
+        scan_early_exit_confidence the remaining scans are cancelled.
+        
+        Returns:
+            List of signal dicts sorted best-first (empty if no BUY/SELL signal)
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return []
+        offset = self._scan_rotation % len(pairs)
+        self._scan_rotation += 1
+        ordered = pairs[offset:] + pairs[:offset]
+        
+        semaphore = asyncio.Semaphore(max(1, self.scan_concurrency))
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._scan_pair(pair, semaphore, i)) for i, pair in enumerate(ordered)]
+        results = []
+        early_exit = False
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                res = await next_done
+                results.append(res)
+                if res['signal'] in ("BUY", "SELL") and res['confidence'] >= self.scan_early_exit_confidence:
+                    early_exit = True
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        signals = [r for r in results if r['signal'] in ("BUY", "SELL")]
+        signals.sort(key=lambda r: (-r['confidence'], r['order']))
+        
+        self.last_scan_report = {
+            'pairs_requested': len(pairs),
+            'pairs_scanned': len(results),
+            'signals': len(signals),
+            'early_exit': early_exit,
+            'total_ms': round((time.perf_counter() - start) * 1000, 1),
+            'concurrency': self.scan_concurrency,
+            'pair_latency_ms': {r['symbol']: r['latency_ms'] for r in results},
+            'errors': {r['symbol']: r['error'] for r in results if r['error']},
+        }
+        log_narration(
+            event_type="SIGNAL_SCAN",
+            details={
+                **self.last_scan_report,
+                'ranked': [{'symbol': r['symbol'], 'signal': r['signal'], 'confidence': r['confidence']}
+                           for r in signals],
+            },
+            symbol="SYSTEM",
+            venue="oanda"
+        )
+        return signals
+    
     def _get_fallback_price(self, symbol: str) -> Dict:
         """Fallback to approximate prices if live API unavailable"""
         import random
@@ -600,28 +805,27 @@ class OandaTradingEngine:
         
         return position_size
     
-    def _load_global_active_pairs(self) -> set:
-        """Load active pairs from all platforms to prevent duplicates"""
+    def _acquire_global_pair(self, symbol: str) -> Tuple[bool, str]:
+        """Lease the pair across platforms so other engines skip it
+        
+        Returns:
+            Tuple of (acquired: bool, reason: str)
+        """
+        if self.pair_leases is None:
+            return True, "OK"
         try:
-            if os.path.exists(self.global_active_pairs_file):
-                with open(self.global_active_pairs_file, 'r') as f:
-                    data = json.load(f)
-                    return set(data.get('pairs', []))
+            return self.pair_leases.acquire(symbol, 'oanda')
         except Exception as e:
-            self.display.warning(f"Could not load global active pairs: {e}")
-        return set()
+            return False, f"Could not lease active pair {symbol}: {e}"
     
-    def _save_global_active_pairs(self, pairs: set):
-        """Save active pairs to global tracker"""
+    def _release_global_pair(self, symbol: str):
+        """Release this engine's lease on the pair"""
+        if self.pair_leases is None:
+            return
         try:
-            with open(self.global_active_pairs_file, 'w') as f:
-                json.dump({
-                    'pairs': list(pairs),
-                    'platform': 'oanda',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
-                }, f)
+            self.pair_leases.release(symbol)
         except Exception as e:
-            self.display.warning(f"Could not save global active pairs: {e}")
+            self.display.warning(f"Could not release active pair {symbol}: {e}")
     
     def _can_trade_pair(self, symbol: str) -> Tuple[bool, str]:
         """
@@ -636,9 +840,9 @@ class OandaTradingEngine:
                 return False, f"Platform limit reached ({self.max_pairs_per_platform} pairs max)"
         
         # Check cross-platform duplicates
-        global_pairs = self._load_global_active_pairs()
-        if symbol in global_pairs and symbol not in self.active_pairs:
-            return False, f"Pair {symbol} already active on another platform"
+        holder = self.pair_leases.holder(symbol) if self.pair_leases else None
+        if holder is not None and symbol not in self.active_pairs:
+            return False, f"Pair {symbol} already active on another platform ({holder})"
         
         return True, "OK"
     
@@ -788,8 +992,15 @@ class OandaTradingEngine:
             'reason': f'Low risk profile (margin: {margin_utilization:.1%}, notional: ${notional:,.0f})'
         }
     
-    def place_trade(self, symbol: str, direction: str):
-        """Place Charter-compliant OCO order with full logging (environment-agnostic)"""
+    def place_trade(self, symbol: str, direction: str, price_snapshot: Optional[PriceSnapshot] = None):
+        """Place Charter-compliant OCO order with full logging (environment-agnostic)
+        
+        Args:
+            symbol: Instrument to trade
+            direction: 'BUY' or 'SELL'
+            price_snapshot: Optional per-cycle PriceSnapshot (avoids a second pricing request)
+        """
+        leased = False
         try:
             # ========================================================================
             # 🛡️ PAIR LIMIT CHECK (NEW - Per User Requirement)
@@ -829,7 +1040,7 @@ class OandaTradingEngine:
                     return None
             
             # Get current price
-            price_data = self.get_current_price(symbol)
+            price_data = self.get_current_price(symbol, price_snapshot)
             if not price_data:
                 self.display.error(f"Could not get price for {symbol}")
                 log_narration(
@@ -968,6 +1179,25 @@ class OandaTradingEngine:
                 )
                 return None
             
+            # ========================================================================
+            # 🛡️ LEASE PAIR BEFORE ORDERING (prevents two engines entering it at once)
+            # ========================================================================
+            acquired, reason = self._acquire_global_pair(symbol)
+            if not acquired:
+                self.display.error(f"❌ PAIR LEASE BLOCKED: {reason}")
+                log_narration(
+                    event_type="PAIR_LIMIT_REJECTION",
+                    details={
+                        "symbol": symbol,
+                        "reason": reason,
+                        "active_pairs": list(self.active_pairs)
+                    },
+                    symbol=symbol,
+                    venue="oanda"
+                )
+                return None
+            leased = symbol not in self.active_pairs
+            
             # Determine units (negative for SELL)
             units = position_size if direction == "BUY" else -position_size
             
@@ -1052,10 +1282,6 @@ class OandaTradingEngine:
                 # 🛡️ UPDATE ACTIVE PAIRS (NEW - Per User Requirement)
                 # ========================================================================
                 self.active_pairs.add(symbol)
-                # Update global tracker to prevent duplicates across platforms
-                global_pairs = self._load_global_active_pairs()
-                global_pairs.add(symbol)
-                self._save_global_active_pairs(global_pairs)
                 
                 self.display.success(f"✅ Pair {symbol} added to active pairs ({len(self.active_pairs)}/{self.max_pairs_per_platform})")
                 
@@ -1217,9 +1443,14 @@ class OandaTradingEngine:
                     venue="oanda"
                 )
                 
+                if leased:
+                    self._release_global_pair(symbol)
                 return None
                 
         except Exception as e:
+            # Drop a lease taken for an order that never became a position
+            if leased and symbol not in self.active_pairs:
+                self._release_global_pair(symbol)
             self.display.error(f"Error placing trade: {e}")
             log_narration(
                 event_type="TRADE_ERROR",
@@ -1272,6 +1503,15 @@ class OandaTradingEngine:
         while self.is_running:
             try:
                 now = datetime.now(timezone.utc)
+                
+                # One pricing request for every managed position this pass
+                managed_symbols = [
+                    pos['symbol'] for pos in list(self.active_positions.values())
+                    if not pos.get('tp_cancelled')
+                    and (now - pos['timestamp']).total_seconds() >= self.min_position_age_seconds
+                ]
+                price_snapshot = await self._get_cycle_snapshot(managed_symbols)
+                
                 for order_id, pos in list(self.active_positions.items()):
                     # Skip if already processed for TP cancellation
                     if pos.get('tp_cancelled'):
@@ -1288,7 +1528,7 @@ class OandaTradingEngine:
 
                     # Get current price to calculate profit
                     try:
-                        current_price_data = self.get_current_price(symbol)
+                        current_price_data = await self.get_current_price_async(symbol, price_snapshot)
                         if not current_price_data:
                             continue
                         current_price = current_price_data['ask'] if direction == 'BUY' else current_price_data['bid']
@@ -1386,7 +1626,7 @@ class OandaTradingEngine:
 
                         # Attempt to cancel TP order(s) associated with this OCO
                         try:
-                            cancel_resp = self.oanda.cancel_order(order_id)
+                            cancel_resp = await self._broker('cancel_order', order_id)
 
                             log_narration(
                                 event_type="TP_CANCEL_ATTEMPT",
@@ -1401,7 +1641,7 @@ class OandaTradingEngine:
                             )
 
                             # Find open trades for this symbol and set an initial trailing stop
-                            trades = self.oanda.get_trades()
+                            trades = await self._broker('get_trades')
                             for t in trades:
                                 trade_instrument = t.get('instrument') or t.get('symbol')
                                 trade_id = t.get('id') or t.get('tradeID') or t.get('trade_id')
@@ -1432,7 +1672,7 @@ class OandaTradingEngine:
                                         # Fallback: use existing stop_loss
                                         adaptive_sl = pos.get('stop_loss')
                                     
-                                    set_resp = self.oanda.set_trade_stop(trade_id, adaptive_sl)
+                                    set_resp = await self._broker('set_trade_stop', trade_id, adaptive_sl)
 
                                     log_narration(
                                         event_type="TRAILING_SL_SET",
@@ -1532,9 +1772,7 @@ class OandaTradingEngine:
             if position['symbol'] in self.active_pairs:
                 self.active_pairs.discard(position['symbol'])
                 # Update global tracker
-                global_pairs = self._load_global_active_pairs()
-                global_pairs.discard(position['symbol'])
-                self._save_global_active_pairs(global_pairs)
+                self._release_global_pair(position['symbol'])
                 self.display.info(f"✅ Pair {position['symbol']} removed from active pairs ({len(self.active_pairs)}/{self.max_pairs_per_platform})", "", Colors.BRIGHT_CYAN)
             
             # ========================================================================
@@ -1584,6 +1822,12 @@ class OandaTradingEngine:
         last_police_sweep = time.time()  # Track last Position Police sweep
         police_sweep_interval = 900  # 15 minutes (M15 charter compliance)
         
+        # Start streaming quote cache for all scanned pairs
+        if self.stream_prices and self.price_stream is None:
+            self.price_stream = get_price_stream(self.oanda, self.trading_pairs)
+            self.oanda.price_stream = self.price_stream
+            self.display.success(f"✅ Price stream started ({len(self.trading_pairs)} pairs)")
+        
         # Start TradeManager background task
         trade_manager_task = asyncio.create_task(self.trade_manager_loop())
         
@@ -1594,7 +1838,7 @@ class OandaTradingEngine:
                 if current_time - last_police_sweep >= police_sweep_interval:
                     try:
                         self.display.info("🚓 Position Police sweep starting...")
-                        _rbz_force_min_notional_position_police()
+                        await self._run_blocking(_rbz_force_min_notional_position_police)
                         last_police_sweep = current_time
                         self.display.success("✅ Position Police sweep complete")
                     except Exception as e:
@@ -1605,28 +1849,29 @@ class OandaTradingEngine:
                 
                 # Place new trade if we have less than 3 active positions
                 if len(self.active_positions) < 3:
-                    # Deterministic signal scan across configured pairs
+                    # Concurrent signal scan across configured pairs, best confidence wins
                     symbol = None
                     direction = None
-                    for _candidate in self.trading_pairs:
-                        try:
-                            candles = self.oanda.get_historical_data(_candidate, count=120, granularity="M15")
-                            sig, conf = generate_signal(_candidate, candles)  # returns ("BUY"/"SELL", confidence) or (None, 0)
-                        except Exception as e:
-                            self.display.error(f"Signal error for {_candidate}: {e}")
-                            continue
-                        if sig in ("BUY","SELL"):
-                            symbol = _candidate
-                            direction = sig
-                            self.display.success(f"✓ Signal: {symbol} {direction} (confidence: {conf:.1%})")
-                            break
+                    ranked = await self.scan_signals(self.trading_pairs)
+                    if ranked:
+                        best = ranked[0]
+                        symbol = best['symbol']
+                        direction = best['signal']
+                        self.display.success(
+                            f"✓ Signal: {symbol} {direction} (confidence: {best['confidence']:.1%}, "
+                            f"{len(ranked)} candidate(s), scan {self.last_scan_report['total_ms']:.0f}ms)"
+                        )
                     
                     if not symbol or not direction:
                         self.display.warning("No valid signals across pairs - skipping cycle")
                         await asyncio.sleep(self.min_trade_interval)
                         continue
                     
-                    trade_id = self.place_trade(symbol, direction)
+                    # One pricing request for the chosen pair plus all open positions
+                    price_snapshot = await self._get_cycle_snapshot(
+                        [symbol] + [pos['symbol'] for pos in list(self.active_positions.values())]
+                    )
+                    trade_id = await self._run_blocking(self.place_trade, symbol, direction, price_snapshot)
                     
                     if trade_id:
                         trade_count += 1
@@ -1654,6 +1899,15 @@ class OandaTradingEngine:
             trade_manager_task.cancel()
         except Exception:
             pass
+        if self.async_oanda:
+            await self.async_oanda.close()
+        if self.price_stream:
+            self.price_stream.stop()
+            self.oanda.price_stream = None
+            self.price_stream = None
+        if self.pair_leases is not None:
+            self.pair_leases.close()
+        flush_logs()
 
 
 async def main():
@@ -1665,6 +1919,10 @@ async def main():
                        choices=['practice', 'live'], 
                        default='practice',
                        help='Trading environment (practice=demo, live=real money)')
+    parser.add_argument('--async-broker', action='store_true',
+                       help='Use non-blocking aiohttp broker I/O inside the trading loops')
+    parser.add_argument('--stream-prices', action='store_true',
+                       help='Read quotes from the OANDA pricing stream cache instead of polling')
     
     args = parser.parse_args()
     
@@ -1679,7 +1937,8 @@ async def main():
             return
         print("\n✅ Live trading confirmed. Initializing engine...\n")
     
-    engine = OandaTradingEngine(environment=args.env)
+    engine = OandaTradingEngine(environment=args.env, async_broker=args.async_broker,
+                                stream_prices=args.stream_prices)
     await engine.run_trading_loop()
 
 
@@ -1708,6 +1967,7 @@ def _rbz_usd_notional(instrument: str, units: float, price: float) -> float:
 def _rbz_fetch_price(sess, acct: str, inst: str, tok: str):
     import requests
     try:
+        get_rate_limiter("oanda").acquire(RequestPriority.PRICING)
         r = sess.get(
             f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/pricing",
             headers={"Authorization": f"Bearer {tok}"},
@@ -1737,7 +1997,11 @@ def _rbz_force_min_notional_position_police():
     violations_found = 0
     violations_closed = 0
     
+    # Sweep shares the OANDA request scheduler with the engine's connector
+    limiter = get_rate_limiter("oanda")
+    
     # 1) fetch open positions
+    limiter.acquire(RequestPriority.ACCOUNT)
     r = s.get(
         f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/openPositions",
         headers={"Authorization": f"Bearer {tok}"}, timeout=7,
@@ -1789,6 +2053,7 @@ def _rbz_force_min_notional_position_police():
             # Close entire side
             side = "long" if net > 0 else "short"
             payload = {"longUnits":"ALL"} if side=="long" else {"shortUnits":"ALL"}
+            limiter.acquire(RequestPriority.ORDER)
             close_response = s.put(
                 f"https://api-fxpractice.oanda.com/v3/accounts/{acct}/positions/{inst}/close",
                 headers={"Authorization": f"Bearer {tok}", "Content-Type":"application/json"},
@@ -1,44 +1,175 @@
 import asyncio
 import orjson
 import datetime
+import os
 from collections import deque
-from typing import AsyncIterator
+from typing import AsyncIterator, Dict, Optional, Tuple
+
+# Event types where only the latest value per symbol matters to a lagging client
+COALESCE_TYPES = {"quote", "price", "tick", "heartbeat"}
+
+POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+class SubscriberLagged(Exception):
+    """Raised to a `disconnect`-policy subscriber whose queue overflowed; resume from its last seq"""
+
+
+class _Subscriber:
+    """Bounded per-client queue of (seq, line, key) with an overflow policy"""
+
+    def __init__(self, maxsize: int, policy: str):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown bus policy {policy!r}; expected one of {POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._order: deque = deque()      # seqs in delivery order (may hold superseded seqs)
+        self._entries: Dict[int, Tuple[bytes, Optional[str]]] = {}
+        self._latest: Dict[str, int] = {}  # coalesce key -> pending seq
+        self._ready = asyncio.Event()
+        self.lagged = False
+        self.dropped = 0
+        self.coalesced = 0
+
+    def push(self, seq: int, line: bytes, key: Optional[str], force: bool = False):
+        if self.lagged:
+            return
+        if self.policy == "coalesce" and key is not None:
+            old = self._latest.pop(key, None)
+            if old is not None and self._entries.pop(old, None) is not None:
+                self.coalesced += 1
+        if len(self._entries) >= self.maxsize and not force:
+            if self.policy == "disconnect":
+                self.lagged = True
+                self._ready.set()
+                return
+            self._drop_oldest()
+        self._order.append(seq)
+        self._entries[seq] = (line, key)
+        if key is not None:
+            self._latest[key] = seq
+        if len(self._order) > 2 * max(self.maxsize, len(self._entries)):
+            self._compact()
+        self._ready.set()
+
+    def _compact(self):
+        """Forget superseded seqs so a stalled client's queue stays bounded under coalescing"""
+        self._order = deque(seq for seq in self._order if seq in self._entries)
+
+    def _drop_oldest(self):
+        while self._order:
+            seq = self._order.popleft()
+            entry = self._entries.pop(seq, None)
+            if entry is not None:
+                if entry[1] is not None and self._latest.get(entry[1]) == seq:
+                    del self._latest[entry[1]]
+                self.dropped += 1
+                return
+
+    async def get(self) -> Tuple[int, bytes]:
+        while True:
+            while self._order:
+                seq = self._order.popleft()
+                entry = self._entries.pop(seq, None)
+                if entry is None:
+                    continue  # superseded by a newer value for the same key
+                if entry[1] is not None and self._latest.get(entry[1]) == seq:
+                    del self._latest[entry[1]]
+                return seq, entry[0]
+            if self.lagged:
+                raise SubscriberLagged()
+            self._ready.clear()
+            await self._ready.wait()
+
 
 class InMemBus:
-    def __init__(self):
+    def __init__(self, maxlen: int = 10_000, queue_size: int = 1_000, policy: str = "coalesce"):
+        # Ring index: event seq s lives at slot s % maxlen while s > last_seq - maxlen
+        self._ring = [None] * maxlen
+        self._maxlen = maxlen
+        self._seq = 0
         self._subs = set()
-        self._buf = deque(maxlen=10_000)
-
-    async def publish(self, line: bytes):
-        self._buf.append(line)
-        dead = set()
-        for q in list(self._subs):
-            try:
-                q.put_nowait(line)
-            except Exception:
-                dead.add(q)
-        self._subs -= dead
-
-    async def subscribe(self) -> AsyncIterator[bytes]:
-        q: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1_000)
-        self._subs.add(q)
+        self.queue_size = queue_size
+        self.policy = policy
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish_nowait(self, line: bytes, key: Optional[str] = None, seq: Optional[int] = None) -> int:
+        """Append to the ring and fan the same bytes object out to every subscriber"""
+        if seq is None:
+            seq = self.next_seq()
+        self._ring[seq % self._maxlen] = (seq, line, key)
+        for sub in list(self._subs):
+            sub.push(seq, line, key)
+        return seq
+
+    async def publish(self, line: bytes, key: Optional[str] = None) -> int:
+        return self.publish_nowait(line, key)
+
+    def next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def replay(self, after: int = 0, limit: Optional[int] = None):
+        """Events with seq > after still in the ring (oldest first)"""
+        start = max(after + 1, self._seq - self._maxlen + 1, 1)
+        if limit is not None:
+            start = max(start, self._seq - limit + 1)
+        for seq in range(start, self._seq + 1):
+            entry = self._ring[seq % self._maxlen]
+            if entry is not None and entry[0] == seq:
+                yield entry
+
+    async def subscribe(self, after: Optional[int] = None, policy: Optional[str] = None,
+                        replay: int = 200) -> AsyncIterator[Tuple[int, bytes]]:
+        """
+        Yield (seq, line). With `after`, resume from that seq (everything still in the
+        ring); otherwise start with the last `replay` events.
+        """
+        sub = _Subscriber(self.queue_size, policy or self.policy)
+        for seq, line, key in self.replay(after or 0, None if after is not None else replay):
+            sub.push(seq, line, key, force=True)  # a resume may exceed the live queue bound
+        self._subs.add(sub)
         try:
-            # Send last 200 events to new subscribers
-            for line in list(self._buf)[-200:]:
-                await q.put(line)
             while True:
-                yield await q.get()
+                yield await sub.get()
         finally:
-            self._subs.discard(q)
+            self._subs.discard(sub)
+
+    def stats(self) -> dict:
+        return {
+            "last_seq": self._seq,
+            "subscribers": len(self._subs),
+            "dropped": sum(s.dropped for s in self._subs),
+            "coalesced": sum(s.coalesced for s in self._subs),
+        }
+
+_bus = InMemBus(policy=os.getenv("ARENA_BUS_POLICY", "coalesce"))
 
-_bus = InMemBus()
+def coalesce_key(ev: dict) -> Optional[str]:
+    if ev.get("type") in COALESCE_TYPES:
+        return f"{ev.get('source')}:{ev.get('type')}:{ev.get('symbol')}"
+    return None
 
-async def bus_publish(ev: dict):
-    """Publish event to all subscribers"""
+async def bus_publish(ev: dict) -> int:
+    """Publish event to all subscribers; returns its sequence number (the caller's dict is not modified)"""
+    ev = dict(ev)
     ev.setdefault("ts", datetime.datetime.utcnow().isoformat() + "Z")
-    await _bus.publish(orjson.dumps(ev))
+    seq = ev["seq"] = _bus.next_seq()
+    return _bus.publish_nowait(orjson.dumps(ev), coalesce_key(ev), seq=seq)
 
-async def bus_subscriber() -> AsyncIterator[bytes]:
-    """Subscribe to event stream"""
-    async for line in _bus.subscribe():
+async def bus_subscriber(after: Optional[int] = None, policy: Optional[str] = None) -> AsyncIterator[bytes]:
+    """Subscribe to event stream (resume with after=<last seen seq>)"""
+    async for _seq, line in _bus.subscribe(after=after, policy=policy):
         yield line
+
+async def bus_subscriber_seq(after: Optional[int] = None,
+                             policy: Optional[str] = None) -> AsyncIterator[Tuple[int, bytes]]:
+    """Subscribe to event stream as (seq, line) pairs"""
+    async for item in _bus.subscribe(after=after, policy=policy):
+        yield item
+
+def bus_stats() -> dict:
+    return _bus.stats()
@@ -0,0 +1,107 @@
+"""
+App-lifetime httpx client pool for broker routers.
+
+One keep-alive AsyncClient per upstream, created on startup and closed on
+shutdown, so proxied calls skip the TCP/TLS handshake. HTTP/2 is enabled
+when the `h2` package is installed. Every client carries the upstream's
+rate-limit hook and a trace hook that counts new vs reused connections.
+"""
+import importlib.util
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+
+import httpx
+
+from app.core.ratelimit import rate_limited
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# timeout seconds, max connections, max keep-alive connections
+# override with ARENA_POOL_<NAME>="timeout:max_conn:max_keepalive"
+UPSTREAMS: Dict[str, Tuple[float, int, int]] = {
+    "oanda": (10.0, 20, 10),
+    "coinbase": (10.0, 10, 5),
+    "coinbase_adv": (10.0, 10, 5),
+    "openalgo": (30.0, 10, 5),
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _limits(name: str) -> Tuple[float, int, int]:
+    raw = os.getenv(f"ARENA_POOL_{name.upper()}")
+    if raw:
+        timeout, max_conn, keepalive = raw.split(":")
+        return float(timeout), int(max_conn), int(keepalive)
+    return UPSTREAMS.get(name, (10.0, 10, 5))
+
+
+def _stat_hooks(name: str) -> Dict:
+    stats = _stats.setdefault(name, {"requests": 0, "new_connections": 0, "errors": 0})
+
+    async def _trace(event: str, info: Dict):
+        # httpcore only emits connect_tcp on a fresh connection
+        if event == "connection.connect_tcp.complete":
+            stats["new_connections"] += 1
+
+    async def _on_request(request: httpx.Request):
+        stats["requests"] += 1
+        request.extensions["trace"] = _trace
+
+    async def _on_response(response: httpx.Response):
+        if response.status_code >= 500:
+            stats["errors"] += 1
+
+    return {"request": [_on_request], "response": [_on_response]}
+
+
+def _create(name: str) -> httpx.AsyncClient:
+    timeout, max_conn, keepalive = _limits(name)
+    hooks = _stat_hooks(name)
+    hooks["request"] = rate_limited(name)["request"] + hooks["request"]
+    return httpx.AsyncClient(
+        timeout=timeout,
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=max_conn, max_keepalive_connections=keepalive),
+        event_hooks=hooks,
+    )
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Shared client for an upstream (created lazily if startup has not run)"""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _create(name)
+    return client
+
+
+@asynccontextmanager
+async def upstream(name: str):
+    """`async with upstream("coinbase") as c:` - borrows the shared client without closing it"""
+    yield get_client(name)
+
+
+async def startup_clients():
+    for name in UPSTREAMS:
+        get_client(name)
+
+
+async def shutdown_clients():
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+
+
+def pool_stats() -> Dict:
+    out = {"http2": HTTP2_AVAILABLE, "upstreams": {}}
+    for name, s in _stats.items():
+        reused = max(s["requests"] - s["new_connections"], 0)
+        out["upstreams"][name] = {
+            **s,
+            "reused_connections": reused,
+            "reuse_rate": round(reused / s["requests"], 3) if s["requests"] else 0.0,
+            "open": name in _clients and not _clients[name].is_closed,
+        }
+    return out
@@ -0,0 +1,152 @@
+"""
+Per-upstream request scheduler for broker routers.
+
+Token bucket with strict priority classes (order placement/cancel > stop
+modification > pricing > candles > account polling), applied to outgoing
+httpx requests through a request event hook. Mirrors the engine-side
+brokers/rate_limiter.py; the gateway ships as its own service, so it keeps
+an asyncio-only copy.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from enum import IntEnum
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+class RequestPriority(IntEnum):
+    ORDER = 0
+    STOP = 1
+    PRICING = 2
+    CANDLES = 3
+    ACCOUNT = 4
+
+
+class AsyncPriorityLimiter:
+    """Token bucket; waiting requests are served by (priority, arrival)"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, reserve: float = 1.0, name: str = "upstream"):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(rate, 1.0))
+        # Tokens below `reserve` are only spent by ORDER/STOP requests
+        self.reserve = min(float(reserve), self.capacity - 1.0) if self.capacity > 1 else 0.0
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._waiters = []
+        self._seq = itertools.count()
+        self._metrics = {p: {"acquired": 0, "queued": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0}
+                         for p in RequestPriority}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.ACCOUNT) -> float:
+        start = time.monotonic()
+        ticket = (int(priority), next(self._seq))
+        heapq.heappush(self._waiters, ticket)
+        needed = 1.0 + (0.0 if priority <= RequestPriority.STOP else self.reserve)
+        queued = False
+        try:
+            while True:
+                self._refill()
+                if self._waiters[0] == ticket and self._tokens >= needed:
+                    heapq.heappop(self._waiters)
+                    self._tokens -= 1.0
+                    break
+                queued = True
+                deficit = max(needed - self._tokens, 0.0) + (0.0 if self._waiters[0] == ticket else 1.0)
+                await asyncio.sleep(min(max(deficit / self.rate, 0.001), 0.05))
+        except asyncio.CancelledError:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+            raise
+
+        waited_ms = (time.monotonic() - start) * 1000
+        m = self._metrics[priority]
+        m["acquired"] += 1
+        m["queued"] += int(queued)
+        m["total_wait_ms"] += waited_ms
+        m["max_wait_ms"] = max(m["max_wait_ms"], waited_ms)
+        return waited_ms / 1000
+
+    def metrics(self) -> Dict:
+        self._refill()
+        depth = {p.name: 0 for p in RequestPriority}
+        for prio, _ in self._waiters:
+            depth[RequestPriority(prio).name] += 1
+        return {
+            "rate_per_sec": self.rate,
+            "burst": self.capacity,
+            "tokens_available": round(self._tokens, 2),
+            "queue_depth": len(self._waiters),
+            "classes": {
+                p.name: {
+                    "acquired": m["acquired"],
+                    "queued": m["queued"],
+                    "queue_depth": depth[p.name],
+                    "avg_wait_ms": round(m["total_wait_ms"] / m["acquired"], 2) if m["acquired"] else 0.0,
+                    "max_wait_ms": round(m["max_wait_ms"], 2),
+                }
+                for p, m in self._metrics.items()
+            },
+        }
+
+
+# requests/sec, burst per upstream; override with ARENA_RATE_LIMIT_<NAME>="rate[:burst]"
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "oanda": (50.0, 50.0),
+    "coinbase": (10.0, 10.0),
+    "coinbase_adv": (25.0, 25.0),
+    "openalgo": (10.0, 10.0),
+}
+
+_limiters: Dict[str, AsyncPriorityLimiter] = {}
+
+
+def get_limiter(name: str) -> AsyncPriorityLimiter:
+    limiter = _limiters.get(name)
+    if limiter is None:
+        raw = os.getenv(f"ARENA_RATE_LIMIT_{name.upper()}")
+        if raw:
+            rate, _, burst = raw.partition(":")
+            rate, burst = float(rate), float(burst or rate)
+        else:
+            rate, burst = DEFAULT_LIMITS.get(name, (10.0, 10.0))
+        limiter = _limiters[name] = AsyncPriorityLimiter(rate, burst, name=name)
+    return limiter
+
+
+def classify(request: httpx.Request) -> RequestPriority:
+    """Priority class for an outgoing broker request"""
+    path = request.url.path
+    if request.method != "GET":
+        if "/trades/" in path and path.endswith("/orders"):
+            return RequestPriority.STOP
+        return RequestPriority.ORDER
+    if any(k in path for k in ("/prices", "/pricing", "/ticker", "/book", "/best_bid_ask")):
+        return RequestPriority.PRICING
+    if "candles" in path:
+        return RequestPriority.CANDLES
+    return RequestPriority.ACCOUNT
+
+
+def rate_limited(name: str) -> Dict:
+    """httpx event_hooks that route every request through the upstream's limiter"""
+    limiter = get_limiter(name)
+
+    async def _hook(request: httpx.Request):
+        await limiter.acquire(classify(request))
+
+    return {"request": [_hook]}
+
+
+def limiter_metrics() -> Dict[str, Dict]:
+    return {name: limiter.metrics() for name, limiter in _limiters.items()}
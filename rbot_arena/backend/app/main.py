@@ -1,9 +1,12 @@
 import os
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import StreamingResponse
+from typing import Optional
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.core.bus import bus_publish, bus_subscriber
+from app.core.bus import bus_publish, bus_subscriber_seq, bus_stats, SubscriberLagged, POLICIES
+from app.core.ratelimit import limiter_metrics
+from app.core.http_pool import startup_clients, shutdown_clients, pool_stats
 from app.routers import auth_router, orders, llm_router, openalgo
 from app.routers import brokers_oanda, brokers_coinbase, brokers_coinbase_advanced, brokers_oanda_orders
 
@@ -37,30 +40,50 @@ async def health():
         "ok": True,
         "paper": os.getenv("PAPER_MODE", "true"),
         "exec": os.getenv("EXECUTION_ENABLED", "false"),
-        "oanda_env": os.getenv("OANDA_ENV", "practice")
+        "oanda_env": os.getenv("OANDA_ENV", "practice"),
+        "rate_limits": limiter_metrics(),
+        "http_pool": pool_stats(),
+        "bus": bus_stats()
     }
 
 @app.get("/events")
-async def sse():
-    """Server-Sent Events stream for all events"""
+async def sse(since: Optional[int] = None, policy: Optional[str] = None,
+              last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events stream for all events (resumes from Last-Event-ID or ?since=seq)"""
+    if policy is not None and policy not in POLICIES:
+        raise HTTPException(status_code=400, detail=f"unknown policy {policy!r}; expected one of {POLICIES}")
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else since
     async def gen():
-        async for line in bus_subscriber():
-            yield b"data: " + line + b"\n\n"
+        try:
+            async for seq, line in bus_subscriber_seq(after=after, policy=policy):
+                yield b"id: %d\ndata: " % seq + line + b"\n\n"
+        except SubscriberLagged:
+            return  # EventSource reconnects with Last-Event-ID
     return StreamingResponse(gen(), media_type="text/event-stream")
 
 @app.websocket("/ws")
-async def ws(websocket: WebSocket):
-    """WebSocket stream for all events"""
+async def ws(websocket: WebSocket, since: Optional[int] = None, policy: Optional[str] = None):
+    """WebSocket stream for all events (resume with ?since=<last seq>)"""
+    if policy is not None and policy not in POLICIES:
+        detail = f"unknown policy {policy!r}; expected one of {POLICIES}"
+        if "websocket.http.response" in websocket.scope.get("extensions", {}):
+            await websocket.send_denial_response(JSONResponse({"detail": detail}, status_code=400))
+        else:
+            await websocket.close(code=1008, reason=detail)
+        return
     await websocket.accept()
     try:
-        async for line in bus_subscriber():
+        async for _seq, line in bus_subscriber_seq(after=since, policy=policy):
             await websocket.send_bytes(line)
+    except SubscriberLagged:
+        await websocket.close(code=1013)  # try again later, resuming from the last seq seen
     except WebSocketDisconnect:
         return
 
 @app.on_event("startup")
 async def startup():
-    """Emit startup event"""
+    """Open upstream client pool and emit startup event"""
+    await startup_clients()
     await bus_publish({
         "source": "arena",
         "type": "heartbeat",
@@ -69,3 +92,8 @@ async def startup():
             "mode": os.getenv("PAPER_MODE", "true")
         }
     })
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close upstream client pool"""
+    await shutdown_clients()
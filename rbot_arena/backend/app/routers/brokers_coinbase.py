@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 import os
 import httpx
 from app.auth.jwt import require_role
+from app.core.http_pool import upstream
 
 router = APIRouter(prefix="/brokers/coinbase", tags=["coinbase"])
 
@@ -11,7 +12,7 @@ COINBASE_ADV_BASE = os.getenv("COINBASE_ADV_BASE", "https://api.exchange.coinbas
 @router.get("/status")
 async def status(_user=Depends(require_role("viewer"))):
     try:
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("coinbase") as c:
             r = await c.get(f"{COINBASE_ADV_BASE}/products")
             r.raise_for_status()
             # Return a small subset: product count and a few symbols
@@ -27,7 +28,7 @@ async def status(_user=Depends(require_role("viewer"))):
 @router.get("/book")
 async def order_book(product_id: str = Query("BTC-USD"), level: int = Query(1), _user=Depends(require_role("viewer"))):
     try:
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("coinbase") as c:
             r = await c.get(f"{COINBASE_ADV_BASE}/products/{product_id}/book", params={"level": level})
             r.raise_for_status()
             return r.json()
@@ -22,6 +22,7 @@ import hashlib
 import time
 import json
 from app.auth.jwt import require_role
+from app.core.http_pool import upstream
 from app.core.bus import bus_publish
 
 router = APIRouter(prefix="/brokers/coinbase-adv", tags=["coinbase_advanced"])
@@ -79,7 +80,7 @@ async def get_accounts(_user=Depends(require_role("viewer"))):
     try:
         path = "/api/v1/accounts"
         headers = _sign_request("GET", path)
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("coinbase_adv") as c:
             r = await c.get(f"{COINBASE_ADV_BASE}{path}", headers=headers)
             r.raise_for_status()
             accounts = r.json()
@@ -168,7 +169,7 @@ async def place_order(
         headers = _sign_request("POST", path, body_str)
         headers["Content-Type"] = "application/json"
         
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("coinbase_adv") as c:
             r = await c.post(f"{COINBASE_ADV_BASE}{path}", content=body_str, headers=headers)
             r.raise_for_status()
             result = r.json()
@@ -202,7 +203,7 @@ async def list_orders(_user=Depends(require_role("viewer"))):
         try:
             path = "/api/v1/orders?order_status=OPEN"
             headers = _sign_request("GET", path)
-            async with httpx.AsyncClient(timeout=10) as c:
+            async with upstream("coinbase_adv") as c:
                 r = await c.get(f"{COINBASE_ADV_BASE}{path}", headers=headers)
                 r.raise_for_status()
                 return r.json()
@@ -239,7 +240,7 @@ async def cancel_order(
     try:
         path = f"/api/v1/orders/{order_id}"
         headers = _sign_request("DELETE", path)
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("coinbase_adv") as c:
             r = await c.delete(f"{COINBASE_ADV_BASE}{path}", headers=headers)
             r.raise_for_status()
             await bus_publish({
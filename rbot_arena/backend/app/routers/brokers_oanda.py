@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, Header
 import os
 import httpx
 from app.auth.jwt import require_role
+from app.core.http_pool import upstream
 
 router = APIRouter(prefix="/brokers/oanda", tags=["oanda"])
 
@@ -20,7 +21,7 @@ async def get_prices(
     url = f"{MARKET_API}/oanda/prices/{path}"
     headers = {"X-PIN": LIVE_PIN} if path == "live" else {}
     try:
-        async with httpx.AsyncClient(timeout=10) as c:
+        async with upstream("oanda") as c:
             r = await c.get(url, params={"instrument": instrument}, headers=headers)
             r.raise_for_status()
             return r.json()
@@ -43,11 +44,12 @@ async def get_candles(
     url = f"{MARKET_API}/oanda/candles/{path}"
     headers = {"X-PIN": LIVE_PIN} if path == "live" else {}
     try:
-        async with httpx.AsyncClient(timeout=15) as c:
+        async with upstream("oanda") as c:
             r = await c.get(
                 url,
                 params={"instrument": instrument, "granularity": granularity, "count": count},
                 headers=headers,
+                timeout=15,
             )
             r.raise_for_status()
             return r.json()
@@ -3,6 +3,7 @@ import httpx
 from fastapi import APIRouter, HTTPException, Depends
 from app.core.bus import bus_publish
 from app.auth.jwt import require_role
+from app.core.http_pool import upstream
 
 router = APIRouter(prefix="/oa", tags=["openalgo"])
 OA = os.getenv("OPENALGO_HOST", "http://127.0.0.1:5000")
@@ -17,7 +18,7 @@ def hdr():
 
 async def fwd(method: str, path: str, **kw):
     """Forward request to OpenAlgo"""
-    async with httpx.AsyncClient(timeout=30) as c:
+    async with upstream("openalgo") as c:
         r = await c.request(method, OA + path, headers=hdr(), **kw)
         if r.status_code >= 400:
             raise HTTPException(r.status_code, r.text)
@@ -7,6 +7,7 @@ PIN: 841921 | Phase 14
 
 import json
 import os
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
@@ -16,6 +17,12 @@ from dataclasses import dataclass, asdict
 import threading
 import math
 
+try:
+    from util.state_store import IncrementalStateStore
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from util.state_store import IncrementalStateStore
+
 @dataclass
 class PositionSizeResult:
     """
@@ -48,8 +55,14 @@ class DynamicSizing:
     - Provides psychological risk controls
     """
     
-    def __init__(self, pin: int = 841921, account_balance: float = 100000.0):
-        """Initialize Dynamic Sizing with PIN authentication"""
+    def __init__(self, pin: int = 841921, account_balance: float = 100000.0,
+                 state_file: Optional[str] = None):
+        """
+        Initialize Dynamic Sizing with PIN authentication
+        
+        Args:
+            state_file: Optional base path for persisting trade history across restarts
+        """
         if pin != 841921:
             raise ValueError("Invalid PIN for Dynamic Sizing")
         
@@ -76,6 +89,48 @@ class DynamicSizing:
         
         self.logger = logging.getLogger(f"DynamicSizing_{pin}")
         self.logger.info(f"Dynamic Sizing initialized with ${account_balance:,.2f} account balance")
+        
+        # Optional persistence: snapshot + delta log of the Kelly trade history
+        self.state: Optional[IncrementalStateStore] = None
+        if state_file:
+            self.state = IncrementalStateStore(os.path.splitext(state_file)[0], lock=self.lock)
+            self._load_state()
+            self.state.attach(self._snapshot_state)
+    
+    def _load_state(self):
+        """
+        ENGINEER: Restore trade history from the latest snapshot plus deltas
+        """
+        snapshot, deltas = self.state.load()
+        if snapshot is not None:
+            tables, _ = snapshot
+            for row in tables.get('trades', []):
+                symbol = row.pop('symbol')
+                self.performance_history.setdefault(symbol, []).append(row)
+        replayed = 0
+        for delta in deltas:
+            if delta['op'] == 'trade':
+                self.performance_history.setdefault(delta['symbol'], []).append(delta['record'])
+                replayed += 1
+        for symbol in self.performance_history:
+            self.performance_history[symbol] = self.performance_history[symbol][-100:]
+        if snapshot is not None or replayed:
+            self.logger.info(f"Loaded trade history for {len(self.performance_history)} symbols ({replayed} deltas replayed)")
+    
+    def _snapshot_state(self):
+        """
+        ENGINEER: Full state for compaction (called by the state store under self.lock)
+        """
+        trades = [
+            {'symbol': symbol, **trade}
+            for symbol, symbol_trades in self.performance_history.items() for trade in symbol_trades
+        ]
+        return {'trades': trades}, {}
+    
+    def save_now(self):
+        """Force a snapshot of the trade history (no-op without state_file)"""
+        if self.state is not None:
+            self.state.snapshot()
     
     def update_account_balance(self, new_balance: float):
         """
@@ -107,6 +162,8 @@ class DynamicSizing:
                 }
                 
                 self.performance_history[symbol].append(trade_record)
+                if self.state is not None:
+                    self.state.record('trade', symbol=symbol, record=trade_record)
                 
                 # Keep only recent trades (last 100 per symbol)
                 if len(self.performance_history[symbol]) > 100:
@@ -434,9 +491,10 @@ class DynamicSizing:
         except Exception as e:
             self.logger.error(f"Risk parameter adjustment failed: {e}")
 
-def get_dynamic_sizing(pin: int = 841921, account_balance: float = 100000.0) -> DynamicSizing:
+def get_dynamic_sizing(pin: int = 841921, account_balance: float = 100000.0,
+                       state_file: Optional[str] = None) -> DynamicSizing:
     """Convenience function to get Dynamic Sizing instance"""
-    return DynamicSizing(pin=pin, account_balance=account_balance)
+    return DynamicSizing(pin=pin, account_balance=account_balance, state_file=state_file)
 
 # Example usage
 if __name__ == "__main__":
@@ -33,6 +33,11 @@ except ImportError:
     ALERTING_AVAILABLE = False
     print("⚠️  Phase 22 alerting system not available - using fallback logging")
 
+try:
+    from util.event_store import record_event
+except ImportError:
+    record_event = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -322,6 +327,8 @@ class OCOValidator:
             
             with open(self.log_file, 'a') as f:
                 f.write(json.dumps(log_entry) + '\n')
+            if record_event is not None:
+                record_event("oco", log_entry)
                 
         except Exception as e:
             logger.error(f"Failed to log validation result: {e}")
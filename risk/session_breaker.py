@@ -35,6 +35,11 @@ except ImportError:
     ALERTING_AVAILABLE = False
     print("⚠️  Phase 22 alerting system not available - using fallback logging")
 
+try:
+    from util.event_store import record_event
+except ImportError:
+    record_event = None
+
 import logging
 
 # Configure logging
@@ -313,6 +318,8 @@ class SessionBreakerEngine:
             
             with open(self.breaker_log_file, 'a') as f:
                 f.write(json.dumps(log_entry) + '\n')
+            if record_event is not None:
+                record_event("breaker", log_entry)
             
             logger.info(f"Breaker event logged to {self.breaker_log_file}")
             
@@ -9,10 +9,12 @@ from __future__ import annotations
 
 import uuid
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Sequence
 
+import numpy as np
 import pandas as pd
 
+from brokers.candle_decode import closes as decode_closes
 from signals import features
 from utils.logger import get_logger
 
@@ -66,30 +68,32 @@ class SignalEngine:
         signals: List[TradeSignal] = []
 
         # --- Coinbase signals ---
+        symbols, closes = [], []
         for symbol in self.COINBASE_INSTRUMENTS:
             try:
                 candles = self._coinbase.get_candles(symbol, granularity="ONE_HOUR", limit=50)
                 close = _candles_to_close(candles, source="coinbase")
                 if close.empty:
                     continue
-                signal = self._score_coinbase(symbol, close)
-                if signal is not None:
-                    signals.append(signal)
+                symbols.append(symbol)
+                closes.append(close)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("coinbase_signal_error", symbol=symbol, error=str(exc))
+        signals.extend(self._score_batch("coinbase", symbols, closes))
 
         # --- OANDA signals ---
+        symbols, closes = [], []
         for instrument in self.OANDA_INSTRUMENTS:
             try:
                 candles = self._oanda.get_candles(instrument, granularity="H1", count=50)
                 close = _candles_to_close(candles, source="oanda")
                 if close.empty:
                     continue
-                signal = self._score_oanda(instrument, close)
-                if signal is not None:
-                    signals.append(signal)
+                symbols.append(instrument)
+                closes.append(close)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("oanda_signal_error", instrument=instrument, error=str(exc))
+        signals.extend(self._score_batch("oanda", symbols, closes))
 
         logger.info("signals_generated", count=len(signals))
         return signals
@@ -98,41 +102,35 @@ class SignalEngine:
     # Private scoring helpers
     # ------------------------------------------------------------------
 
+    def _score_batch(
+        self, broker: str, symbols: Sequence[str], closes: Sequence[pd.Series]
+    ) -> List[TradeSignal]:
+        """Score every instrument of one broker in a single vectorized pass."""
+        if not symbols:
+            return []
+        matrix, counts = features.close_matrix(closes)
+        mom = features.momentum_batch(matrix, counts, window=14)
+        trend = features.trend_direction_batch(matrix, counts, fast=10, slow=30)
+        confidence = combine_scores_batch(mom, trend)
+
+        notional = min(100.0, self._settings.max_total_exposure_usd * 0.1)
+        signals: List[TradeSignal] = []
+        for i in np.flatnonzero(confidence >= self._settings.min_confidence):
+            signals.append(TradeSignal(
+                broker=broker,
+                symbol=symbols[i],
+                side="buy" if trend[i] >= 0 else "sell",
+                confidence=float(confidence[i]),
+                notional_usd=notional,
+                units=1000.0 if broker == "oanda" else 0.0,  # 1 micro-lot as a safe default
+            ))
+        return signals
+
     def _score_coinbase(self, symbol: str, close: pd.Series) -> TradeSignal | None:
-        mom = features.momentum(close, window=14)
-        trend = features.trend_direction(close, fast=10, slow=30)
-        confidence = _combine_scores(mom, trend)
-
-        if confidence < self._settings.min_confidence:
-            return None
-
-        side = "buy" if trend >= 0 else "sell"
-        return TradeSignal(
-            broker="coinbase",
-            symbol=symbol,
-            side=side,
-            confidence=confidence,
-            notional_usd=min(100.0, self._settings.max_total_exposure_usd * 0.1),
-        )
+        return next(iter(self._score_batch("coinbase", [symbol], [close])), None)
 
     def _score_oanda(self, instrument: str, close: pd.Series) -> TradeSignal | None:
-        mom = features.momentum(close, window=14)
-        trend = features.trend_direction(close, fast=10, slow=30)
-        confidence = _combine_scores(mom, trend)
-
-        if confidence < self._settings.min_confidence:
-            return None
-
-        side = "buy" if trend >= 0 else "sell"
-        units = 1000.0  # 1 micro-lot as a safe default
-        return TradeSignal(
-            broker="oanda",
-            symbol=instrument,
-            side=side,
-            confidence=confidence,
-            notional_usd=min(100.0, self._settings.max_total_exposure_usd * 0.1),
-            units=units,
-        )
+        return next(iter(self._score_batch("oanda", [instrument], [close])), None)
 
 
 # ---------------------------------------------------------------------------
@@ -142,21 +140,27 @@ class SignalEngine:
 
 def _candles_to_close(candles: list, source: str) -> pd.Series:
     """Convert raw candle dicts to a pandas Series of closing prices."""
+    if source == "oanda":
+        # Columnar decode; candles without a usable mid close are dropped
+        close = decode_closes(candles)
+        return pd.Series(close[~np.isnan(close)], dtype=float)
     closes: list[float] = []
     for c in candles:
         try:
-            if source == "coinbase":
-                closes.append(float(c["close"]))
-            else:  # oanda
-                closes.append(float(c["mid"]["c"]))
+            closes.append(float(c["close"]))
         except (KeyError, TypeError, ValueError):
             continue
     return pd.Series(closes, dtype=float)
 
 
-def _combine_scores(momentum_score: float, trend_score: float) -> float:
-    """Combine momentum and trend into a 0–1 confidence score."""
+def combine_scores_batch(momentum_score: np.ndarray, trend_score: np.ndarray) -> np.ndarray:
+    """Combine momentum and trend arrays into 0–1 confidence scores."""
     # Normalize momentum to 0–1 range (cap at ±10 %)
-    normalized_mom = max(-1.0, min(1.0, momentum_score / 0.10))
+    normalized_mom = np.clip(np.asarray(momentum_score, dtype=float) / 0.10, -1.0, 1.0)
     raw = (normalized_mom + trend_score) / 2.0  # -1 to +1
     return (raw + 1.0) / 2.0  # shift to 0–1
+
+
+def _combine_scores(momentum_score: float, trend_score: float) -> float:
+    """Combine momentum and trend into a 0–1 confidence score."""
+    return float(combine_scores_batch(np.array([momentum_score]), np.array([trend_score]))[0])
@@ -3,18 +3,78 @@ signals/features.py – cross-market feature generation.
 
 Each function receives a pandas DataFrame with columns
 [open, high, low, close, volume] and returns a scalar feature value.
+
+The *_batch variants take a (symbols x bars) close matrix built by
+close_matrix() and return one value per row in a single NumPy pass; the
+scalar functions are thin wrappers over them.
 """
 
 from __future__ import annotations
 
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
 import pandas as pd
 
 
+def close_matrix(closes: Sequence[Sequence[float]], bars: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack close series into a right-aligned (symbols x bars) matrix.
+
+    Row i ends with the latest close of closes[i]; shorter histories are
+    left-padded with NaN. Returns (matrix, counts of real closes per row).
+    """
+    arrays = [np.asarray(c, dtype=float) for c in closes]
+    if bars is None:
+        bars = max((len(a) for a in arrays), default=0)
+    matrix = np.full((len(arrays), bars), np.nan)
+    counts = np.zeros(len(arrays), dtype=np.int64)
+    for i, values in enumerate(arrays):
+        tail = values[max(len(values) - bars, 0):]
+        if len(tail):
+            matrix[i, bars - len(tail):] = tail
+        counts[i] = len(tail)
+    return matrix, counts
+
+
+def _counts(close: np.ndarray, counts: Optional[np.ndarray]) -> np.ndarray:
+    if counts is None:
+        return np.count_nonzero(~np.isnan(close), axis=1)
+    return np.asarray(counts)
+
+
+def momentum_batch(close: np.ndarray, counts: Optional[np.ndarray] = None, window: int = 14) -> np.ndarray:
+    """Per-row rate-of-change momentum over *window* periods (0.0 for short rows)."""
+    counts = _counts(close, counts)
+    if close.shape[1] < window + 1:
+        return np.zeros(len(close))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mom = close[:, -1] / close[:, -window - 1] - 1.0
+    return np.where(counts >= window + 1, mom, 0.0)
+
+
+def sma_batch(close: np.ndarray, counts: Optional[np.ndarray] = None, window: int = 20) -> np.ndarray:
+    """Per-row mean of the last *window* closes (mean of all closes for short rows)."""
+    counts = _counts(close, counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.nan_to_num(close[:, -window:]).sum(axis=1) / np.minimum(counts, window)
+
+
+def trend_direction_batch(close: np.ndarray, counts: Optional[np.ndarray] = None,
+                          fast: int = 10, slow: int = 30) -> np.ndarray:
+    """Per-row +1.0 / -1.0 / 0.0 SMA-crossover trend (0.0 for rows shorter than *slow*)."""
+    counts = _counts(close, counts)
+    trend = np.sign(sma_batch(close, counts, fast) - sma_batch(close, counts, slow))
+    return np.where(counts >= slow, trend, 0.0)
+
+
+def _row(close: pd.Series) -> np.ndarray:
+    return np.asarray(close, dtype=float).reshape(1, -1)
+
+
 def momentum(close: pd.Series, window: int = 14) -> float:
     """Rate-of-change momentum over *window* periods (0.0 = flat)."""
-    if len(close) < window + 1:
-        return 0.0
-    return float((close.iloc[-1] / close.iloc[-window - 1]) - 1.0)
+    return float(momentum_batch(_row(close), window=window)[0])
 
 
 def rolling_correlation(series_a: pd.Series, series_b: pd.Series, window: int = 20) -> float:
@@ -32,19 +92,9 @@ def rolling_correlation(series_a: pd.Series, series_b: pd.Series, window: int =
 
 def simple_moving_average(close: pd.Series, window: int = 20) -> float:
     """Simple moving average of the last *window* closes."""
-    if len(close) < window:
-        return float(close.mean())
-    return float(close.rolling(window).mean().iloc[-1])
+    return float(sma_batch(_row(close), window=window)[0])
 
 
 def trend_direction(close: pd.Series, fast: int = 10, slow: int = 30) -> float:
     """Returns +1.0 (uptrend), -1.0 (downtrend), or 0.0 (neutral) based on SMA crossover."""
-    if len(close) < slow:
-        return 0.0
-    fast_sma = simple_moving_average(close, fast)
-    slow_sma = simple_moving_average(close, slow)
-    if fast_sma > slow_sma:
-        return 1.0
-    if fast_sma < slow_sma:
-        return -1.0
-    return 0.0
+    return float(trend_direction_batch(_row(close), fast=fast, slow=slow)[0])
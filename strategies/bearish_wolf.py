@@ -11,6 +11,14 @@ from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime, timezone
 
+try:
+    from .indicator_engine import compute, indicators_for
+except ImportError:
+    try:
+        from strategies.indicator_engine import compute, indicators_for
+    except ImportError:
+        from indicator_engine import compute, indicators_for
+
 class BearishWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for bear markets
@@ -56,17 +64,11 @@ class BearishWolf:
         self.logger.info("Bearish Wolf Pack Strategy initialized - Bear regime active")
     
     def calculate_rsi(self, prices: pd.Series, period: int = None) -> pd.Series:
-        """Calculate Relative Strength Index"""
+        """Calculate Relative Strength Index (Wilder smoothing)"""
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(compute('rsi', prices, params=(period,)), index=prices.index)
     
     def calculate_macd(self, prices: pd.Series, fast: int = None, slow: int = None, signal: int = None) -> Dict[str, pd.Series]:
         """Calculate MACD line, signal line, and histogram"""
@@ -77,22 +79,18 @@ class BearishWolf:
         if signal is None:
             signal = self.macd_signal
             
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd = compute('macd', prices, params=(fast, slow, signal))
         
         return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': pd.Series(macd[:, 0], index=prices.index),
+            'signal': pd.Series(macd[:, 1], index=prices.index),
+            'histogram': pd.Series(macd[:, 2], index=prices.index)
         }
     
     def calculate_sma(self, prices: pd.Series, period: int) -> pd.Series:
         """Calculate Simple Moving Average"""
-        return prices.rolling(window=period).mean()
+        return pd.Series(compute('rolling', prices, params=(period,), column='mean'),
+                         index=getattr(prices, 'index', None))
     
     def analyze_rsi_signal(self, rsi: pd.Series) -> Dict[str, Any]:
         """
@@ -103,8 +101,9 @@ class BearishWolf:
         - RSI <30 = potential dead cat bounce
         - Bearish divergence = weakness confirmation
         """
-        current_rsi = rsi.iloc[-1]
-        prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
+        rsi = np.asarray(rsi, dtype=float)
+        current_rsi = rsi[-1]
+        prev_rsi = rsi[-2] if len(rsi) > 1 else current_rsi
         
         signals = []
         score = 0
@@ -155,13 +154,14 @@ class BearishWolf:
         - Bearish crossover = sell signal
         - Both lines below zero = strong bear
         """
-        current_macd = macd['macd'].iloc[-1]
-        current_signal = macd['signal'].iloc[-1]
-        current_hist = macd['histogram'].iloc[-1]
+        macd = {k: np.asarray(v, dtype=float) for k, v in macd.items()}
+        current_macd = macd['macd'][-1]
+        current_signal = macd['signal'][-1]
+        current_hist = macd['histogram'][-1]
         
-        prev_macd = macd['macd'].iloc[-2] if len(macd['macd']) > 1 else current_macd
-        prev_signal = macd['signal'].iloc[-2] if len(macd['signal']) > 1 else current_signal
-        prev_hist = macd['histogram'].iloc[-2] if len(macd['histogram']) > 1 else current_hist
+        prev_macd = macd['macd'][-2] if len(macd['macd']) > 1 else current_macd
+        prev_signal = macd['signal'][-2] if len(macd['signal']) > 1 else current_signal
+        prev_hist = macd['histogram'][-2] if len(macd['histogram']) > 1 else current_hist
         
         signals = []
         score = 0
@@ -206,7 +206,7 @@ class BearishWolf:
             'momentum': 'BEARISH' if current_macd < current_signal else 'BULLISH'
         }
     
-    def analyze_sma_signal(self, price: pd.Series) -> Dict[str, Any]:
+    def analyze_sma_signal(self, price: pd.Series, smas: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
         """
         TRADER_PSYCH: SMA resistance analysis for bear regime
         Bear market SMA characteristics:
@@ -214,17 +214,26 @@ class BearishWolf:
         - SMA resistance at rallies = sell opportunity
         - SMA crossover down = trend confirmation
         - Failed breakout above SMA = weakness
+        
+        smas: Precomputed 'short'/'long' SMA histories (computed from price if omitted)
         """
         if len(price) < max(self.sma_short, self.sma_long):
             return {'signals': [], 'score': 0}
         
-        current_price = price.iloc[-1]
-        sma_short = self.calculate_sma(price, self.sma_short).iloc[-1]
-        sma_long = self.calculate_sma(price, self.sma_long).iloc[-1]
+        if smas is None:
+            smas = {'short': self.calculate_sma(price, self.sma_short),
+                    'long': self.calculate_sma(price, self.sma_long)}
+        price = np.asarray(price, dtype=float)
+        short_smas = np.asarray(smas['short'], dtype=float)
+        long_smas = np.asarray(smas['long'], dtype=float)
+        
+        current_price = price[-1]
+        sma_short = short_smas[-1]
+        sma_long = long_smas[-1]
         
-        prev_price = price.iloc[-2] if len(price) > 1 else current_price
-        prev_sma_short = self.calculate_sma(price, self.sma_short).iloc[-2]
-        prev_sma_long = self.calculate_sma(price, self.sma_long).iloc[-2]
+        prev_price = price[-2] if len(price) > 1 else current_price
+        prev_sma_short = short_smas[-2]
+        prev_sma_long = long_smas[-2]
         
         signals = []
         score = 0
@@ -282,16 +291,18 @@ class BearishWolf:
         - Above average volume on breakdowns
         - Low volume on bounces (weak rallies)
         """
+        volume = np.asarray(volume, dtype=float)
+        price = np.asarray(price, dtype=float)
         if len(volume) < self.volume_ma_period:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
-        current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        current_volume = volume[-1]
+        volume_ma = volume[-self.volume_ma_period:].mean()
         volume_ratio = current_volume / volume_ma
         
         # Price movement for volume confirmation
-        current_price = price.iloc[-1]
-        prev_price = price.iloc[-2] if len(price) > 1 else current_price
+        current_price = price[-1]
+        prev_price = price[-2] if len(price) > 1 else current_price
         price_change_pct = (current_price - prev_price) / prev_price * 100
         
         signals = []
@@ -316,8 +327,8 @@ class BearishWolf:
                 score += 0.2
         
         # Volume trend analysis (declining volume = bear market characteristic)
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        recent_volume_avg = volume[-5:].mean()
+        older_volume_avg = volume[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
         
         if recent_volume_avg < older_volume_avg * 0.9:
             signals.append("VOLUME_TREND_DOWN")
@@ -347,12 +358,19 @@ class BearishWolf:
         
         return min(total_score, 1.0)
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], symbol: Optional[str] = None,
+                              timeframe: str = "M15") -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'volume' price series
+            symbol: Instrument; when given, indicators come from the shared
+                incremental engine and only bars not seen before are computed.
+                New bars are recognised by time, so the series need a time
+                index (or data['time']); positional data (RangeIndex, plain
+                arrays) is computed one-shot over the window with a warning
+            timeframe: Granularity of the bars (part of the shared state key)
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
@@ -368,7 +386,6 @@ class BearishWolf:
                     raise ValueError(f"Missing required data: {key}")
             
             close_prices = data['close']
-            volume_data = data['volume']
             
             if len(close_prices) < max(self.rsi_period, self.sma_long, self.macd_slow):
                 return {
@@ -379,17 +396,22 @@ class BearishWolf:
                     'regime': self.regime
                 }
             
-            current_price = close_prices.iloc[-1]
+            # Indicator state (shared across packs and updated per bar when symbol is given)
+            indicators = indicators_for(data, symbol, timeframe)
+            closes = indicators.field('close')
+            current_price = closes[-1]
             
             # Calculate all technical indicators
-            rsi = self.calculate_rsi(close_prices)
-            macd = self.calculate_macd(close_prices)
+            rsi = indicators.rsi(self.rsi_period).values()
+            macd = indicators.macd(self.macd_fast, self.macd_slow, self.macd_signal).as_dict()
+            smas = {'short': indicators.rolling(self.sma_short).values(column='mean'),
+                    'long': indicators.rolling(self.sma_long).values(column='mean')}
             
             # Analyze each indicator
             rsi_analysis = self.analyze_rsi_signal(rsi)
             macd_analysis = self.analyze_macd_signal(macd)
-            sma_analysis = self.analyze_sma_signal(close_prices)
-            volume_analysis = self.analyze_volume_signal(volume_data, close_prices)
+            sma_analysis = self.analyze_sma_signal(closes, smas)
+            volume_analysis = self.analyze_volume_signal(indicators.field('volume'), closes)
             
             # Compile indicator results
             indicator_results = {
@@ -425,7 +447,7 @@ class BearishWolf:
                 'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
                 'technical_data': {
                     'current_price': current_price,
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
+                    'rsi': rsi[-1] if len(rsi) else None,
                     'macd_histogram': macd_analysis.get('histogram'),
                     'sma_short': sma_analysis.get('sma_short'),
                     'sma_long': sma_analysis.get('sma_long'),
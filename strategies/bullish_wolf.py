@@ -11,6 +11,14 @@ from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime, timezone
 
+try:
+    from .indicator_engine import compute, indicators_for
+except ImportError:
+    try:
+        from strategies.indicator_engine import compute, indicators_for
+    except ImportError:
+        from indicator_engine import compute, indicators_for
+
 class BullishWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for bull markets
@@ -56,17 +64,11 @@ class BullishWolf:
         self.logger.info("Bullish Wolf Pack Strategy initialized - Bull regime active")
     
     def calculate_rsi(self, prices: pd.Series, period: int = None) -> pd.Series:
-        """Calculate Relative Strength Index"""
+        """Calculate Relative Strength Index (Wilder smoothing)"""
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(compute('rsi', prices, params=(period,)), index=prices.index)
     
     def calculate_bollinger_bands(self, prices: pd.Series, period: int = None, std: float = None) -> Dict[str, pd.Series]:
         """Calculate Bollinger Bands"""
@@ -75,8 +77,9 @@ class BullishWolf:
         if std is None:
             std = self.bb_std
             
-        sma = prices.rolling(window=period).mean()
-        rolling_std = prices.rolling(window=period).std()
+        bands = compute('rolling', prices, params=(period,))
+        sma = pd.Series(bands[:, 0], index=prices.index)
+        rolling_std = pd.Series(bands[:, 1], index=prices.index)
         
         return {
             'upper': sma + (rolling_std * std),
@@ -93,17 +96,12 @@ class BullishWolf:
         if signal is None:
             signal = self.macd_signal
             
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        
-        macd_line = ema_fast - ema_slow
-        signal_line = macd_line.ewm(span=signal).mean()
-        histogram = macd_line - signal_line
+        macd = compute('macd', prices, params=(fast, slow, signal))
         
         return {
-            'macd': macd_line,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': pd.Series(macd[:, 0], index=prices.index),
+            'signal': pd.Series(macd[:, 1], index=prices.index),
+            'histogram': pd.Series(macd[:, 2], index=prices.index)
         }
     
     def analyze_rsi_signal(self, rsi: pd.Series) -> Dict[str, Any]:
@@ -114,8 +112,9 @@ class BullishWolf:
         - RSI <30 = oversold bounce opportunity  
         - RSI >80 = overbought caution
         """
-        current_rsi = rsi.iloc[-1]
-        prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
+        rsi = np.asarray(rsi, dtype=float)
+        current_rsi = rsi[-1]
+        prev_rsi = rsi[-2] if len(rsi) > 1 else current_rsi
         
         signals = []
         score = 0
@@ -155,9 +154,10 @@ class BullishWolf:
         - Upper band breakout = continuation signal
         - Lower band bounce = buy opportunity
         """
-        current_upper = bb['upper'].iloc[-1]
-        current_middle = bb['middle'].iloc[-1]  
-        current_lower = bb['lower'].iloc[-1]
+        bb = {k: np.asarray(v, dtype=float) for k, v in bb.items()}
+        current_upper = bb['upper'][-1]
+        current_middle = bb['middle'][-1]  
+        current_lower = bb['lower'][-1]
         
         signals = []
         score = 0
@@ -207,13 +207,14 @@ class BullishWolf:
         - Positive histogram = momentum building
         - Bullish crossover = entry signal
         """
-        current_macd = macd['macd'].iloc[-1]
-        current_signal = macd['signal'].iloc[-1]
-        current_hist = macd['histogram'].iloc[-1]
+        macd = {k: np.asarray(v, dtype=float) for k, v in macd.items()}
+        current_macd = macd['macd'][-1]
+        current_signal = macd['signal'][-1]
+        current_hist = macd['histogram'][-1]
         
-        prev_macd = macd['macd'].iloc[-2] if len(macd['macd']) > 1 else current_macd
-        prev_signal = macd['signal'].iloc[-2] if len(macd['signal']) > 1 else current_signal
-        prev_hist = macd['histogram'].iloc[-2] if len(macd['histogram']) > 1 else current_hist
+        prev_macd = macd['macd'][-2] if len(macd['macd']) > 1 else current_macd
+        prev_signal = macd['signal'][-2] if len(macd['signal']) > 1 else current_signal
+        prev_hist = macd['histogram'][-2] if len(macd['histogram']) > 1 else current_hist
         
         signals = []
         score = 0
@@ -261,16 +262,18 @@ class BullishWolf:
         - Above average volume on breakouts
         - Volume dries up on pullbacks
         """
+        volume = np.asarray(volume, dtype=float)
+        price = np.asarray(price, dtype=float)
         if len(volume) < self.volume_ma_period:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
-        current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        current_volume = volume[-1]
+        volume_ma = volume[-self.volume_ma_period:].mean()
         volume_ratio = current_volume / volume_ma
         
         # Price movement for volume confirmation
-        current_price = price.iloc[-1]
-        prev_price = price.iloc[-2] if len(price) > 1 else current_price
+        current_price = price[-1]
+        prev_price = price[-2] if len(price) > 1 else current_price
         price_change_pct = (current_price - prev_price) / prev_price * 100
         
         signals = []
@@ -292,8 +295,8 @@ class BullishWolf:
             score += 0.3
         
         # Volume trend analysis
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        recent_volume_avg = volume[-5:].mean()
+        older_volume_avg = volume[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
         
         if recent_volume_avg > older_volume_avg * 1.1:
             signals.append("VOLUME_TREND_UP")
@@ -323,12 +326,19 @@ class BullishWolf:
         
         return min(total_score, 1.0)
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], symbol: Optional[str] = None,
+                              timeframe: str = "M15") -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'volume' price series
+            symbol: Instrument; when given, indicators come from the shared
+                incremental engine and only bars not seen before are computed.
+                New bars are recognised by time, so the series need a time
+                index (or data['time']); positional data (RangeIndex, plain
+                arrays) is computed one-shot over the window with a warning
+            timeframe: Granularity of the bars (part of the shared state key)
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
@@ -344,7 +354,6 @@ class BullishWolf:
                     raise ValueError(f"Missing required data: {key}")
             
             close_prices = data['close']
-            volume_data = data['volume']
             
             if len(close_prices) < max(self.rsi_period, self.bb_period, self.macd_slow):
                 return {
@@ -355,18 +364,21 @@ class BullishWolf:
                     'regime': self.regime
                 }
             
-            current_price = close_prices.iloc[-1]
+            # Indicator state (shared across packs and updated per bar when symbol is given)
+            indicators = indicators_for(data, symbol, timeframe)
+            closes = indicators.field('close')
+            current_price = closes[-1]
             
             # Calculate all technical indicators
-            rsi = self.calculate_rsi(close_prices)
-            bollinger = self.calculate_bollinger_bands(close_prices)
-            macd = self.calculate_macd(close_prices)
+            rsi = indicators.rsi(self.rsi_period).values()
+            bollinger = indicators.bollinger(self.bb_period, self.bb_std)
+            macd = indicators.macd(self.macd_fast, self.macd_slow, self.macd_signal).as_dict()
             
             # Analyze each indicator
             rsi_analysis = self.analyze_rsi_signal(rsi)
             bb_analysis = self.analyze_bollinger_signal(current_price, bollinger)
             macd_analysis = self.analyze_macd_signal(macd)
-            volume_analysis = self.analyze_volume_signal(volume_data, close_prices)
+            volume_analysis = self.analyze_volume_signal(indicators.field('volume'), closes)
             
             # Compile indicator results
             indicator_results = {
@@ -402,7 +414,7 @@ class BullishWolf:
                 'indicator_scores': {k: v.get('score', 0) for k, v in indicator_results.items()},
                 'technical_data': {
                     'current_price': current_price,
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
+                    'rsi': rsi[-1] if len(rsi) else None,
                     'bb_position': bb_analysis.get('position'),
                     'macd_histogram': macd_analysis.get('histogram'),
                     'volume_ratio': volume_analysis.get('volume_ratio')
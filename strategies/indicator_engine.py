@@ -0,0 +1,579 @@
+#!/usr/bin/env python3
+"""
+Incremental Indicator Engine - RBOTzilla UNI
+O(1)-per-bar rolling state for the wolf-pack indicators, kept per
+(symbol, timeframe) and per (indicator, source, params): Wilder RSI,
+EMA/MACD, rolling mean/std (SMA, Bollinger, volume MA) and ATR.
+A new bar updates every registered indicator in a few scalar operations
+instead of recomputing the whole lookback with pandas, and all packs
+analysing the same symbol share one state. Latest values are plain floats;
+history is exposed as NumPy views over a fixed-capacity ring.
+PIN: 841921
+"""
+
+import math
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = int(os.getenv("RICK_INDICATOR_HISTORY", "500"))
+
+# Rolling sums are recomputed from the window this often to cancel float drift
+_RESYNC_EVERY = 1024
+
+Number = Union[float, Tuple[float, ...]]
+
+
+class RingHistory:
+    """Fixed-capacity history whose latest values are always one contiguous view
+
+    Rows are written into a buffer twice the capacity; when it fills up, the
+    last capacity-1 rows are moved to the front, so appends are amortized O(1)
+    and view() never copies.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, columns: int = 1):
+        self.capacity = max(int(capacity), 2)
+        self.columns = columns
+        self._buf = np.full((2 * self.capacity, columns), np.nan)
+        self._end = 0
+
+    def __len__(self) -> int:
+        return min(self._end, self.capacity)
+
+    def append(self, row):
+        if self._end == len(self._buf):
+            keep = self.capacity - 1
+            self._buf[:keep] = self._buf[self._end - keep:self._end]
+            self._end = keep
+        self._buf[self._end] = row
+        self._end += 1
+
+    def replace_last(self, row):
+        if self._end:
+            self._buf[self._end - 1] = row
+        else:
+            self.append(row)
+
+    def clear(self):
+        self._end = 0
+
+    def view(self, n: Optional[int] = None, column: Optional[int] = None) -> np.ndarray:
+        """Last n rows (default: all retained); valid until the next append"""
+        size = len(self)
+        if n is not None:
+            size = min(size, n)
+        rows = self._buf[self._end - size:self._end]
+        if column is not None:
+            return rows[:, column]
+        return rows[:, 0] if self.columns == 1 else rows
+
+
+class Indicator:
+    """Base class: subclasses implement _step() over scalar state
+
+    update() appends one output row per bar. amend() re-applies the last bar
+    with revised inputs (an in-progress candle whose close moved) by rolling
+    the state back to before that bar first.
+    """
+
+    columns: Tuple[str, ...] = ("value",)
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.history = RingHistory(capacity, len(self.columns))
+        self.count = 0
+        self._undo = None
+
+    def _get_state(self) -> Tuple:
+        raise NotImplementedError
+
+    def _set_state(self, state: Tuple):
+        raise NotImplementedError
+
+    def _step(self, *inputs) -> Number:
+        raise NotImplementedError
+
+    def update(self, *inputs) -> Number:
+        self._undo = self._get_state()
+        out = self._step(*inputs)
+        self.history.append(out)
+        self.count += 1
+        return out
+
+    def amend(self, *inputs) -> Number:
+        if self._undo is None:
+            return self.update(*inputs)
+        self._set_state(self._undo)
+        out = self._step(*inputs)
+        self.history.replace_last(out)
+        return out
+
+    @property
+    def value(self) -> Number:
+        """Latest output (NaN while warming up)"""
+        if not self.count:
+            return math.nan if len(self.columns) == 1 else (math.nan,) * len(self.columns)
+        row = self.history.view(1)
+        return float(row[0]) if len(self.columns) == 1 else tuple(float(v) for v in row[0])
+
+    def values(self, n: Optional[int] = None, column: Optional[str] = None) -> np.ndarray:
+        """History view (oldest first); column selects one output of a multi-column indicator"""
+        index = self.columns.index(column) if column is not None else None
+        return self.history.view(n, index)
+
+    def as_dict(self, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """History view per output column"""
+        return {name: self.history.view(n, i) for i, name in enumerate(self.columns)}
+
+    @property
+    def ready(self) -> bool:
+        value = self.value
+        return not math.isnan(value if isinstance(value, float) else value[-1])
+
+
+class EMA(Indicator):
+    """Exponential moving average, alpha = 2 / (period + 1), seeded with the first value"""
+
+    def __init__(self, period: int, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._ema = math.nan
+
+    def _get_state(self):
+        return (self._ema,)
+
+    def _set_state(self, state):
+        (self._ema,) = state
+
+    def _step(self, x):
+        ema = self._ema
+        self._ema = x if ema != ema else ema + self.alpha * (x - ema)
+        return self._ema
+
+
+class MACD(Indicator):
+    """MACD line, signal line and histogram from three EMAs"""
+
+    columns = ("macd", "signal", "histogram")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self._fast = EMA(fast, 2)
+        self._slow = EMA(slow, 2)
+        self._signal = EMA(signal, 2)
+
+    def _get_state(self):
+        return (self._fast._ema, self._slow._ema, self._signal._ema)
+
+    def _set_state(self, state):
+        self._fast._ema, self._slow._ema, self._signal._ema = state
+
+    def _step(self, x):
+        line = self._fast._step(x) - self._slow._step(x)
+        signal = self._signal._step(line)
+        return (line, signal, line - signal)
+
+
+class WilderRSI(Indicator):
+    """Relative Strength Index with Wilder smoothing
+
+    The first average gain/loss is the simple mean of the first `period`
+    price changes; after that avg = (avg * (period - 1) + change) / period.
+    """
+
+    def __init__(self, period: int = 14, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self.period = period
+        self._prev = math.nan
+        self._gain = 0.0
+        self._loss = 0.0
+        self._changes = 0
+
+    def _get_state(self):
+        return (self._prev, self._gain, self._loss, self._changes)
+
+    def _set_state(self, state):
+        self._prev, self._gain, self._loss, self._changes = state
+
+    def _step(self, x):
+        prev, self._prev = self._prev, x
+        if prev != prev:
+            return math.nan
+        change = x - prev
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        period = self.period
+        self._changes += 1
+        if self._changes <= period:
+            # Seeding: accumulate sums, convert to the simple average at `period`
+            self._gain += gain
+            self._loss += loss
+            if self._changes < period:
+                return math.nan
+            self._gain /= period
+            self._loss /= period
+        else:
+            self._gain = (self._gain * (period - 1) + gain) / period
+            self._loss = (self._loss * (period - 1) + loss) / period
+        if self._loss == 0:
+            return 100.0 if self._gain > 0 else 50.0
+        return 100.0 - 100.0 / (1.0 + self._gain / self._loss)
+
+
+class RollingMeanStd(Indicator):
+    """Simple moving average and sample standard deviation (ddof=1) over a window
+
+    Sums are kept relative to the first value seen so prices like 1.1 do not
+    lose precision to cancellation, and are recomputed from the window
+    every _RESYNC_EVERY bars.
+    """
+
+    columns = ("mean", "std")
+
+    def __init__(self, period: int, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self.period = period
+        self._window = np.zeros(period)
+        self._pos = 0
+        self._n = 0
+        self._shift = math.nan
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._since_resync = 0
+
+    def _get_state(self):
+        return (self._pos, self._n, self._shift, self._sum, self._sumsq, self._since_resync,
+                float(self._window[self._pos]))
+
+    def _set_state(self, state):
+        self._pos, self._n, self._shift, self._sum, self._sumsq, self._since_resync, evicted = state
+        self._window[self._pos] = evicted
+
+    def _step(self, x):
+        if self._shift != self._shift:
+            self._shift = x
+        d = x - self._shift
+        period = self.period
+        if self._n == period:
+            old = self._window[self._pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self._n += 1
+        self._window[self._pos] = d
+        self._pos = (self._pos + 1) % period
+        self._sum += d
+        self._sumsq += d * d
+        self._since_resync += 1
+        if self._since_resync >= _RESYNC_EVERY:
+            window = self._window[:self._n]
+            self._sum = float(window.sum())
+            self._sumsq = float(np.dot(window, window))
+            self._since_resync = 0
+        if self._n < period:
+            return (math.nan, math.nan)
+        mean = self._sum / period
+        var = (self._sumsq - self._sum * mean) / (period - 1) if period > 1 else 0.0
+        return (self._shift + mean, math.sqrt(var) if var > 0 else 0.0)
+
+
+class ATR(Indicator):
+    """Average True Range: rolling mean of the true range over `period` bars"""
+
+    def __init__(self, period: int = 14, capacity: int = DEFAULT_CAPACITY):
+        super().__init__(capacity)
+        self.period = period
+        self._prev_close = math.nan
+        self._mean = RollingMeanStd(period, 2)
+
+    def _get_state(self):
+        return (self._prev_close,) + self._mean._get_state()
+
+    def _set_state(self, state):
+        self._prev_close = state[0]
+        self._mean._set_state(state[1:])
+
+    def _step(self, high, low, close):
+        prev, self._prev_close = self._prev_close, close
+        true_range = high - low
+        if prev == prev:
+            true_range = max(true_range, abs(high - prev), abs(low - prev))
+        return self._mean._step(true_range)[0]
+
+
+# Indicator kind -> (class, bar fields it consumes)
+INDICATORS: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "ema": (EMA, ("close",)),
+    "macd": (MACD, ("close",)),
+    "rsi": (WilderRSI, ("close",)),
+    "rolling": (RollingMeanStd, ("close",)),
+    "atr": (ATR, ("high", "low", "close")),
+}
+
+BAR_FIELDS = ("close", "high", "low", "volume")
+
+
+class SeriesIndicators:
+    """Bars and registered indicators for one (symbol, timeframe)"""
+
+    def __init__(self, symbol: str = "", timeframe: str = "", capacity: int = DEFAULT_CAPACITY):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.capacity = capacity
+        self.bars = RingHistory(capacity, len(BAR_FIELDS))
+        self.last_time: Any = None
+        self.bar_count = 0
+        self.indicators: Dict[Tuple, Tuple[Indicator, Tuple[int, ...]]] = {}
+        self.lock = threading.RLock()
+
+    def indicator(self, kind: str, *params, source: Optional[str] = None) -> Indicator:
+        """Get or register an indicator; a new one is warmed up from the retained bars"""
+        cls, fields = INDICATORS[kind]
+        if source is not None:
+            fields = (source,)
+        key = (kind, fields, params)
+        with self.lock:
+            entry = self.indicators.get(key)
+            if entry is None:
+                ind = cls(*params, capacity=self.capacity)
+                columns = tuple(BAR_FIELDS.index(f) for f in fields)
+                for row in self.bars.view(None):
+                    ind.update(*(float(row[c]) for c in columns))
+                entry = self.indicators[key] = (ind, columns)
+            return entry[0]
+
+    def ema(self, period: int, source: str = "close") -> EMA:
+        return self.indicator("ema", period, source=source)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9) -> MACD:
+        return self.indicator("macd", fast, slow, signal)
+
+    def rsi(self, period: int = 14) -> WilderRSI:
+        return self.indicator("rsi", period)
+
+    def rolling(self, period: int, source: str = "close") -> RollingMeanStd:
+        return self.indicator("rolling", period, source=source)
+
+    def atr(self, period: int = 14) -> ATR:
+        return self.indicator("atr", period)
+
+    def bollinger(self, period: int = 20, num_std: float = 2.0, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Bollinger bands (upper, middle, lower, width) from the shared rolling mean/std"""
+        bands = self.rolling(period)
+        middle = bands.values(n, "mean")
+        spread = bands.values(n, "std") * num_std
+        return {"upper": middle + spread, "middle": middle, "lower": middle - spread, "width": 2 * spread}
+
+    def field(self, name: str, n: Optional[int] = None) -> np.ndarray:
+        """History view of one bar field: close, high, low or volume"""
+        return self.bars.view(n, BAR_FIELDS.index(name))
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0, time: Any = None) -> bool:
+        """
+        Apply one bar to every registered indicator
+
+        A bar with the same time as the last one replaces it (the in-progress
+        candle moved); otherwise it is appended. Returns True for a new bar.
+        """
+        row = (close, close if high is None else high, close if low is None else low, volume)
+        with self.lock:
+            amend = time is not None and self.bar_count and time == self.last_time
+            if amend:
+                self.bars.replace_last(row)
+            else:
+                self.bars.append(row)
+                self.bar_count += 1
+                self.last_time = time
+            for ind, columns in self.indicators.values():
+                inputs = [row[c] for c in columns]
+                if amend:
+                    ind.amend(*inputs)
+                else:
+                    ind.update(*inputs)
+        return not amend
+
+    def reset(self):
+        with self.lock:
+            self.bars.clear()
+            self.bar_count = 0
+            self.last_time = None
+            for key, (ind, columns) in list(self.indicators.items()):
+                kind, _, params = key
+                self.indicators[key] = (INDICATORS[kind][0](*params, capacity=self.capacity), columns)
+
+    def sync(self, data: Dict[str, Sequence]) -> int:
+        """
+        Bring the state up to date with a window of bars
+
+        data holds 'close' and optionally 'high', 'low', 'volume' as pandas
+        Series (or arrays), plus bar times as data['time'] or as the index of
+        'close'. Only bars after the last applied one are fed to the
+        indicators, matched by time, and a changed last bar is amended in
+        place. A window that no longer lines up with the state (gap,
+        different history) resets and replays it, and so does every window
+        without bar times (a positional RangeIndex or plain arrays), since
+        positions cannot tell a new bar from the previous one.
+
+        Returns:
+            Number of bars applied
+        """
+        close = data["close"]
+        index = bar_times(data)
+        columns = [_as_array(data.get(name, close if name in ("high", "low") else None), len(close))
+                   for name in BAR_FIELDS]
+        n = len(columns[0])
+        if not n:
+            return 0
+
+        with self.lock:
+            start = 0
+            if index is None:
+                self.reset()
+                index = [None] * n
+            elif self.bar_count:
+                start = _align(index, self.last_time)
+                if start is None:
+                    logger.debug(f"{self.symbol} {self.timeframe}: window does not line up, replaying {n} bars")
+                    self.reset()
+                    start = 0
+                else:
+                    last = self.bars.view(1)[0]
+                    tip = start - 1
+                    if any(columns[c][tip] != last[c] for c in range(len(BAR_FIELDS))):
+                        self.update(*(float(col[tip]) for col in columns), time=self.last_time)
+            for i in range(start, n):
+                self.update(*(float(col[i]) for col in columns), time=index[i])
+            return n - start
+
+
+def bar_times(data: Dict[str, Sequence]):
+    """Bar times of a window: data['time'], else the index of 'close' unless it is positional"""
+    times = data.get("time") if hasattr(data, "get") else None
+    if times is not None:
+        to_numpy = getattr(times, "to_numpy", None)  # a pandas column: index by position, not label
+        return to_numpy() if to_numpy is not None else times
+    index = getattr(data["close"], "index", None)
+    if index is None or type(index).__name__ == "RangeIndex":
+        return None
+    return index
+
+
+def _as_array(values, n: int) -> np.ndarray:
+    if values is None:
+        return np.zeros(n)
+    if isinstance(values, np.ndarray):
+        return values.astype(float, copy=False)
+    to_numpy = getattr(values, "to_numpy", None)  # pandas: avoids np.asarray's protocol probing
+    if to_numpy is not None:
+        return to_numpy(dtype=float, copy=False)
+    return np.asarray(values, dtype=float)
+
+
+def _align(index, last_time) -> Optional[int]:
+    """Position just after last_time in index, or None if last_time is not in it"""
+    n = len(index)
+    try:
+        if index[n - 1] == last_time:
+            return n
+        if hasattr(index, "searchsorted"):
+            pos = int(index.searchsorted(last_time))
+        else:
+            pos = n - 1
+            while pos >= 0 and index[pos] != last_time:
+                pos -= 1
+        if 0 <= pos < n and index[pos] == last_time:
+            return pos + 1
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+class IndicatorEngine:
+    """Shared registry of SeriesIndicators keyed by (symbol, timeframe)"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._series: Dict[Tuple[str, str], SeriesIndicators] = {}
+        self._lock = threading.Lock()
+
+    def series(self, symbol: str, timeframe: str = "M15") -> SeriesIndicators:
+        key = (symbol, timeframe)
+        state = self._series.get(key)
+        if state is None:
+            with self._lock:
+                state = self._series.get(key)
+                if state is None:
+                    state = self._series[key] = SeriesIndicators(symbol, timeframe, self.capacity)
+        return state
+
+    def sync(self, symbol: str, timeframe: str, data: Dict[str, Sequence]) -> SeriesIndicators:
+        state = self.series(symbol, timeframe)
+        state.sync(data)
+        return state
+
+    def update(self, symbol: str, timeframe: str, close: float, high: Optional[float] = None,
+               low: Optional[float] = None, volume: float = 0.0, time: Any = None) -> SeriesIndicators:
+        state = self.series(symbol, timeframe)
+        state.update(close, high, low, volume, time)
+        return state
+
+    def drop(self, symbol: str, timeframe: Optional[str] = None):
+        with self._lock:
+            for key in [k for k in self._series if k[0] == symbol and timeframe in (None, k[1])]:
+                del self._series[key]
+
+    def keys(self):
+        return list(self._series)
+
+
+_engine: Optional[IndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Process-wide engine shared by all wolf packs"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = IndicatorEngine()
+    return _engine
+
+
+_untimed_warned = set()
+
+
+def indicators_for(data: Dict[str, Sequence], symbol: Optional[str] = None,
+                   timeframe: str = "M15") -> SeriesIndicators:
+    """
+    Shared, incrementally updated state for symbol; a one-off state for
+    anonymous data, or for a symbol whose window carries no bar times
+    """
+    if symbol:
+        if bar_times(data) is not None:
+            return get_indicator_engine().sync(symbol, timeframe, data)
+        if (symbol, timeframe) not in _untimed_warned:
+            _untimed_warned.add((symbol, timeframe))
+            logger.warning(f"{symbol} {timeframe}: bars have no time index (pass a DatetimeIndex or "
+                           f"data['time']); computing indicators over the whole window each call")
+    state = SeriesIndicators(capacity=max(len(data["close"]), 2))
+    state.sync(data)
+    return state
+
+
+def compute(kind: str, *inputs, params: Tuple = (), column: Optional[str] = None) -> np.ndarray:
+    """Run one indicator over whole arrays (the batch form of the incremental classes)"""
+    arrays = [np.asarray(x, dtype=float) for x in inputs]
+    n = len(arrays[0])
+    ind = INDICATORS[kind][0](*params, capacity=max(n, 2))
+    for row in zip(*arrays):
+        ind.update(*row)
+    return ind.values(None, column).copy()
@@ -11,6 +11,14 @@ from typing import Dict, List, Any, Optional
 import logging
 from datetime import datetime, timezone
 
+try:
+    from .indicator_engine import compute, indicators_for
+except ImportError:
+    try:
+        from strategies.indicator_engine import compute, indicators_for
+    except ImportError:
+        from indicator_engine import compute, indicators_for
+
 class SidewaysWolf:
     """
     PROF_QUANT (35%): Advanced regime logic and confluence scoring for sideways markets
@@ -65,8 +73,9 @@ class SidewaysWolf:
         if std is None:
             std = self.bb_std
             
-        sma = prices.rolling(window=period).mean()
-        rolling_std = prices.rolling(window=period).std()
+        bands = compute('rolling', prices, params=(period,))
+        sma = pd.Series(bands[:, 0], index=prices.index)
+        rolling_std = pd.Series(bands[:, 1], index=prices.index)
         
         return {
             'upper': sma + (rolling_std * std),
@@ -80,43 +89,30 @@ class SidewaysWolf:
         if period is None:
             period = self.atr_period
         
-        # True Range calculation
-        prev_close = close.shift(1)
-        tr1 = high - low
-        tr2 = abs(high - prev_close)
-        tr3 = abs(low - prev_close)
-        
-        true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        atr = true_range.rolling(window=period).mean()
-        
-        return atr
+        # Rolling mean of the true range
+        return pd.Series(compute('atr', high, low, close, params=(period,)), index=close.index)
     
     def calculate_rsi(self, prices: pd.Series, period: int = None) -> pd.Series:
-        """Calculate Relative Strength Index"""
+        """Calculate Relative Strength Index (Wilder smoothing)"""
         if period is None:
             period = self.rsi_period
             
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return pd.Series(compute('rsi', prices, params=(period,)), index=prices.index)
     
     def detect_support_resistance(self, prices: pd.Series) -> Dict[str, float]:
         """
         PROF_QUANT: Detect support and resistance levels for range identification
         """
+        prices = np.asarray(prices, dtype=float)
         if len(prices) < self.support_resistance_periods:
             return {'support': prices.min(), 'resistance': prices.max(), 'range_pct': 0}
         
         # Use recent data for S/R levels
-        recent_prices = prices.tail(self.support_resistance_periods)
+        recent_prices = prices[-self.support_resistance_periods:]
         
         # Simple support/resistance using rolling min/max
-        support = recent_prices.rolling(window=10).min().min()
-        resistance = recent_prices.rolling(window=10).max().max()
+        support = recent_prices.min()
+        resistance = recent_prices.max()
         
         # Calculate range percentage
         range_pct = (resistance - support) / support if support > 0 else 0
@@ -137,10 +133,11 @@ class SidewaysWolf:
         - Mean reversion opportunities at band extremes
         - Middle band acts as dynamic support/resistance
         """
-        current_upper = bb['upper'].iloc[-1]
-        current_middle = bb['middle'].iloc[-1]  
-        current_lower = bb['lower'].iloc[-1]
-        current_width = bb['width'].iloc[-1]
+        bb = {k: np.asarray(v, dtype=float) for k, v in bb.items()}
+        current_upper = bb['upper'][-1]
+        current_middle = bb['middle'][-1]  
+        current_lower = bb['lower'][-1]
+        current_width = bb['width'][-1]
         
         signals = []
         score = 0
@@ -166,7 +163,7 @@ class SidewaysWolf:
             score += 0.3  # Neutral zone
         
         # Band direction (range vs trend)
-        prev_width = bb['width'].iloc[-2] if len(bb['width']) > 1 else current_width
+        prev_width = bb['width'][-2] if len(bb['width']) > 1 else current_width
         if current_width < prev_width:
             signals.append("BB_CONTRACTING")
             score += 0.2  # Favors range conditions
@@ -194,17 +191,19 @@ class SidewaysWolf:
         - Stable ATR suggests established range
         - ATR expansion warns of potential breakout
         """
+        atr = np.asarray(atr, dtype=float)
+        price = np.asarray(price, dtype=float)
         if len(atr) < 2:
             return {'signals': [], 'score': 0}
         
-        current_atr = atr.iloc[-1]
-        current_price = price.iloc[-1]
+        current_atr = atr[-1]
+        current_price = price[-1]
         
         # ATR as percentage of price
         atr_pct = current_atr / current_price if current_price > 0 else 0
         
         # ATR trend
-        atr_ma = atr.rolling(window=10).mean().iloc[-1] if len(atr) >= 10 else current_atr
+        atr_ma = atr[-10:].mean() if len(atr) >= 10 else current_atr
         atr_trend = current_atr / atr_ma if atr_ma > 0 else 1.0
         
         signals = []
@@ -250,8 +249,9 @@ class SidewaysWolf:
         - Overbought (>70) = sell opportunity
         - RSI 40-60 = neutral range zone
         """
-        current_rsi = rsi.iloc[-1]
-        prev_rsi = rsi.iloc[-2] if len(rsi) > 1 else current_rsi
+        rsi = np.asarray(rsi, dtype=float)
+        current_rsi = rsi[-1]
+        prev_rsi = rsi[-2] if len(rsi) > 1 else current_rsi
         
         signals = []
         score = 0
@@ -287,14 +287,14 @@ class SidewaysWolf:
         
         # RSI reversal patterns
         if len(rsi) >= 3:
-            rsi_3_back = rsi.iloc[-3]
+            rsi_3_back = rsi[-3]
             # RSI double bottom/top patterns
             if (current_rsi < 35 and rsi_3_back < 35 and 
-                current_rsi > prev_rsi and rsi.iloc[-2] > rsi_3_back):
+                current_rsi > prev_rsi and rsi[-2] > rsi_3_back):
                 signals.append("RSI_DOUBLE_BOTTOM")
                 score += 0.4
             elif (current_rsi > 65 and rsi_3_back > 65 and 
-                  current_rsi < prev_rsi and rsi.iloc[-2] < rsi_3_back):
+                  current_rsi < prev_rsi and rsi[-2] < rsi_3_back):
                 signals.append("RSI_DOUBLE_TOP")
                 score += 0.4
         
@@ -313,11 +313,13 @@ class SidewaysWolf:
         - Volume spikes at support/resistance tests
         - Low volume in middle of range
         """
+        volume = np.asarray(volume, dtype=float)
+        price = np.asarray(price, dtype=float)
         if len(volume) < self.volume_ma_period:
             return {'signals': [], 'score': 0, 'volume_ratio': 1.0}
         
-        current_volume = volume.iloc[-1]
-        volume_ma = volume.rolling(window=self.volume_ma_period).mean().iloc[-1]
+        current_volume = volume[-1]
+        volume_ma = volume[-self.volume_ma_period:].mean()
         volume_ratio = current_volume / volume_ma
         
         signals = []
@@ -339,8 +341,8 @@ class SidewaysWolf:
             score += 0.2  # Could be breakout or false breakout
         
         # Volume trend (stable volume favors range)
-        recent_volume_avg = volume.tail(5).mean()
-        older_volume_avg = volume.iloc[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
+        recent_volume_avg = volume[-5:].mean()
+        older_volume_avg = volume[-10:-5].mean() if len(volume) >= 10 else recent_volume_avg
         
         volume_change = (recent_volume_avg - older_volume_avg) / older_volume_avg if older_volume_avg > 0 else 0
         
@@ -404,12 +406,19 @@ class SidewaysWolf:
         
         return 'HOLD'  # No clear direction
     
-    def generate_trade_signal(self, data: Dict[str, pd.Series]) -> Dict[str, Any]:
+    def generate_trade_signal(self, data: Dict[str, pd.Series], symbol: Optional[str] = None,
+                              timeframe: str = "M15") -> Dict[str, Any]:
         """
         MENTOR_BK: Main strategy logic - analyze all indicators and generate trade signal
         
         Args:
             data: Dict containing 'close', 'high', 'low', 'volume' price series
+            symbol: Instrument; when given, indicators come from the shared
+                incremental engine and only bars not seen before are computed.
+                New bars are recognised by time, so the series need a time
+                index (or data['time']); positional data (RangeIndex, plain
+                arrays) is computed one-shot over the window with a warning
+            timeframe: Granularity of the bars (part of the shared state key)
             
         Returns:
             Dict with trade decision, confidence, direction, and analysis details
@@ -425,11 +434,6 @@ class SidewaysWolf:
                     raise ValueError(f"Missing required data: {key}")
             
             close_prices = data['close']
-            volume_data = data['volume']
-            
-            # Use close prices for high/low if not provided
-            high_prices = data.get('high', close_prices)
-            low_prices = data.get('low', close_prices)
             
             if len(close_prices) < max(self.bb_period, self.atr_period, self.rsi_period):
                 return {
@@ -440,19 +444,23 @@ class SidewaysWolf:
                     'regime': self.regime
                 }
             
-            current_price = close_prices.iloc[-1]
+            # Indicator state (shared across packs and updated per bar when symbol is given);
+            # close prices stand in for high/low if they are not provided
+            indicators = indicators_for(data, symbol, timeframe)
+            closes = indicators.field('close')
+            current_price = closes[-1]
             
             # Calculate all technical indicators
-            bollinger = self.calculate_bollinger_bands(close_prices)
-            atr = self.calculate_atr(high_prices, low_prices, close_prices)
-            rsi = self.calculate_rsi(close_prices)
-            sr_levels = self.detect_support_resistance(close_prices)
+            bollinger = indicators.bollinger(self.bb_period, self.bb_std)
+            atr = indicators.atr(self.atr_period).values()
+            rsi = indicators.rsi(self.rsi_period).values()
+            sr_levels = self.detect_support_resistance(closes)
             
             # Analyze each indicator
             bb_analysis = self.analyze_bollinger_signal(current_price, bollinger)
-            atr_analysis = self.analyze_atr_signal(atr, close_prices)
+            atr_analysis = self.analyze_atr_signal(atr, closes)
             rsi_analysis = self.analyze_rsi_signal(rsi)
-            volume_analysis = self.analyze_volume_signal(volume_data, close_prices)
+            volume_analysis = self.analyze_volume_signal(indicators.field('volume'), closes)
             
             # Compile indicator results
             indicator_results = {
@@ -491,7 +499,7 @@ class SidewaysWolf:
                     'support': sr_levels.get('support'),
                     'resistance': sr_levels.get('resistance'),
                     'range_pct': sr_levels.get('range_pct'),
-                    'rsi': rsi.iloc[-1] if not rsi.empty else None,
+                    'rsi': rsi[-1] if len(rsi) else None,
                     'bb_position': bb_analysis.get('position'),
                     'atr_pct': atr_analysis.get('atr_pct'),
                     'volume_ratio': volume_analysis.get('volume_ratio')
@@ -94,11 +94,12 @@ class SwarmBot:
     def _calculate_current_price(self) -> float:
         """
         Get FRESH market price from broker API or WebSocket
-        NEVER uses cached data for position management
+        Streamed quotes are used only while the stream heartbeat is healthy
         """
         try:
             # PRODUCTION: Fetch REAL-TIME price from broker
-            # This should call broker API directly, never cache
+            # Connectors with a price stream (OandaConnector.price_stream) serve the
+            # live stream cache and fall back to a direct API call when it is stale
             
             # Check if broker connector is available
             if hasattr(self, 'broker_connector') and self.broker_connector:
@@ -1,57 +1,116 @@
 """Momentum-based signal generator for RICK system
 Charter-compliant: M15 candles, trend + momentum confirmation
 PIN: 841921 - No random entries allowed
+
+generate_signals() scores a whole universe at once from a symbols x bars
+close matrix (one NumPy pass, no per-symbol Python); generate_signal() and
+scan() are thin wrappers over it.
 """
 
-def _sma(seq, n):
-    """Simple Moving Average"""
-    return sum(seq[-n:]) / n if len(seq) >= n else sum(seq)/max(len(seq),1)
+import numpy as np
+
+from signals.features import close_matrix
+
+LOOKBACK = 100      # last N valid closes considered per symbol
+MIN_BARS = 30       # fewer valid closes -> no signal
+MOMENTUM_THRESHOLD = 0.15
+
+# Direction codes used in the batch arrays
+SIGNALS = {1: "BUY", -1: "SELL", 0: None}
+
+def extract_closes(candles):
+    """Valid (> 0) closes from a decoded candle array (brokers.candle_decode),
+    OANDA candle dicts ('mid': {'c': ...}) or {'close': ...} dicts"""
+    if isinstance(candles, np.ndarray):
+        closes = candles['close']
+        return closes[closes > 0]
+    closes = []
+    for c in candles:
+        if isinstance(c, dict):
+            if 'mid' in c and 'c' in c['mid']:
+                closes.append(float(c['mid']['c']))
+            elif 'close' in c:
+                closes.append(float(c['close']))
+    return [x for x in closes if x > 0]
+
+def _sma_batch(matrix, counts, n):
+    """SMA of the last n closes per row (mean of all closes for shorter rows)"""
+    window = np.nan_to_num(matrix[:, -n:])
+    return window.sum(axis=1) / np.maximum(np.minimum(counts, n), 1)
+
+def _mom_batch(matrix, counts, n=10):
+    """Rate of change over n periods per row, in percent (0 for rows with <= n closes)"""
+    if matrix.shape[1] <= n:
+        return np.zeros(len(matrix))
+    a, b = matrix[:, -n - 1], matrix[:, -1]
+    with np.errstate(invalid='ignore'):
+        mom = (b - a) / np.maximum(np.abs(a), 1e-9) * 100.0
+    return np.where(counts > n, mom, 0.0)
+
+def generate_signals(matrix, counts=None):
+    """Evaluate trend + momentum signals for every row of a close matrix in one pass
+
+    Args:
+        matrix: (symbols x bars) closes, right-aligned, NaN-padded on the left
+            (see signals.features.close_matrix)
+        counts: Real closes per row (default: non-NaN count)
+
+    Returns:
+        Dict of arrays aligned with the rows: 'sma20', 'sma50', 'momentum',
+        'direction' (1 BUY, -1 SELL, 0 none; see SIGNALS) and 'confidence'
+    """
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=float))
+    if counts is None:
+        counts = np.count_nonzero(~np.isnan(matrix), axis=1)
+    counts = np.asarray(counts)
 
-def _mom(seq, n=10):
-    """Momentum (rate of change over n periods)"""
-    if len(seq) <= n: 
-        return 0.0
-    a, b = float(seq[-n-1]), float(seq[-1])
-    return (b-a)/max(abs(a),1e-9) * 100.0
+    s20 = _sma_batch(matrix, counts, 20)
+    s50 = _sma_batch(matrix, counts, 50)
+    m10 = _mom_batch(matrix, counts, 10)
+
+    # Trend + momentum confirmation
+    enough = counts >= MIN_BARS
+    buy = enough & (s20 > s50) & (m10 > MOMENTUM_THRESHOLD)
+    sell = enough & (s20 < s50) & (m10 < -MOMENTUM_THRESHOLD)
+    direction = buy.astype(np.int8) - sell.astype(np.int8)
+    confidence = np.where(direction != 0, np.minimum(np.abs(m10) / 2, 1.0), 0.0)
+
+    return {
+        'sma20': s20,
+        'sma50': s50,
+        'momentum': m10,
+        'direction': direction,
+        'confidence': confidence,
+    }
+
+def scan(candles_by_symbol):
+    """Score many symbols at once
+
+    Args:
+        candles_by_symbol: {symbol: list of candle dicts or decoded candle array}
+
+    Returns:
+        {symbol: (signal, confidence)} with the same meaning as generate_signal
+    """
+    symbols = list(candles_by_symbol)
+    matrix, counts = close_matrix([extract_closes(candles_by_symbol[s]) for s in symbols], bars=LOOKBACK)
+    result = generate_signals(matrix, counts)
+    return {
+        symbol: (SIGNALS[int(d)], float(c))
+        for symbol, d, c in zip(symbols, result['direction'], result['confidence'])
+    }
 
 def generate_signal(symbol, candles):
     """Generate BUY/SELL signal with confidence
-    
+
     Args:
         symbol: Trading pair (e.g., "EUR_USD")
-        candles: List of OANDA candle dicts with 'mid': {'c': close_price}
-        
+        candles: List of OANDA candle dicts with 'mid': {'c': close_price},
+            or a record array from get_historical_data(..., as_array=True)
+
     Returns:
         (signal, confidence) where:
             signal: "BUY", "SELL", or None
             confidence: 0.0 to 1.0
     """
-    # Extract closes from OANDA candle format
-    closes = []
-    for c in candles:
-        if isinstance(c, dict):
-            if 'mid' in c and 'c' in c['mid']:
-                closes.append(float(c['mid']['c']))
-            elif 'close' in c:
-                closes.append(float(c['close']))
-    
-    closes = [x for x in closes if x > 0][-100:]  # Last 100 valid closes
-    
-    if len(closes) < 30:
-        return (None, 0.0)
-    
-    # Calculate indicators
-    s20 = _sma(closes, 20)
-    s50 = _sma(closes, 50)
-    m10 = _mom(closes, 10)
-    
-    # Trend + momentum confirmation
-    if s20 > s50 and m10 > 0.15:  # Bullish trend + positive momentum
-        confidence = min(abs(m10)/2, 1.0)
-        return ("BUY", confidence)
-    
-    if s20 < s50 and m10 < -0.15:  # Bearish trend + negative momentum
-        confidence = min(abs(m10)/2, 1.0)
-        return ("SELL", confidence)
-    
-    return (None, 0.0)
+    return scan({symbol: candles})[symbol]
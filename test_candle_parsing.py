@@ -58,6 +58,19 @@ try:
 except Exception as e:
     print(f"❌ Error: {e}")
 
+print()
+
+# Test columnar decoding (what scans consume instead of per-bar dicts)
+print("Test: Decoding candles into NumPy arrays...")
+try:
+    from brokers.candle_decode import decode_candles, JSON_BACKEND
+    bars = decode_candles(mock_response["data"]["candles"])
+    assert bars["close"].tolist() == [1.0855, 1.0860]
+    assert bars["time"][1] - bars["time"][0] == 15 * 60 * 10**9
+    print(f"✅ Decoded {len(bars)} candles: close={bars['close'].tolist()} (JSON parser: {JSON_BACKEND})")
+except Exception as e:
+    print(f"❌ Error: {e}")
+
 print()
 print("=" * 70)
 print("📊 SUMMARY")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the arena event bus (replay/resume, overflow policies, endpoints)
+PIN: 841921
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+
+# Arena backend modules import as `app.*`
+sys.path.insert(0, str((Path(__file__).parent.parent / "rbot_arena" / "backend").resolve()))
+
+try:
+    import orjson  # noqa: F401
+    from app.core import bus
+    from app.core.bus import InMemBus, SubscriberLagged, _Subscriber
+    BUS_AVAILABLE = True
+except ImportError:
+    BUS_AVAILABLE = False
+
+try:
+    from fastapi.testclient import TestClient
+    from starlette.testclient import WebSocketDenialResponse
+    from app import main
+    APP_AVAILABLE = BUS_AVAILABLE
+except ImportError:
+    APP_AVAILABLE = False
+
+
+def _drain(sub, n):
+    async def run():
+        return [await sub.get() for _ in range(n)]
+    return asyncio.run(run())
+
+
+@unittest.skipUnless(BUS_AVAILABLE, "orjson not installed")
+class TestReplayResume(unittest.TestCase):
+    """Test cases for sequenced replay"""
+
+    def _take(self, bus_, n, **kwargs):
+        async def run():
+            out = []
+            async for seq, line in bus_.subscribe(**kwargs):
+                out.append((seq, line))
+                if len(out) == n:
+                    break
+            return out
+        return asyncio.run(run())
+
+    def test_resume_after_seq(self):
+        b = InMemBus(maxlen=100)
+        for i in range(5):
+            b.publish_nowait(b"e%d" % i)
+        self.assertEqual(self._take(b, 3, after=2), [(3, b"e2"), (4, b"e3"), (5, b"e4")])
+        self.assertEqual([s for s, _ in self._take(b, 2, replay=2)], [4, 5])
+
+    def test_ring_eviction(self):
+        b = InMemBus(maxlen=4)
+        for i in range(10):
+            b.publish_nowait(b"e%d" % i)
+        self.assertEqual([s for s, _, _ in b.replay(0)], [7, 8, 9, 10])
+        self.assertEqual([s for s, _ in self._take(b, 4, after=0)], [7, 8, 9, 10])
+        self.assertEqual(b.last_seq, 10)
+
+
+@unittest.skipUnless(BUS_AVAILABLE, "orjson not installed")
+class TestOverflowPolicies(unittest.TestCase):
+    """Test cases for the per-subscriber overflow policies"""
+
+    def test_drop_oldest(self):
+        sub = _Subscriber(3, "drop_oldest")
+        for seq in range(1, 6):
+            sub.push(seq, b"x", None)
+        self.assertEqual(sub.dropped, 2)
+        self.assertEqual([s for s, _ in _drain(sub, 3)], [3, 4, 5])
+
+    def test_coalesce_keeps_latest_and_stays_bounded(self):
+        sub = _Subscriber(10, "coalesce")
+        sub.push(1, b"fill", None)
+        for seq in range(2, 100_002):
+            sub.push(seq, b"tick", "oanda:tick:EUR_USD")
+        self.assertEqual(len(sub._entries), 2)
+        self.assertLessEqual(len(sub._order), 20)
+        self.assertEqual(sub.coalesced, 99_999)
+        self.assertEqual([s for s, _ in _drain(sub, 2)], [1, 100_001])
+
+    def test_disconnect_then_resume(self):
+        b = InMemBus(maxlen=100, queue_size=2)
+        sub = _Subscriber(2, "disconnect")
+        b._subs.add(sub)
+        for i in range(4):
+            b.publish_nowait(b"e%d" % i)
+        self.assertTrue(sub.lagged)
+
+        async def run():
+            got = [await sub.get(), await sub.get()]
+            with self.assertRaises(SubscriberLagged):
+                await sub.get()
+            return got
+        got = asyncio.run(run())
+        self.assertEqual([s for s, _ in got], [1, 2])
+        # The client reconnects from its last seq and gets the rest from the ring
+        self.assertEqual([s for s, _, _ in b.replay(got[-1][0])], [3, 4])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            _Subscriber(1, "bogus")
+
+    def test_bus_publish_does_not_mutate_event(self):
+        ev = {"source": "test", "type": "order", "payload": {}}
+        seq = asyncio.run(bus.bus_publish(ev))
+        self.assertEqual(ev, {"source": "test", "type": "order", "payload": {}})
+        entry = next(bus._bus.replay(seq - 1))
+        self.assertEqual(orjson.loads(entry[1])["seq"], seq)
+
+
+@unittest.skipUnless(APP_AVAILABLE, "fastapi not installed")
+class TestEventEndpoints(unittest.TestCase):
+    """Test cases for /events and /ws"""
+
+    def test_invalid_policy_rejected(self):
+        client = TestClient(main.app)
+        self.assertEqual(client.get("/events", params={"policy": "bogus"}).status_code, 400)
+        with self.assertRaises(WebSocketDenialResponse) as ctx:
+            with client.websocket_connect("/ws?policy=bogus"):
+                pass
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_sse_resumes_from_last_event_id(self):
+        async def run():
+            first = await bus.bus_publish({"source": "test", "type": "order", "payload": {"n": 1}})
+            await bus.bus_publish({"source": "test", "type": "order", "payload": {"n": 2}})
+            response = await main.sse(since=None, policy="drop_oldest", last_event_id=str(first))
+            chunk = await response.body_iterator.__anext__()
+            await response.body_iterator.aclose()
+            return first, chunk
+        first, chunk = asyncio.run(run())
+        self.assertTrue(chunk.startswith(b"id: %d\ndata: " % (first + 1)))
+        self.assertEqual(orjson.loads(chunk.split(b"data: ", 1)[1])["payload"], {"n": 2})
+
+    def test_websocket_streams_with_resume(self):
+        client = TestClient(main.app)
+        seq = asyncio.run(bus.bus_publish({"source": "test", "type": "order", "payload": {"n": 3}}))
+        with client.websocket_connect(f"/ws?since={seq - 1}&policy=coalesce") as ws:
+            self.assertEqual(orjson.loads(ws.receive_bytes())["seq"], seq)
+
+
+if __name__ == "__main__":
+    unittest.main()
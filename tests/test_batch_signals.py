@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for vectorized batch signal evaluation
+PIN: 841921
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+import pandas as pd
+
+from systems import momentum_signals
+from signals import features
+
+
+def _reference_signal(closes):
+    """Per-symbol trend + momentum rule the batch pass must reproduce"""
+    closes = closes[-100:]
+    if len(closes) < 30:
+        return (None, 0.0)
+    sma = lambda n: sum(closes[-n:]) / n if len(closes) >= n else sum(closes) / len(closes)
+    m10 = (closes[-1] - closes[-11]) / abs(closes[-11]) * 100.0
+    if sma(20) > sma(50) and m10 > 0.15:
+        return ("BUY", min(abs(m10) / 2, 1.0))
+    if sma(20) < sma(50) and m10 < -0.15:
+        return ("SELL", min(abs(m10) / 2, 1.0))
+    return (None, 0.0)
+
+
+def _universe(n_symbols, seed=11):
+    rng = np.random.default_rng(seed)
+    universe = {}
+    for i in range(n_symbols):
+        length = int(rng.choice([0, 12, 29, 30, 45, 80, 150]))
+        drift = rng.uniform(-0.004, 0.004)
+        closes = 1.2 * np.cumprod(1 + drift + rng.normal(0, 0.002, length))
+        universe[f"PAIR_{i}"] = [float(c) for c in closes]
+    return universe
+
+
+def _candles(closes):
+    return [{'mid': {'c': f"{c:.6f}"}, 'complete': True} for c in closes]
+
+
+class TestMomentumSignalsBatch(unittest.TestCase):
+    """Test cases for systems.momentum_signals batch evaluation"""
+
+    def test_batch_matches_per_symbol_rule(self):
+        universe = _universe(200)
+        closes = {s: momentum_signals.extract_closes(_candles(c)) for s, c in universe.items()}
+        matrix, counts = momentum_signals.close_matrix(list(closes.values()), bars=momentum_signals.LOOKBACK)
+        self.assertEqual(matrix.shape, (200, momentum_signals.LOOKBACK))
+        result = momentum_signals.generate_signals(matrix, counts)
+        for i, (symbol, series) in enumerate(closes.items()):
+            expected = _reference_signal(series)
+            self.assertEqual(momentum_signals.SIGNALS[int(result['direction'][i])], expected[0], symbol)
+            self.assertAlmostEqual(float(result['confidence'][i]), expected[1], places=12)
+        self.assertTrue((result['direction'] != 0).any())
+
+    def test_scan_and_single_symbol_wrapper_agree(self):
+        universe = _universe(30, seed=5)
+        candles = {s: _candles(c) for s, c in universe.items()}
+        scanned = momentum_signals.scan(candles)
+        for symbol, candle_list in candles.items():
+            self.assertEqual(momentum_signals.generate_signal(symbol, candle_list), scanned[symbol])
+
+    def test_invalid_and_short_histories(self):
+        candles = [{'mid': {'c': '0'}}, 'junk', {'close': 1.1}] * 5
+        self.assertEqual(momentum_signals.generate_signal('EUR_USD', candles), (None, 0.0))
+        self.assertEqual(momentum_signals.generate_signal('EUR_USD', []), (None, 0.0))
+        result = momentum_signals.generate_signals(np.full((1, 100), np.nan))
+        self.assertEqual(result['direction'].tolist(), [0])
+
+
+class TestFeatureBatches(unittest.TestCase):
+    """Test cases for signals.features batch variants"""
+
+    def test_batches_match_scalar_features(self):
+        rng = np.random.default_rng(3)
+        closes = [pd.Series(1 + np.cumsum(rng.normal(0, 0.01, n))) for n in rng.integers(0, 60, 100)]
+        matrix, counts = features.close_matrix(closes)
+        mom = features.momentum_batch(matrix, counts, window=14)
+        sma = features.sma_batch(matrix, counts, window=20)
+        trend = features.trend_direction_batch(matrix, counts, fast=10, slow=30)
+        for i, close in enumerate(closes):
+            expected_mom = (close.iloc[-1] / close.iloc[-15] - 1.0) if len(close) >= 15 else 0.0
+            self.assertAlmostEqual(mom[i], expected_mom, places=12)
+            self.assertAlmostEqual(features.momentum(close), expected_mom, places=12)
+            if len(close):
+                expected_sma = close.iloc[-20:].mean()
+                self.assertAlmostEqual(sma[i], expected_sma, places=12)
+                self.assertAlmostEqual(features.simple_moving_average(close), expected_sma, places=12)
+            if len(close) < 30:
+                self.assertEqual(trend[i], 0.0)
+            else:
+                expected = np.sign(close.iloc[-10:].mean() - close.iloc[-30:].mean())
+                self.assertEqual(trend[i], expected)
+                self.assertEqual(features.trend_direction(close), expected)
+
+    def test_close_matrix_alignment(self):
+        matrix, counts = features.close_matrix([[1.0, 2.0, 3.0], [4.0]], bars=2)
+        self.assertEqual(counts.tolist(), [2, 1])
+        np.testing.assert_array_equal(matrix, [[2.0, 3.0], [np.nan, 4.0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for columnar OANDA candle decoding
+PIN: 841921
+"""
+
+import json
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+
+from brokers.candle_decode import (CANDLE_DTYPE, candle_columns, closes, decode_candles,
+                                   decode_candles_json, json_loads)
+from systems import momentum_signals
+
+CANDLES = [
+    {"complete": True, "volume": 120, "time": "2025-11-07T12:00:00.000000000Z",
+     "mid": {"o": "1.08500", "h": "1.08600", "l": "1.08400", "c": "1.08550"},
+     "bid": {"o": "1.08490", "h": "1.08590", "l": "1.08390", "c": "1.08540"}},
+    {"complete": True, "volume": 80, "time": "2025-11-07T12:15:00.000000000Z",
+     "mid": {"o": "1.08550", "h": "1.08650", "l": "1.08500", "c": "1.08600"}},
+    {"complete": False, "volume": 5, "time": "2025-11-07T12:30:00.000000000Z",
+     "mid": {"o": "1.08600", "h": "1.08610", "l": "1.08590", "c": "1.08605"}},
+]
+
+
+class TestCandleDecode(unittest.TestCase):
+    """Test cases for candle_decode"""
+
+    def test_record_array(self):
+        bars = decode_candles(CANDLES)
+        self.assertEqual(bars.dtype, CANDLE_DTYPE)
+        self.assertEqual(bars["close"].tolist(), [1.0855, 1.086, 1.08605])
+        self.assertEqual(bars["volume"].tolist(), [120, 80, 5])
+        self.assertEqual(bars["complete"].tolist(), [True, True, False])
+        self.assertEqual(bars["time"][0], np.datetime64("2025-11-07T12:00:00", "ns").astype(np.int64))
+        self.assertEqual(int(np.diff(bars["time"])[0]), 15 * 60 * 10**9)
+
+    def test_columns_subset_price_and_complete_only(self):
+        cols = candle_columns(CANDLES, fields=("close",), complete_only=True)
+        self.assertEqual(list(cols), ["close"])
+        self.assertEqual(cols["close"].tolist(), [1.0855, 1.086])
+        # Bars without the requested price component are skipped
+        self.assertEqual(candle_columns(CANDLES, price="bid")["close"].tolist(), [1.0854])
+        with self.assertRaises(ValueError):
+            candle_columns(CANDLES, fields=("spread",))
+
+    def test_malformed_and_unix_times(self):
+        candles = [{"time": "1762516800.000000000", "mid": {"o": "1", "h": "1", "l": "1", "c": "x"}},
+                   {"time": "1762517700.000000000", "mid": {"o": "1", "h": "1", "l": "1", "c": "2.5"}},
+                   {"time": "1762518600.000000000"}]
+        bars = decode_candles(candles)
+        self.assertTrue(np.isnan(bars["close"][0]))
+        self.assertEqual(bars["close"][1], 2.5)
+        self.assertEqual(bars["time"].tolist(), [1762516800 * 10**9, 1762517700 * 10**9])
+        self.assertEqual(len(decode_candles([])), 0)
+
+    def test_json_payload_and_closes_helper(self):
+        payload = json.dumps({"instrument": "EUR_USD", "candles": CANDLES}).encode()
+        self.assertEqual(json_loads(payload)["instrument"], "EUR_USD")
+        bars = decode_candles_json(payload, complete_only=True)
+        self.assertEqual(len(bars), 2)
+        self.assertTrue(np.shares_memory(closes(bars), bars))
+        self.assertEqual(closes(CANDLES).tolist(), bars["close"].tolist() + [1.08605])
+
+    def test_momentum_signal_accepts_arrays(self):
+        rng = np.random.default_rng(2)
+        prices = 1.1 * np.cumprod(1 + 0.001 + rng.normal(0, 0.0005, 120))
+        candles = [{"time": f"2025-11-07T00:00:{i % 60:02d}Z", "mid": {"o": "1", "h": "1", "l": "1", "c": f"{p:.5f}"}}
+                   for i, p in enumerate(prices)]
+        from_dicts = momentum_signals.generate_signal("EUR_USD", candles)
+        self.assertEqual(from_dicts[0], "BUY")
+        self.assertEqual(momentum_signals.generate_signal("EUR_USD", decode_candles(candles)), from_dicts)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the columnar candle store
+PIN: 841921
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+
+from brokers.candle_store import CandleStore, _in_sorted, parse_oanda_candles, to_epoch
+
+# Monday 2024-01-08 00:00 UTC
+MONDAY = datetime(2024, 1, 8, tzinfo=timezone.utc)
+
+
+def _candles(start, n, minutes=15, complete_last=True):
+    out = []
+    for i in range(n):
+        t = start + timedelta(minutes=minutes * i)
+        out.append({
+            "time": t.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "complete": complete_last or i < n - 1,
+            "volume": 10 + i,
+            "mid": {"o": "1.1", "h": "1.2", "l": "1.0", "c": f"{1 + i / 1000:.5f}"},
+        })
+    return out
+
+
+class TestCandleStore(unittest.TestCase):
+    """Test cases for CandleStore"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_drops_in_progress_bar(self):
+        cols = parse_oanda_candles(_candles(MONDAY, 3, complete_last=False))
+        self.assertEqual(len(cols["time"]), 2)
+        self.assertEqual(cols["time"][0], to_epoch(MONDAY))
+        self.assertEqual(cols["close"].tolist(), [1.0, 1.001])
+
+    def test_to_epoch_formats(self):
+        self.assertEqual(to_epoch("2024-01-08"), to_epoch(MONDAY))
+        self.assertEqual(to_epoch("2024-01-08T00:00:00.000000000Z"), to_epoch(MONDAY))
+        self.assertEqual(to_epoch("1704672000"), to_epoch(MONDAY))
+        self.assertEqual(to_epoch("1704672000.5"), to_epoch(MONDAY))
+
+    def test_sorted_membership_matches_isin(self):
+        rng = np.random.default_rng(7)
+        haystack = np.unique(rng.integers(0, 1000, 300))
+        values = rng.integers(-10, 1010, 200)
+        self.assertEqual(_in_sorted(haystack, values).tolist(), np.isin(values, haystack).tolist())
+        self.assertEqual(_in_sorted(haystack[:0], values[:3]).tolist(), [False] * 3)
+
+    def test_append_is_incremental_and_memmapped(self):
+        self.assertEqual(self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY, 10)), 10)
+        # Overlapping refetch: only the bars after the last stored one are new
+        self.assertEqual(self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(minutes=120), 5)), 3)
+        bars = self.store.read("EUR_USD", "M15")
+        self.assertIsInstance(bars["close"], np.memmap)
+        self.assertEqual(len(bars["time"]), 13)
+        self.assertTrue(np.all(np.diff(bars["time"]) == 900))
+        self.assertEqual(self.store.series(), [("EUR_USD", "M15")])
+
+    def test_range_read_and_formats(self):
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY, 20))
+        bars = self.store.read("EUR_USD", "M15", start=MONDAY + timedelta(hours=1), end="2024-01-08T02:00:00Z")
+        self.assertEqual(len(bars["time"]), 4)
+        frame = self.store.read_dataframe("EUR_USD", "M15")
+        self.assertEqual(list(frame.columns), ["open", "high", "low", "close", "volume"])
+        candles = self.store.to_oanda_candles("EUR_USD", "M15", 2)
+        self.assertEqual(candles[-1]["time"], "2024-01-08T04:45:00Z")
+        self.assertEqual(candles[-1]["mid"]["c"], "1.01900")
+
+    def test_torn_append_is_ignored_and_repaired(self):
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY, 5))
+        with open(os.path.join(self.tmp.name, "EUR_USD", "M15", "time.i8"), "ab") as f:
+            f.write(np.int64(0).tobytes())  # crash after writing one column
+        self.assertEqual(self.store.count("EUR_USD", "M15"), 5)
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(minutes=75), 1))
+        self.assertEqual(self.store.read("EUR_USD", "M15")["time"][-1], to_epoch(MONDAY + timedelta(minutes=75)))
+
+    def test_gaps_skip_weekend_and_backfill_merges(self):
+        # Friday 2024-01-12 19:00 -> 20:45, then Sunday 21:00 onward: weekend closure is not a gap
+        friday = datetime(2024, 1, 12, 19, tzinfo=timezone.utc)
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(friday, 8))
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(datetime(2024, 1, 14, 21, tzinfo=timezone.utc), 4))
+        self.assertEqual(self.store.find_gaps("EUR_USD", "M15"), [])
+
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY, 4))
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(hours=2), 4))
+        first_missing = to_epoch(MONDAY + timedelta(hours=1))
+        monday_window = {"start": MONDAY, "end": MONDAY + timedelta(hours=4)}
+        gaps = self.store.find_gaps("EUR_USD", "M15", **monday_window)
+        self.assertEqual(gaps, [(first_missing, first_missing + 3 * 900, 4)])
+
+        requests = []
+
+        def fetch(params):
+            requests.append(params)
+            return _candles(datetime.fromisoformat(params["from"].replace("Z", "+00:00")), 4)
+
+        added = self.store.backfill(fetch, "EUR_USD", "M15", **monday_window)
+        self.assertEqual(added, 4)
+        self.assertEqual(requests[0], {"from": "2024-01-08T01:00:00Z", "to": "2024-01-08T02:00:00Z"})
+        self.assertEqual(self.store.find_gaps("EUR_USD", "M15", **monday_window), [])
+        times = self.store.read("EUR_USD", "M15")["time"]
+        self.assertTrue(np.all(np.diff(times) > 0))
+
+    def test_merge_swaps_in_a_new_generation(self):
+        partition = Path(self.tmp.name, "EUR_USD", "M15")
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(hours=3), 4))
+        before = self.store.read("EUR_USD", "M15")
+        for hours in (2, 1, 0):
+            self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(hours=hours), 1))
+        self.assertEqual(self.store.stats["rewrites"], 3)
+        self.assertEqual(os.readlink(partition / "current"), "g3")
+        # Previous generation kept for in-flight readers, older ones and the flat columns removed
+        self.assertEqual(sorted(p.name for p in partition.iterdir() if not p.name.startswith(".")),
+                         ["current", "g2", "g3"])
+        self.assertEqual(len(before["time"]), 4)  # views taken before the swaps stay valid
+        times = self.store.read("EUR_USD", "M15")["time"]
+        self.assertEqual(len(times), 7)
+        self.assertTrue(np.all(np.diff(times) > 0))
+        self.store.ingest_oanda("EUR_USD", "M15", _candles(MONDAY + timedelta(hours=4), 2))
+        self.assertEqual(self.store.count("EUR_USD", "M15"), 9)
+        self.assertEqual(self.store.series(), [("EUR_USD", "M15")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite event store
+PIN: 841921
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.event_store import EventStore, event_store_mode
+
+
+def _iso(seconds_ago=0.0):
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)).isoformat()
+
+
+def _pnl(net, outcome, seconds_ago=0.0, symbol="EUR_USD"):
+    return {"timestamp": _iso(seconds_ago), "symbol": symbol, "venue": "oanda",
+            "gross_pnl": net + 1, "fees": 1, "net_pnl": net, "outcome": outcome}
+
+
+class TestEventStore(unittest.TestCase):
+    """Test cases for EventStore"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.store = EventStore(self.dir / "events.db", flush_interval=60)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_wal_mode_and_indexes(self):
+        conn = self.store._reader()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list(events)")}
+        self.assertTrue({"idx_events_ts", "idx_events_symbol_ts", "idx_events_type_ts"} <= indexes)
+        plan = " ".join(str(r) for r in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT payload FROM events WHERE event_type = ? AND ts >= ?",
+            ("CHARTER_VIOLATION", 0.0)))
+        self.assertIn("idx_events_type_ts", plan)
+
+    def test_batched_insert_and_query(self):
+        for i in range(20):
+            self.store.record("narration", {"timestamp": _iso(20 - i), "event_type": "HIVE_ANALYSIS",
+                                            "symbol": "EUR_USD" if i % 2 else "GBP_USD", "details": {"i": i}})
+        self.assertEqual(self.store.stats["inserted"], 0)  # queued, not yet written
+        events = self.store.query(stream="narration", symbol="EUR_USD", limit=3)
+        self.assertEqual([e["details"]["i"] for e in events], [15, 17, 19])
+        self.assertEqual(self.store.stats["batches"], 1)
+
+    def test_pnl_aggregates(self):
+        self.store.record("pnl", _pnl(10.0, "win"))
+        self.store.record("pnl", _pnl(-4.0, "loss"))
+        self.store.record("pnl", _pnl(6.0, "win", seconds_ago=3 * 86400))
+        summary = self.store.pnl_summary()
+        self.assertEqual((summary["total_trades"], summary["wins"], summary["losses"]), (3, 2, 1))
+        self.assertAlmostEqual(summary["net_pnl"], 12.0)
+        self.assertAlmostEqual(summary["total_fees"], 3.0)
+        self.assertAlmostEqual(self.store.win_rate(since=time.time() - 86400), 50.0)
+        days = self.store.daily_pnl(days=7)
+        self.assertEqual(sum(d["trades"] for d in days), 3)
+        self.assertAlmostEqual(days[-1]["net_pnl"], 6.0)
+
+    def test_pnl_summary_last_window(self):
+        self.store.record("pnl", _pnl(100.0, "win", seconds_ago=30))
+        self.store.record("pnl", _pnl(-4.0, "loss", seconds_ago=20))
+        self.store.record("pnl", _pnl(6.0, "win", seconds_ago=10))
+        summary = self.store.pnl_summary(last=2)
+        self.assertEqual((summary["total_trades"], summary["wins"], summary["losses"]), (2, 1, 1))
+        self.assertAlmostEqual(summary["net_pnl"], 2.0)
+        self.assertAlmostEqual(summary["total_fees"], 2.0)
+
+    def test_store_is_opt_in(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("RICK_EVENT_STORE", None)
+            self.assertEqual(event_store_mode(), "off")
+            os.environ["RICK_EVENT_STORE"] = "DUAL"
+            self.assertEqual(event_store_mode(), "dual")
+            os.environ["RICK_EVENT_STORE"] = "sqlite"
+            self.assertEqual(event_store_mode(), "off")
+
+    def test_violation_counts(self):
+        self.store.record("narration", {"timestamp": _iso(), "event_type": "CHARTER_VIOLATION"})
+        self.store.record("narration", {"timestamp": _iso(), "event_type": "HIVE_ANALYSIS"})
+        self.store.record("breaker", {"timestamp": _iso(), "event_type": "THRESHOLD_BREACH",
+                                      "pnl_at_trigger": -500.0})
+        self.store.record("oco", {"timestamp": _iso(), "symbol": "EUR_USD", "is_valid": True,
+                                  "action_taken": "VALID"})
+        self.store.record("oco", {"timestamp": _iso(), "symbol": "EUR_USD", "is_valid": False,
+                                  "action_taken": "MISSING_STOP_LOSS"})
+        self.assertEqual(self.store.violation_counts(), {
+            "CHARTER_VIOLATION": 1, "THRESHOLD_BREACH": 1, "OCO_MISSING_STOP_LOSS": 1})
+
+    def test_import_is_resumable_and_skips_dual_written_rows(self):
+        path = self.dir / "pnl.jsonl"
+        with open(path, "w") as f:
+            for i in range(5):
+                f.write(json.dumps(_pnl(1.0, "win", seconds_ago=100 - i)) + "\n")
+        self.assertEqual(self.store.import_jsonl(path, "pnl"), 5)
+        self.assertEqual(self.store.import_jsonl(path, "pnl"), 0)
+
+        # Dual-write starts: the same line goes to the JSONL file and the store
+        live = _pnl(2.0, "win")
+        with open(path, "a") as f:
+            f.write(json.dumps(live) + "\n")
+        self.store.record("pnl", live)
+        self.assertEqual(self.store.import_jsonl(path, "pnl"), 0)
+        self.assertEqual(self.store.count(stream="pnl"), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
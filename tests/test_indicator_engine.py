@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental indicator engine
+PIN: 841921
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+import pandas as pd
+
+from strategies.indicator_engine import IndicatorEngine, RingHistory, SeriesIndicators, compute
+import strategies.indicator_engine as indicator_engine
+from strategies.bullish_wolf import BullishWolf
+from strategies.bearish_wolf import BearishWolf
+from strategies.sideways_wolf import SidewaysWolf
+
+
+def _bars(n, seed=7):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-01-06', periods=n, freq='15min')
+    close = 1.1 + np.cumsum(rng.normal(0.0001, 0.0005, n))
+    return {
+        'close': pd.Series(close, index=index),
+        'high': pd.Series(close + rng.uniform(0, 0.0008, n), index=index),
+        'low': pd.Series(close - rng.uniform(0, 0.0008, n), index=index),
+        'volume': pd.Series(rng.integers(1000, 20000, n).astype(float), index=index),
+    }
+
+
+def _window(data, start, end):
+    return {k: v.iloc[start:end] for k, v in data.items()}
+
+
+def _positional(data):
+    return {k: v.reset_index(drop=True) for k, v in data.items()}
+
+
+def _wilder_rsi(close, period):
+    delta = np.diff(close)
+    out = np.full(len(close), np.nan)
+    gain = np.clip(delta, 0, None)[:period].mean()
+    loss = -np.clip(delta, None, 0)[:period].mean()
+    for i in range(period, len(close)):
+        if i > period:
+            gain = (gain * (period - 1) + max(delta[i - 1], 0)) / period
+            loss = (loss * (period - 1) + max(-delta[i - 1], 0)) / period
+        out[i] = 100 - 100 / (1 + gain / loss)
+    return out
+
+
+class TestIndicators(unittest.TestCase):
+    """Test cases for indicator values against pandas/reference formulas"""
+
+    def setUp(self):
+        self.data = _bars(300)
+        self.close = self.data['close']
+
+    def test_wilder_rsi(self):
+        np.testing.assert_allclose(compute('rsi', self.close, params=(14,)),
+                                   _wilder_rsi(self.close.values, 14), rtol=1e-12)
+
+    def test_ema_and_macd(self):
+        ema = lambda s, span: s.ewm(span=span, adjust=False).mean()
+        np.testing.assert_allclose(compute('ema', self.close, params=(12,)), ema(self.close, 12), rtol=1e-12)
+        line = ema(self.close, 12) - ema(self.close, 26)
+        macd = compute('macd', self.close, params=(12, 26, 9))
+        np.testing.assert_allclose(macd[:, 0], line, atol=1e-12)
+        np.testing.assert_allclose(macd[:, 1], ema(line, 9), atol=1e-12)
+
+    def test_rolling_mean_std_and_atr(self):
+        bands = compute('rolling', self.close, params=(20,))
+        np.testing.assert_allclose(bands[:, 0], self.close.rolling(20).mean(), rtol=1e-12)
+        np.testing.assert_allclose(bands[:, 1], self.close.rolling(20).std(), rtol=1e-9)
+
+        high, low = self.data['high'], self.data['low']
+        prev = self.close.shift(1)
+        true_range = pd.concat([high - low, (high - prev).abs(), (low - prev).abs()], axis=1).max(axis=1)
+        np.testing.assert_allclose(compute('atr', high, low, self.close, params=(14,)),
+                                   true_range.rolling(14).mean(), rtol=1e-9)
+
+    def test_ring_history_views(self):
+        ring = RingHistory(capacity=4)
+        for i in range(11):
+            ring.append(float(i))
+        self.assertEqual(ring.view().tolist(), [7.0, 8.0, 9.0, 10.0])
+        self.assertEqual(ring.view(2).tolist(), [9.0, 10.0])
+        ring.replace_last(99.0)
+        self.assertEqual(ring.view(1).tolist(), [99.0])
+
+
+class TestSeriesIndicators(unittest.TestCase):
+    """Test cases for incremental synchronisation"""
+
+    def setUp(self):
+        self.data = _bars(260)
+
+    def test_sliding_window_applies_only_new_bars(self):
+        state = SeriesIndicators('EUR_USD', 'M15', capacity=100)
+        rsi, macd = state.rsi(14), state.macd()
+        self.assertEqual(state.sync(_window(self.data, 0, 200)), 200)
+        for end in range(201, 261):
+            self.assertEqual(state.sync(_window(self.data, end - 200, end)), 1)
+        self.assertEqual(state.sync(_window(self.data, 60, 260)), 0)
+        np.testing.assert_allclose(rsi.values(), compute('rsi', self.data['close'], params=(14,))[-100:])
+        self.assertAlmostEqual(macd.value[2], compute('macd', self.data['close'], params=(12, 26, 9))[-1, 2])
+
+    def test_revised_last_bar_is_amended(self):
+        state = SeriesIndicators('EUR_USD', 'M15')
+        bands = state.rolling(20)
+        state.sync(_window(self.data, 0, 100))
+        revised = _window(self.data, 0, 100)
+        revised['close'] = revised['close'].copy()
+        revised['close'].iloc[-1] += 0.002
+        self.assertEqual(state.sync(revised), 0)
+        self.assertEqual(state.bar_count, 100)
+        np.testing.assert_allclose(bands.values(column='mean'),
+                                   compute('rolling', revised['close'], params=(20,), column='mean'))
+
+    def test_late_indicator_warms_up_and_gap_resets(self):
+        state = SeriesIndicators('EUR_USD', 'M15')
+        state.sync(_window(self.data, 0, 120))
+        atr = state.atr(14)
+        self.assertEqual(len(atr.values()), 120)
+        self.assertTrue(atr.ready)
+        # A window that does not contain the last applied bar is replayed from scratch
+        self.assertEqual(state.sync(_window(self.data, 150, 200)), 50)
+        self.assertEqual(state.bar_count, 50)
+
+    def test_positional_windows_are_replayed(self):
+        state = SeriesIndicators('EUR_USD', 'M15', capacity=100)
+        state.rsi(14)
+        for end in (100, 101, 102):
+            window = _positional(_window(self.data, end - 100, end))
+            self.assertEqual(state.sync(window), 100)  # never mistaken for an amended last bar
+            self.assertEqual(state.bar_count, 100)
+            np.testing.assert_allclose(state.rsi(14).values(), compute('rsi', window['close'], params=(14,)))
+
+    def test_explicit_time_column_aligns_arrays(self):
+        state = SeriesIndicators('EUR_USD', 'M15')
+        times = self.data['close'].index.asi8
+
+        def arrays(start, end):
+            return {'close': self.data['close'].to_numpy()[start:end], 'time': times[start:end]}
+
+        self.assertEqual(state.sync(arrays(0, 100)), 100)
+        self.assertEqual(state.sync(arrays(1, 101)), 1)
+        self.assertEqual(state.bar_count, 101)
+
+
+class TestWolfPackSharing(unittest.TestCase):
+    """Test cases for the shared engine used by the wolf packs"""
+
+    def setUp(self):
+        self._engine = indicator_engine._engine
+        indicator_engine._engine = IndicatorEngine()
+        self.bars = _bars(201)
+        self.data = _window(self.bars, 0, 200)
+
+    def tearDown(self):
+        indicator_engine._engine = self._engine
+
+    def test_packs_share_state_and_match_one_shot(self):
+        wolves = [BullishWolf(), BearishWolf(), SidewaysWolf()]
+        shared = [wolf.generate_trade_signal(self.data, symbol='EUR_USD') for wolf in wolves]
+        one_shot = [wolf.generate_trade_signal(self.data) for wolf in wolves]
+        for a, b in zip(shared, one_shot):
+            self.assertNotIn('error', a)
+            self.assertEqual(a['signals'], b['signals'])
+            self.assertAlmostEqual(a['confidence'], b['confidence'])
+
+        engine = indicator_engine.get_indicator_engine()
+        self.assertEqual(engine.keys(), [('EUR_USD', 'M15')])
+        state = engine.series('EUR_USD')
+        kinds = sorted(kind for kind, _, _ in state.indicators)
+        # RSI(14) and MACD are registered once for all three packs
+        self.assertEqual(kinds.count('rsi'), 1)
+        self.assertEqual(kinds.count('macd'), 1)
+
+        rsi = state.rsi(14)
+        shared = BullishWolf().generate_trade_signal(_window(self.bars, 1, 201), symbol='EUR_USD')
+        self.assertEqual(state.bar_count, 201)
+        self.assertIs(state.rsi(14), rsi)
+        self.assertAlmostEqual(shared['technical_data']['rsi'], rsi.value)
+
+    def test_positional_data_with_symbol_uses_one_shot_state(self):
+        data = _positional(self.data)
+        with self.assertLogs('strategies.indicator_engine', 'WARNING') as logs:
+            shared = BullishWolf().generate_trade_signal(data, symbol='GBP_USD')
+        self.assertIn('no time index', logs.output[0])
+        self.assertEqual(indicator_engine.get_indicator_engine().keys(), [])
+        one_shot = BullishWolf().generate_trade_signal(data)
+        self.assertEqual(shared['signals'], one_shot['signals'])
+        self.assertAlmostEqual(shared['confidence'], one_shot['confidence'])
+
+
+if __name__ == "__main__":
+    unittest.main()
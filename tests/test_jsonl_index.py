@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the JSONL tail reader and sidecar offset index
+PIN: 841921
+"""
+
+import json
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.jsonl_index import JsonlIndex, iter_lines_reverse, tail_records
+
+
+def _event(i, event_type):
+    return {
+        "timestamp": f"2025-11-20T10:{i // 60:02d}:{i % 60:02d}+00:00",
+        "event_type": event_type,
+        "symbol": "EUR_USD" if i % 2 else "GBP_USD",
+        "details": {"i": i},
+    }
+
+
+class TestJsonlIndex(unittest.TestCase):
+    """Test cases for tail reads and indexed queries"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "narration.jsonl"
+        self._append(range(300))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _append(self, numbers):
+        with open(self.path, "a") as f:
+            for i in numbers:
+                f.write(json.dumps(_event(i, "CHARTER_VIOLATION" if i % 10 == 0 else "HIVE_ANALYSIS")) + "\n")
+
+    def test_reverse_lines_across_blocks(self):
+        lines = list(iter_lines_reverse(self.path, block_size=64))
+        self.assertEqual(len(lines), 300)
+        self.assertEqual(json.loads(lines[0])["details"]["i"], 299)
+
+    def test_tail_records(self):
+        records = tail_records(self.path, 5)
+        self.assertEqual([r["details"]["i"] for r in records], [295, 296, 297, 298, 299])
+
+    def test_latest_by_type(self):
+        index = JsonlIndex(self.path)
+        records = index.latest(3, event_type="CHARTER_VIOLATION")
+        self.assertEqual([r["details"]["i"] for r in records], [270, 280, 290])
+        self.assertTrue(Path(f"{self.path}.idx").exists())
+
+    def test_range_query(self):
+        index = JsonlIndex(self.path)
+        records = index.range("2025-11-20T10:01:00+00:00", "2025-11-20T10:01:09+00:00")
+        self.assertEqual([r["details"]["i"] for r in records], list(range(60, 70)))
+        typed = index.range("2025-11-20T10:01:00+00:00", "2025-11-20T10:02:00+00:00",
+                            event_type="CHARTER_VIOLATION")
+        self.assertEqual([r["details"]["i"] for r in typed], [60, 70, 80, 90, 100, 110, 120])
+
+    def test_incremental_refresh_and_reload(self):
+        index = JsonlIndex(self.path)
+        self.assertEqual(index.refresh(), 300)
+        self._append(range(300, 310))
+        self.assertEqual(index.refresh(), 10)
+        reloaded = JsonlIndex(self.path)
+        self.assertEqual(reloaded.refresh(), 0)  # picked up from the sidecar
+        self.assertEqual(reloaded.count_by_type()["CHARTER_VIOLATION"], 31)
+
+    def test_truncated_file_rebuilds(self):
+        index = JsonlIndex(self.path)
+        index.refresh()
+        self.path.write_text(json.dumps(_event(1, "OCO_PLACED")) + "\n")
+        self.assertEqual(index.count_by_type(), {"OCO_PLACED": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Unit tests for segmented (rotated, compressed) narration logs
+PIN: 841921
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.log_segments import SegmentedLog
+
+
+def _line(i, event_type="HIVE_ANALYSIS", day=20):
+    return json.dumps({
+        "timestamp": f"2025-11-{day:02d}T10:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+        "event_type": event_type,
+        "symbol": "EUR_USD",
+        "details": {"i": i},
+    }) + "\n"
+
+
+class TestSegmentedLog(unittest.TestCase):
+    """Test cases for SegmentedLog"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "narration.jsonl"
+        self.log = SegmentedLog(self.path, max_bytes=2000, rotate_daily=False)
+
+    def tearDown(self):
+        self.log.wait_for_segments(5)
+        self.tmp.cleanup()
+
+    def _write(self, numbers, log=None, **kw):
+        log = log or self.log
+        for i in numbers:
+            line = _line(i, **kw)
+            with log.open_append(len(line)) as f:
+                f.write(line)
+        log.wait_for_segments(5)
+
+    def test_rolls_at_size_with_manifest(self):
+        self._write(range(60))
+        segments = self.log.segments()
+        self.assertGreater(len(segments), 1)
+        self.assertLessEqual(self.path.stat().st_size, 2000)
+        self.assertTrue(all((self.log.segment_dir / s["file"]).exists() for s in segments))
+        self.assertTrue(all(s["file"].endswith(".jsonl.gz") for s in segments))
+        total = sum(s["lines"] for s in segments) + len(self.path.read_text().splitlines())
+        self.assertEqual(total, 60)
+        self.assertLessEqual(segments[0]["start_ts"], segments[0]["end_ts"])
+
+    def test_latest_spans_segments(self):
+        self._write(range(60))
+        records = self.log.latest(40)
+        self.assertEqual([r["details"]["i"] for r in records], list(range(20, 60)))
+
+    def test_type_query_skips_segments_without_type(self):
+        self._write(range(30))
+        self._write([30], event_type="CHARTER_VIOLATION")
+        self._write(range(31, 60))
+        hits = [s for s in self.log.segments() if s["counts"].get("CHARTER_VIOLATION")]
+        self.assertLessEqual(len(hits), 1)
+        records = self.log.latest(5, event_type="CHARTER_VIOLATION")
+        self.assertEqual([r["details"]["i"] for r in records], [30])
+
+    def test_time_range_query(self):
+        self._write(range(60))
+        records = self.log.query("2025-11-20T10:00:10+00:00", "2025-11-20T10:00:19+00:00")
+        self.assertEqual([r["details"]["i"] for r in records], list(range(10, 20)))
+
+    def test_daily_roll(self):
+        log = SegmentedLog(self.path, max_bytes=0, rotate_daily=True)
+        with open(self.path, "a") as f:
+            f.write(_line(1, day=1))  # an old day
+        self.assertTrue(log.maybe_rotate(100))
+        self.assertFalse(self.path.exists())
+        log.wait_for_segments(5)
+        self.assertEqual(len(log.segments()), 1)
+
+    def test_stale_process_does_not_reroll_fresh_file(self):
+        stale = SegmentedLog(self.path, max_bytes=0, rotate_daily=True)
+        fresh = SegmentedLog(self.path, max_bytes=0, rotate_daily=True)
+        with open(self.path, "a") as f:
+            f.write(_line(1, day=1))
+        stale._size, stale._active_day = 100, "2025-11-01"  # counters from before the other roll
+        self.assertTrue(fresh.maybe_rotate(10))
+        fresh.wait_for_segments(5)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"timestamp": time.time(), "event_type": "HIVE_ANALYSIS"}) + "\n")
+        self.assertFalse(stale.maybe_rotate(10))
+        self.assertTrue(self.path.exists())
+        self.assertEqual(len(stale.segments()), 1)
+
+    def test_rotation_waits_for_open_writers(self):
+        self._write(range(5))
+        writing, release = threading.Event(), threading.Event()
+
+        def slow_writer():
+            with self.log.open_append() as f:
+                writing.set()
+                release.wait(5)
+                f.write(_line(99))
+
+        writer = threading.Thread(target=slow_writer)
+        writer.start()
+        writing.wait(5)
+        rotator = threading.Thread(target=self.log.rotate)
+        rotator.start()
+        rotator.join(0.2)
+        self.assertTrue(rotator.is_alive())  # blocked until the writer closes its file
+        release.set()
+        writer.join(5)
+        rotator.join(5)
+        self.log.wait_for_segments(5)
+        self.assertFalse(self.path.exists())
+        self.assertEqual(sum(s["lines"] for s in self.log.segments()), 6)
+        self.assertEqual(self.log.latest(1)[0]["details"]["i"], 99)
+
+    def test_compression_runs_off_the_writer_path(self):
+        self._write(range(5))
+        started, finish = threading.Event(), threading.Event()
+        compress = self.log._compress
+
+        def slow_compress(staging):
+            started.set()
+            finish.wait(5)
+            return compress(staging)
+
+        with mock.patch.object(self.log, "_compress", side_effect=slow_compress):
+            self.assertTrue(self.log.rotate())
+            started.wait(5)
+            self.assertEqual(self.log.segments(), [])  # still compressing
+            with self.log.open_append() as f:
+                f.write(_line(5))
+            finish.set()
+            self.assertTrue(self.log.wait_for_segments(5))
+        self.assertEqual(self.log.segments()[0]["lines"], 5)
+        self.assertEqual(len(self.path.read_text().splitlines()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
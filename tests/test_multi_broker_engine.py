@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MultiBrokerEngine pair leases
+Positions come from fake connectors (no broker credentials needed).
+PIN: 841921
+"""
+
+import os
+import tempfile
+import unittest
+import sys
+from collections import defaultdict
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+# The IBKR connector needs ib_insync at import time; the engine loads master.env on import
+sys.modules.setdefault('ib_insync', mock.MagicMock())
+with mock.patch.dict(os.environ):
+    from multi_broker_engine import MultiBrokerEngine
+from util.positions_registry import ActivePairLeases
+
+
+class _FakeOanda:
+    """Open trades in OANDA's shape"""
+
+    def __init__(self):
+        self.trades = []
+
+    def get_trades(self):
+        return list(self.trades)
+
+
+class _FakeIB:
+    """Open positions in IBConnector's shape"""
+
+    def __init__(self):
+        self.positions = []
+
+    def get_open_positions(self):
+        return list(self.positions)
+
+
+class TestPairLeaseRelease(unittest.TestCase):
+    """Test cases for releasing pair leases when positions close"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        db = os.path.join(self.tmp.name, 'registry.db')
+        self.leases = ActivePairLeases(db, lease_ttl=30)
+        self.other = ActivePairLeases(db, lease_ttl=30)
+        self.oanda, self.ib = _FakeOanda(), _FakeIB()
+        engine = MultiBrokerEngine.__new__(MultiBrokerEngine)
+        engine.brokers = {'oanda': self.oanda, 'ibkr': self.ib}
+        engine.max_pairs_per_platform = 4
+        engine.active_pairs_by_broker = defaultdict(set)
+        engine.unseen_pairs_by_broker = defaultdict(set)
+        engine.pair_leases = self.leases
+        self.engine = engine
+
+    def tearDown(self):
+        self.leases.close()
+        self.other.close()
+        self.tmp.cleanup()
+
+    def _monitor(self):
+        with mock.patch('builtins.print'):
+            return self.engine.monitor_positions()
+
+    def test_closed_position_frees_its_lease(self):
+        self.assertTrue(self.engine._acquire_pair('oanda', 'EUR/USD')[0])
+        self.oanda.trades = [{'instrument': 'EUR_USD', 'unrealizedPL': '12.5'}]
+        self.assertAlmostEqual(self._monitor(), 12.5)
+        self.assertFalse(self.other.acquire('EUR/USD', 'ibkr')[0])  # still open: lease held
+
+        self.oanda.trades = []
+        self._monitor()
+        self.assertIn('EUR/USD', self.engine.active_pairs_by_broker['oanda'])  # one empty poll is not enough
+        self._monitor()
+        self.assertNotIn('EUR/USD', self.engine.active_pairs_by_broker['oanda'])
+        self.assertIsNone(self.leases.holder('EUR/USD'))
+        self.assertTrue(self.other.acquire('EUR/USD', 'ibkr')[0])
+
+    def test_open_positions_keep_their_leases(self):
+        self.assertTrue(self.engine._acquire_pair('ibkr', 'AAPL')[0])
+        self.assertTrue(self.engine._acquire_pair('ibkr', 'MSFT')[0])
+        self.ib.positions = [{'symbol': 'AAPL', 'position': 10.0, 'unrealized_pnl': 0.0}]
+        self._monitor()
+        self._monitor()
+        self.assertEqual(self.engine.active_pairs_by_broker['ibkr'], {'AAPL'})
+        self.assertIsNotNone(self.leases.holder('AAPL'))
+        self.assertIsNone(self.leases.holder('MSFT'))
+
+    def test_connector_without_position_api_does_not_hold_leases(self):
+        self.engine.brokers['coinbase'] = object()
+        self.assertTrue(self.engine._acquire_pair('coinbase', 'BTC-USD')[0])
+        self._monitor()
+        self.assertEqual(self.engine.active_pairs_by_broker['coinbase'], set())
+        self.assertIsNone(self.leases.holder('BTC-USD'))
+
+
+if __name__ == "__main__":
+    unittest.main()
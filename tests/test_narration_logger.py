@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the buffered narration/P&L writer
+PIN: 841921
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.narration_logger import BufferedLogWriter
+
+
+class TestBufferedLogWriter(unittest.TestCase):
+    """Test cases for BufferedLogWriter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "narration.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _lines(self):
+        return self.path.read_text().splitlines() if self.path.exists() else []
+
+    def test_batches_written_on_interval(self):
+        writer = BufferedLogWriter(flush_interval=0.2)
+        for i in range(50):
+            writer.submit(self.path, json.dumps({"i": i}) + "\n")
+        self.assertLess(len(self._lines()), 50)  # not written on the caller's thread
+        time.sleep(0.5)
+        self.assertEqual([json.loads(l)["i"] for l in self._lines()], list(range(50)))
+        self.assertLessEqual(writer.stats["flushes"], 2)
+        writer.close()
+
+    def test_critical_event_flushed_before_return(self):
+        writer = BufferedLogWriter(flush_interval=60)
+        writer.submit(self.path, '{"event_type": "HIVE_ANALYSIS"}\n')
+        self.assertTrue(writer.submit(self.path, '{"event_type": "OCO_PLACED"}\n', critical=True))
+        self.assertEqual(len(self._lines()), 2)
+        writer.close()
+
+    def test_close_drains_queue(self):
+        writer = BufferedLogWriter(flush_interval=60)
+        for _ in range(10):
+            writer.submit(self.path, "{}\n")
+        writer.close()
+        self.assertEqual(len(self._lines()), 10)
+        writer.submit(self.path, "{}\n")  # after close: synchronous write
+        self.assertEqual(len(self._lines()), 11)
+
+    def test_submits_racing_close_are_not_lost(self):
+        writer = BufferedLogWriter(flush_interval=60)
+        start = threading.Barrier(5)
+
+        def produce():
+            start.wait()
+            for _ in range(200):
+                writer.submit(self.path, "{}\n")
+
+        threads = [threading.Thread(target=produce) for _ in range(4)]
+        for t in threads:
+            t.start()
+        start.wait()
+        writer.close()
+        for t in threads:
+            t.join(timeout=5)
+        self.assertEqual(len(self._lines()), 800)
+
+    def test_overflow_falls_back_to_sync_write(self):
+        writer = BufferedLogWriter(flush_interval=60, max_queue=1)
+        for _ in range(5):
+            writer.submit(self.path, "{}\n")
+        writer.close()
+        self.assertEqual(len(self._lines()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
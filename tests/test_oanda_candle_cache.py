@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental OANDA candle cache
+PIN: 841921
+"""
+
+import unittest
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from brokers.oanda_candle_cache import CandleCache, parse_oanda_time
+
+
+def _bars(start, n, complete_last=False):
+    """n consecutive M15 candles; the last one is in progress unless complete_last"""
+    out = []
+    for i in range(n):
+        t = start + timedelta(minutes=15 * i)
+        out.append({
+            "time": t.strftime("%Y-%m-%dT%H:%M:%S.000000000Z"),
+            "complete": complete_last or i < n - 1,
+            "volume": i,
+            "mid": {"o": "1", "h": "1", "l": "1", "c": str(1 + i / 1000)},
+        })
+    return out
+
+
+class TestCandleCache(unittest.TestCase):
+    """Test cases for CandleCache"""
+
+    def setUp(self):
+        self.cache = CandleCache(maxlen=200)
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self.start = now - timedelta(minutes=15 * 119)
+
+    def test_cold_then_incremental(self):
+        """First call loads count bars, later calls ask only for bars after the last completed one"""
+        params = self.cache.request_params("EUR_USD", "M15", 120)
+        self.assertEqual(params, {"count": 120})
+        cold = _bars(self.start, 120)
+        result = self.cache.update("EUR_USD", "M15", cold, 120, params)
+        self.assertEqual(len(result), 120)
+        self.assertFalse(result[-1]["complete"])
+
+        params = self.cache.request_params("EUR_USD", "M15", 120)
+        self.assertEqual(params["from"], cold[-2]["time"])
+        self.assertEqual(params["count"], 200)  # explicit: OANDA would otherwise send at most 500
+
+        # Previous in-progress bar closed, a new one opened
+        new = _bars(self.start + timedelta(minutes=15 * 119), 2)
+        result = self.cache.update("EUR_USD", "M15", new, 120, params)
+        self.assertEqual(len(result), 120)
+        self.assertEqual(result[-1]["time"], new[-1]["time"])
+        self.assertTrue(result[-2]["complete"])
+        self.assertEqual(result[0]["time"], cold[1]["time"])
+        self.assertEqual(self.cache.stats["cold_fetches"], 1)
+        self.assertEqual(self.cache.stats["incremental_fetches"], 1)
+
+    def test_duplicate_bars_ignored(self):
+        """Bars at or before the last cached time are not appended twice"""
+        cold = _bars(self.start, 120)
+        self.cache.update("EUR_USD", "M15", cold, 120, {"count": 120})
+        params = self.cache.request_params("EUR_USD", "M15", 120)
+        result = self.cache.update("EUR_USD", "M15", cold[-3:], 120, params)
+        times = [c["time"] for c in result]
+        self.assertEqual(len(times), len(set(times)))
+
+    def test_long_gap_forces_cold_fetch(self):
+        """A gap longer than the ring would leave a hole, so reload in full"""
+        old_start = datetime.now(timezone.utc) - timedelta(days=30)
+        self.cache.update("EUR_USD", "M15", _bars(old_start, 120), 120, {"count": 120})
+        self.assertEqual(self.cache.request_params("EUR_USD", "M15", 120), {"count": 120})
+
+    def test_gap_beyond_request_window_forces_cold_fetch(self):
+        """Large rings are still limited by the bars one from= request returns"""
+        cache = CandleCache(maxlen=10000)
+        start = datetime.now(timezone.utc) - timedelta(minutes=15 * 6000)
+        cache.update("EUR_USD", "M15", _bars(start, 120), 120, {"count": 120})
+        self.assertEqual(cache.request_params("EUR_USD", "M15", 120), {"count": 120})
+        start = datetime.now(timezone.utc) - timedelta(minutes=15 * 700)
+        cache.update("EUR_USD", "M15", _bars(start, 120), 120, {"count": 120})
+        params = cache.request_params("EUR_USD", "M15", 120)
+        self.assertEqual(params["count"], 5000)
+
+    def test_series_are_independent(self):
+        self.cache.update("EUR_USD", "M15", _bars(self.start, 120), 120, {"count": 120})
+        self.assertEqual(self.cache.request_params("EUR_USD", "H1", 50), {"count": 50})
+        self.assertEqual(self.cache.get("GBP_USD", "M15", 10), [])
+
+    def test_parse_oanda_time(self):
+        t = parse_oanda_time("2025-01-02T03:04:05.123456789Z")
+        self.assertEqual((t.year, t.hour, t.second), (2025, 3, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
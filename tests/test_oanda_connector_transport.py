@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the OandaConnector pooled HTTP transport
+Runs against a local keep-alive HTTP server (no OANDA credentials needed).
+PIN: 841921
+"""
+
+import unittest
+import asyncio
+import os
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+os.environ.setdefault("OANDA_PRACTICE_TOKEN", "test-token")
+os.environ.setdefault("OANDA_PRACTICE_ACCOUNT_ID", "101-001-0000000-001")
+
+from brokers.oanda_connector import OandaConnector
+from brokers.oanda_async_connector import AsyncOandaConnector
+
+
+class _FakeOandaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if "/pricing" in self.path:
+            self._reply(200, {"prices": [{
+                "instrument": "EUR_USD",
+                "bids": [{"price": "1.08000"}],
+                "asks": [{"price": "1.08020"}],
+                "time": "2025-01-01T00:00:00Z",
+            }]})
+        elif "/USD_JPY/candles" in self.path:
+            # RFC3339 timestamps as OANDA sends them, for the decoded array path
+            self._reply(200, {"candles": [{"time": "2025-01-01T00:00:00.000000000Z", "volume": 1, "complete": True,
+                                           "mid": {"o": "1", "h": "1", "l": "1", "c": "1"}}]})
+        elif "/candles" in self.path:
+            self._reply(200, {"candles": [{"time": "t", "volume": 1, "complete": True,
+                                           "mid": {"o": "1", "h": "1", "l": "1", "c": "1"}}]})
+        else:
+            self._reply(404, {"errorMessage": "not found"})
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply(200, {"orderCancelTransaction": {"id": "1"}})
+
+    def log_message(self, *args):
+        pass
+
+
+class TestOandaConnectorTransport(unittest.TestCase):
+    """Test cases for the pooled keep-alive session"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOandaHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.connector = OandaConnector(environment="practice", pool_size=4, max_retries=0)
+        self.connector.api_base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.connector.close()
+
+    def test_connections_are_reused(self):
+        """Consecutive calls ride one keep-alive connection"""
+        for _ in range(5):
+            prices = self.connector.get_live_prices(["EUR_USD"])
+            self.assertAlmostEqual(prices["EUR_USD"]["bid"], 1.08)
+
+        stats = self.connector.get_connection_stats()
+        pricing = stats["endpoints"]["GET pricing"]
+        self.assertEqual(pricing["requests"], 5)
+        self.assertEqual(pricing["new_connections"], 1)
+        self.assertEqual(pricing["reused_connections"], 4)
+        self.assertEqual(stats["pool_size"], 4)
+
+    def test_per_endpoint_counters(self):
+        """Stats are keyed by method and endpoint class"""
+        self.connector.get_historical_data("EUR_USD", count=1)
+        self.connector.cancel_order("42")
+        self.connector.get_trades()  # 404 on the fake server
+
+        endpoints = self.connector.get_connection_stats()["endpoints"]
+        self.assertEqual(endpoints["GET candles"]["requests"], 1)
+        self.assertEqual(endpoints["PUT orders"]["requests"], 1)
+        self.assertEqual(endpoints["GET trades"]["errors"], 1)
+        self.assertGreaterEqual(endpoints["GET candles"]["avg_latency_ms"], 0)
+
+    def test_historical_data_as_array(self):
+        """Candles can be returned as a decoded record array"""
+        bars = self.connector.get_historical_data("USD_JPY", count=1, as_array=True)
+        self.assertEqual(bars.dtype.names, ("time", "open", "high", "low", "close", "volume", "complete"))
+        self.assertEqual(bars["close"].tolist(), [1.0])
+        self.assertEqual(bars["time"][0], 1735689600 * 10**9)
+
+    def test_price_snapshot_single_request(self):
+        """A snapshot for many instruments costs one pricing request and is read-only"""
+        snapshot = self.connector.get_price_snapshot(["EUR_USD", "GBP_USD", "EUR_USD"])
+        self.assertIn("EUR_USD", snapshot)
+        self.assertAlmostEqual(snapshot.get("EUR_USD")["mid"], 1.0801)
+        with self.assertRaises(TypeError):
+            snapshot.get("EUR_USD")["bid"] = 0.0
+        endpoints = self.connector.get_connection_stats()["endpoints"]
+        self.assertEqual(endpoints["GET pricing"]["requests"], 1)
+
+    def test_performance_stats_use_real_latency(self):
+        """Legacy rolling latency window is still populated"""
+        self.connector.get_live_prices(["EUR_USD"])
+        perf = self.connector.get_performance_stats()
+        self.assertEqual(perf["total_requests"], 1)
+
+
+class TestAsyncOandaConnector(unittest.TestCase):
+    """Test cases for the awaitable connector"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOandaHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.sync = OandaConnector(environment="practice", max_retries=0)
+        self.sync.api_base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.sync.close()
+
+    def test_concurrent_calls_share_stats(self):
+        """Concurrent awaits return sync-shaped results and feed the shared counters"""
+        async def run():
+            async with AsyncOandaConnector(connector=self.sync) as conn:
+                return await asyncio.gather(
+                    conn.get_live_prices(["EUR_USD"]),
+                    conn.get_historical_data("EUR_USD", count=1),
+                    conn.cancel_order("42"),
+                    conn.get_trades(),
+                    conn.get_historical_data("USD_JPY", count=1, as_array=True),
+                )
+
+        prices, candles, cancel, trades, bars = asyncio.run(run())
+        self.assertAlmostEqual(prices["EUR_USD"]["ask"], 1.0802)
+        self.assertEqual(len(candles), 1)
+        self.assertEqual(bars["close"].tolist(), [1.0])
+        self.assertTrue(cancel["success"])
+        self.assertEqual(trades, [])
+
+        endpoints = self.sync.get_connection_stats()["endpoints"]
+        self.assertEqual(endpoints["GET pricing"]["requests"], 1)
+        self.assertEqual(endpoints["GET trades"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
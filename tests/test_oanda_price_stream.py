@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the OANDA streaming price feed and quote cache
+Runs against a local streaming HTTP server (no OANDA credentials needed).
+PIN: 841921
+"""
+
+import unittest
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+os.environ.setdefault("OANDA_PRACTICE_TOKEN", "test-token")
+os.environ.setdefault("OANDA_PRACTICE_ACCOUNT_ID", "101-001-0000000-001")
+
+from brokers.oanda_connector import OandaConnector
+from brokers.oanda_price_stream import OandaPriceStream, QuoteCache, Quote
+
+
+class _FakeStreamHandler(BaseHTTPRequestHandler):
+    """Sends one PRICE and one HEARTBEAT chunk (like OANDA), then goes silent"""
+    protocol_version = "HTTP/1.1"
+
+    def _chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._chunk({"type": "PRICE", "instrument": "EUR_USD", "time": "2025-01-01T00:00:00Z",
+                     "bids": [{"price": "1.10000"}], "asks": [{"price": "1.10010"}], "tradeable": True})
+        self._chunk({"type": "HEARTBEAT", "time": "t"})
+        time.sleep(1.5)  # stall past the heartbeat timeout
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+class TestQuoteCache(unittest.TestCase):
+    """Test cases for QuoteCache"""
+
+    def test_max_age(self):
+        cache = QuoteCache()
+        cache.update(Quote("EUR_USD", 1.0, 1.1, 1.05, "t", time.monotonic() - 10))
+        self.assertIsNotNone(cache.get("EUR_USD"))
+        self.assertIsNone(cache.get("EUR_USD", max_age=5))
+        self.assertIsNone(cache.get("GBP_USD"))
+
+
+class TestOandaPriceStream(unittest.TestCase):
+    """Test cases for OandaPriceStream"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeStreamHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.connector = OandaConnector(environment="practice", max_retries=0)
+        self.connector.stream_base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.stream = OandaPriceStream(self.connector, ["EUR_USD"], heartbeat_timeout=0.5,
+                                       reconnect_backoff=0.05)
+        self.connector.price_stream = self.stream
+
+    def tearDown(self):
+        self.stream.stop()
+        self.connector.close()
+
+    def _wait_for(self, predicate, timeout=3.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def test_quotes_served_from_cache(self):
+        """Connector reads bid/ask from the stream while it is healthy"""
+        self.stream.start()
+        self.assertTrue(self._wait_for(lambda: self.stream.get_quote("EUR_USD") is not None))
+        quote = self.connector.get_current_bid_ask("EUR_USD")
+        self.assertEqual(quote["source"], "stream")
+        self.assertAlmostEqual(quote["bid"], 1.1)
+        self.assertAlmostEqual(quote["ask"], 1.1001)
+        self.assertTrue(self._wait_for(lambda: self.stream.stats["heartbeats"] >= 1))
+
+    def test_stale_stream_reconnects(self):
+        """A silent stream is detected as stale and re-opened"""
+        self.stream.start()
+        self.assertTrue(self._wait_for(lambda: self.stream.stats["stale_disconnects"] >= 1))
+        self.assertTrue(self._wait_for(lambda: self.stream.stats["connects"] >= 2))
+        self.assertGreaterEqual(self.stream.stats["reconnects"], 1)
+
+    def test_unhealthy_stream_returns_none(self):
+        """No quotes are served before the stream connects"""
+        self.assertIsNone(self.stream.get_quote("EUR_USD"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the cached ParameterManager
+PIN: 841921
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.parameter_manager import ParameterManager
+
+# Keep the change audit log (logs/parameter_changes.log) out of the repo
+_quiet_change_log = mock.patch.dict(os.environ, {'RICK_PARAM_LOG': 'off'})
+
+
+def setUpModule():
+    _quiet_change_log.start()
+
+
+def tearDownModule():
+    _quiet_change_log.stop()
+
+
+class TestParameterManager(unittest.TestCase):
+    """Test cases for ParameterManager caching and notifications"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'params.json')
+        with open(self.path, 'w') as f:
+            json.dump({'risk.max_position_pct': '0.1', 'gate.enabled': 'true', 'oanda.environment': 'practice'}, f)
+        self.pm = ParameterManager(self.path)
+
+    def tearDown(self):
+        self.pm.stop_watching()
+        self.tmp.cleanup()
+
+    def _edit_on_disk(self, **changes):
+        with open(self.path) as f:
+            params = json.load(f)
+        params.update(changes)
+        with open(self.path, 'w') as f:
+            json.dump(params, f)
+
+    def test_typed_getters(self):
+        self.assertEqual(self.pm.get_float('risk.max_position_pct'), 0.1)
+        self.assertIs(self.pm.get_bool('gate.enabled'), True)
+        self.assertEqual(self.pm.get_int('missing', 7), 7)
+        self.assertEqual(self.pm.get_float('oanda.environment', 1.5), 1.5)  # not numeric: default
+
+    def test_refresh_is_stat_only_until_file_changes(self):
+        self.assertEqual(self.pm.refresh(), {})
+        self._edit_on_disk(**{'risk.max_position_pct': 0.05})
+        self.assertEqual(self.pm.refresh(), {'risk.max_position_pct': ('0.1', 0.05)})
+        self.assertEqual(self.pm.get_float('risk.max_position_pct'), 0.05)
+
+    def test_set_notifies_matching_subscribers(self):
+        risk, gates = [], []
+        self.pm.subscribe(risk.append, prefix='risk.', watch=False)
+        unsubscribe = self.pm.subscribe(gates.append, keys=['gate.enabled'], watch=False)
+        self.pm.get_float('risk.max_position_pct')  # cache the old value
+        self.assertTrue(self.pm.bulk_update({'risk.max_position_pct': 0.08, 'gate.enabled': False}, 'test'))
+        self.assertEqual(risk, [{'risk.max_position_pct': ('0.1', 0.08)}])
+        self.assertEqual(gates, [{'gate.enabled': ('true', False)}])
+        self.assertEqual(self.pm.get_float('risk.max_position_pct'), 0.08)
+
+        unsubscribe()
+        self.pm.set('gate.enabled', True, 'test')
+        self.assertEqual(len(gates), 1)
+        self.assertEqual(self.pm.refresh(), {})  # own write does not trigger a reload
+
+    def test_locked_parameter_rejected_without_notification(self):
+        seen = []
+        self.pm.subscribe(seen.append, watch=False)
+        self.pm.lock_parameter('oanda.environment')
+        self.assertFalse(self.pm.set('oanda.environment', 'live', 'test'))
+        self.assertEqual(self.pm.get('oanda.environment'), 'practice')
+        self.assertEqual(seen, [])
+
+    def test_watcher_delivers_out_of_process_edits(self):
+        received = threading.Event()
+        seen = []
+
+        def on_change(changes):
+            seen.append(changes)
+            received.set()
+
+        self.pm.watch_interval = 0.05
+        self.pm.subscribe(on_change, keys=['risk.max_position_pct'])
+        time.sleep(0.1)  # let the watcher arm
+        self._edit_on_disk(**{'risk.max_position_pct': 0.02})
+        self.assertTrue(received.wait(3.0))
+        self.assertEqual(seen[0], {'risk.max_position_pct': ('0.1', 0.02)})
+        self.assertEqual(self.pm.get_float('risk.max_position_pct'), 0.02)
+
+
+class TestConnectorSubscription(unittest.TestCase):
+    """EnhancedOandaConnector never follows oanda.environment changes made elsewhere"""
+
+    def setUp(self):
+        try:
+            import brokers.oanda_connector_enhanced as enhanced
+        except ImportError as e:
+            self.skipTest(f"connector dependencies missing: {e}")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pm = ParameterManager(os.path.join(self.tmp.name, 'oanda_parameters.json'))
+        for patch in (mock.patch.object(enhanced, 'get_parameter_manager', return_value=self.pm),
+                      mock.patch.dict(os.environ)):
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.connectors = [enhanced.EnhancedOandaConnector(environment='practice') for _ in range(2)]
+
+    def tearDown(self):
+        for connector in self.connectors:
+            connector.close()
+        self.pm.stop_watching()
+        self.tmp.cleanup()
+
+    def test_environment_change_does_not_flip_other_connectors(self):
+        first, second = self.connectors
+        with self.assertLogs(second.logger, level='WARNING') as logs:
+            first.switch_environment('live')
+        self.assertEqual(first.environment, 'live')
+        self.assertEqual(second.environment, 'practice')
+        self.assertEqual(second.api_base, 'https://api-fxpractice.oanda.com')
+        self.assertIn('stays on practice', logs.output[0])
+        self.pm.set('oanda.environment', 'practice', component='test')
+        self.assertEqual(first.environment, 'live')
+        self.assertIsNone(self.pm._watcher)  # no file watch started by connectors
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for PatternLearner journal + snapshot persistence
+PIN: 841921
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+
+from ml_learning.pattern_learner import PatternLearner, TradePattern, decode_patterns, encode_patterns
+
+
+def _signal(i):
+    return {
+        'timestamp': f"2025-11-20T10:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+        'regime': 'BULLISH' if i % 2 else 'BEARISH',
+        'confidence': 0.7,
+        'direction': 'BUY',
+        'signals': ['RSI_BULL_RANGE', 'MACD_BULLISH_CROSSOVER'] if i % 3 else [],
+        'technical_data': {'rsi': 40.0 + i % 20, 'bb_position': 0.5} if i % 4 else {'rsi': 55.0},
+    }
+
+
+class TestPatternPersistence(unittest.TestCase):
+    """Test cases for journaled pattern persistence"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.patterns_file = os.path.join(self.tmp.name, 'patterns.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _learner(self):
+        return PatternLearner(patterns_file=self.patterns_file)
+
+    def test_updates_append_to_journal(self):
+        learner = self._learner()
+        ids = [learner.store_trade_pattern(_signal(i), entry_price=1.1) for i in range(5)]
+        learner.update_trade_outcome(ids[1], exit_price=1.2, outcome='WIN', pnl=0.1, duration_minutes=30)
+        with open(learner.journal_file) as f:
+            ops = [json.loads(line)['op'] for line in f]
+        self.assertEqual(ops, ['add'] * 5 + ['outcome'])
+        self.assertFalse(os.path.exists(learner.snapshot_file))
+
+    def test_restart_replays_journal(self):
+        learner = self._learner()
+        ids = [learner.store_trade_pattern(_signal(i), entry_price=1.1) for i in range(12)]
+        learner.update_trade_outcome(ids[3], exit_price=1.2, outcome='WIN', pnl=0.1, duration_minutes=30)
+        reloaded = self._learner()
+        self.assertEqual(reloaded.patterns, learner.patterns)
+        self.assertEqual(reloaded.trade_count, 1)
+
+    def test_rejected_outcome_removal_replays(self):
+        learner = self._learner()
+        learner.min_win_rate = 0.95
+        ids = [learner.store_trade_pattern(_signal(i)) for i in range(15)]
+        for pid in ids[:10]:
+            learner.update_trade_outcome(pid, exit_price=1.0, outcome='WIN', pnl=0.1, duration_minutes=5)
+        learner.update_trade_outcome(ids[12], exit_price=1.0, outcome='LOSS', pnl=-0.1, duration_minutes=5)
+        self.assertEqual(len(learner.patterns), 14)  # losing update pushed win rate below min: dropped
+        reloaded = self._learner()
+        self.assertEqual(reloaded.patterns, learner.patterns)
+        self.assertEqual(reloaded.trade_count, learner.trade_count)
+
+    def test_compaction_snapshot_and_truncate(self):
+        learner = self._learner()
+        learner.compact_min_records = 20
+        for i in range(25):
+            learner.store_trade_pattern(_signal(i))
+        self.assertTrue(os.path.exists(learner.snapshot_file))
+        self.assertEqual(learner.journal.records, 5)
+        reloaded = self._learner()
+        self.assertEqual(reloaded.patterns, learner.patterns)
+
+    def test_records_after_compaction_survive_restarts(self):
+        learner = self._learner()
+        learner.compact_min_records = 3
+        for i in range(3):
+            learner.store_trade_pattern(_signal(i))
+        self.assertEqual(learner.journal.records, 0)  # compacted: journal emptied
+        restarted = self._learner()
+        for i in range(3, 5):
+            restarted.store_trade_pattern(_signal(i))
+        reloaded = self._learner()
+        self.assertEqual(len(reloaded.patterns), 5)
+        self.assertEqual(reloaded.patterns, restarted.patterns)
+
+    def test_legacy_json_migrates_to_snapshot(self):
+        legacy = TradePattern(timestamp='2025-11-20T10:00:00+00:00', regime='BULLISH',
+                              indicators={'rsi': 45.0}, signals=['X'], confidence=0.6, direction='BUY',
+                              outcome='WIN', pnl=0.2, duration_minutes=10)
+        with open(self.patterns_file, 'w') as f:
+            json.dump({'patterns': [legacy.__dict__], 'trade_count': 3}, f)
+        learner = self._learner()
+        self.assertEqual(learner.patterns, [legacy])
+        self.assertEqual(learner.trade_count, 3)
+        self.assertTrue(os.path.exists(learner.snapshot_file))
+
+    def test_snapshot_loads_100k_patterns_quickly(self):
+        patterns = [
+            TradePattern(timestamp=f"2025-11-20T10:00:00.{i:06d}+00:00", regime='BULLISH' if i % 2 else 'BEARISH',
+                         indicators={'rsi': float(i % 100), 'bb_position': 0.5, 'confidence': 0.7},
+                         signals=['RSI_BULL_RANGE', 'MACD_BULLISH_CROSSOVER'], confidence=0.7, direction='BUY',
+                         entry_price=1.1, exit_price=1.2 if i % 2 else None, outcome='WIN' if i % 2 else None,
+                         pnl=0.1 if i % 2 else None, duration_minutes=30 if i % 2 else None, win_rate_context=0.5)
+            for i in range(100000)
+        ]
+        path = os.path.join(self.tmp.name, 'big.npz')
+        with open(path, 'wb') as f:
+            np.savez(f, **encode_patterns(patterns, seq=42, trade_count=7))
+        start = time.perf_counter()
+        with np.load(path, allow_pickle=False) as data:
+            loaded, seq, trade_count = decode_patterns(data)
+        elapsed = time.perf_counter() - start
+        self.assertEqual((seq, trade_count), (42, 7))
+        self.assertEqual(loaded[:3], patterns[:3])
+        self.assertEqual(loaded[-1], patterns[-1])
+        self.assertLess(elapsed, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,15 +9,18 @@ import unittest
 import os
 import sys
 import json
+import subprocess
 import tempfile
 import time
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
-from util.positions_registry import PositionsRegistry
+from util.positions_registry import (ActivePairLeases, PositionsRegistry, SQLitePositionsRegistry,
+                                     get_positions_registry)
 
 
 class TestPositionsRegistry(unittest.TestCase):
@@ -306,6 +309,162 @@ class TestRegistryEdgeCases(unittest.TestCase):
             self.registry.unregister_position(symbol, 'test')
 
 
+class TestSQLitePositionsRegistry(unittest.TestCase):
+    """Test cases for the SQLite backend"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.registry_file = os.path.join(self.temp_dir.name, 'test_registry.db')
+        self.registry = SQLitePositionsRegistry(registry_file=self.registry_file)
+    
+    def tearDown(self):
+        """Clean up test files"""
+        self.temp_dir.cleanup()
+    
+    def test_register_and_unregister(self):
+        """Test the shared API round trip"""
+        self.assertTrue(self.registry.register_position('EUR_USD', 'oanda', '1', 'BUY', 15000))
+        self.assertFalse(self.registry.register_position('EUR_USD', 'ibkr', '2', 'SELL', 15000))
+        self.assertTrue(self.registry.register_position('EUR_USD', 'oanda', '3', 'SELL', 20000))
+        self.assertFalse(self.registry.is_symbol_available('EUR_USD'))
+        self.assertEqual(self.registry.get_active_positions()['EUR_USD']['order_id'], '3')
+        self.assertEqual(self.registry.get_active_positions(platform='ibkr'), {})
+        self.assertFalse(self.registry.unregister_position('EUR_USD', 'ibkr'))
+        self.assertTrue(self.registry.unregister_position('EUR_USD', 'oanda'))
+        self.assertTrue(self.registry.is_symbol_available('EUR_USD'))
+    
+    def test_try_register_compare_and_set(self):
+        """Test that expected_order_id guards same-platform replacement"""
+        self.assertTrue(self.registry.try_register('GBP_USD', 'oanda', '1', 'BUY', 15000))
+        self.assertFalse(self.registry.try_register('GBP_USD', 'oanda', '2', 'BUY', 15000, expected_order_id='9'))
+        self.assertTrue(self.registry.try_register('GBP_USD', 'oanda', '2', 'BUY', 15000, expected_order_id='1'))
+        self.assertEqual(self.registry.get_active_positions()['GBP_USD']['order_id'], '2')
+    
+    def test_concurrent_try_register_single_winner(self):
+        """Test that racing platforms get exactly one winner"""
+        results = []
+        registries = [SQLitePositionsRegistry(registry_file=self.registry_file) for _ in range(3)]
+        
+        def claim(registry, platform):
+            results.append((platform, registry.try_register('USD_JPY', platform, platform, 'BUY', 15000)))
+        
+        threads = [threading.Thread(target=claim, args=(r, p))
+                   for r, p in zip(registries, ['oanda', 'ibkr', 'coinbase'])]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        winners = [p for p, ok in results if ok]
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(self.registry.get_active_positions()['USD_JPY']['platform'], winners[0])
+    
+    def test_cleanup_stale_positions(self):
+        """Test cleanup of stale positions"""
+        self.registry.register_position('EUR_USD', 'oanda', '1', 'BUY', 15000)
+        self.registry.register_position('AUD_USD', 'oanda', '2', 'BUY', 15000)
+        with self.registry._writing() as conn:
+            conn.execute("UPDATE positions SET registered_at = ? WHERE symbol = 'EUR_USD'",
+                         (datetime(2020, 1, 1, tzinfo=timezone.utc).isoformat(),))
+        self.assertEqual(self.registry.cleanup_stale_positions(max_age_hours=1), 1)
+        self.assertEqual(list(self.registry.get_active_positions()), ['AUD_USD'])
+    
+    def test_imports_legacy_json_once(self):
+        """Test one-time import of the JSON registry"""
+        legacy = PositionsRegistry(registry_file=os.path.join(self.temp_dir.name, 'legacy.json'))
+        legacy.register_position('NZD_USD', 'ibkr', '7', 'SELL', 15000)
+        db = os.path.join(self.temp_dir.name, 'migrated.db')
+        registry = SQLitePositionsRegistry(registry_file=db, legacy_file=legacy.registry_file)
+        self.assertEqual(registry.get_active_positions()['NZD_USD']['platform'], 'ibkr')
+        registry.unregister_position('NZD_USD', 'ibkr')
+        reopened = SQLitePositionsRegistry(registry_file=db, legacy_file=legacy.registry_file)
+        self.assertTrue(reopened.is_symbol_available('NZD_USD'))
+    
+    def test_backend_selection(self):
+        """Test get_positions_registry backend choice"""
+        self.assertIsInstance(get_positions_registry('sqlite', self.registry_file), SQLitePositionsRegistry)
+        json_file = os.path.join(self.temp_dir.name, 'r.json')
+        self.assertIsInstance(get_positions_registry('json', json_file), PositionsRegistry)
+        with self.assertRaises(ValueError):
+            get_positions_registry('redis', json_file)
+
+
+class TestActivePairLeases(unittest.TestCase):
+    """Test cases for the cross-engine active-pair leases"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.temp_dir.name, 'registry.db')
+        self.oanda = ActivePairLeases(self.db, lease_ttl=30, watch_interval=0.02)
+        self.coinbase = ActivePairLeases(self.db, lease_ttl=30)
+    
+    def tearDown(self):
+        self.oanda.close()
+        self.coinbase.close()
+        self.temp_dir.cleanup()
+    
+    def _insert_foreign_lease(self, symbol, pid, expires_at):
+        conn = self.oanda._conn()
+        conn.execute("INSERT INTO active_pairs VALUES (?, 'ibkr', ?, ?, ?, ?, ?)",
+                     (symbol, f"{self.oanda.host}:{pid}:x", self.oanda.host, pid, time.time(), expires_at))
+    
+    def test_acquire_blocks_other_platform_and_enforces_limit(self):
+        self.assertEqual(self.oanda.acquire('EUR_USD', 'oanda'), (True, "OK"))
+        self.assertEqual(self.oanda.acquire('EUR_USD', 'oanda'), (True, "OK"))  # renewal
+        acquired, reason = self.coinbase.acquire('EUR_USD', 'coinbase')
+        self.assertFalse(acquired)
+        self.assertIn('oanda', reason)
+        self.assertTrue(self.oanda.acquire('GBP_USD', 'oanda', max_per_platform=2)[0])
+        self.assertFalse(self.oanda.acquire('USD_JPY', 'oanda', max_per_platform=2)[0])
+        self.assertEqual(self.coinbase.count_by_platform(), {'oanda': 2})
+        self.assertEqual(self.coinbase.holder('GBP_USD'), 'oanda')
+    
+    def test_release_only_own_lease(self):
+        self.oanda.acquire('EUR_USD', 'oanda')
+        self.assertFalse(self.coinbase.release('EUR_USD'))
+        self.assertTrue(self.oanda.release('EUR_USD'))
+        self.assertTrue(self.coinbase.acquire('EUR_USD', 'coinbase')[0])
+    
+    def test_concurrent_acquire_has_single_winner(self):
+        instances = [ActivePairLeases(self.db, lease_ttl=30) for _ in range(8)]
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(instances[i].acquire('BTC-USD', f"p{i}")[0]))
+                   for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results.count(True), 1)
+        for inst in instances:
+            inst.close()
+    
+    def test_expired_and_dead_owner_leases_are_reaped(self):
+        self._insert_foreign_lease('AAPL', os.getpid(), time.time() - 1)  # missed its renewals
+        self.assertIsNone(self.oanda.holder('AAPL'))
+        proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+        proc.wait()
+        self._insert_foreign_lease('MSFT', proc.pid, time.time() + 60)  # owner process is gone
+        self.assertEqual(self.oanda.holder('MSFT'), 'ibkr')
+        self.assertTrue(self.coinbase.acquire('MSFT', 'coinbase')[0])
+        self.assertTrue(self.coinbase.acquire('AAPL', 'coinbase')[0])
+    
+    def test_watch_reports_changes_from_other_instances(self):
+        seen = []
+        changed = threading.Event()
+        
+        def on_change(pairs):
+            seen.append(pairs)
+            if pairs:
+                changed.set()
+        
+        self.oanda.watch(on_change)
+        time.sleep(0.1)
+        self.coinbase.acquire('ETH-USD', 'coinbase')
+        self.assertTrue(changed.wait(2.0))
+        self.assertEqual(seen[-1], {'ETH-USD': 'coinbase'})
+
+
 def run_tests():
     """Run all tests"""
     # Create test suite
@@ -315,6 +474,8 @@ def run_tests():
     # Add test cases
     suite.addTests(loader.loadTestsFromTestCase(TestPositionsRegistry))
     suite.addTests(loader.loadTestsFromTestCase(TestRegistryEdgeCases))
+    suite.addTests(loader.loadTestsFromTestCase(TestSQLitePositionsRegistry))
+    suite.addTests(loader.loadTestsFromTestCase(TestActivePairLeases))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
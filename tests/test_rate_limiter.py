@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the priority broker request scheduler
+PIN: 841921
+"""
+
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from brokers.rate_limiter import PriorityRateLimiter, RequestPriority, RateLimitTimeout
+
+
+class TestPriorityRateLimiter(unittest.TestCase):
+    """Test cases for PriorityRateLimiter"""
+
+    def test_burst_then_throttle(self):
+        limiter = PriorityRateLimiter(rate=20, burst=3, reserve=0)
+        for _ in range(3):
+            self.assertLess(limiter.acquire(RequestPriority.ACCOUNT), 0.01)
+        self.assertGreater(limiter.acquire(RequestPriority.ACCOUNT), 0.02)
+
+    def test_order_jumps_queued_candles(self):
+        """An ORDER arriving behind queued CANDLES requests is served first"""
+        limiter = PriorityRateLimiter(rate=10, burst=1, reserve=0)
+        limiter.acquire(RequestPriority.CANDLES)  # drain the bucket
+        served = []
+        lock = threading.Lock()
+
+        def worker(priority):
+            limiter.acquire(priority)
+            with lock:
+                served.append(priority)
+
+        threads = [threading.Thread(target=worker, args=(RequestPriority.CANDLES,)) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.02)
+        order = threading.Thread(target=worker, args=(RequestPriority.ORDER,))
+        order.start()
+        for t in threads + [order]:
+            t.join(timeout=2)
+        self.assertEqual(served[0], RequestPriority.ORDER)
+
+    def test_reserve_held_for_orders(self):
+        limiter = PriorityRateLimiter(rate=1, burst=2, reserve=1)
+        limiter.acquire(RequestPriority.ACCOUNT)
+        with self.assertRaises(RateLimitTimeout):
+            limiter.acquire(RequestPriority.ACCOUNT, timeout=0.05)
+        self.assertLess(limiter.acquire(RequestPriority.ORDER, timeout=0.05), 0.05)
+
+    def test_metrics(self):
+        limiter = PriorityRateLimiter(rate=100, burst=5, name="test")
+        limiter.acquire(RequestPriority.PRICING)
+        metrics = limiter.get_metrics()
+        self.assertEqual(metrics["name"], "test")
+        self.assertEqual(metrics["classes"]["PRICING"]["acquired"], 1)
+        self.assertEqual(metrics["queue_depth"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for single-flight broker read coalescing
+PIN: 841921
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from brokers.request_coalescer import RequestCoalescer
+
+
+class TestRequestCoalescer(unittest.TestCase):
+    """Test cases for RequestCoalescer"""
+
+    def setUp(self):
+        self.coalescer = RequestCoalescer()
+        self.calls = 0
+        self.key = RequestCoalescer.make_key("GET", "/v3/accounts/x/trades")
+
+    def _slow_fetch(self):
+        self.calls += 1
+        time.sleep(0.1)
+        return {"success": True, "data": {"trades": []}}
+
+    def test_concurrent_calls_share_one_request(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.coalescer.do(self.key, self._slow_fetch)))
+                   for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=2)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r == results[0] for r in results))
+        # Each caller owns its copy
+        self.assertEqual(len({id(r) for r in results}), 5)
+        results[0]["data"]["trades"].append("mutated")
+        self.assertEqual(results[1]["data"]["trades"], [])
+        self.assertEqual(self.coalescer.get_stats()["coalesced"], 4)
+
+    def test_micro_cache_ttl_and_invalidate(self):
+        self.coalescer.do(self.key, self._slow_fetch, ttl=5)
+        self.coalescer.do(self.key, self._slow_fetch, ttl=5)
+        self.assertEqual(self.calls, 1)
+        self.coalescer.invalidate()
+        self.coalescer.do(self.key, self._slow_fetch, ttl=5)
+        self.assertEqual(self.calls, 2)
+
+    def test_invalidate_during_flight_does_not_cache_stale_result(self):
+        results = []
+        reader = threading.Thread(target=lambda: results.append(self.coalescer.do(self.key, self._slow_fetch, ttl=5)))
+        reader.start()
+        time.sleep(0.03)
+        self.coalescer.invalidate()  # e.g. an order was placed while the read was on the wire
+        # A caller arriving after the write starts its own request instead of joining the stale one
+        self.coalescer.do(self.key, self._slow_fetch, ttl=5)
+        reader.join(timeout=2)
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(len(results), 1)
+        self.coalescer.do(self.key, self._slow_fetch, ttl=5)
+        self.assertEqual(self.calls, 2)  # cached by the post-invalidate read only
+
+    def test_async_invalidate_during_flight(self):
+        async def fetch():
+            self.calls += 1
+            n = self.calls
+            await asyncio.sleep(0.05)
+            return {"success": True, "n": n}
+
+        async def run():
+            first = asyncio.ensure_future(self.coalescer.do_async(self.key, fetch, ttl=5))
+            await asyncio.sleep(0.01)
+            self.coalescer.invalidate()
+            second = await self.coalescer.do_async(self.key, fetch, ttl=5)
+            return await first, second, await self.coalescer.do_async(self.key, fetch, ttl=5)
+
+        first, second, cached = asyncio.run(run())
+        self.assertEqual((first["n"], second["n"], cached["n"]), (1, 2, 2))
+        self.assertEqual(self.calls, 2)
+
+    def test_failures_not_cached(self):
+        fail = lambda: {"success": False, "error": "HTTP 503"}
+        self.coalescer.do(self.key, fail, ttl=5)
+        self.assertEqual(self.coalescer.get_stats()["cached"], 0)
+
+    def test_key_ignores_param_order(self):
+        self.assertEqual(RequestCoalescer.make_key("get", "/p", {"a": 1, "b": 2}),
+                         RequestCoalescer.make_key("GET", "/p", {"b": 2, "a": 1}))
+
+    def test_async_calls_share_one_request(self):
+        async def fetch():
+            self.calls += 1
+            await asyncio.sleep(0.05)
+            return {"success": True}
+
+        async def run():
+            return await asyncio.gather(*(self.coalescer.do_async(self.key, fetch) for _ in range(4)))
+
+        results = asyncio.run(run())
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent OANDA signal scan (scan_signals / _scan_pair)
+Runs against a fake async connector (no OANDA credentials needed).
+PIN: 841921
+"""
+
+import asyncio
+import os
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+# The engine module loads master.env and runs a position sweep on import: keep both local
+with mock.patch.dict(os.environ), mock.patch("requests.Session"):
+    import oanda_trading_engine
+from oanda_trading_engine import OandaTradingEngine
+
+
+class _FakeAsyncConnector:
+    """Serves candles after a per-pair delay and tracks how many fetches overlap"""
+
+    def __init__(self, delays=None, failing=()):
+        self.delays = delays or {}
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fetched = []
+        self.cancelled = []
+
+    async def get_historical_data(self, pair, count=120, granularity="M15", as_array=False):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(pair, 0.01))
+            if pair in self.failing:
+                raise ConnectionError(f"HTTP 503 for {pair}")
+            self.fetched.append(pair)
+            return pair
+        except asyncio.CancelledError:
+            self.cancelled.append(pair)
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+class TestSignalScan(unittest.TestCase):
+    """Test cases for OandaTradingEngine.scan_signals"""
+
+    def setUp(self):
+        self.signals = {}
+        patches = [
+            mock.patch.object(oanda_trading_engine, "generate_signal",
+                              side_effect=lambda pair, candles: self.signals.get(pair, (None, 0.0))),
+            mock.patch.object(oanda_trading_engine, "log_narration"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _engine(self, connector, concurrency=8):
+        engine = OandaTradingEngine.__new__(OandaTradingEngine)
+        engine.async_oanda = connector
+        engine.display = mock.Mock()
+        engine.scan_concurrency = concurrency
+        engine.scan_early_exit_confidence = 1.0
+        engine._scan_rotation = 0
+        engine.last_scan_report = {}
+        return engine
+
+    def _scan(self, engine, pairs):
+        return asyncio.run(engine.scan_signals(pairs))
+
+    def test_concurrency_is_bounded(self):
+        pairs = [f"P{i}" for i in range(10)]
+        connector = _FakeAsyncConnector({p: 0.02 for p in pairs})
+        engine = self._engine(connector, concurrency=3)
+        self._scan(engine, pairs)
+        self.assertEqual(connector.max_in_flight, 3)
+        self.assertEqual(sorted(connector.fetched), sorted(pairs))
+        self.assertEqual(engine.last_scan_report["pairs_scanned"], 10)
+
+    def test_signals_ranked_by_confidence(self):
+        self.signals = {"EUR_USD": ("BUY", 0.6), "GBP_USD": ("SELL", 0.9), "USD_JPY": ("BUY", 0.75)}
+        engine = self._engine(_FakeAsyncConnector())
+        ranked = self._scan(engine, ["EUR_USD", "GBP_USD", "USD_JPY", "AUD_USD"])
+        self.assertEqual([r["symbol"] for r in ranked], ["GBP_USD", "USD_JPY", "EUR_USD"])
+        self.assertEqual(ranked[0]["signal"], "SELL")
+        self.assertEqual(engine.last_scan_report["signals"], 3)
+
+    def test_early_exit_on_max_confidence(self):
+        self.signals = {"EUR_USD": ("BUY", 1.0), "GBP_USD": ("SELL", 0.9)}
+        connector = _FakeAsyncConnector({"EUR_USD": 0.01, "GBP_USD": 2.0, "USD_JPY": 2.0})
+        engine = self._engine(connector)
+        start = time.perf_counter()
+        ranked = self._scan(engine, ["GBP_USD", "USD_JPY", "EUR_USD"])
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual([r["symbol"] for r in ranked], ["EUR_USD"])
+        self.assertTrue(engine.last_scan_report["early_exit"])
+        self.assertEqual(engine.last_scan_report["pairs_scanned"], 1)
+        self.assertEqual(sorted(connector.cancelled), ["GBP_USD", "USD_JPY"])
+
+    def test_rotation_breaks_ties_fairly(self):
+        pairs = ["EUR_USD", "GBP_USD", "USD_JPY"]
+        self.signals = {p: ("BUY", 0.7) for p in pairs}
+        engine = self._engine(_FakeAsyncConnector())
+        winners = [self._scan(engine, pairs)[0]["symbol"] for _ in range(len(pairs) + 1)]
+        self.assertEqual(winners, ["EUR_USD", "GBP_USD", "USD_JPY", "EUR_USD"])
+
+    def test_pair_errors_are_isolated(self):
+        self.signals = {"EUR_USD": ("BUY", 0.6), "USD_JPY": ("SELL", 0.8)}
+        engine = self._engine(_FakeAsyncConnector(failing={"GBP_USD"}))
+        ranked = self._scan(engine, ["EUR_USD", "GBP_USD", "USD_JPY"])
+        self.assertEqual([r["symbol"] for r in ranked], ["USD_JPY", "EUR_USD"])
+        report = engine.last_scan_report
+        self.assertEqual(report["pairs_scanned"], 3)
+        self.assertEqual(list(report["errors"]), ["GBP_USD"])
+        self.assertIn("HTTP 503", report["errors"]["GBP_USD"])
+        engine.display.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Unit tests for vectorized SmartLogicFilter analysis and batch validation
+PIN: 841921
+"""
+
+import contextlib
+import io
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+
+from logic.smart_logic import SmartLogicFilter
+
+
+def _history(n, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 1.09 + np.cumsum(rng.normal(0, 0.002, n))
+    return {
+        "recent_highs": list(closes + np.abs(rng.normal(0, 0.003, n))),
+        "recent_lows": list(closes - np.abs(rng.normal(0, 0.003, n))),
+        "recent_closes": list(closes),
+        "recent_volumes": [int(v) for v in rng.integers(500, 2000, n)],
+    }
+
+
+def _candidates(history, count, seed=1):
+    rng = np.random.default_rng(seed)
+    signals = []
+    for _ in range(count):
+        direction = str(rng.choice(["buy", "sell", "long", "short"]))
+        side = 1 if direction in ("buy", "long") else -1
+        entry = float(rng.choice(history["recent_closes"]))
+        signals.append({
+            "symbol": "EURUSD",
+            "direction": direction,
+            "entry_price": entry,
+            "target_price": entry + side * float(rng.uniform(0.002, 0.02)),
+            "stop_loss": entry - side * float(rng.uniform(0.001, 0.004)),
+            "swing_high": float(rng.choice([0.0, 1.095, 1.10])),
+            "swing_low": float(rng.choice([0.0, 1.08, 1.085])),
+            **history,
+        })
+    return signals
+
+
+def _reference_fvg(signal):
+    """3-candle loop the vectorized detection must reproduce"""
+    highs, lows, entry = signal["recent_highs"], signal["recent_lows"], signal["entry_price"]
+    buy = signal["direction"] in ("buy", "long")
+    aligned = []
+    for i in range(len(highs) - 2):
+        if lows[i] > highs[i + 2] and buy and highs[i + 2] <= entry <= lows[i]:
+            aligned.append((lows[i] - highs[i + 2]) / entry)
+        if highs[i] < lows[i + 2] and not buy and highs[i] <= entry <= lows[i + 2]:
+            aligned.append((lows[i + 2] - highs[i]) / entry)
+    return aligned
+
+
+def _reference_fib(signal, levels):
+    high, low, entry = signal["swing_high"], signal["swing_low"], signal["entry_price"]
+    prices = [high - (high - low) * l if l <= 1.0 else high + (high - low) * (l - 1.0) for l in levels]
+    distances = [abs(entry - p) / entry for p in prices]
+    return min(distances), distances.index(min(distances))
+
+
+class TestSmartLogicVectorized(unittest.TestCase):
+    """Test cases for the vectorized filters and validate_signals"""
+
+    def setUp(self):
+        self.filter = SmartLogicFilter()
+        self.history = _history(80)
+        self.signals = _candidates(self.history, 200)
+
+    def test_fvg_and_fibonacci_match_reference_loops(self):
+        history = self.filter.analyze_history(self.signals[0])
+        fvg = self.filter._fvg_scores(self.signals, history)
+        fib = self.filter._fibonacci_scores(self.signals)
+        checked = 0
+        for signal, fvg_score, fib_score in zip(self.signals, fvg, fib):
+            aligned = _reference_fvg(signal)
+            self.assertEqual(fvg_score.passed, bool(aligned))
+            if aligned:
+                self.assertEqual(fvg_score.details["aligned_zones"], len(aligned))
+                self.assertEqual(fvg_score.details["strongest_strength"], max(aligned))
+            if signal["swing_high"] > signal["swing_low"] > 0:
+                distance, index = _reference_fib(signal, self.filter.fib_levels)
+                self.assertEqual(fib_score.details.get("distance"), distance)
+                self.assertEqual(fib_score.passed, distance <= 0.005)
+                if fib_score.passed:
+                    self.assertEqual(fib_score.details["level"].split("_")[1], str(self.filter.fib_levels[index]))
+                checked += 1
+        self.assertGreater(checked, 0)
+        self.assertTrue(any(score.passed for score in fvg))
+
+    def test_batch_matches_single_validation(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            single = [self.filter.validate_signal(signal) for signal in self.signals]
+            batch = self.filter.validate_signals(self.signals)
+        strip = lambda v: {**v.__dict__, "validation_timestamp": None,
+                           "filter_scores": [f.__dict__ for f in v.filter_scores]}
+        self.assertEqual([strip(v) for v in single], [strip(v) for v in batch])
+        self.assertTrue(any(v.passed for v in batch))
+        self.assertTrue(any(not v.charter_compliant for v in batch))
+
+    def test_shared_history_analyzed_once(self):
+        signals = [{k: v for k, v in s.items() if k not in self.history} for s in self.signals[:50]]
+        other = _candidates(_history(40, seed=3), 10)
+        with mock.patch.object(self.filter, "analyze_history", wraps=self.filter.analyze_history) as analyze, \
+                contextlib.redirect_stdout(io.StringIO()):
+            merged = self.filter.validate_signals(signals, market_data=self.history)
+            self.filter.validate_signals(other)
+        self.assertLessEqual(analyze.call_count, 2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual([v.score for v in merged],
+                             [v.score for v in self.filter.validate_signals(self.signals[:50])])
+
+    def test_insufficient_history(self):
+        signal = dict(self.signals[0], recent_highs=[1.1, 1.2], recent_volumes=[1000] * 5, recent_closes=[1.1] * 12)
+        history = self.filter.analyze_history(signal)
+        self.assertEqual(self.filter._validate_fvg_confluence(signal, history).score, 0.3)
+        self.assertEqual(self.filter._validate_volume_profile(signal, history).details,
+                         {"volume_points": 5, "price_points": 12})
+        self.assertIsNone(history.rsi)
+        self.assertEqual(self.filter._validate_momentum(signal, history).details, {"price_points": 12})
+
+
+if __name__ == "__main__":
+    unittest.main()
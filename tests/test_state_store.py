@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the incremental state store and the components persisted with it
+PIN: 841921
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+from util.state_store import IncrementalStateStore, decode_columns, encode_columns
+from risk.correlation_monitor import CorrelationMonitor
+from risk.dynamic_sizing import DynamicSizing
+from ml_learning.optimizer import OptimizationResult, TradingOptimizer
+
+
+class TestColumnCodec(unittest.TestCase):
+    """Test cases for columnar record encoding"""
+
+    def test_round_trip_mixed_columns(self):
+        records = [
+            {'symbol': 'EUR_USD', 'price': 1.1, 'count': 3, 'ok': True, 'params': {'rsi': 14}},
+            {'symbol': 'GBP_USD', 'price': None, 'count': None, 'ok': False, 'params': {}},
+            {'symbol': None, 'price': 1.3, 'count': 5, 'ok': True, 'params': [1, 2], 'extra': 'x'},
+        ]
+        arrays, schema = encode_columns('t', records)
+        self.assertEqual(schema['kinds'], {'symbol': 's', 'price': 'f', 'count': 'i', 'ok': 'b',
+                                           'params': 'j', 'extra': 's'})
+        decoded = decode_columns('t', arrays, schema)
+        expected = [dict(r, extra=r.get('extra')) for r in records]
+        self.assertEqual(decoded, expected)
+
+    def test_empty_table(self):
+        arrays, schema = encode_columns('t', [])
+        self.assertEqual(decode_columns('t', arrays, schema), [])
+
+
+class TestIncrementalStateStore(unittest.TestCase):
+    """Test cases for IncrementalStateStore"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self.tmp.name, 'state')
+        self.rows = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _store(self, **kwargs):
+        store = IncrementalStateStore(self.base, **kwargs)
+        store.attach(lambda: ({'rows': list(self.rows)}, {'note': 'x'}))
+        return store
+
+    def test_debounced_flush_batches_deltas(self):
+        store = self._store(flush_interval=0.05)
+        for i in range(50):
+            self.rows.append({'i': i})
+            store.record('row', i=i)
+        self.assertTrue(store.dirty)
+        self.assertFalse(os.path.exists(store.journal.path))
+        deadline = time.time() + 2.0
+        while store.journal.records < 50 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(store.journal.records, 50)
+        self.assertEqual(store.stats['flushes'], 1)
+        store.close()
+
+    def test_snapshot_plus_delta_replay(self):
+        store = self._store(flush_interval=0)
+        for i in range(5):
+            self.rows.append({'i': i})
+            store.record('row', i=i)
+        self.assertTrue(store.snapshot())
+        self.assertEqual(store.journal.records, 0)
+        store.record('row', i=5)
+        store.close()
+
+        snapshot, deltas = IncrementalStateStore(self.base).load()
+        tables, meta = snapshot
+        self.assertEqual(tables['rows'], [{'i': i} for i in range(5)])
+        self.assertEqual(meta, {'note': 'x'})
+        self.assertEqual([d['i'] for d in deltas], [5])
+
+    def test_restart_after_compaction_keeps_new_deltas(self):
+        store = self._store(flush_interval=0)
+        for i in range(3):
+            self.rows.append({'i': i})
+            store.record('row', i=i)
+        self.assertTrue(store.snapshot())
+        store.close()
+
+        restarted = IncrementalStateStore(self.base)
+        restarted.load()
+        restarted.record('row', i=99)
+        restarted.close()
+
+        snapshot, deltas = IncrementalStateStore(self.base).load()
+        self.assertEqual(snapshot[0]['rows'], [{'i': i} for i in range(3)])
+        self.assertEqual([d['i'] for d in deltas], [99])
+
+    def test_compaction_after_threshold(self):
+        store = self._store(flush_interval=0.01, compact_min_records=10)
+        for i in range(12):
+            self.rows.append({'i': i})
+            store.record('row', i=i)
+        deadline = time.time() + 2.0
+        while store.stats['snapshots'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        store.close()
+        self.assertTrue(os.path.exists(store.snapshot_file))
+        snapshot, deltas = IncrementalStateStore(self.base).load()
+        self.assertEqual(len(snapshot[0]['rows']) + len(list(deltas)), 12)
+
+
+class TestComponentPersistence(unittest.TestCase):
+    """Test cases for restart-safe component state"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_correlation_monitor_restart(self):
+        monitor = CorrelationMonitor(pin=841921, correlation_file=self._path('correlations.json'))
+        for i in range(30):
+            monitor.update_price_data('EUR_USD', 1.10 + i * 0.001)
+            monitor.update_price_data('GBP_USD', 1.25 + i * 0.0012)
+        monitor.update_correlations(['EUR_USD', 'GBP_USD'])
+        self.assertFalse(os.path.exists(monitor.state.snapshot_file))  # deltas only
+        monitor.state.close()
+
+        reloaded = CorrelationMonitor(pin=841921, correlation_file=self._path('correlations.json'))
+        self.assertEqual(reloaded.price_data, monitor.price_data)
+        self.assertEqual(reloaded.correlation_matrix, monitor.correlation_matrix)
+
+        reloaded.save_now()
+        again = CorrelationMonitor(pin=841921, correlation_file=self._path('correlations.json'))
+        self.assertEqual(again.price_data, monitor.price_data)
+        self.assertEqual(again.correlation_matrix, monitor.correlation_matrix)
+
+    def test_correlation_monitor_imports_legacy_json(self):
+        with open(self._path('correlations.json'), 'w') as f:
+            json.dump({'correlations': {}, 'price_data': {
+                'EUR_USD': [{'timestamp': '2025-11-20T10:00:00+00:00', 'price': 1.1}]}}, f)
+        monitor = CorrelationMonitor(pin=841921, correlation_file=self._path('correlations.json'))
+        self.assertTrue(os.path.exists(monitor.state.snapshot_file))
+        self.assertEqual(monitor.price_data['EUR_USD'][0]['price'], 1.1)
+
+    def test_optimizer_restart(self):
+        optimizer = TradingOptimizer(pin=841921, optimization_file=self._path('optimizations.json'))
+        for i in range(5):
+            optimizer.record_trade_performance({'regime': 'BULLISH', 'pnl': 0.1 * i, 'outcome': 'WIN',
+                                                'parameters': {'rsi_period': 14}})
+        with optimizer.lock:
+            suggestion = OptimizationResult(parameter='rsi_period', current_value=14, suggested_value=12,
+                                            expected_improvement=0.1, confidence=0.6, reasoning='test',
+                                            data_points=5)
+            optimizer.optimization_history.append(suggestion)
+            optimizer.state.record('suggestions', results=[suggestion.__dict__])
+        optimizer.state.close()
+
+        reloaded = TradingOptimizer(pin=841921, optimization_file=self._path('optimizations.json'))
+        self.assertEqual(reloaded.performance_history, optimizer.performance_history)
+        self.assertEqual(reloaded.optimization_history, [suggestion])
+
+        reloaded.save_now()
+        again = TradingOptimizer(pin=841921, optimization_file=self._path('optimizations.json'))
+        self.assertEqual(again.performance_history, optimizer.performance_history)
+        self.assertEqual(again.optimization_history, [suggestion])
+
+    def test_dynamic_sizing_opt_in_persistence(self):
+        sizer = DynamicSizing(pin=841921, state_file=self._path('sizing.json'))
+        for i in range(105):
+            sizer.record_trade_result('EUR_USD', {'outcome': 'WIN' if i % 2 else 'LOSS', 'pnl': 1.0, 'pnl_pct': 0.5})
+        sizer.record_trade_result('GBP_USD', {'outcome': 'WIN', 'pnl': 2.0, 'pnl_pct': 1.0})
+        sizer.state.close()
+
+        reloaded = DynamicSizing(pin=841921, state_file=self._path('sizing.json'))
+        self.assertEqual(reloaded.performance_history, sizer.performance_history)
+        self.assertEqual(len(reloaded.performance_history['EUR_USD']), 100)
+
+        reloaded.save_now()
+        again = DynamicSizing(pin=841921, state_file=self._path('sizing.json'))
+        self.assertEqual(again.performance_history, sizer.performance_history)
+
+        self.assertIsNone(DynamicSizing(pin=841921).state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batched/concurrent StrategyAggregator
+PIN: 841921
+"""
+
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+
+import numpy as np
+import pandas as pd
+
+import util.strategy_aggregator as strategy_aggregator
+from util.strategy_aggregator import STRATEGY_ORDER, VOTE_DTYPE, StrategyAggregator
+
+
+def _frame(n=60, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 0.0005, n))
+    return pd.DataFrame({
+        'open': close, 'high': close + 0.0004, 'low': close - 0.0004, 'close': close,
+    })
+
+
+# Module-level strategies so the process pool can pickle them
+def trap(df, direction):
+    return {'entry': float(df['close'].iloc[-1]), 'sl': 1.0, 'tp': 1.3}
+
+
+def fib(df):
+    return [{'action': 'buy', 'entry': 1.10, 'sl': 1.09, 'tp': 1.15},
+            {'action': 'sell', 'entry': 1.12}]
+
+
+def holy_grail(df, features=None):
+    df['scratch'] = 1.0  # must not leak into the caller's frame
+    if features is None or 'rsi' not in features:
+        raise RuntimeError("features missing")
+    return [{'action': 'buy', 'entry': 1.20, 'sl': 1.08}]
+
+
+def sweep(df):
+    return [{'action': 'hold'}, 'junk']
+
+
+def scalper(df):
+    raise ValueError("boom")
+
+
+class TestStrategyAggregator(unittest.TestCase):
+    """Test cases for vote collection and consensus"""
+
+    def setUp(self):
+        patcher = mock.patch.object(strategy_aggregator, 'log_narration', create=True)
+        self.narration = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock.patch.object(strategy_aggregator, 'NARRATION_AVAILABLE', True).start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _aggregator(self, **kwargs):
+        agg = StrategyAggregator(signal_vote_threshold=2, **kwargs)
+        self.addCleanup(agg.close)
+        for name, fn in zip(STRATEGY_ORDER, (trap, fib, holy_grail, sweep, scalper)):
+            agg.strategies[name]['available'] = True
+            agg.strategies[name]['fn'] = fn
+        return agg
+
+    def test_consensus_levels_and_stats(self):
+        agg = self._aggregator(max_workers=0)
+        df = _frame()
+        signals = agg.aggregate_signals(df, 'EUR_USD', direction='buy')
+        self.assertNotIn('scratch', df.columns)
+        self.assertEqual([s['action'] for s in signals], ['buy'])
+        buy = signals[0]
+        self.assertEqual(buy['strategy_names'], ['trap_reversal', 'fib_confluence', 'price_action_holy_grail'])
+        self.assertEqual(buy['strategies_triggered'], 3)
+        self.assertAlmostEqual(buy['confidence'], 3 / 5)
+        self.assertAlmostEqual(buy['entry'], (df['close'].iloc[-1] + 1.10 + 1.20) / 3)
+        self.assertEqual((buy['sl'], buy['tp']), (1.0, 1.3))
+        self.assertAlmostEqual(buy['rr_ratio'], abs(1.3 - buy['entry']) / abs(buy['entry'] - 1.0))
+
+        stats = agg.get_statistics()
+        self.assertEqual(stats['strategy_stats']['ema_scalper']['errors'], 1)
+        self.assertIn('boom', stats['strategy_stats']['ema_scalper']['last_error'])
+        self.assertEqual(stats['strategy_stats']['fib_confluence']['calls'], 1)
+        self.assertEqual(stats['invalid_votes'], 2)
+        self.assertEqual((stats['signals_accepted'], stats['signals_rejected']), (1, 0))
+        # One per-pair vote line plus one consensus line
+        events = [c.kwargs['event_type'] for c in self.narration.call_args_list]
+        self.assertEqual(events, ['STRATEGY_SIGNAL', 'MULTI_STRATEGY_CONSENSUS'])
+
+    def test_score_votes_fallbacks(self):
+        agg = self._aggregator(max_workers=0)
+        votes = np.zeros((1, len(STRATEGY_ORDER), 2), dtype=VOTE_DTYPE)
+        for key in ('entry', 'sl', 'tp'):
+            votes[key] = np.nan
+        votes[0, 1, 1] = (True, 1.2, np.nan, np.nan)
+        votes[0, 3, 1] = (True, np.nan, np.nan, np.nan)
+        scored = agg.score_votes(votes)
+        self.assertEqual(scored['votes'].tolist(), [[0, 2]])
+        self.assertAlmostEqual(scored['sl'][0, 1], 1.2 + 0.0020)
+        self.assertAlmostEqual(scored['tp'][0, 1], 1.2 - 0.0064)
+        self.assertAlmostEqual(scored['rr_ratio'][0, 1], 3.2)
+
+    def test_batch_threaded_matches_serial(self):
+        frames = {f"PAIR_{i}": _frame(seed=i) for i in range(12)}
+        frames['SHORT'] = _frame(n=3)
+        directions = {pair: ('sell' if i % 2 else 'buy') for i, pair in enumerate(frames)}
+        serial = self._aggregator(max_workers=0).aggregate_batch(frames, directions)
+        threaded = self._aggregator(max_workers=4).aggregate_batch(frames, directions)
+        self.assertEqual(serial['SHORT'], [])
+        strip = lambda res: {p: [{k: v for k, v in s.items() if k != 'timestamp'} for s in sigs]
+                             for p, sigs in res.items()}
+        self.assertEqual(strip(serial), strip(threaded))
+        # trap_reversal votes follow the per-pair direction
+        self.assertIn('trap_reversal', serial['PAIR_1'][-1]['strategy_names'])
+        self.assertEqual(serial['PAIR_1'][-1]['action'], 'sell')
+
+    def test_process_pool_strategies(self):
+        agg = self._aggregator(max_workers=2, process_strategies=['fib_confluence'])
+        self.assertTrue(agg.strategies['fib_confluence']['cpu_bound'])
+        signals = agg.aggregate_batch({'EUR_USD': _frame(), 'GBP_USD': _frame(seed=2)})
+        self.assertEqual([s['action'] for s in signals['EUR_USD']], ['buy'])
+        self.assertEqual(agg.get_statistics()['strategy_stats']['fib_confluence']['calls'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
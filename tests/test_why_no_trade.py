@@ -151,6 +151,17 @@ class TestWhyNoTrade(unittest.TestCase):
         self.assertEqual(len(violations), 1)
         self.assertEqual(violations[0]['symbol'], 'EUR_USD')
     
+    def test_analyze_recent_violations_window(self):
+        """Test that only the latest narration lines are searched"""
+        with open(self.narration_file, 'a') as f:
+            for i in range(20):
+                f.write(json.dumps({'timestamp': '2025-11-20T11:00:00+00:00',
+                                    'event_type': 'HIVE_ANALYSIS', 'symbol': 'EUR_USD'}) + '\n')
+        
+        self.assertEqual(self.diagnostic.analyze_recent_violations(window=20), [])
+        violations = self.diagnostic.analyze_recent_violations(window=21)
+        self.assertEqual([v['symbol'] for v in violations], ['GBP_USD'])
+    
     def test_diagnose_symbol_no_signal(self):
         """Test diagnosing symbol with no active issues"""
         report = self.diagnostic.diagnose_symbol('USD_JPY')
@@ -7,6 +7,7 @@ PIN: 841921 | Phase 14
 
 import json
 import os
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple, Set
@@ -17,6 +18,12 @@ import threading
 from collections import defaultdict
 import itertools
 
+try:
+    from util.state_store import IncrementalStateStore
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from util.state_store import IncrementalStateStore
+
 @dataclass
 class CorrelationResult:
     """
@@ -91,12 +98,65 @@ class CorrelationMonitor:
         self.logger = logging.getLogger(f"CorrelationMonitor_{pin}")
         self.logger.info("Correlation Monitor initialized")
         
+        # Persistence: snapshot + delta log next to correlation_file
+        self.state = IncrementalStateStore(os.path.splitext(correlation_file)[0], lock=self.lock)
+        
         # Load existing correlation data
-        self._load_correlations()
+        migrated = self._load_correlations()
+        self.state.attach(self._snapshot_state)
+        if migrated:
+            self._save_correlations()
+    
+    def _load_correlations(self) -> bool:
+        """
+        ENGINEER: Load the latest snapshot and replay deltas (or import the legacy JSON file)
+        
+        Returns:
+            True if legacy data was imported and should be snapshotted
+        """
+        migrated = False
+        snapshot, deltas = self.state.load()
+        if snapshot is not None:
+            tables, _ = snapshot
+            for corr_dict in tables.get('correlations', []):
+                result = CorrelationResult(**corr_dict)
+                result.symbol_pair = tuple(result.symbol_pair)
+                self.correlation_matrix[result.symbol_pair] = result
+            for row in tables.get('prices', []):
+                self.price_data[row['symbol']].append({'timestamp': row['timestamp'], 'price': row['price']})
+        else:
+            migrated = self._load_legacy_file()
+        
+        replayed = 0
+        for delta in deltas:
+            if delta['op'] == 'price':
+                self.price_data[delta['symbol']].append({'timestamp': delta['timestamp'], 'price': delta['price']})
+            elif delta['op'] == 'correlation':
+                result = CorrelationResult(**delta['result'])
+                result.symbol_pair = tuple(result.symbol_pair)
+                self.correlation_matrix[result.symbol_pair] = result
+            replayed += 1
+        
+        for symbol in self.price_data:
+            self.price_data[symbol] = self.price_data[symbol][-100:]  # Keep last 100 data points
+        if snapshot is not None or replayed:
+            self.logger.info(f"Loaded {len(self.correlation_matrix)} correlation pairs ({replayed} deltas replayed)")
+        return migrated
+    
+    def _snapshot_state(self):
+        """
+        ENGINEER: Full state for compaction (called by the state store under self.lock)
+        """
+        correlations = [asdict(result) for result in self.correlation_matrix.values()]
+        prices = [
+            {'symbol': symbol, 'timestamp': p['timestamp'], 'price': p['price']}
+            for symbol, points in self.price_data.items() for p in points
+        ]
+        return {'correlations': correlations, 'prices': prices}, {}
     
-    def _load_correlations(self):
+    def _load_legacy_file(self) -> bool:
         """
-        ENGINEER: Load correlation data from persistent storage
+        ENGINEER: One-time import of the pre-snapshot correlations JSON file
         """
         if os.path.exists(self.correlation_file):
             try:
@@ -119,40 +179,23 @@ class CorrelationMonitor:
                 for symbol, prices in corr_data.get('price_data', {}).items():
                     self.price_data[symbol] = prices[-100:]  # Keep last 100 data points
                 
-                self.logger.info(f"Loaded {len(self.correlation_matrix)} correlation pairs")
+                self.logger.info(f"Loaded {len(self.correlation_matrix)} correlation pairs from {self.correlation_file}")
+                return True
                 
             except Exception as e:
                 self.logger.error(f"Failed to load correlations: {e}")
         else:
             self.logger.info("No existing correlation file found - starting fresh")
+        return False
     
     def _save_correlations(self):
         """
-        ENGINEER: Save correlation data to persistent storage
+        ENGINEER: Write a compacted snapshot now (acquires self.lock; do not call while holding it)
         """
-        try:
-            # Prepare correlation data for JSON serialization
-            correlations = {}
-            for (symbol1, symbol2), result in self.correlation_matrix.items():
-                pair_key = f"{symbol1}_vs_{symbol2}"
-                correlations[pair_key] = asdict(result)
-            
-            corr_data = {
-                'correlations': correlations,
-                'price_data': dict(self.price_data),
-                'last_updated': datetime.now(timezone.utc).isoformat()
-            }
-            
-            # Write to temporary file first, then rename for atomic operation
-            temp_file = f"{self.correlation_file}.tmp"
-            with open(temp_file, 'w') as f:
-                json.dump(corr_data, f, indent=2)
-            
-            os.rename(temp_file, self.correlation_file)
-            self.logger.debug("Saved correlation data")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to save correlations: {e}")
+        if not self.state.snapshot():
+            self.logger.error("Failed to save correlations")
+        else:
+            self.logger.debug("Saved correlation snapshot")
     
     def update_price_data(self, symbol: str, price: float, timestamp: Optional[str] = None):
         """
@@ -169,6 +212,7 @@ class CorrelationMonitor:
                 }
                 
                 self.price_data[symbol].append(price_record)
+                self.state.record('price', symbol=symbol, timestamp=timestamp, price=price)
                 
                 # Keep only recent data
                 cutoff_time = datetime.now(timezone.utc) - timedelta(days=self.lookback_days * 2)
@@ -294,10 +338,10 @@ class CorrelationMonitor:
                     if correlation_result:
                         self.correlation_matrix[pair] = correlation_result
                         self.last_correlation_update[pair] = datetime.now(timezone.utc).isoformat()
+                        self.state.record('correlation', result=asdict(correlation_result))
                         updated_count += 1
                 
                 if updated_count > 0:
-                    self._save_correlations()
                     self.logger.info(f"Updated {updated_count} correlation pairs")
                 
         except Exception as e:
@@ -506,8 +550,7 @@ class CorrelationMonitor:
     
     def save_now(self):
         """Force save correlation data to disk"""
-        with self.lock:
-            self._save_correlations()
+        self._save_correlations()
 
 def get_correlation_monitor(pin: int = 841921) -> CorrelationMonitor:
     """Convenience function to get Correlation Monitor instance"""
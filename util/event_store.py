@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Event Store
+One WAL-mode SQLite table for narration, P&L, session breaker, OCO
+validation and pattern outcome events, indexed on (ts), (symbol, ts),
+(event_type, ts) and (stream, ts). Writers enqueue rows and a background
+thread inserts them in batches; aggregates (daily P&L, win rate, violation
+counts) are indexed queries instead of JSONL scans.
+
+The store is opt-in: RICK_EVENT_STORE=dual turns on dual-write mode, where
+the JSONL files stay authoritative and are still written, the store mirrors
+them, and import_jsonl() backfills history written before the store existed.
+Unset (or off), nothing is opened and callers keep scanning the JSONL files.
+PIN: 841921
+"""
+
+import atexit
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    from .jsonl_index import to_epoch
+except ImportError:
+    from util.jsonl_index import to_epoch
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+DEFAULT_DB = PROJECT_ROOT / "logs" / "events.db"
+
+STREAMS = ("narration", "pnl", "breaker", "oco", "pattern")
+
+# Counted by violation_counts(); breaker events and non-VALID OCO checks always count
+VIOLATION_EVENT_TYPES = (
+    "CHARTER_VIOLATION", "OCO_ERROR", "ORDER_FAILED", "TRADE_ERROR",
+    "CIRCUIT_BREAKER", "BREAKER_TRIPPED",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    stream TEXT NOT NULL,
+    event_type TEXT,
+    symbol TEXT,
+    venue TEXT,
+    pnl REAL,
+    outcome TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_symbol_ts ON events (symbol, ts);
+CREATE INDEX IF NOT EXISTS idx_events_type_ts ON events (event_type, ts);
+CREATE INDEX IF NOT EXISTS idx_events_stream_ts ON events (stream, ts);
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    stream TEXT NOT NULL,
+    inode INTEGER,
+    offset INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS live_since (
+    stream TEXT PRIMARY KEY,
+    ts REAL NOT NULL
+);
+"""
+
+_INSERT = ("INSERT INTO events (ts, stream, event_type, symbol, venue, pnl, outcome, payload) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+Row = Tuple[float, str, Optional[str], Optional[str], Optional[str], Optional[float], Optional[str], str]
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize(stream: str, record: Dict[str, Any], now: Optional[float] = None) -> Row:
+    """Map one JSONL record of a stream onto the events columns"""
+    ts = to_epoch(record.get("timestamp"), now if now is not None else time.time())
+    event_type = record.get("event_type")
+    pnl = None
+    outcome = record.get("outcome")
+    if stream == "pnl":
+        event_type = event_type or "PNL"
+        pnl = _float(record.get("net_pnl"))
+    elif stream == "breaker":
+        pnl = _float(record.get("pnl_at_trigger"))
+    elif stream == "oco":
+        event_type = f"OCO_{record.get('action_taken') or ('VALID' if record.get('is_valid') else 'INVALID')}"
+    elif stream == "pattern":
+        event_type = event_type or "PATTERN_OUTCOME"
+        pnl = _float(record.get("pnl"))
+    return (
+        ts, stream,
+        None if event_type is None else str(event_type),
+        record.get("symbol") or record.get("instrument"),
+        record.get("venue"),
+        pnl,
+        None if outcome is None else str(outcome).lower(),
+        json.dumps(record, default=str),
+    )
+
+
+class EventStore:
+    """
+    SQLite event store with a batching background writer
+
+    record() only appends to an in-memory list; the writer thread inserts
+    pending rows in one transaction every flush_interval seconds or as soon
+    as max_batch rows are waiting. Queries flush first so a process always
+    reads its own writes. Each thread reads through its own connection; WAL
+    lets readers (dashboard, monitors) run while the writer commits.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB, flush_interval: float = 0.5,
+                 max_batch: int = 500, max_pending: int = 50000):
+        """
+        Args:
+            path: SQLite database file (':memory:' is not supported; use a temp file)
+            flush_interval: Seconds between batched inserts
+            max_batch: Insert early once this many rows are pending
+            max_pending: Rows beyond this are inserted on the caller's thread
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._pending: List[Row] = []
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._local = threading.local()
+        self._live_marked: set = set()
+        self.stats = {"recorded": 0, "inserted": 0, "batches": 0, "errors": 0, "imported": 0}
+        self._conn = self._connect()
+        with self._write_lock:
+            self._conn.executescript(_SCHEMA)
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # --- Writes ----------------------------------------------------------------------------
+    def record(self, stream: str, record: Dict[str, Any]) -> None:
+        """Queue one event (a dict as written to the stream's JSONL file)"""
+        row = normalize(stream, record)
+        if stream not in self._live_marked:
+            self._mark_live(stream, row[0])
+        if self._stopped.is_set():
+            self._insert([row])
+            return
+        full = False
+        with self._pending_lock:
+            overflow = len(self._pending) >= self.max_pending
+            if not overflow:
+                self._pending.append(row)
+                full = len(self._pending) >= self.max_batch
+        self.stats["recorded"] += 1
+        if overflow:
+            self._insert([row])
+            return
+        if self._thread is None:
+            self._start()
+        if full:
+            self._wake.set()
+
+    def _mark_live(self, stream: str, ts: float):
+        # First dual-written row: backfills only import older rows, so nothing is stored twice
+        with self._write_lock:
+            self._conn.execute("INSERT OR IGNORE INTO live_since (stream, ts) VALUES (?, ?)", (stream, ts))
+            self._conn.commit()
+        self._live_marked.add(stream)
+
+    def _start(self):
+        with self._pending_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-store-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """Insert all pending rows now; returns the number inserted"""
+        with self._pending_lock:
+            rows, self._pending = self._pending, []
+        if rows:
+            self._insert(rows)
+        return len(rows)
+
+    def _insert(self, rows: Sequence[Row]):
+        with self._write_lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(_INSERT, rows)
+                self.stats["inserted"] += len(rows)
+                self.stats["batches"] += 1
+            except sqlite3.Error as e:
+                self.stats["errors"] += 1
+                logger.error(f"Event store insert of {len(rows)} rows failed: {e}")
+
+    def close(self):
+        """Stop the writer thread and insert what is pending"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        self.flush()
+
+    # --- Backfill --------------------------------------------------------------------------
+    def import_jsonl(self, path: Union[str, Path], stream: str, batch_size: int = 5000) -> int:
+        """
+        Backfill a JSONL (or .jsonl.gz) file into the store; returns rows added
+
+        Resumable: plain files continue from the byte offset reached last time
+        (restarting if the file was replaced), gzip segments are imported once.
+        Rows at or after the stream's first dual-written event are skipped.
+        """
+        path = Path(path)
+        if not path.exists():
+            return 0
+        key = str(path.resolve())
+        st = path.stat()
+        compressed = path.suffix == ".gz"
+        with self._write_lock:
+            row = self._conn.execute("SELECT inode, offset FROM imports WHERE path = ?", (key,)).fetchone()
+            cutoff = self._conn.execute("SELECT ts FROM live_since WHERE stream = ?", (stream,)).fetchone()
+        cutoff = cutoff[0] if cutoff else None
+        offset = 0
+        if row is not None:
+            if compressed:
+                return 0
+            if row[0] == st.st_ino and row[1] <= st.st_size:
+                offset = row[1]
+        if not compressed and offset == st.st_size:
+            return 0
+
+        added = 0
+        batch: List[Row] = []
+        last_ts = 0.0
+        opener = gzip.open if compressed else open
+        with opener(path, "rb") as f:
+            f.seek(offset)
+            pos = offset
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line: pick it up next time
+                pos += len(line)
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                parsed = normalize(stream, record, now=last_ts)
+                last_ts = parsed[0]
+                if cutoff is not None and parsed[0] >= cutoff:
+                    continue
+                batch.append(parsed)
+                if len(batch) >= batch_size:
+                    self._insert(batch)
+                    added += len(batch)
+                    batch = []
+        if batch:
+            self._insert(batch)
+            added += len(batch)
+        with self._write_lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO imports (path, stream, inode, offset, rows) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET inode = excluded.inode, offset = excluded.offset, "
+                "rows = CASE WHEN imports.inode = excluded.inode THEN imports.rows + excluded.rows "
+                "ELSE excluded.rows END",
+                (key, stream, None if compressed else st.st_ino, pos, added))
+        self.stats["imported"] += added
+        if added:
+            logger.info(f"Imported {added} {stream} events from {path}")
+        return added
+
+    # --- Queries ---------------------------------------------------------------------------
+    def _select(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        self.flush()
+        return self._reader().execute(sql, params).fetchall()
+
+    @staticmethod
+    def _where(stream=None, event_type=None, symbol=None, since=None, until=None) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if stream is not None:
+            clauses.append("stream = ?")
+            params.append(stream)
+        if event_type is not None:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+        if symbol is not None:
+            clauses.append("symbol = ?")
+            params.append(symbol)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(to_epoch(since, 0.0))
+        if until is not None:
+            clauses.append("ts <= ?")
+            params.append(to_epoch(until, 0.0))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, stream: Optional[str] = None, event_type: Optional[str] = None,
+              symbol: Optional[str] = None, since: Optional[Any] = None, until: Optional[Any] = None,
+              limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+        """Matching events as originally logged (oldest first; the latest `limit` if set)"""
+        where, params = self._where(stream, event_type, symbol, since, until)
+        sql = f"SELECT payload FROM events{where} ORDER BY ts DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        rows = self._select(sql, params)
+        return [json.loads(payload) for (payload,) in reversed(rows)]
+
+    def count(self, stream: Optional[str] = None, event_type: Optional[str] = None,
+              symbol: Optional[str] = None, since: Optional[Any] = None, until: Optional[Any] = None) -> int:
+        where, params = self._where(stream, event_type, symbol, since, until)
+        return self._select(f"SELECT COUNT(*) FROM events{where}", params)[0][0]
+
+    def daily_pnl(self, days: int = 7, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-UTC-day net P&L and trade counts for the last `days` days (oldest first)"""
+        since = time.time() - days * 86400
+        where, params = self._where("pnl", None, symbol, since, None)
+        rows = self._select(
+            "SELECT date(ts, 'unixepoch') AS day, COALESCE(SUM(pnl), 0), COUNT(*), "
+            "SUM(outcome = 'win'), SUM(outcome = 'loss') "
+            f"FROM events{where} GROUP BY day ORDER BY day", params)
+        return [{"day": day, "net_pnl": pnl, "trades": n, "wins": wins or 0, "losses": losses or 0}
+                for day, pnl, n, wins, losses in rows]
+
+    def pnl_summary(self, since: Optional[Any] = None, symbol: Optional[str] = None,
+                    last: Optional[int] = None) -> Dict[str, Any]:
+        """Trade count, wins/losses, win rate (%) and P&L totals from the pnl stream
+        (only the latest `last` events if set)"""
+        where, params = self._where("pnl", None, symbol, since, None)
+        source = f"events{where}"
+        if last is not None:
+            source = f"(SELECT * FROM events{where} ORDER BY ts DESC, id DESC LIMIT ?)"
+            params = params + [int(last)]
+        total, wins, losses, net = self._select(
+            "SELECT COUNT(*), SUM(outcome = 'win'), SUM(outcome = 'loss'), COALESCE(SUM(pnl), 0) "
+            f"FROM {source}", params)[0]
+        gross, fees = self._select(
+            "SELECT COALESCE(SUM(json_extract(payload, '$.gross_pnl')), 0), "
+            "COALESCE(SUM(json_extract(payload, '$.fees')), 0) "
+            f"FROM {source}", params)[0]
+        wins, losses = wins or 0, losses or 0
+        return {
+            "total_trades": total,
+            "wins": wins,
+            "losses": losses,
+            "win_rate": (wins / total * 100) if total else 0.0,
+            "gross_pnl": gross,
+            "total_fees": fees,
+            "net_pnl": net,
+        }
+
+    def win_rate(self, since: Optional[Any] = None, symbol: Optional[str] = None) -> float:
+        """Win rate (%) of closed trades since `since`"""
+        return self.pnl_summary(since, symbol)["win_rate"]
+
+    def violation_counts(self, since: Optional[Any] = None) -> Dict[str, int]:
+        """Counts per event_type of breaker trips, failed OCO checks and violation narration"""
+        lo = to_epoch(since, 0.0) if since is not None else 0.0
+        marks = ",".join("?" * len(VIOLATION_EVENT_TYPES))
+        rows = self._select(
+            "SELECT event_type, COUNT(*) FROM events WHERE ts >= ? AND ("
+            "stream = 'breaker' OR (stream = 'oco' AND event_type != 'OCO_VALID') "
+            f"OR event_type IN ({marks})) GROUP BY event_type",
+            [lo, *VIOLATION_EVENT_TYPES])
+        return {event_type: n for event_type, n in rows}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {"path": str(self.path), "pending": pending, **self.stats}
+
+
+def event_store_mode() -> str:
+    mode = os.getenv("RICK_EVENT_STORE", "off").lower()
+    return "dual" if mode == "dual" else "off"
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> Optional[EventStore]:
+    """Process-wide store at RICK_EVENT_DB (default logs/events.db); None when disabled"""
+    global _store
+    if event_store_mode() == "off":
+        return None
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = EventStore(os.getenv("RICK_EVENT_DB", str(DEFAULT_DB)))
+                atexit.register(_store.close)
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Event store unavailable: {e}")
+                return None
+        return _store
+
+
+def record_event(stream: str, record: Dict[str, Any]) -> None:
+    """Mirror one logged event into the store (never raises into the caller)"""
+    try:
+        store = get_event_store()
+        if store is not None:
+            store.record(stream, record)
+    except Exception as e:
+        logger.debug(f"Event store write skipped: {e}")
+
+
+def default_sources() -> List[Tuple[Path, str]]:
+    """Existing JSONL logs and the stream each one feeds"""
+    logs = PROJECT_ROOT / "logs"
+    sources: List[Tuple[Path, str]] = []
+    segments = logs / "segments" / "narration"
+    if segments.exists():
+        sources += [(p, "narration") for p in sorted(segments.glob("*.jsonl.gz"))]
+    sources += [
+        (PROJECT_ROOT / "narration.jsonl", "narration"),
+        (logs / "pnl.jsonl", "pnl"),
+        (logs / "session_breaker.jsonl", "breaker"),
+        (logs / "oco_validation.jsonl", "oco"),
+    ]
+    return sources
+
+
+def migrate(store: Optional[EventStore] = None) -> Dict[str, int]:
+    """Backfill every default source; safe to re-run"""
+    store = store or get_event_store()
+    if store is None:
+        return {}
+    return {str(path): store.import_jsonl(path, stream) for path, stream in default_sources()}
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        for source, n in migrate().items():
+            print(f"{n:8d}  {source}")
+    else:
+        store = get_event_store()
+        if store is None:
+            print("Event store disabled (set RICK_EVENT_STORE=dual to enable it)")
+        else:
+            print(json.dumps({"stats": store.get_stats(), "summary": store.pnl_summary(),
+                              "daily_pnl": store.daily_pnl(), "violations": store.violation_counts()},
+                             indent=2))
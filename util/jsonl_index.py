@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+JSONL Tail Reader & Offset Index
+Reads the last N records of append-only JSONL logs by seeking backward from
+EOF, and keeps a sidecar offset index (timestamp + event_type per line) so
+range and type queries only read the bytes they return.
+PIN: 841921
+"""
+
+import json
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer assumption
+    fcntl = None
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+INDEX_VERSION = 1
+_ROW = struct.Struct("<QdI")  # byte offset, epoch seconds, event_type id
+
+
+def iter_lines_reverse(path: Union[str, Path], block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield complete lines newest-first, reading fixed-size blocks backward from EOF"""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + tail
+            lines = chunk.split(b"\n")
+            tail = lines[0]  # may continue in the previous block
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def tail_records(path: Union[str, Path], n: int,
+                 predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+    """Last n parseable records (oldest first), optionally filtered"""
+    if n <= 0 or not Path(path).exists():
+        return []
+    out: List[Dict[str, Any]] = []
+    for line in iter_lines_reverse(path):
+        try:
+            record = json.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue  # partial line still being written, or corrupt
+        if predicate is None or predicate(record):
+            out.append(record)
+            if len(out) >= n:
+                break
+    out.reverse()
+    return out
+
+
+def to_epoch(value: Any, default: float) -> float:
+    """ISO-8601 string, datetime or number -> epoch seconds (default if unparseable)"""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            pass
+    return default
+
+
+class JsonlIndex:
+    """
+    Sidecar offset index for one JSONL file
+
+    `<file>.idx` holds one fixed-size row per line (offset, timestamp,
+    event_type id); `<file>.idx.json` holds the type table, row count and
+    the byte position indexed so far. The index is brought up to date
+    incrementally on every query and rebuilt if the file was truncated or
+    replaced (e.g. rotated).
+    """
+
+    def __init__(self, path: Union[str, Path], time_field: str = "timestamp", type_field: str = "event_type"):
+        self.path = Path(path)
+        self.idx_path = Path(f"{self.path}.idx")
+        self.meta_path = Path(f"{self.path}.idx.json")
+        self.time_field = time_field
+        self.type_field = type_field
+        self._lock = threading.Lock()
+        self._reset()
+        self._loaded = False
+
+    def _reset(self):
+        self.offsets = array("Q")
+        self.times = array("d")
+        self.type_ids = array("I")
+        self.types: List[str] = []
+        self._type_lookup: Dict[str, int] = {}
+        self._by_type: Dict[int, array] = {}
+        self.indexed_to = 0
+        self._inode = None
+
+    # --- Index maintenance -----------------------------------------------------------------
+    def _load(self):
+        self._loaded = True
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            if meta.get("version") != INDEX_VERSION:
+                return
+            rows = int(meta["rows"])
+            with open(self.idx_path, "rb") as f:
+                raw = f.read(rows * _ROW.size)
+            if len(raw) != rows * _ROW.size:
+                return
+        except (OSError, ValueError, KeyError):
+            return
+        self.types = list(meta["types"])
+        self._type_lookup = {t: i for i, t in enumerate(self.types)}
+        for offset, ts, type_id in _ROW.iter_unpack(raw):
+            self._append_row(offset, ts, type_id)
+        self.indexed_to = int(meta["indexed_to"])
+        self._inode = meta.get("inode")
+
+    def _append_row(self, offset: int, ts: float, type_id: int):
+        self._by_type.setdefault(type_id, array("Q")).append(len(self.offsets))
+        self.offsets.append(offset)
+        self.times.append(ts)
+        self.type_ids.append(type_id)
+
+    def _type_id(self, name: str) -> int:
+        type_id = self._type_lookup.get(name)
+        if type_id is None:
+            type_id = self._type_lookup[name] = len(self.types)
+            self.types.append(name)
+        return type_id
+
+    def refresh(self) -> int:
+        """Index lines appended since the last call; returns number of new rows"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self.offsets:
+                    self._reset()
+                return 0
+            if st.st_size < self.indexed_to or (self._inode is not None and st.st_ino != self._inode):
+                self._reset()  # truncated or replaced: start over
+            self._inode = st.st_ino
+            if st.st_size == self.indexed_to:
+                return 0
+
+            first_new = len(self.offsets)
+            last_ts = self.times[-1] if self.times else 0.0
+            with open(self.path, "rb") as f:
+                f.seek(self.indexed_to)
+                pos = self.indexed_to
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partial line: index it once it is complete
+                    try:
+                        record = json.loads(line)
+                        ts = to_epoch(record.get(self.time_field), last_ts)
+                        type_id = self._type_id(str(record.get(self.type_field)))
+                    except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                        pos += len(line)
+                        continue
+                    self._append_row(pos, ts, type_id)
+                    last_ts = ts
+                    pos += len(line)
+            self.indexed_to = pos
+            self._persist(first_new)
+            return len(self.offsets) - first_new
+
+    def _persist(self, first_new: int):
+        try:
+            with open(self.idx_path, "ab") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.truncate(first_new * _ROW.size)
+                f.seek(first_new * _ROW.size)
+                f.write(b"".join(_ROW.pack(self.offsets[i], self.times[i], self.type_ids[i])
+                                 for i in range(first_new, len(self.offsets))))
+                tmp = Path(f"{self.meta_path}.tmp")
+                tmp.write_text(json.dumps({
+                    "version": INDEX_VERSION,
+                    "rows": len(self.offsets),
+                    "indexed_to": self.indexed_to,
+                    "inode": self._inode,
+                    "types": self.types,
+                }))
+                os.replace(tmp, self.meta_path)
+        except OSError as e:
+            logger.warning(f"Could not persist index for {self.path}: {e}")
+
+    # --- Queries ---------------------------------------------------------------------------
+    def _read_rows(self, rows: List[int]) -> List[Dict[str, Any]]:
+        out = []
+        with open(self.path, "rb") as f:
+            for row in rows:
+                f.seek(self.offsets[row])
+                try:
+                    out.append(json.loads(f.readline()))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+        return out
+
+    def latest(self, n: int, event_type: Optional[str] = None,
+               predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Last n records (oldest first), optionally of one event_type and/or matching predicate"""
+        if event_type is None:
+            return tail_records(self.path, n, predicate)
+        self.refresh()
+        type_id = self._type_lookup.get(event_type)
+        if type_id is None or n <= 0:
+            return []
+        rows = self._by_type[type_id]
+        out: List[Dict[str, Any]] = []
+        i = len(rows)
+        while i > 0 and len(out) < n:
+            batch = [rows[j] for j in range(max(i - n, 0), i)]
+            i -= len(batch)
+            records = [r for r in self._read_rows(batch) if predicate is None or predicate(r)]
+            out = records[-(n - len(out)):] + out if records else out
+        return out
+
+    def range(self, start: Optional[Union[float, str, datetime]] = None,
+              end: Optional[Union[float, str, datetime]] = None,
+              event_type: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records with start <= timestamp <= end (oldest first), optionally of one event_type"""
+        self.refresh()
+        lo = bisect_left(self.times, to_epoch(start, 0.0)) if start is not None else 0
+        hi = bisect_right(self.times, to_epoch(end, 0.0)) if end is not None else len(self.times)
+        if lo >= hi:
+            return []
+        if event_type is not None:
+            type_id = self._type_lookup.get(event_type)
+            if type_id is None:
+                return []
+            type_rows = self._by_type[type_id]
+            rows = list(type_rows[bisect_left(type_rows, lo):bisect_left(type_rows, hi)])
+            if limit is not None:
+                rows = rows[:limit]
+            return self._read_rows(rows)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        # Contiguous span: one read
+        end_offset = self.offsets[hi] if hi < len(self.offsets) else self.indexed_to
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[lo])
+            raw = f.read(end_offset - self.offsets[lo])
+        out = []
+        for line in raw.splitlines():
+            try:
+                out.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+        return out
+
+    def count_by_type(self) -> Dict[str, int]:
+        self.refresh()
+        return {self.types[t]: len(rows) for t, rows in self._by_type.items()}
+
+
+_indexes: Dict[str, JsonlIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(path: Union[str, Path]) -> JsonlIndex:
+    """Process-wide index per file"""
+    key = str(Path(path).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = JsonlIndex(key)
+        return index
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Segmented JSONL Logs
+Rolls an append-only JSONL log at a size limit or at UTC midnight into
+gzip-compressed segments under logs/segments/<stem>/, with a manifest of
+min/max timestamps and per-event-type counts so readers only open the
+segments that overlap a query. The active file keeps its original path.
+
+Writers append through open_append(), which holds a shared flock on the
+active file; rotation takes it exclusively only to rename the file, and a
+writer that locked a file which was renamed meanwhile reopens the path, so
+nothing is appended to a file after it was rotated. The renamed file is
+compressed on a background thread and its manifest entry is added when
+compression finishes.
+PIN: 841921
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer assumption
+    fcntl = None
+
+try:
+    from .jsonl_index import get_index, to_epoch
+except ImportError:
+    from util.jsonl_index import get_index, to_epoch
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+_RESTAT_EVERY = 100
+
+
+def segment_dir_for(path: Union[str, Path]) -> Path:
+    """Archive directory for a log: <log dir>/logs/segments/<stem>"""
+    path = Path(path)
+    return path.parent / "logs" / "segments" / path.stem
+
+
+class SegmentedLog:
+    """
+    Active JSONL file plus compressed, manifest-indexed archive segments
+
+    Writers append through open_append() (which rotates when due); readers
+    use latest() and query(), which consult the manifest to skip
+    non-overlapping segments.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 100 * 1024 * 1024,
+                 rotate_daily: bool = True, compress_level: int = 6,
+                 time_field: str = "timestamp", type_field: str = "event_type"):
+        """
+        Args:
+            path: Active log file
+            max_bytes: Roll once the active file reaches this size (0 = no size limit)
+            rotate_daily: Also roll when the UTC day changes
+            compress_level: gzip level for closed segments
+        """
+        self.path = Path(path)
+        self.segment_dir = segment_dir_for(self.path)
+        self.manifest_path = self.segment_dir / "manifest.json"
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress_level = compress_level
+        self.time_field = time_field
+        self.type_field = type_field
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._size: Optional[int] = None
+        self._active_day: Optional[str] = None
+        self._manifest_cache: Optional[List[Dict[str, Any]]] = None
+        self._manifest_mtime = None
+        self._compressors: List[threading.Thread] = []
+        self._compressors_lock = threading.Lock()
+
+    # --- Manifest --------------------------------------------------------------------------
+    def segments(self) -> List[Dict[str, Any]]:
+        """Manifest entries, oldest first"""
+        try:
+            mtime = self.manifest_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if self._manifest_cache is None or mtime != self._manifest_mtime:
+            try:
+                self._manifest_cache = json.loads(self.manifest_path.read_text()).get("segments", [])
+                self._manifest_mtime = mtime
+            except (OSError, ValueError):
+                return []
+        return list(self._manifest_cache)
+
+    def _write_manifest(self, segments: List[Dict[str, Any]]):
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"version": 1, "segments": segments}, indent=1))
+        os.replace(tmp, self.manifest_path)
+
+    # --- Locks -----------------------------------------------------------------------------
+    @contextmanager
+    def _flock(self, name: str):
+        """Exclusive cross-process lock file under the segment directory (no-op without fcntl)"""
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.segment_dir / name, "a") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @contextmanager
+    def open_append(self, incoming: int = 0):
+        """Rotate if due, then open the active file for appending (rotation waits for it to close)"""
+        self.maybe_rotate(incoming)
+        while True:
+            f = open(self.path, "a")
+            if not fcntl:
+                break
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                if os.fstat(f.fileno()).st_ino == os.stat(self.path).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            f.close()  # rotated while we waited for the lock: reopen the new file
+        with f:
+            yield f
+
+    # --- Rotation --------------------------------------------------------------------------
+    def _first_day(self) -> Optional[str]:
+        try:
+            with open(self.path, "rb") as f:
+                first = f.readline()
+            ts = json.loads(first).get(self.time_field)
+            return datetime.fromtimestamp(to_epoch(ts, time.time()), tz=timezone.utc).strftime("%Y-%m-%d")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def maybe_rotate(self, incoming: int = 0) -> bool:
+        """Roll the active file if it is over size or from a previous UTC day"""
+        with self._lock:
+            self._writes += 1
+            if self._size is None or self._writes % _RESTAT_EVERY == 0:
+                try:
+                    self._size = self.path.stat().st_size
+                except FileNotFoundError:
+                    self._size = 0
+                    self._active_day = None
+                if self._active_day is None and self._size:
+                    self._active_day = self._first_day()
+            today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            if not self._size:
+                self._active_day = today
+                self._size = incoming
+                return False
+            if not self._due(self._size + incoming, self._active_day, today):
+                self._size += incoming
+                return False
+            rotated = self._rotate(incoming, today)
+            if rotated:
+                self._size = incoming
+                self._active_day = today
+            else:  # someone else rotated (or it failed): restat on the next write
+                self._size = None
+                self._active_day = None
+            return rotated
+
+    def _due(self, size: int, day: Optional[str], today: str) -> bool:
+        return bool((self.max_bytes and size > self.max_bytes) or
+                    (self.rotate_daily and day is not None and day != today))
+
+    def rotate(self) -> bool:
+        """Close the active file into a compressed segment now"""
+        with self._lock:
+            rotated = self._rotate()
+            self._size = None
+            self._active_day = None
+            return rotated
+
+    def _rotate(self, incoming: Optional[int] = None, today: Optional[str] = None) -> bool:
+        """Rename the active file into the segment directory and compress it in the background
+
+        With `incoming` set (maybe_rotate), the size/day check is repeated under
+        the lock: a process with stale counters must not roll a file another
+        process has just started.
+        """
+        try:
+            with self._flock(".lock"):
+                try:
+                    size = self.path.stat().st_size
+                except FileNotFoundError:
+                    size = 0
+                if size == 0:
+                    return False  # another process rotated first
+                if incoming is not None and not self._due(size + incoming, self._first_day(), today):
+                    return False
+                stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+                staging = self.segment_dir / f"{self.path.stem}-{stamp}.jsonl"
+                with open(self.path, "a") as active:
+                    if fcntl:
+                        fcntl.flock(active, fcntl.LOCK_EX)  # wait for writers holding the file
+                    os.replace(self.path, staging)
+                for sidecar in (Path(f"{self.path}.idx"), Path(f"{self.path}.idx.json")):
+                    try:
+                        sidecar.unlink()
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            logger.error(f"Log rotation failed for {self.path}: {e}")
+            return False
+        worker = threading.Thread(target=self._finish_segment, args=(staging,),
+                                  name=f"compress-{self.path.stem}")
+        with self._compressors_lock:
+            self._compressors = [t for t in self._compressors if t.is_alive()] + [worker]
+        worker.start()
+        return True
+
+    def _finish_segment(self, staging: Path):
+        try:
+            entry = self._compress(staging)
+            with self._flock(".lock"):
+                self._manifest_cache = None
+                segments = self.segments()
+                segments.append(entry)
+                segments.sort(key=lambda s: s["file"])  # compressions may finish out of order
+                self._write_manifest(segments)
+            logger.info(f"Rotated {self.path.name} -> {entry['file']} ({entry['lines']} lines)")
+        except OSError as e:
+            logger.error(f"Compressing {staging.name} failed (left uncompressed): {e}")
+
+    def wait_for_segments(self, timeout: Optional[float] = None) -> bool:
+        """Block until rotated files from this process are compressed and in the manifest"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._compressors_lock:
+            workers = list(self._compressors)
+        for worker in workers:
+            worker.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(worker.is_alive() for worker in workers)
+
+    def _compress(self, staging: Path) -> Dict[str, Any]:
+        target = staging.with_suffix(".jsonl.gz")
+        counts: Dict[str, int] = {}
+        start_ts = end_ts = None
+        lines = 0
+        with open(staging, "rb") as src, gzip.open(target, "wb", compresslevel=self.compress_level) as dst:
+            for line in src:
+                dst.write(line)
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                lines += 1
+                ts = to_epoch(record.get(self.time_field), end_ts or 0.0)
+                start_ts = ts if start_ts is None else min(start_ts, ts)
+                end_ts = ts if end_ts is None else max(end_ts, ts)
+                event_type = str(record.get(self.type_field))
+                counts[event_type] = counts.get(event_type, 0) + 1
+        raw_bytes = staging.stat().st_size
+        staging.unlink()
+        return {
+            "file": target.name,
+            "start_ts": start_ts,
+            "end_ts": end_ts,
+            "lines": lines,
+            "bytes": raw_bytes,
+            "compressed_bytes": target.stat().st_size,
+            "counts": counts,
+        }
+
+    # --- Readers ---------------------------------------------------------------------------
+    def _read_segment(self, entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+        out = []
+        try:
+            with gzip.open(self.segment_dir / entry["file"], "rb") as f:
+                for line in f:
+                    try:
+                        out.append(json.loads(line))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+        except OSError as e:
+            logger.warning(f"Skipping unreadable segment {entry.get('file')}: {e}")
+        return out
+
+    def latest(self, n: int, event_type: Optional[str] = None,
+               predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """Last n records across the active file and segments (oldest first)"""
+        out = get_index(self.path).latest(n, event_type=event_type, predicate=predicate)
+        for entry in reversed(self.segments()):
+            if len(out) >= n:
+                break
+            if event_type is not None and not entry.get("counts", {}).get(event_type):
+                continue
+            records = [r for r in self._read_segment(entry)
+                       if (event_type is None or r.get(self.type_field) == event_type)
+                       and (predicate is None or predicate(r))]
+            out = records[-(n - len(out)):] + out if records else out
+        return out
+
+    def query(self, since: Optional[Any] = None, until: Optional[Any] = None,
+              event_type: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Records in [since, until] (oldest first), opening only overlapping segments"""
+        lo = to_epoch(since, 0.0) if since is not None else None
+        hi = to_epoch(until, 0.0) if until is not None else None
+        out: List[Dict[str, Any]] = []
+        for entry in self.segments():
+            if entry.get("start_ts") is None:
+                continue
+            if (lo is not None and entry["end_ts"] < lo) or (hi is not None and entry["start_ts"] > hi):
+                continue
+            if event_type is not None and not entry.get("counts", {}).get(event_type):
+                continue
+            for r in self._read_segment(entry):
+                if event_type is not None and r.get(self.type_field) != event_type:
+                    continue
+                ts = to_epoch(r.get(self.time_field), 0.0)
+                if (lo is None or ts >= lo) and (hi is None or ts <= hi):
+                    out.append(r)
+                    if limit is not None and len(out) >= limit:
+                        return out
+        remaining = None if limit is None else limit - len(out)
+        out.extend(get_index(self.path).range(since, until, event_type=event_type, limit=remaining))
+        return out
+
+
+_logs: Dict[str, SegmentedLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_segmented_log(path: Union[str, Path], **kwargs) -> SegmentedLog:
+    """Process-wide SegmentedLog per file (kwargs apply on first use)"""
+    key = str(Path(path).resolve())
+    with _logs_lock:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = SegmentedLog(key, **kwargs)
+        return log
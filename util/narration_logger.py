@@ -5,12 +5,26 @@ Provides centralized logging for trading narration and P&L tracking
 PIN: 841921
 """
 
+import atexit
 import json
+import os
+import queue
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
+try:
+    from .jsonl_index import tail_records
+    from .log_segments import get_segmented_log
+    from .event_store import get_event_store, record_event
+except ImportError:
+    from util.jsonl_index import tail_records
+    from util.log_segments import get_segmented_log
+    from util.event_store import get_event_store, record_event
+
 # Project paths - use current file location to determine project root
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
 LOGS_DIR = PROJECT_ROOT / "logs"
@@ -22,6 +36,195 @@ logger = logging.getLogger(__name__)
 # Ensure log directory exists
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Narration rolls into compressed segments under logs/segments/narration/
+# (RICK_NARRATION_MAX_MB, 0 = no size limit; RICK_NARRATION_ROTATE_DAILY=0 disables UTC-midnight roll)
+narration_log = get_segmented_log(
+    NARRATION_FILE,
+    max_bytes=int(float(os.getenv("RICK_NARRATION_MAX_MB", 100)) * 1024 * 1024),
+    rotate_daily=os.getenv("RICK_NARRATION_ROTATE_DAILY", "1").lower() not in ("0", "false", "no"),
+)
+
+# Events that must be on disk before log_narration returns when buffered logging is on
+# (breaker trips are not narrated; they go to the session breaker log)
+CRITICAL_EVENT_TYPES = {
+    "OCO_PLACED", "TRADE_OPENED", "ORDER_FAILED", "ORDER_REJECTED_MIN_NOTIONAL", "OCO_ERROR",
+    "POSITION_CLOSED", "TRADE_CLOSED", "TTL_ENFORCEMENT", "HEDGE_EXECUTED", "DUAL_CONNECTOR_ORDER",
+    "CHARTER_VIOLATION", "TRADE_ERROR",
+}
+
+
+class BufferedLogWriter:
+    """
+    Background JSONL writer
+
+    Callers enqueue lines into a bounded queue and return immediately; one
+    writer thread appends batches per file (one open/write/fsync per file per
+    flush interval). Critical lines block until their batch is fsynced. If the
+    queue is full the line is written synchronously rather than dropped.
+    """
+
+    def __init__(self, flush_interval: float = 0.5, max_queue: int = 10000,
+                 fsync: str = "interval", max_batch: int = 1000):
+        """
+        Args:
+            flush_interval: Seconds between batch flushes
+            max_queue: Bounded queue size
+            fsync: 'interval' (every flush), 'critical' (only batches with a critical line) or 'never'
+            max_batch: Flush early once this many lines are pending
+        """
+        if fsync not in ("interval", "critical", "never"):
+            raise ValueError(f"Invalid fsync policy: {fsync}")
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._io_lock = threading.Lock()
+        # Held across the stopped check and the enqueue, so nothing lands behind close()'s sentinel
+        self._state_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.stats = {"enqueued": 0, "written": 0, "flushes": 0, "overflow_sync_writes": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="narration-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, line: str, critical: bool = False, timeout: float = 5.0) -> bool:
+        """Queue one line; critical lines wait (up to timeout) until durably written"""
+        done = threading.Event() if critical else None
+        with self._state_lock:
+            write_now = self._stopped.is_set()
+            if not write_now:
+                try:
+                    self._queue.put_nowait((path, line, done))
+                    self.stats["enqueued"] += 1
+                except queue.Full:
+                    self.stats["overflow_sync_writes"] += 1
+                    write_now = True
+        if write_now:
+            self._write_batch({path: [line]}, durable=critical)
+            return True
+        return done.wait(timeout) if done is not None else True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is written (and fsynced)"""
+        done = threading.Event()
+        with self._state_lock:
+            if self._stopped.is_set():
+                return True
+            try:
+                self._queue.put((None, None, done), timeout=timeout)
+            except queue.Full:
+                return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Drain the queue and stop the writer thread"""
+        with self._state_lock:
+            if self._stopped.is_set():
+                return
+            self._stopped.set()  # late submits write synchronously; nothing is lost
+            self._queue.put((None, None, None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        pending: Dict[Path, List[str]] = {}
+        waiters: List[threading.Event] = []
+        count = 0
+        deadline = time.monotonic() + self.flush_interval
+        stop = False
+        while not stop:
+            try:
+                path, line, done = self._queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                if path is None and done is None:
+                    stop = True  # close(): drain what we have and exit
+                elif path is not None:
+                    pending.setdefault(path, []).append(line)
+                    count += 1
+                if done is not None:
+                    waiters.append(done)
+            except queue.Empty:
+                pass
+            if stop or waiters or count >= self.max_batch or time.monotonic() >= deadline:
+                if pending:
+                    self._write_batch(pending, durable=bool(waiters))
+                for done in waiters:
+                    done.set()
+                pending, waiters, count = {}, [], 0
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write_batch(self, batch: Dict[Path, List[str]], durable: bool):
+        do_fsync = self.fsync == "interval" or (self.fsync == "critical" and durable)
+        with self._io_lock:
+            for path, lines in batch.items():
+                try:
+                    with _open_append(path, sum(len(l) for l in lines)) as f:
+                        f.write(''.join(lines))
+                        f.flush()
+                        if do_fsync:
+                            os.fsync(f.fileno())
+                    self.stats["written"] += len(lines)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.error(f"Failed to write {len(lines)} log lines to {path}: {e}")
+            self.stats["flushes"] += 1
+
+
+_writer: Optional[BufferedLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def enable_buffered_logging(flush_interval: float = 0.5, max_queue: int = 10000,
+                            fsync: str = "interval") -> BufferedLogWriter:
+    """Move narration/P&L writes off the caller's thread (idempotent)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BufferedLogWriter(flush_interval=flush_interval, max_queue=max_queue, fsync=fsync)
+            atexit.register(disable_buffered_logging)
+        return _writer
+
+
+def disable_buffered_logging(timeout: float = 5.0) -> None:
+    """Drain pending lines and return to synchronous writes"""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close(timeout)
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Block until all buffered narration/P&L lines are on disk"""
+    writer = _writer
+    return writer.flush(timeout) if writer is not None else True
+
+
+def get_log_writer_stats() -> Dict[str, Any]:
+    writer = _writer
+    if writer is None:
+        return {"buffered": False}
+    return {"buffered": True, "queue_depth": writer._queue.qsize(), "fsync": writer.fsync, **writer.stats}
+
+
+def _open_append(path: Path, nbytes: int):
+    if path == NARRATION_FILE:
+        return narration_log.open_append(nbytes)  # rotates when due
+    return open(path, 'a')
+
+
+def _append_line(path: Path, line: str, critical: bool = False) -> None:
+    writer = _writer
+    if writer is not None:
+        writer.submit(path, line, critical=critical)
+    else:
+        with _open_append(path, len(line)) as f:
+            f.write(line)
+
+
+if os.getenv("RICK_BUFFERED_LOGS", "").lower() in ("1", "true", "yes"):
+    enable_buffered_logging(
+        flush_interval=float(os.getenv("RICK_LOG_FLUSH_INTERVAL", 0.5)),
+        fsync=os.getenv("RICK_LOG_FSYNC", "interval"),
+    )
+
 def log_narration(
     event_type: str,
     details: Dict[str, Any],
@@ -46,8 +249,8 @@ def log_narration(
             "details": details
         }
         
-        with open(NARRATION_FILE, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        _append_line(NARRATION_FILE, json.dumps(event) + '\n', critical=event_type in CRITICAL_EVENT_TYPES)
+        record_event("narration", event)
             
         logger.debug(f"Narration logged: {event_type}")
         
@@ -100,8 +303,8 @@ def log_pnl(
             "details": details or {}
         }
         
-        with open(PNL_FILE, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        _append_line(PNL_FILE, json.dumps(event) + '\n', critical=True)
+        record_event("pnl", event)
             
         logger.info(f"P&L logged: {symbol} {outcome} ${net_pnl:.2f}")
         
@@ -112,18 +315,9 @@ def log_pnl(
 def get_latest_narration(n: int = 10) -> list:
     """Get the latest N narration events"""
     try:
-        if not NARRATION_FILE.exists():
-            return []
-        
-        events = []
-        with open(NARRATION_FILE, 'r') as f:
-            for line in f:
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        
-        return events[-n:]
+        flush_logs()
+        # Seek backward from EOF; older segments are opened only if the active file has < n
+        return narration_log.latest(n)
     
     except Exception as e:
         logger.error(f"Failed to read narration: {e}")
@@ -133,26 +327,56 @@ def get_latest_narration(n: int = 10) -> list:
 def get_latest_pnl(n: int = 10) -> list:
     """Get the latest N P&L events"""
     try:
-        if not PNL_FILE.exists():
-            return []
-        
-        events = []
-        with open(PNL_FILE, 'r') as f:
-            for line in f:
-                try:
-                    events.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        
-        return events[-n:]
+        flush_logs()
+        # Seek backward from EOF: cost scales with n, not file size
+        return tail_records(PNL_FILE, n)
     
     except Exception as e:
         logger.error(f"Failed to read P&L: {e}")
         return []
 
 
+def query_narration(event_type: Optional[str] = None, since: Optional[Any] = None,
+                    until: Optional[Any] = None, limit: Optional[int] = None) -> list:
+    """
+    Narration events by type and/or time range (oldest first)
+    
+    Only archive segments whose manifest time range and event-type counts
+    match are opened; the active file is read through its sidecar offset
+    index. With only event_type and limit, returns the latest `limit`.
+    
+    Args:
+        event_type: e.g. 'CHARTER_VIOLATION'
+        since/until: ISO timestamp, datetime or epoch seconds (inclusive)
+        limit: Max events
+    """
+    try:
+        flush_logs()
+        if since is None and until is None and event_type is not None and limit is not None:
+            return narration_log.latest(limit, event_type=event_type)
+        return narration_log.query(since, until, event_type=event_type, limit=limit)
+    except Exception as e:
+        logger.error(f"Failed to query narration: {e}")
+        return []
+
+
+_pnl_backfilled = False
+
+
 def get_session_summary() -> Dict[str, Any]:
-    """Get session summary from P&L log"""
+    """Get session summary from the event store (falls back to the P&L log)"""
+    global _pnl_backfilled
+    try:
+        store = get_event_store()
+        if store is not None:
+            if not _pnl_backfilled:
+                flush_logs()
+                store.import_jsonl(PNL_FILE, "pnl")  # history from before dual-write
+                _pnl_backfilled = True
+            return store.pnl_summary(last=1000)  # same window as the P&L log scan below
+    except Exception as e:
+        logger.warning(f"Event store summary unavailable, scanning P&L log: {e}")
+
     try:
         pnl_events = get_latest_pnl(n=1000)  # Get all recent events
         
@@ -1,136 +1,359 @@
+import ctypes
+import ctypes.util
 import json
 import os
+import select
+import sys
+import threading
 import time
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# (old_value, new_value) per changed key; a removed key has new_value None
+Changes = Dict[str, Tuple[Any, Any]]
+
+_TRUE_STRINGS = {"1", "true", "yes", "on"}
+
+# Audit log of parameter changes, anchored at the project root rather than the cwd
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CHANGE_LOG = os.path.join(PROJECT_ROOT, "logs", "parameter_changes.log")
+
+# inotify(7) event bits used by the config watcher
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+
+
+def _inotify_open(directory: str) -> Optional[int]:
+    """inotify fd watching directory for writes/renames, or None where unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if fd < 0:
+            return None
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
 
 class ParameterManager:
-    """Centralized parameter management with locking and audit trail"""
-    
+    """Centralized parameter management with locking and audit trail
+
+    Parameters are held in memory; get() and the typed getters are plain
+    dictionary lookups. The config file is revalidated by (mtime, inode,
+    size) rather than re-read: refresh() costs one stat() unless the file
+    changed. A background watcher (inotify on Linux, stat every
+    RICK_PARAM_WATCH_INTERVAL seconds elsewhere) starts with the first
+    subscriber, so edits made by other processes or by hand reach
+    subscribers without a restart.
+    """
+
     def __init__(self, config_path: str):
         self.config_path = config_path
+        self.lock_path = f"{config_path}.locks"
         self.locked_params = set()
         self.params = {}
-        self.load_config()
-        
-        # Setup logging
+        self._lock = threading.RLock()
+        self._typed: Dict[Tuple[str, type], Any] = {}
+        self._stamp = None
+        self._subscribers: List[Tuple[Callable[[Changes], None], Optional[frozenset], Optional[str]]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self.watch_interval = float(os.getenv("RICK_PARAM_WATCH_INTERVAL", "1.0"))
+
+        # Setup logging (RICK_PARAM_LOG overrides the file, "off" disables it)
         self.logger = logging.getLogger("parameter_manager")
         self.logger.setLevel(logging.INFO)
-        handler = logging.FileHandler("logs/parameter_changes.log")
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-    
-    def load_config(self):
-        """Load configuration from file"""
-        if os.path.exists(self.config_path):
+        change_log = os.getenv("RICK_PARAM_LOG", DEFAULT_CHANGE_LOG)
+        if change_log.lower() != "off" and not any(isinstance(h, logging.FileHandler) for h in self.logger.handlers):
+            os.makedirs(os.path.dirname(os.path.abspath(change_log)), exist_ok=True)
+            handler = logging.FileHandler(change_log)
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+
+        self.load_config()
+
+    def _file_stamp(self) -> Tuple:
+        stamp = []
+        for path in (self.config_path, self.lock_path):
             try:
-                with open(self.config_path, 'r') as f:
-                    self.params = json.load(f)
-                    
-                # Also load locked parameters if they exist
-                lock_path = f"{self.config_path}.locks"
-                if os.path.exists(lock_path):
-                    with open(lock_path, 'r') as f:
-                        self.locked_params = set(json.load(f))
-            except Exception as e:
-                self.logger.error(f"Error loading configuration: {str(e)}")
-                self.params = {}
-        else:
-            self.params = {}
-            self.save_config()
-    
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_ino, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def load_config(self) -> Changes:
+        """Load configuration from file; returns the keys whose values changed"""
+        with self._lock:
+            stamp = self._file_stamp()
+            if os.path.exists(self.config_path):
+                try:
+                    with open(self.config_path, 'r') as f:
+                        params = json.load(f)
+
+                    # Also load locked parameters if they exist
+                    locked = self.locked_params
+                    if os.path.exists(self.lock_path):
+                        with open(self.lock_path, 'r') as f:
+                            locked = set(json.load(f))
+                except Exception as e:
+                    # Keep the last good values; a half-written file is retried on the next change
+                    self.logger.error(f"Error loading configuration: {str(e)}")
+                    return {}
+                changes = self._replace_params(params)
+                self.locked_params = locked
+                self._stamp = stamp
+            else:
+                changes = self._replace_params({})
+                self.save_config()
+        return changes
+
+    def _replace_params(self, params: Dict[str, Any]) -> Changes:
+        old = self.params
+        changes = {key: (old.get(key), params.get(key))
+                   for key in old.keys() | params.keys() if old.get(key) != params.get(key)}
+        self.params = params
+        if changes:
+            self._typed.clear()
+        return changes
+
     def save_config(self):
         """Save configuration to file with backup"""
-        try:
-            # Create backup of current config
-            if os.path.exists(self.config_path):
-                backup_dir = os.path.join(os.path.dirname(self.config_path), "backups")
-                os.makedirs(backup_dir, exist_ok=True)
-                backup_path = os.path.join(backup_dir, f"{os.path.basename(self.config_path)}.{int(time.time())}.bak")
-                with open(self.config_path, 'r') as src, open(backup_path, 'w') as dst:
-                    dst.write(src.read())
-            
-            # Write new config
-            with open(self.config_path, 'w') as f:
-                json.dump(self.params, f, indent=2)
-                
-            # Save locked parameters
-            lock_path = f"{self.config_path}.locks"
-            with open(lock_path, 'w') as f:
-                json.dump(list(self.locked_params), f)
-                
-            return True
-        except Exception as e:
-            self.logger.error(f"Error saving configuration: {str(e)}")
-            return False
-    
+        with self._lock:
+            try:
+                # Create backup of current config
+                if os.path.exists(self.config_path):
+                    backup_dir = os.path.join(os.path.dirname(self.config_path), "backups")
+                    os.makedirs(backup_dir, exist_ok=True)
+                    backup_path = os.path.join(backup_dir, f"{os.path.basename(self.config_path)}.{int(time.time())}.bak")
+                    with open(self.config_path, 'r') as src, open(backup_path, 'w') as dst:
+                        dst.write(src.read())
+
+                # Write new config (atomic replace: watchers never see a partial file)
+                self._write_json(self.config_path, self.params, indent=2)
+
+                # Save locked parameters
+                self._write_json(self.lock_path, list(self.locked_params))
+
+                self._stamp = self._file_stamp()
+                return True
+            except Exception as e:
+                self.logger.error(f"Error saving configuration: {str(e)}")
+                return False
+
+    @staticmethod
+    def _write_json(path: str, data: Any, indent: Optional[int] = None):
+        temp_file = f"{path}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=indent)
+        os.replace(temp_file, path)
+
+    def refresh(self) -> Changes:
+        """Reload if the config or lock file changed on disk and notify subscribers"""
+        if self._file_stamp() == self._stamp:
+            return {}
+        changes = self.load_config()
+        if changes:
+            self.logger.info(f"Reloaded {self.config_path}: {len(changes)} parameter(s) changed on disk")
+            self._notify(changes)
+        return changes
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get parameter value"""
         return self.params.get(key, default)
-    
+
+    def _get_typed(self, key: str, kind: type, default: Any) -> Any:
+        try:
+            return self._typed[(key, kind)]
+        except KeyError:
+            pass
+        params = self.params
+        value = params.get(key)
+        if value is None:
+            return default
+        try:
+            if kind is bool and isinstance(value, str):
+                converted = value.strip().lower() in _TRUE_STRINGS
+            else:
+                converted = kind(value)
+        except (TypeError, ValueError):
+            self.logger.warning(f"Parameter '{key}' value {value!r} is not a valid {kind.__name__}")
+            return default
+        if self.params is params:  # don't cache a value a concurrent update just replaced
+            self._typed[(key, kind)] = converted
+        return converted
+
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        """Get parameter as float (converted once, then cached until it changes)"""
+        return self._get_typed(key, float, default)
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Get parameter as int (converted once, then cached until it changes)"""
+        return self._get_typed(key, int, default)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Get parameter as bool ("true"/"1"/"yes"/"on" strings are True)"""
+        return self._get_typed(key, bool, default)
+
+    def get_str(self, key: str, default: str = "") -> str:
+        """Get parameter as str"""
+        return self._get_typed(key, str, default)
+
     def set(self, key: str, value: Any, component: str) -> bool:
         """Set parameter value with audit logging"""
-        if key in self.locked_params:
-            self.logger.warning(f"Attempted to modify locked parameter '{key}' by {component}")
-            return False
-        
-        old_value = self.params.get(key)
-        self.params[key] = value
-        success = self.save_config()
-        
-        if success:
-            # Log the change
-            self.logger.info(f"Parameter '{key}' changed by {component}: {old_value} -> {value}")
-            return True
-        return False
-    
+        return self.bulk_update({key: value}, component)
+
     def lock_parameter(self, key: str):
         """Lock a parameter to prevent changes"""
-        if key in self.params:
-            self.locked_params.add(key)
-            self.logger.info(f"Parameter '{key}' locked with value: {self.params[key]}")
-            self.save_config()
-    
+        with self._lock:
+            if key in self.params:
+                self.locked_params.add(key)
+                self.logger.info(f"Parameter '{key}' locked with value: {self.params[key]}")
+                self.save_config()
+
     def unlock_parameter(self, key: str):
         """Unlock a parameter to allow changes"""
-        if key in self.locked_params:
-            self.locked_params.remove(key)
-            self.logger.info(f"Parameter '{key}' unlocked")
-            self.save_config()
-            
+        with self._lock:
+            if key in self.locked_params:
+                self.locked_params.remove(key)
+                self.logger.info(f"Parameter '{key}' unlocked")
+                self.save_config()
+
     def get_all_parameters(self):
         """Get all parameters as a dictionary"""
         return self.params.copy()
-    
+
     def get_locked_parameters(self):
         """Get all locked parameters as a set"""
         return self.locked_params.copy()
-    
+
     def bulk_update(self, params_dict: Dict[str, Any], component: str) -> bool:
         """Update multiple parameters at once"""
-        # First check if any parameters are locked
-        for key in params_dict:
-            if key in self.locked_params:
-                self.logger.warning(f"Bulk update contains locked parameter '{key}' from {component}")
+        with self._lock:
+            # First check if any parameters are locked
+            for key in params_dict:
+                if key in self.locked_params:
+                    self.logger.warning(f"Attempted to modify locked parameter '{key}' by {component}")
+                    return False
+
+            # If all clear, update all parameters (copy-on-write: readers never see a partial update)
+            params = dict(self.params)
+            params.update(params_dict)
+            changes = self._replace_params(params)
+            if not self.save_config():
                 return False
-        
-        # If all clear, update all parameters
-        for key, value in params_dict.items():
-            old_value = self.params.get(key)
-            self.params[key] = value
-            self.logger.info(f"Parameter '{key}' changed by {component}: {old_value} -> {value}")
-        
-        return self.save_config()
-
-# Singleton instance
+            for key, (old_value, value) in changes.items():
+                self.logger.info(f"Parameter '{key}' changed by {component}: {old_value} -> {value}")
+        if changes:
+            self._notify(changes)
+        return True
+
+    def subscribe(self, callback: Callable[[Changes], None], keys: Optional[Iterable[str]] = None,
+                  prefix: Optional[str] = None, watch: bool = True) -> Callable[[], None]:
+        """
+        Call callback(changes) whenever matching parameters change
+
+        Args:
+            callback: Receives {key: (old_value, new_value)} for the matching keys
+            keys: Only these keys (default: all)
+            prefix: Only keys starting with prefix, e.g. "risk."
+            watch: Also start the file watcher so out-of-process edits are delivered
+
+        Returns:
+            A function that removes the subscription
+        """
+        entry = (callback, frozenset(keys) if keys is not None else None, prefix)
+        with self._lock:
+            self._subscribers.append(entry)
+        if watch:
+            self.start_watching()
+
+        def unsubscribe():
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+        return unsubscribe
+
+    def _notify(self, changes: Changes):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, keys, prefix in subscribers:
+            matched = {k: v for k, v in changes.items()
+                       if (keys is None or k in keys) and (prefix is None or k.startswith(prefix))}
+            if not matched:
+                continue
+            try:
+                callback(matched)
+            except Exception as e:
+                self.logger.error(f"Parameter subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def start_watching(self):
+        """Start the background watcher that applies on-disk edits (idempotent)"""
+        with self._lock:
+            if self._watcher is not None:
+                return
+            self._stop_watching.clear()
+            self._watcher = threading.Thread(target=self._watch, name="parameter-watch", daemon=True)
+            self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the background watcher"""
+        self._stop_watching.set()
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.join(5.0)
+        self._watcher = None
+
+    def _watch(self):
+        directory = os.path.dirname(os.path.abspath(self.config_path))
+        fd = _inotify_open(directory)
+        try:
+            while not self._stop_watching.is_set():
+                if fd is not None:
+                    # Block until something in the config directory changes (wake up to check for stop)
+                    ready, _, _ = select.select([fd], [], [], 1.0)
+                    if not ready:
+                        continue
+                    try:
+                        while os.read(fd, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                elif self._stop_watching.wait(self.watch_interval):
+                    break
+                try:
+                    self.refresh()
+                except Exception as e:
+                    self.logger.error(f"Parameter refresh failed: {e}")
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+# Singleton instances, one per config file
 _instance = None
+_instances: Dict[str, ParameterManager] = {}
+_instances_lock = threading.Lock()
 
 def get_parameter_manager(config_path=None):
-    """Get the singleton instance of ParameterManager"""
+    """Get the shared ParameterManager for config_path (default: configs/system_parameters.json)"""
     global _instance
-    if _instance is None:
-        if config_path is None:
-            config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs", "system_parameters.json")
-        _instance = ParameterManager(config_path)
-    return _instance
\ No newline at end of file
+    if config_path is None:
+        config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs", "system_parameters.json")
+    key = os.path.abspath(config_path)
+    with _instances_lock:
+        manager = _instances.get(key)
+        if manager is None:
+            manager = _instances[key] = ParameterManager(config_path)
+        if _instance is None:
+            _instance = manager
+    return manager
@@ -2,17 +2,33 @@
 """
 Positions Registry - Cross-Platform Position Tracking
 Prevents duplicate positions across multiple trading platforms (OANDA, IBKR, Coinbase)
+
+Two backends share one API: PositionsRegistry (JSON file, whole-file rewrite
+under a polled flock) and SQLitePositionsRegistry (row-level atomic upserts in
+WAL mode, lock-free reads). get_positions_registry() picks one from
+RICK_POSITIONS_BACKEND ('sqlite' default, 'json').
+
+ActivePairLeases keeps the engines' active-pair sets in the same database as
+crash-safe leases (see get_active_pair_leases()).
 PIN: 841921 | Generated: 2025-11-20
 """
 
 import json
 import os
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set
+import socket
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 import fcntl
 import time
 
+DEFAULT_JSON_FILE = '/tmp/rick_positions_registry.json'
+DEFAULT_SQLITE_FILE = '/tmp/rick_positions_registry.db'
+
 
 class PositionsRegistry:
     """
@@ -22,7 +38,7 @@ class PositionsRegistry:
     Prevents the same symbol from being traded on multiple platforms simultaneously.
     """
     
-    def __init__(self, registry_file: str = '/tmp/rick_positions_registry.json'):
+    def __init__(self, registry_file: str = DEFAULT_JSON_FILE):
         """
         Initialize the positions registry.
         
@@ -131,6 +147,21 @@ class PositionsRegistry:
         Returns:
             True if position registered successfully, False if symbol already taken
         """
+        # Same platform may update its own entry (e.g., modify order)
+        return self.try_register(symbol, platform, order_id, direction, notional_usd)
+    
+    def try_register(self, symbol: str, platform: str, order_id: str, direction: str,
+                     notional_usd: float, expected_order_id: Optional[str] = None) -> bool:
+        """
+        Compare-and-set registration.
+        
+        Takes the symbol if it is free; if `platform` already holds it, replaces
+        the entry only when expected_order_id is None or matches the current
+        order_id. Another platform's position is never overwritten.
+        
+        Returns:
+            True if this call wrote the entry
+        """
         lock_fd = self._acquire_lock()
         if lock_fd is None:
             raise TimeoutError("Could not acquire registry lock")
@@ -138,15 +169,13 @@ class PositionsRegistry:
         try:
             registry = self._load_registry()
             positions = registry['positions']
-            
-            # Check if symbol already has an active position
-            if symbol in positions:
-                existing = positions[symbol]
-                # Allow same platform to update (e.g., modify order)
+            existing = positions.get(symbol)
+            if existing is not None:
                 if existing['platform'] != platform:
                     return False
+                if expected_order_id is not None and existing.get('order_id') != expected_order_id:
+                    return False
             
-            # Register the position
             positions[symbol] = {
                 'platform': platform,
                 'order_id': order_id,
@@ -154,7 +183,6 @@ class PositionsRegistry:
                 'notional_usd': notional_usd,
                 'registered_at': datetime.now(timezone.utc).isoformat()
             }
-            
             self._save_registry(registry)
             return True
             
@@ -288,6 +316,407 @@ class PositionsRegistry:
             self._release_lock(lock_fd)
 
 
+class _SQLiteStore:
+    """Shared plumbing for the SQLite-backed coordination tables (per-thread WAL connections, flock-queued writers)."""
+    
+    _SCHEMA = ""
+    
+    def __init__(self, registry_file: str):
+        self.registry_file = registry_file
+        self.lock_file = f"{registry_file}.lock"
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._lock_fd = os.open(self.lock_file, os.O_CREAT | os.O_RDWR)
+        self._conn().executescript(self._SCHEMA)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Per-thread connection (autocommit; transactions are explicit)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.registry_file, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def _writing(self):
+        """One BEGIN IMMEDIATE transaction; writers queue on a blocking flock (no poll loop)."""
+        with self._write_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                conn = self._conn()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+
+class SQLitePositionsRegistry(_SQLiteStore):
+    """
+    Positions registry backed by SQLite in WAL mode.
+    
+    Same public API as PositionsRegistry. Every mutation is a single
+    statement (or one short BEGIN IMMEDIATE transaction) that touches only
+    the affected rows, so try_register is a true compare-and-set. Writers
+    queue on a blocking flock (the kernel wakes the next waiter; nothing
+    sleeps-polls) and reads never take a lock.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS positions (
+            symbol TEXT PRIMARY KEY,
+            platform TEXT NOT NULL,
+            order_id TEXT,
+            direction TEXT,
+            notional_usd REAL,
+            registered_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_positions_platform ON positions (platform);
+        CREATE TABLE IF NOT EXISTS registry_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    
+    def __init__(self, registry_file: str = DEFAULT_SQLITE_FILE,
+                 legacy_file: Optional[str] = None):
+        """
+        Initialize the SQLite positions registry.
+        
+        Args:
+            registry_file: Path to the SQLite database
+            legacy_file: JSON registry imported once when the database is new
+        """
+        super().__init__(registry_file)
+        if legacy_file:
+            self._import_legacy(legacy_file)
+    
+    def _import_legacy(self, legacy_file: str):
+        if not os.path.exists(legacy_file):
+            return
+        with self._writing() as conn:
+            if conn.execute("SELECT 1 FROM registry_meta WHERE key = 'legacy_imported'").fetchone():
+                return
+            try:
+                with open(legacy_file, 'r') as f:
+                    positions = json.load(f).get('positions', {})
+            except (json.JSONDecodeError, IOError, AttributeError):
+                positions = {}
+            conn.executemany(
+                "INSERT OR IGNORE INTO positions VALUES (?, ?, ?, ?, ?, ?)",
+                [(symbol, pos.get('platform'), pos.get('order_id'), pos.get('direction'),
+                  pos.get('notional_usd'), pos.get('registered_at') or datetime.now(timezone.utc).isoformat())
+                 for symbol, pos in positions.items() if isinstance(pos, dict) and pos.get('platform')])
+            conn.execute("INSERT INTO registry_meta VALUES ('legacy_imported', ?)", (legacy_file,))
+    
+    @staticmethod
+    def _row_to_position(row) -> Dict:
+        return {
+            'platform': row[1],
+            'order_id': row[2],
+            'direction': row[3],
+            'notional_usd': row[4],
+            'registered_at': row[5]
+        }
+    
+    def try_register(self, symbol: str, platform: str, order_id: str, direction: str,
+                     notional_usd: float, expected_order_id: Optional[str] = None) -> bool:
+        """
+        Compare-and-set registration in one statement.
+        
+        Takes the symbol if it is free; if `platform` already holds it, replaces
+        the entry only when expected_order_id is None or matches the current
+        order_id. Another platform's position is never overwritten.
+        
+        Returns:
+            True if this call wrote the entry
+        """
+        sql = ("INSERT INTO positions VALUES (?, ?, ?, ?, ?, ?) "
+               "ON CONFLICT(symbol) DO UPDATE SET order_id = excluded.order_id, "
+               "direction = excluded.direction, notional_usd = excluded.notional_usd, "
+               "registered_at = excluded.registered_at "
+               "WHERE positions.platform = excluded.platform")
+        params = [symbol, platform, order_id, direction, notional_usd,
+                  datetime.now(timezone.utc).isoformat()]
+        if expected_order_id is not None:
+            sql += " AND positions.order_id = ?"
+            params.append(expected_order_id)
+        with self._writing() as conn:
+            return conn.execute(sql, params).rowcount == 1
+    
+    def register_position(self, symbol: str, platform: str, order_id: str, 
+                         direction: str, notional_usd: float) -> bool:
+        """Register a new position; False if another platform holds the symbol."""
+        return self.try_register(symbol, platform, order_id, direction, notional_usd)
+    
+    def unregister_position(self, symbol: str, platform: str) -> bool:
+        """Remove a position; False if not found or held by another platform."""
+        with self._writing() as conn:
+            cur = conn.execute("DELETE FROM positions WHERE symbol = ? AND platform = ?", (symbol, platform))
+            return cur.rowcount == 1
+    
+    def is_symbol_available(self, symbol: str) -> bool:
+        """True if no platform holds the symbol (lock-free read)."""
+        return self._conn().execute("SELECT 1 FROM positions WHERE symbol = ?", (symbol,)).fetchone() is None
+    
+    def get_active_positions(self, platform: Optional[str] = None) -> Dict[str, Dict]:
+        """All active positions, optionally filtered by platform (lock-free read)."""
+        if platform is None:
+            rows = self._conn().execute("SELECT * FROM positions").fetchall()
+        else:
+            rows = self._conn().execute("SELECT * FROM positions WHERE platform = ?", (platform,)).fetchall()
+        return {row[0]: self._row_to_position(row) for row in rows}
+    
+    def cleanup_stale_positions(self, max_age_hours: int = 24) -> int:
+        """Remove positions older than max_age_hours (or with unparseable timestamps)."""
+        now = datetime.now(timezone.utc)
+        with self._writing() as conn:
+            stale_symbols = []
+            for symbol, registered_at in conn.execute("SELECT symbol, registered_at FROM positions"):
+                try:
+                    if now - datetime.fromisoformat(registered_at) > timedelta(hours=max_age_hours):
+                        stale_symbols.append(symbol)
+                except (ValueError, TypeError):
+                    stale_symbols.append(symbol)
+            conn.executemany("DELETE FROM positions WHERE symbol = ?", [(s,) for s in stale_symbols])
+            return len(stale_symbols)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ActivePairLeases(_SQLiteStore):
+    """
+    Cross-engine active-pair tracking with crash-safe leases.
+    
+    Each active pair is one row (symbol -> platform, owner) in the registry
+    database. acquire() checks for a cross-platform duplicate, checks the
+    per-platform limit and takes the pair in one BEGIN IMMEDIATE
+    transaction. A row is a lease, not a permanent claim. The owning
+    process renews its leases from a heartbeat thread. A lease that is not
+    renewed within lease_ttl seconds is ignored and reaped; this happens
+    when an engine crashed or was killed. Leases held by a PID that no
+    longer exists on this host are reaped at the next write.
+    """
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS active_pairs (
+            symbol TEXT PRIMARY KEY,
+            platform TEXT NOT NULL,
+            owner TEXT NOT NULL,
+            host TEXT NOT NULL,
+            pid INTEGER NOT NULL,
+            acquired_at REAL NOT NULL,
+            expires_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_active_pairs_platform ON active_pairs (platform, expires_at);
+    """
+    
+    def __init__(self, registry_file: str = DEFAULT_SQLITE_FILE, lease_ttl: Optional[float] = None,
+                 watch_interval: float = 0.5):
+        """
+        Initialize the active-pair lease table.
+        
+        Args:
+            registry_file: Path to the SQLite database (shared with the positions registry)
+            lease_ttl: Seconds a lease survives without renewal (default: RICK_PAIR_LEASE_TTL, else 120)
+            watch_interval: How often watchers check PRAGMA data_version for commits
+        """
+        super().__init__(registry_file)
+        self.lease_ttl = float(lease_ttl if lease_ttl is not None else os.getenv('RICK_PAIR_LEASE_TTL', 120))
+        self.watch_interval = watch_interval
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.owner = f"{self.host}:{self.pid}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._watch_callbacks: List[Callable[[Dict[str, str]], None]] = []
+    
+    def _reap(self, conn: sqlite3.Connection, now: float):
+        conn.execute("DELETE FROM active_pairs WHERE expires_at <= ?", (now,))
+        dead = [(owner,) for owner, pid in
+                conn.execute("SELECT DISTINCT owner, pid FROM active_pairs WHERE host = ?", (self.host,))
+                if not _pid_alive(pid)]
+        conn.executemany("DELETE FROM active_pairs WHERE owner = ?", dead)
+    
+    def acquire(self, symbol: str, platform: str,
+                max_per_platform: Optional[int] = None) -> Tuple[bool, str]:
+        """
+        Atomically lease `symbol` for `platform`.
+        
+        Re-acquiring a pair this instance already holds on the same platform
+        renews it. The pair is refused when another platform or engine holds
+        it, or when the platform already has max_per_platform live leases.
+        
+        Returns:
+            Tuple of (acquired: bool, reason: str)
+        """
+        now = time.time()
+        with self._writing() as conn:
+            self._reap(conn, now)
+            row = conn.execute("SELECT platform, owner FROM active_pairs WHERE symbol = ?", (symbol,)).fetchone()
+            if row is not None:
+                if row[0] != platform or row[1] != self.owner:
+                    return False, f"Pair {symbol} already active on {row[0]}"
+                conn.execute("UPDATE active_pairs SET expires_at = ? WHERE symbol = ?", (now + self.lease_ttl, symbol))
+                return True, "OK"
+            if max_per_platform is not None:
+                count = conn.execute("SELECT COUNT(*) FROM active_pairs WHERE platform = ?", (platform,)).fetchone()[0]
+                if count >= max_per_platform:
+                    return False, f"Platform {platform} limit reached ({max_per_platform} pairs max)"
+            conn.execute("INSERT INTO active_pairs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                         (symbol, platform, self.owner, self.host, self.pid, now, now + self.lease_ttl))
+        self._start_heartbeat()
+        return True, "OK"
+    
+    def release(self, symbol: str) -> bool:
+        """Release a pair held by this instance; False if it holds no lease on it."""
+        with self._writing() as conn:
+            return conn.execute("DELETE FROM active_pairs WHERE symbol = ? AND owner = ?",
+                                (symbol, self.owner)).rowcount == 1
+    
+    def release_all(self) -> int:
+        """Release every pair held by this instance."""
+        with self._writing() as conn:
+            return conn.execute("DELETE FROM active_pairs WHERE owner = ?", (self.owner,)).rowcount
+    
+    def renew(self) -> int:
+        """Extend all of this instance's leases by lease_ttl; returns how many were renewed."""
+        with self._writing() as conn:
+            return conn.execute("UPDATE active_pairs SET expires_at = ? WHERE owner = ?",
+                                (time.time() + self.lease_ttl, self.owner)).rowcount
+    
+    def holder(self, symbol: str) -> Optional[str]:
+        """Platform holding a live lease on symbol, or None (lock-free read)."""
+        row = self._conn().execute("SELECT platform FROM active_pairs WHERE symbol = ? AND expires_at > ?",
+                                   (symbol, time.time())).fetchone()
+        return row[0] if row else None
+    
+    def get_active_pairs(self, platform: Optional[str] = None) -> Dict[str, str]:
+        """Live leases as {symbol: platform}, optionally for one platform (lock-free read)."""
+        sql = "SELECT symbol, platform FROM active_pairs WHERE expires_at > ?"
+        params: list = [time.time()]
+        if platform is not None:
+            sql += " AND platform = ?"
+            params.append(platform)
+        return dict(self._conn().execute(sql, params).fetchall())
+    
+    def count_by_platform(self) -> Dict[str, int]:
+        """Number of live leases per platform (lock-free read)."""
+        return dict(self._conn().execute(
+            "SELECT platform, COUNT(*) FROM active_pairs WHERE expires_at > ? GROUP BY platform",
+            (time.time(),)).fetchall())
+    
+    def watch(self, callback: Callable[[Dict[str, str]], None]) -> Callable[[], None]:
+        """
+        Call callback({symbol: platform}) whenever the set of live leases changes.
+        
+        Any process's commit bumps SQLite's PRAGMA data_version, and the
+        watcher thread checks that counter before re-reading the table. A lease
+        that expires without a commit is also noticed, at its expiry time.
+        
+        Returns:
+            A function that removes the watch
+        """
+        with self._write_lock:
+            self._watch_callbacks.append(callback)
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch_loop, name="pair-lease-watch", daemon=True)
+                self._watcher.start()
+        
+        def unwatch():
+            with self._write_lock:
+                if callback in self._watch_callbacks:
+                    self._watch_callbacks.remove(callback)
+        return unwatch
+    
+    def _watch_loop(self):
+        conn = self._conn()
+        last_version = None
+        last_pairs = None
+        next_expiry = None
+        while not self._stop.wait(self.watch_interval):
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == last_version and (next_expiry is None or time.time() < next_expiry):
+                continue
+            last_version = version
+            pairs = self.get_active_pairs()
+            row = conn.execute("SELECT MIN(expires_at) FROM active_pairs WHERE expires_at > ?",
+                               (time.time(),)).fetchone()
+            next_expiry = row[0] if row else None
+            if pairs == last_pairs:
+                continue
+            last_pairs = pairs
+            with self._write_lock:
+                callbacks = list(self._watch_callbacks)
+            for callback in callbacks:
+                try:
+                    callback(dict(pairs))
+                except Exception:
+                    pass
+    
+    def _start_heartbeat(self):
+        if self._heartbeat is not None:
+            return
+        with self._write_lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="pair-lease-heartbeat", daemon=True)
+                self._heartbeat.start()
+    
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.lease_ttl / 3):
+            try:
+                self.renew()
+            except sqlite3.Error:
+                pass  # retried on the next beat; the lease outlives two missed beats
+    
+    def close(self, release: bool = True):
+        """Stop heartbeat/watch threads and (by default) release this instance's leases."""
+        self._stop.set()
+        for thread in (self._heartbeat, self._watcher):
+            if thread is not None:
+                thread.join(5.0)
+        if release:
+            self.release_all()
+
+
+def get_active_pair_leases(registry_file: Optional[str] = None) -> ActivePairLeases:
+    """Active-pair leases stored alongside the SQLite positions registry."""
+    return ActivePairLeases(registry_file or DEFAULT_SQLITE_FILE)
+
+
+def get_positions_registry(backend: Optional[str] = None, registry_file: Optional[str] = None):
+    """
+    Create the configured registry backend.
+    
+    Args:
+        backend: 'sqlite' or 'json' (default: RICK_POSITIONS_BACKEND, else 'sqlite')
+        registry_file: Override the backend's default path
+    """
+    backend = (backend or os.getenv('RICK_POSITIONS_BACKEND', 'sqlite')).lower()
+    if backend == 'json':
+        return PositionsRegistry(registry_file or DEFAULT_JSON_FILE)
+    if backend == 'sqlite':
+        if registry_file:
+            return SQLitePositionsRegistry(registry_file)
+        return SQLitePositionsRegistry(DEFAULT_SQLITE_FILE, legacy_file=DEFAULT_JSON_FILE)
+    raise ValueError(f"Unknown positions registry backend: {backend}")
+
+
 def main():
     """CLI interface for positions registry"""
     import argparse
@@ -297,10 +726,11 @@ def main():
     parser.add_argument('--cleanup', action='store_true', help='Clean up stale positions')
     parser.add_argument('--check', type=str, help='Check if symbol is available')
     parser.add_argument('--platform', type=str, help='Filter by platform')
+    parser.add_argument('--backend', choices=['sqlite', 'json'], help='Registry backend')
     
     args = parser.parse_args()
     
-    registry = PositionsRegistry()
+    registry = get_positions_registry(args.backend)
     
     if args.list:
         positions = registry.get_active_positions(platform=args.platform)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+State Journal
+Append-only JSONL log of state mutations for components that used to
+rewrite their whole state file on every change. Each record carries a
+monotonically increasing sequence number; a snapshot stores the last
+sequence it includes, so startup is "load snapshot, replay records after
+it" and a crash between writing a snapshot and truncating the journal
+never applies a record twice.
+PIN: 841921
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class StateJournal:
+    """
+    Sequenced append-only journal
+
+    append() writes one line and flushes it to the OS (no fsync: an OS
+    crash can lose the tail, a process crash cannot). A torn final line
+    from an interrupted write is cut off when the journal is opened.
+    """
+
+    def __init__(self, path: Union[str, Path], fsync: bool = False):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self.seq = 0
+        self.records = 0  # lines currently in the file
+        self._repair_tail()
+        for record in self._read():
+            self.seq = max(self.seq, int(record.get("seq", 0)))
+            self.records += 1
+        self._file = None
+
+    def _repair_tail(self):
+        try:
+            with open(self.path, "rb+") as f:
+                data = f.read()
+                if data and not data.endswith(b"\n"):
+                    cut = data.rfind(b"\n") + 1
+                    f.truncate(cut)
+                    logger.warning(f"Dropped torn journal tail ({len(data) - cut} bytes) in {self.path}")
+        except FileNotFoundError:
+            pass
+
+    def _read(self) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+                    if isinstance(record, dict):
+                        yield record
+        except FileNotFoundError:
+            return
+
+    def replay(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """Records with seq > after_seq, in write order"""
+        for record in self._read():
+            if int(record.get("seq", 0)) > after_seq:
+                yield record
+
+    def append(self, op: str, **fields) -> int:
+        """Write one record; returns its sequence number"""
+        return self.extend([(op, fields)])
+
+    def extend(self, records: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Write several (op, fields) records in one write; returns the last sequence number"""
+        with self._lock:
+            if not records:
+                return self.seq
+            lines = []
+            for op, fields in records:
+                self.seq += 1
+                lines.append(json.dumps({"seq": self.seq, "op": op, **fields}, default=str) + "\n")
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.write("".join(lines))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.records += len(lines)
+            return self.seq
+
+    def advance_to(self, seq: int) -> None:
+        """Never issue a sequence number <= seq (call after loading a snapshot taken at seq:
+        the journal may have been emptied by compaction, and new records must replay after it)"""
+        with self._lock:
+            self.seq = max(self.seq, int(seq))
+
+    def reset(self, upto_seq: int) -> None:
+        """Drop records covered by a snapshot taken at upto_seq (keeps any newer ones)"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            keep = [r for r in self._read() if int(r.get("seq", 0)) > upto_seq]
+            tmp = Path(f"{self.path}.tmp")
+            with open(tmp, "w") as f:
+                for record in keep:
+                    f.write(json.dumps(record, default=str) + "\n")
+            os.replace(tmp, self.path)
+            self.records = len(keep)
+            self.seq = max(self.seq, upto_seq)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
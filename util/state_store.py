@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Incremental State Store
+Shared persistence for risk/ML components whose state used to be rewritten
+as one pretty-printed JSON file on every update. A component records each
+mutation as a small delta; deltas are batched by a debounced background
+flush into an append-only log (util/state_journal), and a compacted
+snapshot is written once the log outgrows compact_min_records. Snapshots
+store record lists column-wise as typed NumPy arrays (.npz, no pickle).
+Each persisted update costs O(change); snapshots are amortized.
+PIN: 841921
+"""
+
+import atexit
+import json
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from .state_journal import StateJournal
+except ImportError:
+    from util.state_journal import StateJournal
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# (tables of homogeneous records, small JSON-able metadata)
+Snapshot = Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Any]]
+
+
+# --- Columnar record encoding -------------------------------------------------------------
+def _kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not None]
+    if all(isinstance(v, bool) for v in present) and present:
+        return "b"
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present) and present:
+        return "i"
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return "f"  # also the all-None case
+    if all(isinstance(v, str) for v in present):
+        return "s"
+    return "j"
+
+
+def encode_columns(name: str, records: List[Dict[str, Any]]) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    List of dicts -> one typed array per key, plus the schema needed to decode
+
+    Floats become float64 (NaN = None), ints int64 with a null mask, strings
+    a vocabulary plus int32 codes, anything else (nested dicts) JSON text.
+    """
+    keys: List[str] = []
+    seen = set()
+    for r in records:
+        for k in r:
+            if k not in seen:
+                seen.add(k)
+                keys.append(k)
+    arrays: Dict[str, np.ndarray] = {}
+    kinds: Dict[str, str] = {}
+    for i, key in enumerate(keys):
+        values = [r.get(key) for r in records]
+        kind = kinds[key] = _kind(values)
+        col = f"{name}.{i}"
+        if kind == "f":
+            arrays[col] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        elif kind in ("i", "b"):
+            arrays[col] = np.array([0 if v is None else v for v in values],
+                                   dtype=np.int64 if kind == "i" else bool)
+            if any(v is None for v in values):
+                arrays[f"{col}.null"] = np.array([v is None for v in values], dtype=bool)
+        elif kind == "s":
+            lookup: Dict[str, int] = {}
+            arrays[f"{col}.codes"] = np.array(
+                [-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values], dtype=np.int32)
+            arrays[f"{col}.vocab"] = np.array(list(lookup), dtype=str)
+        else:
+            arrays[col] = np.array([json.dumps(v) for v in values], dtype=str)
+    return arrays, {"rows": len(records), "keys": keys, "kinds": kinds}
+
+
+def decode_columns(name: str, arrays, schema: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Inverse of encode_columns"""
+    columns = []
+    for i, key in enumerate(schema["keys"]):
+        kind = schema["kinds"][key]
+        col = f"{name}.{i}"
+        if kind == "f":
+            values = [None if v != v else v for v in arrays[col].tolist()]
+        elif kind in ("i", "b"):
+            values = arrays[col].tolist()
+            if f"{col}.null" in arrays:
+                values = [None if null else v for v, null in zip(values, arrays[f"{col}.null"].tolist())]
+        elif kind == "s":
+            vocab = arrays[f"{col}.vocab"].tolist() + [None]
+            values = [vocab[c] for c in arrays[f"{col}.codes"].tolist()]
+        else:
+            values = [json.loads(v) for v in arrays[col].tolist()]
+        columns.append(values)
+    keys = schema["keys"]
+    if not keys:
+        return [{} for _ in range(schema["rows"])]
+    return [dict(zip(keys, row)) for row in zip(*columns)]
+
+
+# --- Store ----------------------------------------------------------------------------------
+class IncrementalStateStore:
+    """
+    Snapshot + delta log with dirty tracking and a debounced background flush
+
+    Typical wiring in a component:
+        store = IncrementalStateStore(base, lock=self.lock)
+        snapshot, deltas = store.load()      # restore, then apply each delta
+        store.attach(self._snapshot_state)   # () -> (tables, meta), called under lock
+        store.record('op', **fields)         # after each mutation, under lock
+
+    record() only queues the delta and marks the store dirty; the writer
+    thread waits flush_interval after the first dirty mark (coalescing a
+    burst of updates) and appends all queued deltas in one write.
+    """
+
+    def __init__(self, base_path: Union[str, Path], lock: Optional[Any] = None,
+                 flush_interval: float = 1.0, compact_min_records: int = 1000):
+        """
+        Args:
+            base_path: Files are <base>.snapshot.npz and <base>.delta.jsonl
+            lock: The component's state lock (held while taking snapshots)
+            flush_interval: Debounce window for background flushes (0 = write on every record)
+            compact_min_records: Write a snapshot once the delta log reaches this many records
+        """
+        base = str(base_path)
+        self.snapshot_file = f"{base}.snapshot.npz"
+        self.journal = StateJournal(f"{base}.delta.jsonl")
+        self.lock = lock if lock is not None else threading.Lock()
+        self.flush_interval = flush_interval
+        self.compact_min_records = compact_min_records
+        self._snapshot_fn: Optional[Callable[[], Snapshot]] = None
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._pending_lock = threading.Lock()
+        self._dirty = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"deltas": 0, "flushes": 0, "snapshots": 0, "errors": 0}
+        _stores.add(self)
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty.is_set()
+
+    # --- Load -------------------------------------------------------------------------------
+    def load(self) -> Tuple[Optional[Snapshot], Iterator[Dict[str, Any]]]:
+        """(latest snapshot or None, deltas recorded after it)"""
+        seq = 0
+        snapshot = None
+        if os.path.exists(self.snapshot_file):
+            try:
+                with np.load(self.snapshot_file, allow_pickle=False) as data:
+                    header = json.loads(str(data["__meta__"]))
+                    if header.get("version") != SNAPSHOT_VERSION:
+                        raise ValueError(f"unsupported snapshot version {header.get('version')}")
+                    tables = {name: decode_columns(name, data, schema)
+                              for name, schema in header["tables"].items()}
+                seq = header["seq"]
+                snapshot = (tables, header.get("meta", {}))
+            except Exception as e:
+                logger.error(f"Ignoring unreadable snapshot {self.snapshot_file}: {e}")
+        # A compacted log restarts empty: new deltas must still number after the snapshot
+        self.journal.advance_to(seq)
+        return snapshot, self.journal.replay(seq)
+
+    def attach(self, snapshot_fn: Callable[[], Snapshot]) -> None:
+        """Register the callback that returns the component's full state"""
+        self._snapshot_fn = snapshot_fn
+
+    # --- Write ------------------------------------------------------------------------------
+    def record(self, op: str, **fields) -> None:
+        """Queue one delta (call right after the in-memory mutation)"""
+        with self._pending_lock:
+            self._pending.append((op, fields))
+        self.stats["deltas"] += 1
+        if self.flush_interval <= 0 or self._stopped.is_set():
+            self.flush()
+            return
+        self._dirty.set()
+        if self._thread is None:
+            with self._pending_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="state-store-flush", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._dirty.wait()
+            self._stopped.wait(self.flush_interval)  # debounce: let a burst accumulate
+            self.flush()
+            if self.journal.records >= self.compact_min_records:
+                self.snapshot()
+
+    def flush(self) -> int:
+        """Append queued deltas to the log now; returns how many were written"""
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+            self._dirty.clear()
+        if batch:
+            try:
+                self.journal.extend(batch)
+                self.stats["flushes"] += 1
+            except OSError as e:
+                self.stats["errors"] += 1
+                logger.error(f"Failed to write {len(batch)} state deltas to {self.journal.path}: {e}")
+                with self._pending_lock:
+                    self._pending[:0] = batch
+        return len(batch)
+
+    def snapshot(self) -> bool:
+        """Write a compacted snapshot of the attached state and truncate the log it covers"""
+        if self._snapshot_fn is None:
+            return False
+        try:
+            with self.lock:
+                self.flush()  # the log now matches in-memory state
+                tables, meta = self._snapshot_fn()
+                seq = self.journal.seq
+            arrays: Dict[str, np.ndarray] = {}
+            schemas = {}
+            for name, records in tables.items():
+                cols, schemas[name] = encode_columns(name, records)
+                arrays.update(cols)
+            header = {"version": SNAPSHOT_VERSION, "seq": seq, "tables": schemas, "meta": meta}
+            arrays["__meta__"] = np.array(json.dumps(header, default=str))
+            tmp = f"{self.snapshot_file}.tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_file)
+            self.journal.reset(seq)
+            self.stats["snapshots"] += 1
+            return True
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"State snapshot failed for {self.snapshot_file}: {e}")
+            return False
+
+    def close(self) -> None:
+        """Stop the flush thread and write anything still queued"""
+        self._stopped.set()
+        self._dirty.set()
+        if self._thread is not None:
+            self._thread.join(5.0)
+        self.flush()
+        self.journal.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {"pending": pending, "log_records": self.journal.records, **self.stats}
+
+
+_stores: "weakref.WeakSet[IncrementalStateStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for store in list(_stores):
+        try:
+            store.close()
+        except Exception:
+            pass
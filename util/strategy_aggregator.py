@@ -2,13 +2,22 @@
 """
 Strategy Aggregator - Multi-Signal Consensus Engine
 Combines 5 prototype strategies with ML filtering and Hive Mind amplification
+Strategies run concurrently per batch of pairs and vote into a NumPy matrix
+(RICK_AGGREGATOR_WORKERS, RICK_AGGREGATOR_PROCESS_STRATEGIES)
 PIN: 841921 | Phase 2 Integration
 """
 
 import sys
 import os
+import inspect
+import logging
+import threading
+import time
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Dict, Optional, Sequence, Tuple, Union
 from datetime import datetime, timezone
 
 sys.path.insert(0, '/home/ing/RICK/RICK_LIVE_CLEAN')
@@ -56,29 +65,127 @@ try:
 except ImportError:
     NARRATION_AVAILABLE = False
 
+try:
+    from strategies.indicator_engine import compute
+    FEATURES_AVAILABLE = True
+except ImportError:
+    FEATURES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Column order of the vote matrix
+STRATEGY_ORDER = (
+    'trap_reversal',
+    'fib_confluence',
+    'price_action_holy_grail',
+    'liquidity_sweep',
+    'ema_scalper',
+)
+ACTIONS = ('buy', 'sell')
+_ACTION_INDEX = {action: i for i, action in enumerate(ACTIONS)}
+_SIDE = np.array([1.0, -1.0])  # +1 buy, -1 sell (aligned with ACTIONS)
+
+# One cell per (pair, strategy, action); prices are NaN when the strategy gave none
+VOTE_DTYPE = np.dtype([
+    ('vote', '?'),
+    ('entry', '<f8'),
+    ('sl', '<f8'),
+    ('tp', '<f8'),
+])
+
+# Fallback SL/TP distances when no voting strategy supplied one
+FALLBACK_SL = 0.0020  # 20 pips
+FALLBACK_TP = 0.0064  # 64 pips
+
+MIN_BARS = 5
+
+
+def shared_features(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Features computed once per frame and handed to every strategy that
+    accepts a `features` keyword: float OHLC arrays, ATR(14), RSI(14) and
+    EMA(9)/EMA(21) of close (indicators need strategies.indicator_engine)
+    """
+    features = {
+        col: df[col].to_numpy(dtype=float)
+        for col in ('open', 'high', 'low', 'close') if col in df
+    }
+    if FEATURES_AVAILABLE and 'close' in features:
+        close = features['close']
+        features['rsi'] = compute('rsi', close, params=(14,))
+        features['ema_fast'] = compute('ema', close, params=(9,))
+        features['ema_slow'] = compute('ema', close, params=(21,))
+        if 'high' in features and 'low' in features:
+            features['atr'] = compute('atr', features['high'], features['low'], close, params=(14,))
+    return features
+
+
+@lru_cache(maxsize=None)
+def _accepts_features(fn) -> bool:
+    try:
+        return 'features' in inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _run_strategy(fn, frame: pd.DataFrame, args: Tuple, kwargs: Dict) -> Tuple[object, float, Optional[str]]:
+    """Run one strategy; returns (result, elapsed_ms, error). Module level so process pools can pickle it"""
+    start = time.perf_counter()
+    try:
+        result, error = fn(frame, *args, **kwargs), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return result, (time.perf_counter() - start) * 1000.0, error
+
+
+def _price(sig: Dict, key: str) -> float:
+    try:
+        return float(sig[key])
+    except (KeyError, TypeError, ValueError):
+        return np.nan
+
 
 class StrategyAggregator:
     """
     Aggregates signals from 5 independent strategies
     Applies voting mechanism with configurable thresholds
     Confidence scoring based on multi-strategy agreement
+
+    Strategies for every pair of a batch run concurrently (thread pool, or a
+    process pool for strategies listed as CPU-bound); their votes land in a
+    preallocated (pairs x strategies x actions) VOTE_DTYPE matrix and
+    consensus is scored for all pairs at once.
     """
-    
-    def __init__(self, signal_vote_threshold: int = 2):
+
+    def __init__(self, signal_vote_threshold: int = 2, max_workers: Optional[int] = None,
+                 process_strategies: Optional[Iterable[str]] = None):
         """
         Initialize Strategy Aggregator
-        
+
         Args:
             signal_vote_threshold: Minimum number of strategies that must agree (default: 2/5)
+            max_workers: Pool size for concurrent strategy runs (default:
+                RICK_AGGREGATOR_WORKERS or 5); 0 runs strategies in the calling thread
+            process_strategies: Strategy names to run in a process pool instead of
+                threads (default: comma-separated RICK_AGGREGATOR_PROCESS_STRATEGIES)
         """
         self.signal_vote_threshold = signal_vote_threshold
-        
+        if max_workers is None:
+            max_workers = int(os.getenv("RICK_AGGREGATOR_WORKERS", "5"))
+        self.max_workers = max(0, max_workers)
+        if process_strategies is None:
+            process_strategies = [
+                s.strip() for s in os.getenv("RICK_AGGREGATOR_PROCESS_STRATEGIES", "").split(",") if s.strip()
+            ]
+        process_strategies = set(process_strategies)
+
         # Strategy availability tracking
         self.strategies = {
             'trap_reversal': {
                 'available': TRAP_AVAILABLE,
                 'weight': 1.0,  # Equal weighting
-                'fn': trap_reversal_signal if TRAP_AVAILABLE else None
+                'fn': trap_reversal_signal if TRAP_AVAILABLE else None,
+                'directional': True  # Called as fn(df, direction)
             },
             'fib_confluence': {
                 'available': FIB_AVAILABLE,
@@ -101,219 +208,269 @@ class StrategyAggregator:
                 'fn': ema_scalper_signal if EMA_AVAILABLE else None
             }
         }
-        
-        self.strategies_available = sum(
-            1 for s in self.strategies.values() if s['available']
-        )
-        
+        for name, spec in self.strategies.items():
+            spec['cpu_bound'] = name in process_strategies
+
         # Statistics tracking
         self.total_signals_evaluated = 0
         self.signals_accepted = 0
         self.signals_rejected = 0
+        self.invalid_votes = 0
         self.strategy_votes = {name: 0 for name in self.strategies.keys()}
-    
+        self.strategy_stats = {
+            name: {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'last_error': None}
+            for name in self.strategies.keys()
+        }
+
+        self._pool_lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def strategies_available(self) -> int:
+        return sum(1 for s in self.strategies.values() if s['available'])
+
     def aggregate_signals(
-        self, 
-        df: pd.DataFrame, 
+        self,
+        df: pd.DataFrame,
         pair: str,
         direction: Optional[str] = None
     ) -> List[Dict]:
         """
         Run all available strategies and aggregate signals via voting
-        
+
         Args:
             df: DataFrame with OHLC data (columns: open, high, low, close)
             pair: Currency pair (for logging)
             direction: 'buy', 'sell', or None (for non-directional strategies)
-        
+
         Returns:
             List of aggregated signals with confidence scores
         """
-        
-        if len(df) < 5:
-            return []
-        
-        self.total_signals_evaluated += 1
-        aggregated = []
-        votes = {}
-        
-        # ============================================
-        # STRATEGY 1: Trap Reversal
-        # ============================================
-        if self.strategies['trap_reversal']['available'] and direction:
-            try:
-                trap_sig = self.strategies['trap_reversal']['fn'](df, direction)
-                if trap_sig:
-                    key = f"trap_reversal_{direction}"
-                    votes[key] = trap_sig
-                    self.strategy_votes['trap_reversal'] += 1
-                    
-                    if NARRATION_AVAILABLE:
-                        log_narration(
-                            event_type="STRATEGY_SIGNAL",
-                            details={"strategy": "trap_reversal", "direction": direction},
-                            symbol=pair
-                        )
-            except Exception as e:
-                pass  # Silently fail on individual strategies
-        
-        # ============================================
-        # STRATEGY 2: Fibonacci Confluence (non-directional)
-        # ============================================
-        if self.strategies['fib_confluence']['available']:
-            try:
-                fib_sigs = self.strategies['fib_confluence']['fn'](df)
-                if fib_sigs:
-                    for sig in fib_sigs:
-                        key = f"fib_confluence_{sig['action']}"
-                        votes[key] = sig
-                        self.strategy_votes['fib_confluence'] += 1
-                        
-                        if NARRATION_AVAILABLE:
-                            log_narration(
-                                event_type="STRATEGY_SIGNAL",
-                                details={"strategy": "fib_confluence", "action": sig['action']},
-                                symbol=pair
-                            )
-            except Exception as e:
-                pass
-        
-        # ============================================
-        # STRATEGY 3: Price Action Holy Grail (non-directional)
-        # ============================================
-        if self.strategies['price_action_holy_grail']['available']:
-            try:
-                pa_sigs = self.strategies['price_action_holy_grail']['fn'](df)
-                if pa_sigs:
-                    for sig in pa_sigs:
-                        key = f"price_action_{sig['action']}"
-                        votes[key] = sig
-                        self.strategy_votes['price_action_holy_grail'] += 1
-                        
-                        if NARRATION_AVAILABLE:
-                            log_narration(
-                                event_type="STRATEGY_SIGNAL",
-                                details={"strategy": "price_action", "action": sig['action']},
-                                symbol=pair
-                            )
-            except Exception as e:
-                pass
-        
-        # ============================================
-        # STRATEGY 4: Liquidity Sweep (non-directional)
-        # ============================================
-        if self.strategies['liquidity_sweep']['available']:
-            try:
-                liq_sigs = self.strategies['liquidity_sweep']['fn'](df)
-                if liq_sigs:
-                    for sig in liq_sigs:
-                        key = f"liquidity_sweep_{sig['action']}"
-                        votes[key] = sig
-                        self.strategy_votes['liquidity_sweep'] += 1
-                        
-                        if NARRATION_AVAILABLE:
-                            log_narration(
-                                event_type="STRATEGY_SIGNAL",
-                                details={"strategy": "liquidity_sweep", "action": sig['action']},
-                                symbol=pair
-                            )
-            except Exception as e:
-                pass
-        
-        # ============================================
-        # STRATEGY 5: EMA Scalper (non-directional)
-        # ============================================
-        if self.strategies['ema_scalper']['available']:
-            try:
-                ema_sig = self.strategies['ema_scalper']['fn'](df)
-                if ema_sig:
-                    key = f"ema_scalper_{ema_sig['action']}"
-                    votes[key] = ema_sig
-                    self.strategy_votes['ema_scalper'] += 1
-                    
-                    if NARRATION_AVAILABLE:
-                        log_narration(
-                            event_type="STRATEGY_SIGNAL",
-                            details={"strategy": "ema_scalper", "action": ema_sig['action']},
-                            symbol=pair
-                        )
-            except Exception as e:
-                pass
-        
-        # ============================================
-        # VOTING & AGGREGATION
-        # ============================================
-        
-        # Group votes by action
-        action_votes = {}
-        for vote_key, vote_sig in votes.items():
-            action = vote_sig.get('action', 'buy')
-            if action not in action_votes:
-                action_votes[action] = []
-            action_votes[action].append(vote_sig)
-        
-        # Check if we meet quorum
-        for action, signals in action_votes.items():
-            if len(signals) >= self.signal_vote_threshold:
+        return self.aggregate_batch({pair: df}, direction)[pair]
+
+    def aggregate_batch(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        direction: Union[None, str, Dict[str, Optional[str]]] = None
+    ) -> Dict[str, List[Dict]]:
+        """
+        Run all available strategies for many pairs in one call
+
+        Args:
+            frames: {pair: DataFrame with OHLC data}
+            direction: One direction for every pair, or {pair: direction}
+                (only trap_reversal needs it)
+
+        Returns:
+            {pair: list of aggregated signals}; pairs with fewer than 5 bars get []
+        """
+        results: Dict[str, List[Dict]] = {pair: [] for pair in frames}
+        pairs = [pair for pair, df in frames.items() if len(df) >= MIN_BARS]
+        if not pairs:
+            return results
+
+        directions = direction if isinstance(direction, dict) else {pair: direction for pair in pairs}
+        votes = self.collect_votes([frames[p] for p in pairs], [directions.get(p) for p in pairs])
+        scored = self.score_votes(votes)
+
+        self.total_signals_evaluated += len(pairs)
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        for i, pair in enumerate(pairs):
+            if NARRATION_AVAILABLE and votes['vote'][i].any():
+                # One narration line per pair instead of one per vote
+                log_narration(
+                    event_type="STRATEGY_SIGNAL",
+                    details={"votes": {
+                        name: [ACTIONS[a] for a in np.flatnonzero(votes['vote'][i, s])]
+                        for s, name in enumerate(STRATEGY_ORDER) if votes['vote'][i, s].any()
+                    }},
+                    symbol=pair
+                )
+
+            for a, action in enumerate(ACTIONS):
+                triggered = int(scored['votes'][i, a])
+                if triggered < self.signal_vote_threshold:
+                    continue
+
                 # CONSENSUS REACHED
-                confidence = len(signals) / self.strategies_available
-                
-                # Calculate aggregate entry/SL/TP
-                entries = [s.get('entry', 0) for s in signals if 'entry' in s]
-                sls = [s.get('sl', 0) for s in signals if 'sl' in s]
-                tps = [s.get('tp', 0) for s in signals if 'tp' in s]
-                
-                avg_entry = sum(entries) / len(entries) if entries else 0
-                
-                # Conservative SL (best protection), Aggressive TP (best profit)
-                if action == 'buy':
-                    sl = min(sls) if sls else avg_entry - 0.0020  # Fallback: -20 pips
-                    tp = max(tps) if tps else avg_entry + 0.0064  # Fallback: +64 pips
-                else:  # sell
-                    sl = max(sls) if sls else avg_entry + 0.0020  # Fallback: +20 pips
-                    tp = min(tps) if tps else avg_entry - 0.0064  # Fallback: -64 pips
-                
-                # Calculate R:R ratio
-                risk = abs(avg_entry - sl)
-                reward = abs(tp - avg_entry)
-                rr_ratio = reward / risk if risk > 0 else 0
-                
-                aggregated_signal = {
+                signal = {
                     'action': action,
-                    'entry': float(avg_entry),
-                    'sl': float(sl),
-                    'tp': float(tp),
-                    'risk': float(risk),
-                    'reward': float(reward),
-                    'rr_ratio': float(rr_ratio),
-                    'strategies_triggered': len(signals),
-                    'confidence': float(confidence),
-                    'strategy_names': [s for s in action_votes.keys()],
-                    'tag': f'multi_strategy_{len(signals)}_agreement',
-                    'timestamp': datetime.now(timezone.utc).isoformat()
+                    'entry': float(scored['entry'][i, a]),
+                    'sl': float(scored['sl'][i, a]),
+                    'tp': float(scored['tp'][i, a]),
+                    'risk': float(scored['risk'][i, a]),
+                    'reward': float(scored['reward'][i, a]),
+                    'rr_ratio': float(scored['rr_ratio'][i, a]),
+                    'strategies_triggered': triggered,
+                    'confidence': float(scored['confidence'][i, a]),
+                    'strategy_names': [STRATEGY_ORDER[s] for s in np.flatnonzero(votes['vote'][i, :, a])],
+                    'tag': f'multi_strategy_{triggered}_agreement',
+                    'timestamp': timestamp
                 }
-                
-                aggregated.append(aggregated_signal)
+                results[pair].append(signal)
                 self.signals_accepted += 1
-                
+
                 if NARRATION_AVAILABLE:
                     log_narration(
                         event_type="MULTI_STRATEGY_CONSENSUS",
                         details={
                             "action": action,
-                            "strategies_agreed": len(signals),
-                            "confidence": confidence,
-                            "entry": avg_entry,
-                            "rr_ratio": rr_ratio
+                            "strategies_agreed": triggered,
+                            "confidence": signal['confidence'],
+                            "entry": signal['entry'],
+                            "rr_ratio": signal['rr_ratio']
                         },
                         symbol=pair
                     )
-        
-        if not aggregated:
-            self.signals_rejected += 1
-        
-        return aggregated
-    
+
+            if not results[pair]:
+                self.signals_rejected += 1
+
+        return results
+
+    def collect_votes(self, frames: Sequence[pd.DataFrame],
+                      directions: Optional[Sequence[Optional[str]]] = None) -> np.ndarray:
+        """
+        Run every available strategy on every frame and fill the vote matrix
+
+        Args:
+            frames: OHLC DataFrames, one per row of the result
+            directions: Direction per frame for directional strategies
+
+        Returns:
+            VOTE_DTYPE array of shape (len(frames), len(STRATEGY_ORDER), len(ACTIONS))
+        """
+        votes = np.zeros((len(frames), len(STRATEGY_ORDER), len(ACTIONS)), dtype=VOTE_DTYPE)
+        for key in ('entry', 'sl', 'tp'):
+            votes[key] = np.nan
+        if directions is None:
+            directions = [None] * len(frames)
+
+        active = [
+            (s, name, self.strategies[name]) for s, name in enumerate(STRATEGY_ORDER)
+            if self.strategies[name]['available'] and self.strategies[name]['fn'] is not None
+        ]
+        wants_features = any(_accepts_features(spec['fn']) for _, _, spec in active)
+
+        # (row, strategy index, name, default action, future or finished result)
+        tasks = []
+        for i, (df, direction) in enumerate(zip(frames, directions)):
+            features = shared_features(df) if wants_features else None
+            for s, name, spec in active:
+                args: Tuple = ()
+                if spec.get('directional'):
+                    if not direction:
+                        continue
+                    args = (direction,)
+                kwargs = {'features': features} if features is not None and _accepts_features(spec['fn']) else {}
+                # Shallow copy: strategies that add columns don't race on the shared frame
+                call = (spec['fn'], df.copy(deep=False), args, kwargs)
+                pool = self._pool(spec.get('cpu_bound', False))
+                pending = pool.submit(_run_strategy, *call) if pool is not None else _run_strategy(*call)
+                tasks.append((i, s, name, direction or 'buy', pending))
+
+        for i, s, name, default_action, pending in tasks:
+            result, elapsed_ms, error = pending.result() if isinstance(pending, Future) else pending
+            stats = self.strategy_stats[name]
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            if error is not None:
+                stats['errors'] += 1
+                stats['last_error'] = error
+                logger.warning(f"Strategy {name} failed: {error}")
+                continue
+            if not result:
+                continue
+            for sig in (result if isinstance(result, list) else [result]):
+                a = _ACTION_INDEX.get(sig.get('action', default_action)) if isinstance(sig, dict) else None
+                if a is None:
+                    self.invalid_votes += 1
+                    continue
+                # Same strategy and action twice: the later signal wins
+                votes[i, s, a] = (True, _price(sig, 'entry'), _price(sig, 'sl'), _price(sig, 'tp'))
+                self.strategy_votes[name] += 1
+
+        return votes
+
+    def score_votes(self, votes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Consensus levels for a vote matrix, computed for all pairs at once
+
+        Entry is the mean of the voters' entries (0 if none), SL the most
+        conservative and TP the most aggressive given (fixed pip fallbacks
+        otherwise).
+
+        Returns:
+            Dict of (pairs x actions) arrays: 'votes', 'confidence', 'entry',
+            'sl', 'tp', 'risk', 'reward' and 'rr_ratio'
+        """
+        vote = votes['vote']
+        counts = vote.sum(axis=1)
+
+        def given(key):
+            values = votes[key]
+            have = vote & ~np.isnan(values)
+            return values, have, have.any(axis=1)
+
+        entry, have_entry, any_entry = given('entry')
+        n_entry = have_entry.sum(axis=1)
+        avg_entry = np.where(have_entry, entry, 0.0).sum(axis=1) / np.maximum(n_entry, 1)
+
+        sl, have_sl, any_sl = given('sl')
+        tp, have_tp, any_tp = given('tp')
+        lowest_sl = np.where(have_sl, sl, np.inf).min(axis=1)
+        highest_sl = np.where(have_sl, sl, -np.inf).max(axis=1)
+        lowest_tp = np.where(have_tp, tp, np.inf).min(axis=1)
+        highest_tp = np.where(have_tp, tp, -np.inf).max(axis=1)
+
+        # Conservative SL (best protection), Aggressive TP (best profit)
+        buy = _SIDE > 0
+        best_sl = np.where(buy, lowest_sl, highest_sl)
+        best_tp = np.where(buy, highest_tp, lowest_tp)
+        sl_out = np.where(any_sl, best_sl, avg_entry - _SIDE * FALLBACK_SL)
+        tp_out = np.where(any_tp, best_tp, avg_entry + _SIDE * FALLBACK_TP)
+
+        # Calculate R:R ratio
+        risk = np.abs(avg_entry - sl_out)
+        reward = np.abs(tp_out - avg_entry)
+        rr_ratio = np.divide(reward, risk, out=np.zeros_like(risk), where=risk > 0)
+
+        return {
+            'votes': counts,
+            'confidence': counts / max(self.strategies_available, 1),
+            'entry': avg_entry,
+            'sl': sl_out,
+            'tp': tp_out,
+            'risk': risk,
+            'reward': reward,
+            'rr_ratio': rr_ratio,
+        }
+
+    def _pool(self, cpu_bound: bool):
+        """Shared executor for a strategy (None when running in the calling thread)"""
+        if self.max_workers == 0:
+            return None
+        with self._pool_lock:
+            if cpu_bound:
+                if self._process_pool is None:
+                    self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                return self._process_pool
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                       thread_name_prefix="strategy")
+            return self._thread_pool
+
+    def close(self):
+        """Shut down the strategy worker pools"""
+        with self._pool_lock:
+            pools, self._thread_pool, self._process_pool = (self._thread_pool, self._process_pool), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
     def evaluate_signal_strength(self, signal: Dict) -> float:
         """
         Evaluate strength of aggregated signal (0.0 to 1.0)
@@ -337,27 +494,37 @@ class StrategyAggregator:
         
         return float(strength)
     
+
     def get_statistics(self) -> Dict:
         """
         Return aggregator statistics
-        
+
         Returns:
-            Dict with signal evaluation statistics
+            Dict with signal evaluation statistics and per-strategy
+            latency/error counters
         """
         acceptance_rate = (
             self.signals_accepted / self.total_signals_evaluated * 100
             if self.total_signals_evaluated > 0 else 0
         )
-        
+
         return {
             'total_signals_evaluated': self.total_signals_evaluated,
             'signals_accepted': self.signals_accepted,
             'signals_rejected': self.signals_rejected,
             'acceptance_rate': round(acceptance_rate, 1),
             'strategies_available': self.strategies_available,
-            'strategy_votes': self.strategy_votes.copy()
+            'strategy_votes': self.strategy_votes.copy(),
+            'invalid_votes': self.invalid_votes,
+            'strategy_stats': {
+                name: {
+                    **stats,
+                    'avg_ms': round(stats['total_ms'] / stats['calls'], 3) if stats['calls'] else 0.0
+                }
+                for name, stats in self.strategy_stats.items()
+            }
         }
-    
+
     def set_vote_threshold(self, threshold: int):
         """
         Dynamically adjust voting threshold
@@ -17,14 +17,16 @@ from typing import Dict, List, Optional
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
 
+from util.jsonl_index import tail_records
+
 try:
     from foundation.rick_charter import RickCharter
-    from util.positions_registry import PositionsRegistry
+    from util.positions_registry import get_positions_registry
     from util.usd_converter import get_usd_notional
 except ImportError as e:
     print(f"Warning: Could not import required modules: {e}")
     RickCharter = None
-    PositionsRegistry = None
+    get_positions_registry = None
     get_usd_notional = None
 
 
@@ -39,7 +41,7 @@ class TradeBlockDiagnostic:
             dev_mode: Enable development mode (from RICK_DEV_MODE env var)
         """
         self.dev_mode = dev_mode or os.getenv('RICK_DEV_MODE') == '1'
-        self.registry = PositionsRegistry() if PositionsRegistry else None
+        self.registry = get_positions_registry() if get_positions_registry else None
         self.narration_file = Path(__file__).parent.parent / 'narration.jsonl'
         
     def check_charter_compliance(self, symbol: str, position_size: float, 
@@ -142,13 +144,14 @@ class TradeBlockDiagnostic:
             return {'blocked': False, 'error': str(e)}
     
     def analyze_recent_violations(self, symbol: Optional[str] = None, 
-                                 limit: int = 10) -> List[Dict]:
+                                 limit: int = 10, window: int = 1000) -> List[Dict]:
         """
         Analyze recent charter violations from narration log.
         
         Args:
             symbol: Optional symbol filter
             limit: Maximum number of violations to return
+            window: Only look at this many of the latest narration lines
             
         Returns:
             List of recent violations
@@ -159,25 +162,14 @@ class TradeBlockDiagnostic:
         violations = []
         
         try:
-            with open(self.narration_file, 'r') as f:
-                # Read last N lines efficiently
-                lines = []
-                for line in f:
-                    lines.append(line)
-                    if len(lines) > 1000:  # Keep last 1000 lines in memory
-                        lines.pop(0)
-                
-                # Parse violations
-                for line in reversed(lines):
-                    try:
-                        event = json.loads(line.strip())
-                        if event.get('event_type') == 'CHARTER_VIOLATION':
-                            if symbol is None or event.get('symbol') == symbol:
-                                violations.append(event)
-                                if len(violations) >= limit:
-                                    break
-                    except json.JSONDecodeError:
-                        continue
+            # Seek back from EOF over the last `window` lines only (archived segments are not opened)
+            recent = tail_records(self.narration_file, window)
+            for event in reversed(recent):
+                if event.get('event_type') == 'CHARTER_VIOLATION':
+                    if symbol is None or event.get('symbol') == symbol:
+                        violations.append(event)
+                        if len(violations) >= limit:
+                            break
         
         except Exception as e:
             print(f"Error reading narration file: {e}")